@@ -20,8 +20,11 @@ from dataclasses import dataclass
 # Добавляем src в путь
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from signals.ai_signals import AISignalAnalyzer
+from signals.ai_signals import AISignalAnalyzer, _compute_technical_indicators
+from signals.candle_archive import CandleArchive
+from signals.factor_matrix import FactorMatrix
 from api_manager import get_coin_price
+from http_client import http_client
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -50,6 +53,11 @@ class Backtester:
     
     SUPPORTED_SYMBOLS = ["BTC", "ETH", "TON", "SOL", "XRP"]
     
+    # Свечей истории для индикаторов в каждой точке (MA 50/200 требует 200)
+    INDICATOR_WINDOW = 200
+    # 4h свечей в сутках (change_24h / volume_24h)
+    CANDLES_PER_DAY = 6
+    
     def __init__(self):
         """Initialize backtester with mock whale tracker."""
         # Create a mock whale tracker for the analyzer
@@ -57,6 +65,8 @@ class Backtester:
         mock_whale_tracker = Mock()
         mock_whale_tracker.get_transactions_by_blockchain = AsyncMock(return_value=[])
         self.analyzer = AISignalAnalyzer(mock_whale_tracker)
+        self.archive = CandleArchive()
+        self.factor_matrix = FactorMatrix()
     
     async def fetch_historical_data(self, symbol: str, days: int) -> List[Dict]:
         """
@@ -67,36 +77,33 @@ class Backtester:
         """
         logger.info(f"Fetching historical data for {symbol} over {days} days...")
         
-        # Use Bybit to fetch historical 4h candles
-        # For simplicity, we'll use the existing get_price_history_bybit method
-        # 4h interval, limit based on days (6 candles per day for 4h)
-        candles_needed = days * 6
+        # 4h свечи Bybit из локального архива: с биржи догружается только
+        # то, чего ещё нет в data/candles.db, поэтому период не ограничен
+        end_time = datetime.now()
+        start_time = end_time - timedelta(days=days)
         
         try:
             bybit_symbol = self.analyzer.bybit_mapping.get(symbol, f"{symbol}USDT")
-            prices_data = await self.analyzer.get_price_history_bybit(
-                symbol, interval="240", limit=min(candles_needed, 200)
+            candles = await self.archive.fetch(
+                "bybit",
+                bybit_symbol,
+                "4h",
+                int(start_time.timestamp() * 1000),
+                int(end_time.timestamp() * 1000),
             )
             
-            if not prices_data or len(prices_data) < 10:
+            if len(candles) < 10:
                 logger.error(f"Insufficient historical data for {symbol}")
                 return []
             
-            # Get OHLCV data as well
-            ohlcv_data = await self.analyzer.get_ohlcv_data(symbol, interval="4h", limit=min(candles_needed, 200))
-            
-            if not ohlcv_data:
-                logger.error(f"Failed to fetch OHLCV data for {symbol}")
-                return []
-            
-            # Combine price and OHLCV data
-            historical_data = []
-            for i, candle in enumerate(ohlcv_data):
-                historical_data.append({
-                    "timestamp": datetime.fromtimestamp(candle.get("time", 0)),
-                    "price": candle.get("close", 0),
+            historical_data = [
+                {
+                    "timestamp": datetime.fromtimestamp(candle["timestamp"] / 1000),
+                    "price": candle["close"],
                     "ohlcv": candle
-                })
+                }
+                for candle in candles
+            ]
             
             logger.info(f"Fetched {len(historical_data)} data points for {symbol}")
             return historical_data
@@ -105,64 +112,81 @@ class Backtester:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return []
     
-    async def _generate_signal_at_point(self, symbol: str, data_point: Dict) -> Optional[Dict]:
+    def _signal_inputs_at_point(self, historical_data: List[Dict], index: int) -> Dict:
         """
-        Симулировать генерацию сигнала в определенной точке времени.
+        Входы calculate_signal в точке index только по свечам до неё включительно.
         
-        Returns:
-            Dict with signal information or None if signal generation failed
+        Исторических значений остальных источников (киты, стакан, деривативы)
+        нет - они отсутствуют, как при недоступном API.
         """
-        try:
-            # Get market data at this point
-            current_price = data_point["price"]
-            
-            # Simulate minimal signal calculation
-            # For backtesting, we'll use a simplified version
-            signal_params = {
-                "direction": "sideways",  # Default
-                "entry_price": current_price,
-                "target1_price": current_price * 1.015,
-                "target2_price": current_price * 1.025,
-                "stop_loss_price": current_price * 0.994,
-                "probability": 50.0
-            }
-            
-            # Try to get actual signal params (this may fail due to API limits in backtest)
-            try:
-                actual_params = await self.analyzer.get_signal_params(symbol)
-                if actual_params:
-                    signal_params = actual_params
-            except Exception as e:
-                logger.debug(f"Using default signal params for {symbol}: {e}")
-            
-            return signal_params
-            
-        except Exception as e:
-            logger.error(f"Error generating signal at point for {symbol}: {e}")
-            return None
+        window = historical_data[max(0, index + 1 - self.INDICATOR_WINDOW):index + 1]
+        ohlcv = [
+            {**point["ohlcv"], "volumeto": point["ohlcv"]["close"] * point["ohlcv"]["volume"]}
+            for point in window
+        ]
+        day = ohlcv[-self.CANDLES_PER_DAY - 1:]
+        open_price = day[0]["close"]
+        return {
+            "market_data": {
+                "price_usd": ohlcv[-1]["close"],
+                "change_24h": (ohlcv[-1]["close"] - open_price) / open_price * 100 if open_price else 0,
+                "volume_24h": sum(c["volumeto"] for c in day[1:]),
+            },
+            "technical_data": _compute_technical_indicators([c["close"] for c in ohlcv], ohlcv),
+        }
+    
+    def score_history(self, historical_data: List[Dict]) -> List[Dict]:
+        """
+        Направление и вероятность сигнала в каждой точке истории.
+        
+        Факторы всех точек считаются одной матрицей (FactorMatrix) по тем же
+        правилам и весам, что calculate_signal.
+        """
+        rows = [self._signal_inputs_at_point(historical_data, i) for i in range(len(historical_data))]
+        result = self.factor_matrix.score(rows)
+        if not result:
+            return []
+        return [
+            {"direction": str(direction), "probability": float(probability), "total_score": float(total)}
+            for direction, probability, total in zip(
+                result["direction"], result["probability"], result["total_score"]
+            )
+        ]
+    
+    def _signal_params(self, data_point: Dict, scored: Dict) -> Dict:
+        """Вход, цели и стоп long/short сигнала (проценты как в get_signal_params)."""
+        current_price = data_point["price"]
+        side = 1 if scored["direction"] == "long" else -1
+        return {
+            "direction": scored["direction"],
+            "entry_price": current_price,
+            "target1_price": current_price * (1 + side * 1.5 / 100),
+            "target2_price": current_price * (1 + side * 2.0 / 100),
+            "stop_loss_price": current_price * (1 - side * 0.6 / 100),
+            "probability": scored["probability"],
+        }
     
     async def simulate_signals(self, symbol: str, historical_data: List[Dict]) -> List[Dict]:
         """
         Симулировать сигналы на исторических данных.
         
         Для каждой точки данных:
-        1. Генерируем сигнал
+        1. Генерируем сигнал (score_history - по свечам до этой точки)
         2. Проверяем достигла ли цена Target1 или Stop Loss
         3. Записываем результат
         """
         results = []
         
         logger.info(f"Simulating signals for {symbol}...")
+        scored = self.score_history(historical_data)
         
         # Sample every 2 candles to avoid too many signals
         for i in range(0, len(historical_data) - 5, 2):
             data_point = historical_data[i]
             
-            # Generate signal at this point
-            signal = await self._generate_signal_at_point(symbol, data_point)
-            
-            if not signal or signal["direction"] == "sideways":
+            if scored[i]["direction"] == "sideways":
                 continue  # Пропускаем боковик
+            signal = self._signal_params(data_point, scored[i])
             
             # Проверяем результат на следующих 4 часах данных (next 4 candles = 16 hours for 4h candles)
             outcome = self._check_outcome(
@@ -376,6 +400,8 @@ async def main():
     
     else:
         parser.print_help()
+    
+    await http_client.close()
 
 
 if __name__ == "__main__":
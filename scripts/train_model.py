@@ -17,6 +17,7 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from http_client import http_client
 from ml.data_collector import prepare_training_data
 from ml.trainer import train_ensemble, save_models
 from ml.config import ML_CONFIG
@@ -130,9 +131,12 @@ async def main():
     
     # Train for each symbol
     results = []
-    for symbol in symbols:
-        success = await train_for_symbol(symbol, days=args.days)
-        results.append((symbol, success))
+    try:
+        for symbol in symbols:
+            success = await train_for_symbol(symbol, days=args.days)
+            results.append((symbol, success))
+    finally:
+        await http_client.close()
     
     # Print summary
     logger.info("\n" + "=" * 60)
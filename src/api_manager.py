@@ -16,6 +16,8 @@ import logging
 from typing import Optional, Dict
 from datetime import datetime, timedelta
 
+from http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,7 +66,7 @@ class CurrencyRates:
     async def update_rates(self):
         """Обновить курсы валют от ЦБ РФ."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 timeout = aiohttp.ClientTimeout(total=10)
                 async with session.get(self.CBR_API_URL, timeout=timeout) as response:
                     if response.status == 200:
@@ -223,7 +225,7 @@ class MultiAPIManager:
         start_time = datetime.now()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 params = {
                     "ids": coin_id.lower(),
                     "vs_currencies": "usd,rub,eur",
@@ -286,7 +288,7 @@ class MultiAPIManager:
         start_time = datetime.now()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 coin_info = self.get_coin_info(symbol)
                 paprika_id = coin_info.get("paprika_id", f"{symbol.lower()}-{symbol.lower()}")
                 
@@ -342,7 +344,7 @@ class MultiAPIManager:
         start_time = datetime.now()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 coin_info = self.get_coin_info(symbol)
                 mexc_symbol = coin_info.get("mexc", f"{symbol.upper()}USDT")
                 
@@ -396,7 +398,7 @@ class MultiAPIManager:
         start_time = datetime.now()
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 coin_info = self.get_coin_info(symbol)
                 kraken_symbol = coin_info.get("kraken", f"{symbol.upper()}USDT")
                 
@@ -581,7 +583,7 @@ class MultiAPIManager:
                 "endTime": end_time * 1000,
                 "limit": 1000
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 timeout = aiohttp.ClientTimeout(total=15)
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
@@ -626,7 +628,7 @@ class MultiAPIManager:
                 "before": str(end_time * 1000),   # before = end time (more recent)
                 "limit": "300"
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 timeout = aiohttp.ClientTimeout(total=15)
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
@@ -673,7 +675,7 @@ class MultiAPIManager:
                 "end": end_time * 1000,
                 "limit": 200
             }
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 timeout = aiohttp.ClientTimeout(total=15)
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
@@ -723,7 +725,7 @@ class MultiAPIManager:
         logger.info(f"Получаю исторические цены {symbol} с {from_timestamp} по {to_timestamp}...")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart/range"
                 params = {
                     "vs_currency": "usd",
@@ -3,28 +3,36 @@ Gheezy Crypto Telegram Bot - Minimalist Design
 С подключением Multi-API Manager (CoinGecko + CoinPaprika + MEXC + Kraken)
 """
 
+import asyncio
 import logging
 from typing import Tuple
 from datetime import datetime
 
 import aiohttp
 from aiogram import Bot, Dispatcher, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, CommandObject
 from aiogram.types import (
     Message,
     CallbackQuery,
     InlineKeyboardMarkup,
     InlineKeyboardButton,
+    BufferedInputFile,
 )
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
 
 from config import settings
+from http_client import http_client
 from api_manager import get_coin_price as get_price_multi_api, get_api_stats
 from whale.tracker import WhaleTracker as RealWhaleTracker
 from signals.ai_signals import AISignalAnalyzer
 from signals.signal_tracker import SignalTracker
+from signals.signal_snapshots import SignalSnapshotService
+from signals.signal_progress import ThrottledEditor
+from signals.market_stream import market_stream
+from signals.cpu_pool import CPUPool
+from signals.latency import latency_tracker
 from signals.super_signals import SuperSignals
 from signals.gem_scanner import GemScanner
 from ml.data_collector import ml_collector
@@ -53,6 +61,10 @@ signal_analyzer = SignalAnalyzer()
 defi_aggregator = DeFiAggregator()
 whale_tracker = RealWhaleTracker()
 ai_signal_analyzer = AISignalAnalyzer(whale_tracker)
+ai_signal_analyzer.cpu_pool = CPUPool(settings.signal_cpu_workers, preload=("signals.ai_signals",))
+signal_snapshot_service = SignalSnapshotService(
+    ai_signal_analyzer, refresh_interval=settings.signal_precompute_interval
+)
 signal_tracker = SignalTracker()
 
 
@@ -205,7 +217,7 @@ async def get_coin_price(symbol: str) -> dict:
 
 async def get_market_data() -> dict:
     try:
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             url = "https://api.coingecko.com/api/v3/global"
             timeout = aiohttp.ClientTimeout(total=10)
             async with session.get(url, timeout=timeout) as response:
@@ -1275,6 +1287,40 @@ _У вас пока нет отслеживаемых сигналов._
         user_messages[chat_id] = new_msg.message_id
 
 
+@router.message(Command("debug"))
+async def cmd_debug(message: Message, command: CommandObject):
+    """
+    Задержки этапов AI сигналов (только для админов).
+
+    /debug           - самые медленные этапы (p50/p95/max, ошибки, cache hit)
+    /debug <префикс> - только этапы с префиксом (fetch., enhancer., data_sources.)
+    /debug json      - полная статистика файлом
+    /debug reset     - сбросить статистику
+    """
+    if message.from_user.id not in settings.telegram_admin_ids:
+        return
+
+    arg = (command.args or "").strip()
+
+    if arg == "json":
+        await message.answer_document(
+            BufferedInputFile(latency_tracker.to_json().encode("utf-8"), filename="latency.json"),
+            caption="⏱ Задержки этапов AI сигналов",
+        )
+        return
+
+    if arg == "reset":
+        latency_tracker.reset()
+        await message.answer("⏱ Статистика задержек сброшена")
+        return
+
+    summary = latency_tracker.summary(limit=25, prefix=arg or None)
+    await message.answer(
+        f"⏱ *Задержки этапов (мс)*\n\n```\n{summary}\n```",
+        parse_mode=ParseMode.MARKDOWN,
+    )
+
+
 @router.callback_query(lambda c: c.data == "whale_all")
 async def callback_whale_all(callback: CallbackQuery):
     """Обновить все транзакции китов."""
@@ -1769,7 +1815,7 @@ async def send_signal_in_parts(
                         text="💰 Цена", callback_data="price_" + symbol.lower()
                     ),
                     InlineKeyboardButton(
-                        text="🔄 Обновить", callback_data="signal_" + symbol.lower()
+                        text="🔄 Обновить", callback_data="signal_refresh_" + symbol.lower()
                     ),
                 ],
                 [
@@ -1892,7 +1938,7 @@ async def send_signal_in_parts(
                             text="💰 Цена", callback_data="price_" + symbol.lower()
                         ),
                         InlineKeyboardButton(
-                            text="🔄 Обновить", callback_data="signal_" + symbol.lower()
+                            text="🔄 Обновить", callback_data="signal_refresh_" + symbol.lower()
                         ),
                     ],
                     [
@@ -1927,14 +1973,36 @@ async def send_signal_in_parts(
 
 @router.callback_query(lambda c: c.data.startswith("signal_"))
 async def callback_signal_coin(callback: CallbackQuery):
-    symbol = callback.data.replace("signal_", "").upper()
+    # "signal_refresh_btc" - принудительный пересчёт, "signal_btc" - готовый снимок
+    force_refresh = callback.data.startswith("signal_refresh_")
+    prefix = "signal_refresh_" if force_refresh else "signal_"
+    symbol = callback.data[len(prefix):].upper()
     user_id = callback.from_user.id
 
-    # Показываем индикатор загрузки
-    await callback.answer("⏳ Анализирую данные...")
-    await callback.message.edit_text(
-        "⏳ *Анализирую данные...*\n\nПодождите несколько секунд",
-        parse_mode=ParseMode.MARKDOWN,
+    # Показываем индикатор загрузки только если готового снимка нет;
+    # дальше сообщение обновляется промежуточными результатами анализа
+    progress_editor = None
+    if force_refresh or signal_snapshot_service.get_snapshot(symbol) is None:
+        await callback.answer("⏳ Анализирую данные...")
+        await callback.message.edit_text(
+            "⏳ *Анализирую данные...*\n\nПодождите несколько секунд",
+            parse_mode=ParseMode.MARKDOWN,
+        )
+        progress_editor = ThrottledEditor(
+            lambda text: safe_send_message(
+                callback.message.edit_text, text, parse_mode=ParseMode.MARKDOWN
+            )
+        )
+    else:
+        await callback.answer()
+
+    # Анализ запускается сразу, параллельно с проверкой прошлых сигналов
+    signal_task = asyncio.ensure_future(
+        signal_snapshot_service.get_message(
+            symbol,
+            force_refresh=force_refresh,
+            on_progress=progress_editor.submit if progress_editor else None,
+        )
     )
 
     # First, check pending signals for this symbol
@@ -1978,8 +2046,10 @@ async def callback_signal_coin(callback: CallbackQuery):
 
     # Получаем AI сигнал
     try:
-        signal_text = await ai_signal_analyzer.analyze_coin(symbol)
+        signal_text = await signal_task
     except Exception as e:
+        if progress_editor is not None:
+            await progress_editor.close()
         logger.error(f"Error analyzing {symbol}: {e}", exc_info=True)
         signal_text = (
             "❌ *Ошибка анализа*\n\n"
@@ -2005,6 +2075,10 @@ async def callback_signal_coin(callback: CallbackQuery):
             pass
         return
 
+    # Итоговое сообщение не должно перезаписываться запоздавшим превью
+    if progress_editor is not None:
+        await progress_editor.close()
+
     # Note: Previous signal information is now tracked in statistics, not displayed in each message
 
     # Сохраняем новый сигнал
@@ -2366,8 +2440,22 @@ def create_bot() -> Tuple[Bot, Dispatcher]:
 async def on_startup(bot: Bot):
     logger.info("Gheezy Crypto Bot запущен с 5 API")
     
+    # Общий пул HTTP соединений (keep-alive, DNS кэш, лимиты на хост)
+    await http_client.start()
+    
+    # Процессы расчёта индикаторов запускаются сейчас, а не на первом сигнале
+    await ai_signal_analyzer.cpu_pool.start()
+    
     # Initialize ML data collector (creates data/ml directory)
     logger.info(f"ML data collector initialized: {ml_collector.csv_path}")
+
+    # Фоновый предрасчёт AI сигналов
+    if settings.signal_precompute_enabled:
+        await signal_snapshot_service.start()
+    
+    # Сделки, стакан и свечи Bybit по WebSocket
+    if settings.market_stream_enabled:
+        await market_stream.start()
     
     for admin_id in settings.telegram_admin_ids:
         try:
@@ -2379,6 +2467,11 @@ async def on_startup(bot: Bot):
 
 async def on_shutdown(bot: Bot):
     logger.info("Gheezy Crypto Bot остановлен")
+    await signal_snapshot_service.stop()
+    await market_stream.stop()
+    ai_signal_analyzer.cpu_pool.shutdown()
     await signal_analyzer.close()
     await defi_aggregator.close()
     await whale_tracker.close()
+    # Последним: закрывает соединения всех модулей
+    await http_client.close()
@@ -5,7 +5,7 @@ Gheezy Crypto - Конфигурация приложения
 """
 
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -142,6 +142,22 @@ class Settings(BaseSettings):
         default=300,
         description="Интервал обновления сигналов (секунды)",
     )
+    signal_precompute_enabled: bool = Field(
+        default=True,
+        description="Фоновый предрасчёт AI сигналов для поддерживаемых монет",
+    )
+    signal_precompute_interval: int = Field(
+        default=120,
+        description="Интервал фонового пересчёта AI сигналов (секунды)",
+    )
+    market_stream_enabled: bool = Field(
+        default=True,
+        description="WebSocket Bybit для сделок, стакана и 5m свечей (без него - REST)",
+    )
+    signal_cpu_workers: Optional[int] = Field(
+        default=None,
+        description="Процессов для расчёта индикаторов и рендера сигналов (0 - в event loop, пусто - по числу CPU)",
+    )
     
     # Smart Signals Settings
     smart_signals_scan_limit: int = Field(
@@ -361,29 +361,16 @@ class DynamicTargetsEnhancer(BaseEnhancer):
         order_blocks: List[Dict],
         direction: str
     ) -> Optional[Dict]:
-        """Найти ближайший Order Block."""
-        if not order_blocks:
-            return None
-        
-        nearest = None
-        min_distance = float('inf')
-        
-        for ob in order_blocks:
-            ob_high = ob.get('high', 0)
-            ob_low = ob.get('low', 0)
-            
-            if direction == "below" and ob_high < entry:
-                distance = entry - ob_high
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest = ob
-            elif direction == "above" and ob_low > entry:
-                distance = ob_low - entry
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest = ob
-        
-        return nearest
+        """Найти ближайший Order Block (при равном расстоянии - первый в списке)."""
+        # Блоков единицы, и каждый список опрашивается один-два раза -
+        # один проход дешевле сортировки под бинарный поиск
+        if direction == "below":
+            candidates = [ob for ob in order_blocks if ob.get('high', 0) < entry]
+            return max(candidates, key=lambda ob: ob.get('high', 0), default=None)
+        if direction == "above":
+            candidates = [ob for ob in order_blocks if ob.get('low', 0) > entry]
+            return min(candidates, key=lambda ob: ob.get('low', 0), default=None)
+        return None
     
     def _adjust_tp_for_rr(
         self,
@@ -17,6 +17,7 @@ from .whale_tracker import WhaleTrackerEnhancer
 from .funding_advanced import FundingAdvancedEnhancer
 from .volatility import VolatilityEnhancer
 from .dynamic_targets import DynamicTargetsEnhancer
+from signals.latency import latency_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +81,7 @@ class EnhancerManager:
         
         # 1. Order Flow (до ±10)
         try:
-            order_flow_score = await self.order_flow.get_score(coin)
+            order_flow_score = await latency_tracker.trace("enhancer.order_flow.get_score", self.order_flow.get_score(coin))
             total += order_flow_score
             logger.debug(f"Order Flow score for {coin}: {order_flow_score:.2f}")
         except Exception as e:
@@ -88,7 +89,7 @@ class EnhancerManager:
         
         # 2. Volume Profile (до ±10)
         try:
-            volume_profile_score = await self.volume_profile.get_score(coin, current_price=current_price)
+            volume_profile_score = await latency_tracker.trace("enhancer.volume_profile.get_score", self.volume_profile.get_score(coin, current_price=current_price))
             total += volume_profile_score
             logger.debug(f"Volume Profile score for {coin}: {volume_profile_score:.2f}")
         except Exception as e:
@@ -96,7 +97,7 @@ class EnhancerManager:
         
         # 3. Multi-Exchange (до ±5)
         try:
-            multi_exchange_score = await self.multi_exchange.get_score(coin)
+            multi_exchange_score = await latency_tracker.trace("enhancer.multi_exchange.get_score", self.multi_exchange.get_score(coin))
             total += multi_exchange_score
             logger.debug(f"Multi-Exchange score for {coin}: {multi_exchange_score:.2f}")
         except Exception as e:
@@ -104,7 +105,7 @@ class EnhancerManager:
         
         # 4. Liquidations (до ±12)
         try:
-            liquidations_score = await self.liquidations.get_score(coin, current_price=current_price)
+            liquidations_score = await latency_tracker.trace("enhancer.liquidations.get_score", self.liquidations.get_score(coin, current_price=current_price))
             total += liquidations_score
             logger.debug(f"Liquidations score for {coin}: {liquidations_score:.2f}")
         except Exception as e:
@@ -112,7 +113,7 @@ class EnhancerManager:
         
         # 5. Smart Money (до ±12)
         try:
-            smart_money_score = await self.smart_money.get_score(coin, current_price=current_price)
+            smart_money_score = await latency_tracker.trace("enhancer.smart_money.get_score", self.smart_money.get_score(coin, current_price=current_price))
             total += smart_money_score
             logger.debug(f"Smart Money score for {coin}: {smart_money_score:.2f}")
         except Exception as e:
@@ -120,7 +121,7 @@ class EnhancerManager:
         
         # 6. Wyckoff (до ±10)
         try:
-            wyckoff_score = await self.wyckoff.get_score(coin, current_price=current_price)
+            wyckoff_score = await latency_tracker.trace("enhancer.wyckoff.get_score", self.wyckoff.get_score(coin, current_price=current_price))
             total += wyckoff_score
             logger.debug(f"Wyckoff score for {coin}: {wyckoff_score:.2f}")
         except Exception as e:
@@ -128,7 +129,7 @@ class EnhancerManager:
         
         # 7. On-Chain (до ±10) - НОВЫЙ
         try:
-            on_chain_score = await self.on_chain.get_score(coin, current_price=current_price)
+            on_chain_score = await latency_tracker.trace("enhancer.on_chain.get_score", self.on_chain.get_score(coin, current_price=current_price))
             total += on_chain_score
             logger.debug(f"On-Chain score for {coin}: {on_chain_score:.2f}")
         except Exception as e:
@@ -136,7 +137,7 @@ class EnhancerManager:
         
         # 8. Whale Tracker (до ±8) - НОВЫЙ
         try:
-            whale_tracker_score = await self.whale_tracker.get_score(coin, current_price=current_price)
+            whale_tracker_score = await latency_tracker.trace("enhancer.whale_tracker.get_score", self.whale_tracker.get_score(coin, current_price=current_price))
             total += whale_tracker_score
             logger.debug(f"Whale Tracker score for {coin}: {whale_tracker_score:.2f}")
         except Exception as e:
@@ -144,7 +145,7 @@ class EnhancerManager:
         
         # 9. Funding Advanced (до ±7) - НОВЫЙ
         try:
-            funding_advanced_score = await self.funding_advanced.get_score(coin, current_price=current_price)
+            funding_advanced_score = await latency_tracker.trace("enhancer.funding_advanced.get_score", self.funding_advanced.get_score(coin, current_price=current_price))
             total += funding_advanced_score
             logger.debug(f"Funding Advanced score for {coin}: {funding_advanced_score:.2f}")
         except Exception as e:
@@ -152,7 +153,7 @@ class EnhancerManager:
         
         # 10. Volatility (до ±6) - НОВЫЙ
         try:
-            volatility_score = await self.volatility.get_score(coin, current_price=current_price)
+            volatility_score = await latency_tracker.trace("enhancer.volatility.get_score", self.volatility.get_score(coin, current_price=current_price))
             total += volatility_score
             logger.debug(f"Volatility score for {coin}: {volatility_score:.2f}")
         except Exception as e:
@@ -254,7 +255,7 @@ class EnhancerManager:
         
         # 1. Volume Profile levels
         try:
-            levels = await self.volume_profile.get_levels(coin)
+            levels = await latency_tracker.trace("enhancer.volume_profile.get_levels", self.volume_profile.get_levels(coin))
             extra_data['volume_profile_levels'] = levels
         except Exception as e:
             logger.warning(f"Error getting Volume Profile levels for {coin}: {e}")
@@ -262,7 +263,7 @@ class EnhancerManager:
         
         # 2. Exchange leader
         try:
-            leader = await self.multi_exchange.get_leader(coin)
+            leader = await latency_tracker.trace("enhancer.multi_exchange.get_leader", self.multi_exchange.get_leader(coin))
             extra_data['exchange_leader'] = leader
         except Exception as e:
             logger.warning(f"Error getting exchange leader for {coin}: {e}")
@@ -270,7 +271,7 @@ class EnhancerManager:
         
         # 3. Order Flow CVD
         try:
-            cvd = await self.order_flow.get_cvd(coin)
+            cvd = await latency_tracker.trace("enhancer.order_flow.get_cvd", self.order_flow.get_cvd(coin))
             extra_data['order_flow_cvd'] = cvd
         except Exception as e:
             logger.warning(f"Error getting Order Flow CVD for {coin}: {e}")
@@ -279,7 +280,7 @@ class EnhancerManager:
         # 4. Liquidation zones
         try:
             if current_price is not None:
-                liquidation_zones = await self.liquidations.get_liquidation_zones(coin, current_price)
+                liquidation_zones = await latency_tracker.trace("enhancer.liquidations.get_liquidation_zones", self.liquidations.get_liquidation_zones(coin, current_price))
                 extra_data['liquidation_zones'] = liquidation_zones
             else:
                 extra_data['liquidation_zones'] = {}
@@ -289,7 +290,7 @@ class EnhancerManager:
         
         # 5. SMC levels
         try:
-            smc_levels = await self.smart_money.get_smc_levels(coin)
+            smc_levels = await latency_tracker.trace("enhancer.smart_money.get_smc_levels", self.smart_money.get_smc_levels(coin))
             extra_data['smc_levels'] = smc_levels
         except Exception as e:
             logger.warning(f"Error getting SMC levels for {coin}: {e}")
@@ -297,7 +298,7 @@ class EnhancerManager:
         
         # 6. Wyckoff phase
         try:
-            wyckoff_phase = await self.wyckoff.get_wyckoff_phase(coin)
+            wyckoff_phase = await latency_tracker.trace("enhancer.wyckoff.get_wyckoff_phase", self.wyckoff.get_wyckoff_phase(coin))
             extra_data['wyckoff_phase'] = wyckoff_phase
         except Exception as e:
             logger.warning(f"Error getting Wyckoff phase for {coin}: {e}")
@@ -305,7 +306,7 @@ class EnhancerManager:
         
         # 7. On-Chain data - НОВЫЙ
         try:
-            on_chain_data = await self.on_chain.get_on_chain_data(coin)
+            on_chain_data = await latency_tracker.trace("enhancer.on_chain.get_on_chain_data", self.on_chain.get_on_chain_data(coin))
             extra_data['on_chain'] = on_chain_data
         except Exception as e:
             logger.warning(f"Error getting on-chain data for {coin}: {e}")
@@ -313,7 +314,7 @@ class EnhancerManager:
         
         # 8. Whale Activity - НОВЫЙ
         try:
-            whale_activity = await self.whale_tracker.get_whale_activity(coin)
+            whale_activity = await latency_tracker.trace("enhancer.whale_tracker.get_whale_activity", self.whale_tracker.get_whale_activity(coin))
             extra_data['whale_activity'] = whale_activity
         except Exception as e:
             logger.warning(f"Error getting whale activity for {coin}: {e}")
@@ -321,7 +322,7 @@ class EnhancerManager:
         
         # 9. Funding data - НОВЫЙ
         try:
-            funding_data = await self.funding_advanced.get_funding_data(coin)
+            funding_data = await latency_tracker.trace("enhancer.funding_advanced.get_funding_data", self.funding_advanced.get_funding_data(coin))
             extra_data['funding'] = funding_data
         except Exception as e:
             logger.warning(f"Error getting funding data for {coin}: {e}")
@@ -329,7 +330,7 @@ class EnhancerManager:
         
         # 10. Volatility - НОВЫЙ
         try:
-            volatility_data = await self.volatility.get_volatility_data(coin)
+            volatility_data = await latency_tracker.trace("enhancer.volatility.get_volatility_data", self.volatility.get_volatility_data(coin))
             extra_data['volatility'] = volatility_data
         except Exception as e:
             logger.warning(f"Error getting volatility data for {coin}: {e}")
@@ -9,6 +9,7 @@ Multi-Exchange Enhancer - сравнение цен и объемов между
 import logging
 import aiohttp
 from typing import Dict, Optional, List
+from http_client import http_client
 from .base import BaseEnhancer
 
 logger = logging.getLogger(__name__)
@@ -187,7 +188,7 @@ class MultiExchangeEnhancer(BaseEnhancer):
             params = {"symbol": symbol}
             
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -214,7 +215,7 @@ class MultiExchangeEnhancer(BaseEnhancer):
             }
             
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -243,7 +244,7 @@ class MultiExchangeEnhancer(BaseEnhancer):
             params = {"instId": symbol}
             
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -271,7 +272,7 @@ class MultiExchangeEnhancer(BaseEnhancer):
             params = {"currency": coin}
             
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
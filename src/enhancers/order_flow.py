@@ -11,8 +11,11 @@ import logging
 import aiohttp
 from typing import Dict, Optional, List
 from datetime import datetime, timedelta
+from http_client import http_client
 from .base import BaseEnhancer
 
+from signals.market_stream import market_stream
+
 logger = logging.getLogger(__name__)
 
 
@@ -97,7 +100,10 @@ class OrderFlowEnhancer(BaseEnhancer):
     
     async def _get_recent_trades(self, coin: str, limit: int = 1000) -> Optional[List[Dict]]:
         """
-        Получить последние сделки с Binance.
+        Получить последние сделки.
+        
+        Из буфера MarketStream (сделки Bybit spot), если он запущен и
+        накопил limit сделок, иначе aggTrades Binance через REST.
         
         Args:
             coin: Символ монеты
@@ -112,6 +118,14 @@ class OrderFlowEnhancer(BaseEnhancer):
                 self.logger.warning(f"Unknown symbol for Order Flow: {coin}")
                 return None
             
+            streamed = market_stream.last_trades(symbol, limit)
+            if streamed is not None:
+                # В формате aggTrades: m (buyer is maker) - продажа тейкера
+                return [
+                    {"p": trade.price, "q": trade.size, "m": trade.side == "Sell", "T": trade.time}
+                    for trade in streamed
+                ]
+            
             # Используем Binance aggTrades endpoint
             url = "https://api.binance.com/api/v3/aggTrades"
             params = {
@@ -120,7 +134,7 @@ class OrderFlowEnhancer(BaseEnhancer):
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         trades = await response.json()
@@ -12,6 +12,7 @@ Volatility Enhancer.
 import logging
 from typing import Dict, List, Optional
 from .base import BaseEnhancer
+from signals.indicators import calculate_atr
 
 logger = logging.getLogger(__name__)
 
@@ -237,26 +238,15 @@ class VolatilityEnhancer(BaseEnhancer):
         Returns:
             float: Значение ATR
         """
-        if len(ohlcv_data) < period + 1:
+        # Свечи без цены закрытия пропускаются (ATR в % делит на последний close)
+        candles = [c for c in ohlcv_data if c.get('close')]
+        if len(candles) < period + 1:
             return 0.0
         
-        true_ranges = []
-        
-        for i in range(1, len(ohlcv_data)):
-            high = ohlcv_data[i].get('high', 0)
-            low = ohlcv_data[i].get('low', 0)
-            prev_close = ohlcv_data[i-1].get('close', 0)
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        # Берём последние N значений
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[-period:]) / period
-            return atr
-        
-        return 0.0
+        atr = calculate_atr(
+            [c.get('high', 0) for c in candles],
+            [c.get('low', 0) for c in candles],
+            [c['close'] for c in candles],
+            period,
+        )
+        return atr.value if atr else 0.0
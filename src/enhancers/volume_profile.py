@@ -9,11 +9,10 @@ Volume Profile Enhancer - анализ уровней объема.
 """
 
 import logging
-import aiohttp
 import numpy as np
 from typing import Dict, Optional, List, Tuple
-from datetime import datetime, timedelta
 from .base import BaseEnhancer
+from signals.candle_store import candle_store
 
 logger = logging.getLogger(__name__)
 
@@ -169,45 +168,14 @@ class VolumeProfileEnhancer(BaseEnhancer):
                 self.logger.warning(f"Unknown symbol for Volume Profile: {coin}")
                 return None
             
-            # Используем Binance klines endpoint
-            url = "https://api.binance.com/api/v3/klines"
-            
-            # Рассчитываем временной диапазон
-            end_time = int(datetime.now().timestamp() * 1000)
-            start_time = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
-            
-            params = {
-                "symbol": symbol,
-                "interval": "1h",  # 1 час свечи
-                "startTime": start_time,
-                "endTime": end_time,
-                "limit": 1000
-            }
+            # Часовые свечи Binance за days дней
+            ohlcv_data = await candle_store.get("binance", symbol, "1h", days * 24)
+            if not ohlcv_data:
+                self.logger.warning(f"Failed to fetch OHLCV for {coin}")
+                return None
             
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=timeout) as response:
-                    if response.status == 200:
-                        klines = await response.json()
-                        
-                        # Преобразуем в удобный формат
-                        ohlcv_data = []
-                        for kline in klines:
-                            ohlcv_data.append({
-                                'timestamp': kline[0],
-                                'open': float(kline[1]),
-                                'high': float(kline[2]),
-                                'low': float(kline[3]),
-                                'close': float(kline[4]),
-                                'volume': float(kline[5])
-                            })
-                        
-                        self.logger.debug(f"Fetched {len(ohlcv_data)} candles for {coin}")
-                        return ohlcv_data
-                    else:
-                        self.logger.warning(f"Failed to fetch OHLCV for {coin}: {response.status}")
-                        return None
-                        
+            self.logger.debug(f"Got {len(ohlcv_data)} candles for {coin}")
+            return ohlcv_data
         except Exception as e:
             self.logger.error(f"Error fetching OHLCV for {coin}: {e}")
             return None
@@ -12,7 +12,9 @@ import logging
 import aiohttp
 from typing import Dict, List, Optional
 from datetime import datetime
+from http_client import http_client
 from .base import BaseEnhancer
+from signals.candle_store import candle_store
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +168,7 @@ class WyckoffEnhancer(BaseEnhancer):
             symbol = self.SYMBOL_MAPPING.get(coin, f"{coin}USDT")
             url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
             
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                     if resp.status == 200:
                         data = await resp.json()
@@ -182,31 +184,7 @@ class WyckoffEnhancer(BaseEnhancer):
         """Получить свечи с Binance."""
         try:
             symbol = self.SYMBOL_MAPPING.get(coin, f"{coin}USDT")
-            url = f"https://api.binance.com/api/v3/klines"
-            params = {
-                'symbol': symbol,
-                'interval': interval,
-                'limit': limit
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        candles = []
-                        for candle in data:
-                            candles.append({
-                                'timestamp': candle[0],
-                                'open': float(candle[1]),
-                                'high': float(candle[2]),
-                                'low': float(candle[3]),
-                                'close': float(candle[4]),
-                                'volume': float(candle[5])
-                            })
-                        return candles
-            
-            return []
-            
+            return await candle_store.get("binance", symbol, interval, limit) or []
         except Exception as e:
             self.logger.error(f"Error getting candles for {coin}: {e}")
             return []
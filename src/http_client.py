@@ -0,0 +1,135 @@
+"""
+HTTP Client - общий пул соединений aiohttp для всего процесса.
+
+Вместо aiohttp.ClientSession() на каждый запрос модули берут одну сессию
+процесса: соединения к биржам и API переиспользуются (keep-alive, без
+повторного TCP/TLS рукопожатия), DNS кэшируется, число соединений
+ограничено на хост.
+
+    async with http_client.session() as session:   # вместо aiohttp.ClientSession()
+        async with session.get(url, timeout=...) as response:
+            ...
+
+    data = await http_client.get_json(url, params=params)  # с повторами
+
+Сессия создаётся при первом обращении (или в on_startup) и закрывается в
+on_shutdown; выход из session() её не закрывает. Таймаут по умолчанию -
+DEFAULT_TIMEOUT, таймаут запроса его переопределяет. Повторы - только в
+get_json: при обрыве соединения, таймауте, 429 и 5xx с экспоненциальной
+паузой.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPClient:
+    """
+    Общая aiohttp-сессия с пулом соединений.
+
+    Args:
+        limit: Всего соединений
+        limit_per_host: Соединений на один хост
+        keepalive_timeout: Сколько секунд держать простаивающее соединение
+        dns_cache_ttl: Время жизни DNS кэша (секунды)
+        timeout: Таймаут запросов по умолчанию
+        retries: Повторов в get_json
+        retry_backoff: Пауза перед первым повтором (секунды, далее x2)
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT,
+        retries: int = 2,
+        retry_backoff: float = 0.5,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Общая сессия текущего event loop (создаётся при первом обращении)."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and not self._session.closed:
+                # Сессия другого (завершённого) loop - закрыть её там уже нельзя
+                self._session.detach()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+        return self._session
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Общая сессия для async with (не закрывается на выходе)."""
+        yield self.get_session()
+
+    async def start(self):
+        """Создать сессию заранее (on_startup)."""
+        self.get_session()
+        logger.info(f"HTTP client pool ready (limit {self.limit}, {self.limit_per_host} per host)")
+
+    async def close(self):
+        """Закрыть сессию и все соединения (on_shutdown)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        retries: Optional[int] = None,
+    ) -> Any:
+        """
+        GET с разбором JSON и повторами при временных ошибках.
+
+        Raises:
+            aiohttp.ClientResponseError: Ответ не 2xx (после повторов для 429/5xx)
+            aiohttp.ClientError, asyncio.TimeoutError: Сеть недоступна после повторов
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            try:
+                async with self.get_session().get(url, params=params, headers=headers, timeout=timeout) as response:
+                    if response.status in RETRY_STATUSES and attempt < retries:
+                        logger.debug(f"HTTP {response.status} from {url}, retrying")
+                    else:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == retries:
+                    raise
+                logger.debug(f"Request to {url} failed ({e!r}), retrying")
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+
+
+# Общий клиент процесса (закрывается в on_shutdown)
+http_client = HTTPClient()
@@ -3,12 +3,10 @@ Data collector for ML models - downloads historical data from Binance API
 and collects training data from verified signals.
 """
 
-import aiohttp
-import asyncio
 import pandas as pd
 import csv
 from datetime import datetime, timedelta
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
 import logging
 import sys
 import os
@@ -16,95 +14,65 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-logger = logging.getLogger(__name__)
+from signals.candle_archive import CandleArchive
+from signals.indicators import atr_series, bollinger_series, macd_series, rsi_series
+from signals.kernels import sma
 
-BINANCE_API_URL = "https://api.binance.com/api/v3/klines"
+logger = logging.getLogger(__name__)
 
 
-async def download_historical_data(symbol: str, days: int = 365, interval: str = "4h") -> pd.DataFrame:
+async def download_historical_data(
+    symbol: str,
+    days: int = 365,
+    interval: str = "4h",
+    archive: Optional[CandleArchive] = None,
+) -> pd.DataFrame:
     """
     Download historical OHLCV data from Binance API.
     
+    Candles are kept in the local candle archive, so repeated runs only
+    download the bars closed since the previous run (and any gaps).
+    
     Args:
         symbol: Symbol (BTC, ETH)
         days: Number of days of historical data
         interval: Timeframe (4h, 1h, etc.)
+        archive: Candle archive (default: data/candles.db)
     
     Returns:
-        pd.DataFrame with OHLCV data
+        pd.DataFrame with OHLCV data (closed candles only)
     """
-    binance_symbol = f"{symbol}USDT"
+    archive = archive or CandleArchive()
     
-    # Calculate start time
     end_time = datetime.now()
     start_time = end_time - timedelta(days=days)
     
-    start_ts = int(start_time.timestamp() * 1000)
-    end_ts = int(end_time.timestamp() * 1000)
+    logger.info(f"Loading {days} days of {interval} data for {symbol}")
     
-    logger.info(f"Downloading {days} days of {interval} data for {symbol}")
-    
-    all_candles = []
+    candles = await archive.fetch(
+        "binance",
+        f"{symbol}USDT",
+        interval,
+        int(start_time.timestamp() * 1000),
+        int(end_time.timestamp() * 1000),
+    )
     
-    async with aiohttp.ClientSession() as session:
-        current_start = start_ts
-        
-        while current_start < end_ts:
-            params = {
-                'symbol': binance_symbol,
-                'interval': interval,
-                'startTime': current_start,
-                'endTime': end_ts,
-                'limit': 1000  # Max limit per request
-            }
-            
-            try:
-                async with session.get(BINANCE_API_URL, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if not data:
-                            break
-                        
-                        all_candles.extend(data)
-                        
-                        # Update start time for next batch
-                        current_start = data[-1][0] + 1
-                        
-                        logger.debug(f"Downloaded {len(data)} candles, total: {len(all_candles)}")
-                        
-                        # Rate limiting
-                        await asyncio.sleep(0.2)
-                    else:
-                        logger.error(f"Error fetching data: {response.status}")
-                        break
-                        
-            except Exception as e:
-                logger.error(f"Error downloading data: {e}")
-                break
-    
-    if not all_candles:
+    if not len(candles):
         logger.error(f"No data downloaded for {symbol}")
         return pd.DataFrame()
     
-    # Convert to DataFrame
-    df = pd.DataFrame(all_candles, columns=[
-        'timestamp', 'open', 'high', 'low', 'close', 'volume',
-        'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-        'taker_buy_quote', 'ignore'
-    ])
-    
-    # Convert types
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    df['open'] = df['open'].astype(float)
-    df['high'] = df['high'].astype(float)
-    df['low'] = df['low'].astype(float)
-    df['close'] = df['close'].astype(float)
-    df['volume'] = df['volume'].astype(float)
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(candles.times, unit='ms'),
+        'open': candles.open,
+        'high': candles.high,
+        'low': candles.low,
+        'close': candles.close,
+        'volume': candles.volume,
+    })
     
-    logger.info(f"Downloaded {len(df)} candles for {symbol}")
+    logger.info(f"Loaded {len(df)} candles for {symbol}")
     
-    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+    return df
 
 
 def calculate_indicators_for_training(df: pd.DataFrame) -> pd.DataFrame:
@@ -117,35 +85,26 @@ def calculate_indicators_for_training(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with added indicator columns
     """
+    # Те же формулы, что и в live-сигналах и сканерах (signals.indicators)
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
+    close = df['close'].to_numpy(dtype=float)
+    
     # RSI
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['rsi'] = 100 - (100 / (1 + rs))
+    df['rsi'] = rsi_series(close, period=14)
     
     # MACD
-    ema_12 = df['close'].ewm(span=12, adjust=False).mean()
-    ema_26 = df['close'].ewm(span=26, adjust=False).mean()
-    df['macd'] = ema_12 - ema_26
-    df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-    df['macd_diff'] = df['macd'] - df['macd_signal']
+    df['macd'], df['macd_signal'], df['macd_diff'] = macd_series(close)
     
     # Bollinger Bands
-    df['bb_middle'] = df['close'].rolling(window=20).mean()
-    bb_std = df['close'].rolling(window=20).std()
-    df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-    df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
+    df['bb_upper'], df['bb_middle'], df['bb_lower'] = bollinger_series(close, period=20)
     
     # Moving averages
-    df['ma_50'] = df['close'].rolling(window=50).mean()
-    df['ma_200'] = df['close'].rolling(window=200).mean()
-    
-    # Additional indicators
-    df['atr'] = ((df['high'] - df['low']) + 
-                 abs(df['high'] - df['close'].shift(1)) + 
-                 abs(df['low'] - df['close'].shift(1))) / 3
-    df['atr'] = df['atr'].rolling(window=14).mean()
+    df['ma_50'] = sma(close, 50)
+    df['ma_200'] = sma(close, 200)
+    
+    # ATR
+    df['atr'] = atr_series(high, low, close, period=14)
     
     # Volume SMA
     df['volume_sma'] = df['volume'].rolling(window=20).mean()
@@ -9,9 +9,18 @@ import numpy as np
 from typing import Dict, List, Optional
 import logging
 
+from signals.indicators import candlestick_pattern_masks, divergence_series
+
 logger = logging.getLogger(__name__)
 
 
+def _divergence_feature(close: pd.Series, oscillator) -> np.ndarray:
+    """Divergence signal per bar, 0 when the oscillator is not a full series."""
+    if oscillator is None or np.ndim(oscillator) != 1 or len(oscillator) != len(close):
+        return np.zeros(len(close), dtype=int)
+    return divergence_series(close.to_numpy(dtype=float), oscillator).signal.astype(int)
+
+
 def extract_features(
     candles: List[dict],
     indicators: Optional[Dict] = None,
@@ -65,6 +74,10 @@ def extract_features(
     features["high_low_range"] = (df["high"] - df["low"]) / df["close"]
     features["close_open_range"] = (df["close"] - df["open"]) / df["open"]
 
+    # Candlestick patterns (1 on the candle where the pattern completes)
+    for name, mask in candlestick_pattern_masks(candles).items():
+        features[f"pattern_{name}"] = mask.astype(int)
+
     # Technical indicators
     if indicators:
         # RSI
@@ -130,6 +143,10 @@ def extract_features(
         features["adx"] = indicators.get("adx", 0.0)
         features["obv"] = indicators.get("obv", 0.0)
         features["vwap"] = indicators.get("vwap", df["close"])
+
+        # Divergences per bar (1 bullish, -1 bearish) from full oscillator series
+        features["rsi_divergence"] = _divergence_feature(df["close"], indicators.get("rsi"))
+        features["macd_divergence"] = _divergence_feature(df["close"], indicators.get("macd_diff"))
     else:
         # Set default values for indicators
         features["rsi"] = 50.0
@@ -151,6 +168,8 @@ def extract_features(
         features["adx"] = 0.0
         features["obv"] = 0.0
         features["vwap"] = df["close"]
+        features["rsi_divergence"] = 0
+        features["macd_divergence"] = 0
 
     # Market data features
     if market_data:
@@ -12,6 +12,7 @@ import aiohttp
 import structlog
 
 from config import settings
+from http_client import http_client
 from signals.indicators import (
     BollingerBands,
     MACD,
@@ -68,13 +69,13 @@ class SignalAnalyzer:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Получение HTTP сессии."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = http_client.get_session()
         return self._session
 
     async def close(self) -> None:
-        """Закрытие HTTP сессии."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Освобождение общей HTTP сессии."""
+        # Сессия общая (http_client) - закрывается в on_shutdown
+        self._session = None
 
     async def get_price_history(
         self,
@@ -0,0 +1,249 @@
+"""
+Candle Archive - локальный архив закрытых свечей в SQLite.
+
+Свечи хранятся по (площадка, символ, интервал, время открытия), рядом -
+индекс покрытых диапазонов [start, end) в мс. Запрос периода загружает с
+биржи только непокрытые куски (хвост с прошлого запуска и дыры), поэтому
+повторное обучение или бэктест за год обходится без сети.
+
+В архив попадают только закрытые бары: формирующийся бар будет загружен
+при следующем запросе, когда закроется. Диапазон, за который биржа не
+вернула свечей (до листинга, простой), тоже отмечается покрытым.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from http_client import http_client
+from signals.candle_store import BYBIT_INTERVALS, REQUEST_TIMEOUT
+from signals.candles import INTERVAL_MS, OHLCV_COLUMNS, CandleSeries
+
+logger = logging.getLogger(__name__)
+
+# Пауза между страницами загрузки (rate limit)
+PAGE_DELAY_SECONDS = 0.2
+PAGE_LIMIT = 1000
+
+RangeFetcher = Callable[[str, str, int, int], Awaitable[CandleSeries]]
+
+
+async def download_binance(symbol: str, interval: str, start: int, end: int) -> CandleSeries:
+    """Свечи Binance spot с открытием в [start, end), постранично от старых к новым."""
+    pages = []
+    cursor = start
+    while cursor < end:
+        params = {"symbol": symbol, "interval": interval, "startTime": cursor, "endTime": end - 1, "limit": PAGE_LIMIT}
+        rows = await http_client.get_json("https://api.binance.com/api/v3/klines", params=params, timeout=REQUEST_TIMEOUT)
+        if not rows:
+            break
+        page = CandleSeries.from_rows(rows)
+        pages.append(page)
+        cursor = int(page.times[-1]) + 1
+        logger.debug(f"Downloaded {len(page)} {interval} candles for {symbol}")
+        await asyncio.sleep(PAGE_DELAY_SECONDS)
+    return CandleSeries.concat(pages) if pages else CandleSeries.empty()
+
+
+async def download_bybit(symbol: str, interval: str, start: int, end: int) -> CandleSeries:
+    """Свечи Bybit spot с открытием в [start, end) (Bybit отдаёт страницы от новых к старым)."""
+    pages = []
+    cursor = end - 1
+    while cursor >= start:
+        params = {
+            "category": "spot",
+            "symbol": symbol,
+            "interval": BYBIT_INTERVALS[interval],
+            "start": start,
+            "end": cursor,
+            "limit": PAGE_LIMIT,
+        }
+        data = await http_client.get_json("https://api.bybit.com/v5/market/kline", params=params, timeout=REQUEST_TIMEOUT)
+        if data.get("retCode") != 0:
+            raise RuntimeError(f"Bybit kline error: {data.get('retMsg')}")
+        rows = data.get("result", {}).get("list", [])
+        if not rows:
+            break
+        page = CandleSeries.from_rows(rows, reverse=True)
+        pages.append(page)
+        cursor = int(page.times[0]) - 1
+        logger.debug(f"Downloaded {len(page)} {interval} candles for {symbol}")
+        await asyncio.sleep(PAGE_DELAY_SECONDS)
+    return CandleSeries.concat(pages[::-1]) if pages else CandleSeries.empty()
+
+
+RANGE_FETCHERS: Dict[str, RangeFetcher] = {
+    "binance": download_binance,
+    "bybit": download_bybit,
+}
+
+
+class CandleArchive:
+    """
+    SQLite-архив свечей с индексом покрытых диапазонов.
+
+    Args:
+        db_path: Путь к файлу БД
+        fetchers: Площадка -> загрузчик диапазона (по умолчанию Binance и Bybit)
+        clock: Текущее время в секундах (для тестов)
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/candles.db",
+        fetchers: Optional[Dict[str, RangeFetcher]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fetchers = dict(RANGE_FETCHERS if fetchers is None else fetchers)
+        self.clock = clock
+        self._init_db()
+
+    def _init_db(self):
+        """Создание таблиц свечей и покрытия."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS candles (
+                    venue TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    open_time INTEGER NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (venue, symbol, interval, open_time)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS coverage (
+                    venue TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    start INTEGER NOT NULL,
+                    end INTEGER NOT NULL,
+                    PRIMARY KEY (venue, symbol, interval, start)
+                )
+            ''')
+            conn.commit()
+
+    # === Покрытие ===
+
+    def covered_ranges(self, venue: str, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """Покрытые диапазоны [start, end) по возрастанию."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT start, end FROM coverage WHERE venue = ? AND symbol = ? AND interval = ? ORDER BY start',
+                (venue, symbol, interval),
+            ).fetchall()
+        return [(start, end) for start, end in rows]
+
+    def missing_ranges(self, venue: str, symbol: str, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Непокрытые куски [start, end)."""
+        missing = []
+        cursor = start
+        for covered_start, covered_end in self.covered_ranges(venue, symbol, interval):
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                missing.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    def _mark_covered(self, conn: sqlite3.Connection, venue: str, symbol: str, interval: str, start: int, end: int):
+        """Добавить диапазон, слив его с пересекающимися и соседними."""
+        key = (venue, symbol, interval)
+        overlapping = conn.execute(
+            'SELECT start, end FROM coverage WHERE venue = ? AND symbol = ? AND interval = ? AND start <= ? AND end >= ?',
+            (*key, end, start),
+        ).fetchall()
+        for covered_start, covered_end in overlapping:
+            start, end = min(start, covered_start), max(end, covered_end)
+        conn.execute(
+            'DELETE FROM coverage WHERE venue = ? AND symbol = ? AND interval = ? AND start <= ? AND end >= ?',
+            (*key, end, start),
+        )
+        conn.execute('INSERT INTO coverage (venue, symbol, interval, start, end) VALUES (?, ?, ?, ?, ?)', (*key, start, end))
+
+    # === Свечи ===
+
+    def store(self, venue: str, symbol: str, interval: str, candles: CandleSeries, start: int, end: int):
+        """
+        Сохранить свечи и отметить [start, end) покрытым.
+
+        Свечи вне диапазона не сохраняются.
+        """
+        times = candles.times
+        inside = (times >= start) & (times < end)
+        rows = zip(
+            times[inside].tolist(),
+            *(candles.column(name)[inside].tolist() for name in OHLCV_COLUMNS),
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO candles (venue, symbol, interval, open_time, open, high, low, close, volume) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((venue, symbol, interval, *row) for row in rows),
+            )
+            self._mark_covered(conn, venue, symbol, interval, start, end)
+            conn.commit()
+
+    def load(self, venue: str, symbol: str, interval: str, start: int, end: int) -> CandleSeries:
+        """Свечи архива с открытием в [start, end) одной колоночной серией."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                'SELECT open_time, open, high, low, close, volume FROM candles '
+                'WHERE venue = ? AND symbol = ? AND interval = ? AND open_time >= ? AND open_time < ? '
+                'ORDER BY open_time',
+                (venue, symbol, interval, start, end),
+            ).fetchall()
+        if not rows:
+            return CandleSeries.empty()
+        table = np.array(rows, dtype=np.float64)
+        return CandleSeries(
+            {name: table[:, i + 1] for i, name in enumerate(OHLCV_COLUMNS)},
+            times=table[:, 0].astype(np.int64),
+        )
+
+    async def fetch(self, venue: str, symbol: str, interval: str, start: int, end: Optional[int] = None) -> CandleSeries:
+        """
+        Закрытые свечи за [start, end) мс: недостающее догружается с биржи.
+
+        Args:
+            venue: "binance" или "bybit"
+            symbol: Символ площадки ("BTCUSDT")
+            interval: "1h", "4h", "1d", ...
+            start: Начало периода (мс)
+            end: Конец периода (мс, по умолчанию - сейчас)
+
+        Returns:
+            CandleSeries от старых к новым (срезы - без копирования)
+        """
+        step = INTERVAL_MS[interval]
+        now = int(self.clock() * 1000)
+        # Только закрытые бары, границы по сетке интервала
+        end = min(now if end is None else end, now // step * step)
+        start = start // step * step
+
+        fetch_range = self.fetchers[venue]
+        for gap_start, gap_end in self.missing_ranges(venue, symbol, interval, start, end):
+            try:
+                candles = await fetch_range(symbol, interval, gap_start, gap_end)
+            except Exception as e:
+                logger.error(f"Error downloading {venue} {symbol} {interval} candles: {e}")
+                continue
+            self.store(venue, symbol, interval, candles, gap_start, gap_end)
+            logger.info(f"Archived {len(candles)} {interval} candles for {symbol} ({venue})")
+
+        return self.load(venue, symbol, interval, start, end)
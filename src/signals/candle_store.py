@@ -0,0 +1,316 @@
+"""
+Candle Store - общий для процесса склад свечей.
+
+Ключ: (площадка, символ, интервал). Для каждого ключа хранится скользящее
+окно последних баров (CandleSeries). Первый запрос загружает окно целиком,
+следующие - только хвост: бары начиная с последней сохранённой свечи
+(она могла ещё формироваться) до текущего момента. Запросы в пределах
+max_age секунд после загрузки и параллельные запросы того же ключа
+обслуживаются из памяти одной загрузкой.
+
+Площадки: "bybit" (spot v5), "binance" (spot v3), "cryptocompare" (histo*).
+Интервалы в общем виде: "1m", "5m", "15m", "1h", "4h", "1d". get_resampled
+собирает старшие таймфреймы из окна базового интервала (signals.resample).
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+from http_client import http_client
+from signals.candles import INTERVAL_MS, CandleSeries
+from signals.resample import base_bars_needed, resample
+
+logger = logging.getLogger(__name__)
+
+# Интервалы Bybit v5 ("5", "60", "D")
+BYBIT_INTERVALS = {"1m": "1", "5m": "5", "15m": "15", "30m": "30", "1h": "60", "4h": "240", "1d": "D"}
+INTERVAL_FROM_BYBIT = {value: key for key, value in BYBIT_INTERVALS.items()}
+
+CRYPTOCOMPARE_ENDPOINTS = {"1m": "histominute", "1h": "histohour", "1d": "histoday"}
+
+# Повторный запрос раньше этого срока не ходит в сеть
+DEFAULT_MAX_AGE = 10.0
+# Окно, которое обновляет поток (MarketStream), свежее столько секунд после последнего бара
+STREAM_TIMEOUT = 30.0
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+Fetcher = Callable[[str, str, int], Awaitable[Optional[CandleSeries]]]
+
+
+async def fetch_bybit(symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+    """Последние limit свечей Bybit spot (от старых к новым)."""
+    params = {"category": "spot", "symbol": symbol, "interval": BYBIT_INTERVALS[interval], "limit": limit}
+    data = await http_client.get_json("https://api.bybit.com/v5/market/kline", params=params, timeout=REQUEST_TIMEOUT)
+    if data.get("retCode") != 0:
+        logger.warning(f"Bybit kline error for {symbol} {interval}: {data.get('retMsg')}")
+        return None
+    rows = data.get("result", {}).get("list", [])
+    # Bybit отдаёт от новых к старым: [start, open, high, low, close, volume, turnover]
+    return CandleSeries.from_rows(rows, reverse=True) if rows else None
+
+
+async def fetch_binance(symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+    """Последние limit свечей Binance spot."""
+    params = {"symbol": symbol, "interval": interval, "limit": limit}
+    rows = await http_client.get_json("https://api.binance.com/api/v3/klines", params=params, timeout=REQUEST_TIMEOUT)
+    return CandleSeries.from_rows(rows) if rows else None
+
+
+async def fetch_cryptocompare(symbol: str, interval: str, limit: int) -> Optional[CandleSeries]:
+    """Последние limit свечей CryptoCompare (символ - монета, котировка USD)."""
+    url = f"https://min-api.cryptocompare.com/data/v2/{CRYPTOCOMPARE_ENDPOINTS[interval]}"
+    # limit у CryptoCompare - число баров минус один
+    params = {"fsym": symbol, "tsym": "USD", "limit": max(limit - 1, 1)}
+    data = await http_client.get_json(url, params=params, timeout=REQUEST_TIMEOUT)
+    if data.get("Response") != "Success":
+        logger.warning(f"CryptoCompare OHLCV error for {symbol}: {data.get('Message')}")
+        return None
+    candles = data.get("Data", {}).get("Data", [])
+    if not candles:
+        return None
+    series = CandleSeries.from_dicts(
+        candles,
+        columns=("open", "high", "low", "close", "volumefrom", "volumeto"),
+        time_key="time",
+    )
+    return series[-limit:]
+
+
+# Площадка -> (загрузчик, максимум баров за запрос, множитель времени свечи к мс)
+VENUES: Dict[str, Tuple[Fetcher, int, int]] = {
+    "bybit": (fetch_bybit, 1000, 1),
+    "binance": (fetch_binance, 1000, 1),
+    "cryptocompare": (fetch_cryptocompare, 2000, 1000),
+}
+
+
+@dataclass
+class _Entry:
+    series: CandleSeries
+    window: int
+    fetched_at: float
+    streamed_at: Optional[float] = None
+
+
+class CandleStore:
+    """
+    Скользящие окна свечей по (площадка, символ, интервал).
+
+    Args:
+        max_age: Сколько секунд после загрузки отдавать окно без запроса
+        venues: Площадка -> (загрузчик, максимум баров за запрос, множитель времени)
+        clock: Текущее время в секундах (для тестов)
+    """
+
+    def __init__(
+        self,
+        max_age: float = DEFAULT_MAX_AGE,
+        venues: Optional[Dict[str, Tuple[Fetcher, int, int]]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_age = max_age
+        self.venues = dict(VENUES if venues is None else venues)
+        self.clock = clock
+        self._entries: Dict[Tuple[str, str, str], _Entry] = {}
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+        self.stats = {"hits": 0, "full_fetches": 0, "tail_fetches": 0, "errors": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(
+        self,
+        venue: str,
+        symbol: str,
+        interval: str,
+        limit: int,
+        max_age: Optional[float] = None,
+    ) -> Optional[CandleSeries]:
+        """
+        Последние limit свечей (от старых к новым).
+
+        Args:
+            venue: "bybit", "binance", "cryptocompare"
+            symbol: Символ площадки ("BTCUSDT"; для CryptoCompare - "BTC")
+            interval: "5m", "15m", "1h", "4h", "1d"
+            limit: Сколько баров нужно
+            max_age: Переопределить max_age для этого запроса (0 - всегда догружать хвост)
+
+        Returns:
+            Представление окна (не копия) или None, если загрузить не удалось.
+            При ошибке догрузки возвращаются уже сохранённые свечи, кроме
+            запроса с max_age=0 (нужны свежие) - тогда None.
+        """
+        if venue not in self.venues or interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported candles: {venue} {interval}")
+        key = (venue, symbol, interval)
+        limit = min(limit, self.venues[venue][1])
+        max_age = self.max_age if max_age is None else max_age
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.window >= limit and self._is_fresh(entry, max_age):
+            self.stats["hits"] += 1
+            return entry.series[-limit:]
+
+        series, refreshed = await self._load(key, limit)
+        if refreshed and len(series) < limit and self._entries[key].window < limit:
+            # Загрузка шла под меньший limit другого запроса - догружаем окно один раз
+            series, refreshed = await self._load(key, limit)
+
+        if series is None:
+            return None
+        if not refreshed and max_age == 0:
+            logger.warning(f"Fresh candles unavailable for {' '.join(key)}, not serving stored ones")
+            return None
+        return series[-limit:]
+
+    async def _load(self, key: Tuple[str, str, str], limit: int) -> Tuple[Optional[CandleSeries], bool]:
+        """Загрузка окна; параллельные запросы того же ключа ждут одну загрузку."""
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._refresh(key, limit))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(pending)
+
+    def _is_fresh(self, entry: _Entry, max_age: float) -> bool:
+        now = self.clock()
+        if entry.streamed_at is not None and now - entry.streamed_at < STREAM_TIMEOUT:
+            return True
+        return now - entry.fetched_at < max_age
+
+    def apply_bar(self, venue: str, symbol: str, interval: str, candle: Dict) -> bool:
+        """
+        Обновить загруженное окно баром из потока (формирующимся или закрытым).
+
+        Время открытия бара - в единицах площадки ("timestamp" или поле времени окна).
+
+        Пока поток присылает бары, окно считается свежим без запросов к площадке.
+        Бар после пропуска не применяется: окно помечается устаревшим и при
+        следующем get догружается хвост.
+
+        Returns:
+            True, если бар применён
+        """
+        entry = self._entries.get((venue, symbol, interval))
+        if entry is None or not len(entry.series):
+            return False
+        series = entry.series
+        bar = CandleSeries(
+            {name: [candle.get(name, 0)] for name in series.columns},
+            times=[candle.get(series.time_key, candle.get("timestamp"))],
+            time_key=series.time_key,
+        )
+        opened, last = int(bar.times[0]), int(series.times[-1])
+        if opened < last:
+            return False
+        if opened > last + INTERVAL_MS[interval] // self.venues[venue][2]:
+            entry.streamed_at = None
+            entry.fetched_at = 0.0
+            return False
+
+        keep = len(series) - 1 if opened == last else len(series)
+        entry.series = CandleSeries.concat([series[:keep], bar])[-entry.window:]
+        entry.streamed_at = self.clock()
+        return True
+
+    async def get_resampled(
+        self,
+        venue: str,
+        symbol: str,
+        interval: str,
+        limit: int,
+        base_interval: str,
+        max_age: Optional[float] = None,
+    ) -> Optional[CandleSeries]:
+        """
+        Последние limit свечей interval, собранные из окна base_interval.
+
+        Несколько таймфреймов одного символа обслуживаются одним окном базовых
+        свечей. Если базовых баров нужно больше, чем отдаёт один запрос к
+        площадке, interval загружается напрямую.
+        """
+        if interval == base_interval:
+            return await self.get(venue, symbol, interval, limit, max_age)
+        needed = base_bars_needed(interval, limit, base_interval)
+        if needed > self.venues[venue][1]:
+            return await self.get(venue, symbol, interval, limit, max_age)
+
+        base = await self.get(venue, symbol, base_interval, needed, max_age)
+        if not base:
+            return None
+        return resample(base, interval, time_scale=self.venues[venue][2])[-limit:]
+
+    async def _refresh(self, key: Tuple[str, str, str], limit: int) -> Tuple[Optional[CandleSeries], bool]:
+        """(окно, загружено ли оно сейчас); при ошибке - сохранённое окно и False."""
+        entry = self._entries.get(key)
+        window = max(limit, entry.window if entry else 0)
+
+        try:
+            series = await self._fetch_window(key, entry, window)
+        except Exception as e:
+            logger.error(f"Error fetching candles {' '.join(key)}: {e}")
+            series = None
+
+        if series is None or not len(series):
+            self.stats["errors"] += 1
+            return (entry.series if entry else None), False
+
+        self._entries[key] = _Entry(series[-window:], window, self.clock())
+        return self._entries[key].series, True
+
+    async def _fetch_window(
+        self,
+        key: Tuple[str, str, str],
+        entry: Optional[_Entry],
+        window: int,
+    ) -> Optional[CandleSeries]:
+        venue, symbol, interval = key
+        fetch, _, time_scale = self.venues[venue]
+
+        tail = self._tail_size(entry, window, interval, time_scale)
+        if tail is not None and tail < window:
+            self.stats["tail_fetches"] += 1
+            fresh = await fetch(symbol, interval, tail)
+            if fresh is None or not len(fresh):
+                return None
+            merged = self._merge(entry.series, fresh, INTERVAL_MS[interval] // time_scale)
+            if merged is not None:
+                return merged
+            logger.debug(f"Gap in {venue} {symbol} {interval} candles, refetching window")
+
+        self.stats["full_fetches"] += 1
+        return await fetch(symbol, interval, window)
+
+    def _tail_size(self, entry: Optional[_Entry], window: int, interval: str, time_scale: int) -> Optional[int]:
+        """Сколько последних баров догрузить или None - нужно окно целиком."""
+        if entry is None or len(entry.series) < window or not entry.series.has_time:
+            return None
+        last_open = int(entry.series.times[-1]) * time_scale
+        elapsed = self.clock() * 1000 - last_open
+        # Последняя сохранённая свеча (могла формироваться) + новые + одна в запас на расхождение часов
+        return max(int(elapsed // INTERVAL_MS[interval]), 0) + 2
+
+    @staticmethod
+    def _merge(series: CandleSeries, fresh: CandleSeries, step: int) -> Optional[CandleSeries]:
+        """Окно с заменённым хвостом или None, если между ними пропуск."""
+        keep = int(np.searchsorted(series.times, fresh.times[0]))
+        if keep == len(series) and fresh.times[0] - series.times[-1] > step:
+            return None
+        # Новые массивы: выданные раньше срезы окна не меняются
+        return CandleSeries.concat([series[:keep], fresh])
+
+    def clear(self) -> None:
+        """Забыть все окна."""
+        self._entries.clear()
+
+
+# Общий склад процесса
+candle_store = CandleStore()
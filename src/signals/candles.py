@@ -0,0 +1,341 @@
+"""
+CandleSeries - колоночное представление свечей.
+
+Свечи хранятся в непрерывных массивах float64 (open/high/low/close/volume
+и любые дополнительные колонки, например volumeto CryptoCompare) плюс
+int64 время открытия. Колонки отдаются без копирования, срезы - тоже
+представления тех же массивов, append амортизированно O(1).
+
+Для старого кода серия ведёт себя как List[Dict]: len(), индексы,
+срезы, итерация, c["close"], c.get("volumeto", 0) работают как раньше.
+"""
+
+import logging
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Длительность интервалов свечей в мс (свечи бирж выровнены по UTC от эпохи)
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+# Расположение полей в ответах klines: Binance/MEXC [time, o, h, l, c, v, ...]
+BINANCE_KLINE_LAYOUT = {"timestamp": 0, "open": 1, "high": 2, "low": 3, "close": 4, "volume": 5}
+# Gate.io spot candlesticks: [time(сек), volume(quote), close, high, low, open, ...]
+GATE_KLINE_LAYOUT = {"timestamp": 0, "open": 5, "high": 3, "low": 4, "close": 2, "volume": 1}
+
+
+def _kline_columns(
+    rows: Sequence[Sequence[Any]], layout: Dict[str, int], width: int
+) -> Tuple[Dict[str, np.ndarray], Optional[np.ndarray]]:
+    """Колонки float64 и время int64 из строк klines (ValueError/TypeError на битой строке)."""
+    table = np.array([row[:width] for row in rows], dtype=object).reshape(len(rows), width)
+    columns = {
+        name: table[:, index].astype(np.float64)
+        for name, index in layout.items()
+        if name != "timestamp"
+    }
+    times = table[:, layout["timestamp"]].astype(np.int64) if "timestamp" in layout else None
+    return columns, times
+
+
+def _is_valid_kline(row: Sequence[Any], layout: Dict[str, int], width: int) -> bool:
+    """Строка klines полная и все поля layout приводятся к числу."""
+    try:
+        if len(row) < width:
+            return False
+        for name, index in layout.items():
+            int(row[index]) if name == "timestamp" else float(row[index])
+    except (ValueError, TypeError):
+        return False
+    return True
+
+
+class Candle(Mapping):
+    """Свеча-представление строки CandleSeries (только чтение, как dict)."""
+
+    __slots__ = ("_series", "_index")
+
+    def __init__(self, series: "CandleSeries", index: int):
+        self._series = series
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        series = self._series
+        if key == series.time_key and series.has_time:
+            return int(series._times[self._index])
+        if key in series._columns:
+            return float(series._columns[key][self._index])
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._series.keys())
+
+    def __len__(self) -> int:
+        return len(self._series.keys())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+class CandleSeries(Sequence):
+    """
+    Свечи от старых к новым в колонках float64 (+ время int64).
+
+    Args:
+        columns: Колонка -> массив значений (одинаковой длины)
+        times: Время открытия свечей (опционально)
+        time_key: Имя поля времени в dict-представлении ("timestamp", "time")
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Any],
+        times: Optional[Any] = None,
+        time_key: str = "timestamp",
+    ):
+        arrays = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        lengths = {len(values) for values in arrays.values()}
+        if times is not None:
+            times = np.asarray(times, dtype=np.int64)
+            lengths.add(len(times))
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+
+        self.time_key = time_key
+        self.has_time = times is not None
+        self._size = lengths.pop() if lengths else 0
+        self._columns = arrays
+        self._times = times if times is not None else np.zeros(self._size, dtype=np.int64)
+
+    # === Конструкторы ===
+
+    @classmethod
+    def empty(cls, columns: Iterable[str] = OHLCV_COLUMNS, time_key: str = "timestamp") -> "CandleSeries":
+        """Пустая серия (для последующих append)."""
+        return cls({name: np.empty(0) for name in columns}, times=np.empty(0, dtype=np.int64), time_key=time_key)
+
+    @classmethod
+    def from_dicts(
+        cls,
+        candles: Iterable[Dict],
+        columns: Optional[Iterable[str]] = None,
+        time_key: Optional[str] = None,
+    ) -> "CandleSeries":
+        """
+        Серия из списка dict-свечей.
+
+        Args:
+            candles: Свечи
+            columns: Числовые колонки (по умолчанию - все ключи первой свечи кроме времени)
+            time_key: Поле времени (по умолчанию "timestamp" или "time", если есть)
+        """
+        if isinstance(candles, CandleSeries):
+            return candles
+        candles = list(candles)
+        first = candles[0] if candles else {}
+        if time_key is None:
+            time_key = next((key for key in ("timestamp", "time") if key in first), "timestamp")
+        if columns is None:
+            columns = [key for key in first if key != time_key] if first else list(OHLCV_COLUMNS)
+        times = [c[time_key] for c in candles] if time_key in first else None
+        return cls(
+            {name: [c.get(name, 0) or 0 for c in candles] for name in columns},
+            times=times,
+            time_key=time_key,
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[Any]],
+        layout: Dict[str, int] = BINANCE_KLINE_LAYOUT,
+        time_key: str = "timestamp",
+        time_scale: int = 1,
+        reverse: bool = False,
+    ) -> "CandleSeries":
+        """
+        Серия из сырых строк klines (значения могут быть строками).
+
+        Строки короче layout или с нечисловыми полями пропускаются
+        (с предупреждением в лог), серия строится из остальных.
+
+        Args:
+            rows: Строки ответа биржи
+            layout: Колонка -> индекс поля в строке ("timestamp" - время)
+            time_key: Имя поля времени
+            time_scale: Множитель времени (1000 для секунд -> мс)
+            reverse: Строки идут от новых к старым (Bybit, OKX)
+        """
+        width = max(layout.values()) + 1
+        if reverse:
+            rows = list(rows)[::-1]
+        try:
+            columns, times = _kline_columns(rows, layout, width)
+        except (ValueError, TypeError):
+            valid = [row for row in rows if _is_valid_kline(row, layout, width)]
+            logger.warning(f"Skipped {len(rows) - len(valid)} malformed kline rows of {len(rows)}")
+            columns, times = _kline_columns(valid, layout, width)
+        if times is not None:
+            times = times * time_scale
+        return cls(columns, times=times, time_key=time_key)
+
+    @classmethod
+    def concat(cls, parts: Sequence["CandleSeries"]) -> "CandleSeries":
+        """Склеить серии с одинаковыми колонками (в новые массивы)."""
+        first = parts[0]
+        return cls(
+            {name: np.concatenate([part.column(name) for part in parts]) for name in first.columns},
+            times=np.concatenate([part.times for part in parts]) if first.has_time else None,
+            time_key=first.time_key,
+        )
+
+    # === Колонки ===
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(self._columns)
+
+    def keys(self) -> Tuple[str, ...]:
+        """Ключи dict-представления свечи."""
+        return ((self.time_key,) if self.has_time else ()) + self.columns
+
+    def column(self, name: str, default: Optional[float] = None) -> np.ndarray:
+        """
+        Колонка без копирования (время - int64).
+
+        Args:
+            name: Имя колонки
+            default: Значение для отсутствующей колонки (None - KeyError)
+        """
+        if name == self.time_key and self.has_time:
+            return self._times[:self._size]
+        if name in self._columns:
+            return self._columns[name][:self._size]
+        if default is None:
+            raise KeyError(name)
+        return np.full(self._size, float(default))
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:self._size]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.column("open")
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.column("high")
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.column("low")
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("close")
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.column("volume")
+
+    # === Sequence ===
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Candle, "CandleSeries"]:
+        if isinstance(index, slice):
+            return CandleSeries(
+                {name: values[:self._size][index] for name, values in self._columns.items()},
+                times=self._times[:self._size][index] if self.has_time else None,
+                time_key=self.time_key,
+            )
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("candle index out of range")
+        return Candle(self, index)
+
+    def __iter__(self) -> Iterator[Candle]:
+        for index in range(self._size):
+            yield Candle(self, index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (CandleSeries, list, tuple)):
+            return len(self) == len(other) and all(dict(a) == dict(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"CandleSeries({self._size} candles, columns={self.columns})"
+
+    def to_dicts(self) -> List[Dict]:
+        """Список dict-свечей (для JSON и старых API)."""
+        return [dict(candle) for candle in self]
+
+    # === Append ===
+
+    def append(self, candle: Dict) -> None:
+        """
+        Добавить свечу в конец (амортизированно O(1): ёмкость удваивается).
+
+        Срезы, взятые раньше, не меняются.
+        """
+        capacity = len(self._times)
+        if self._size == capacity or any(len(values) != capacity for values in self._columns.values()):
+            new_capacity = max(8, 2 * self._size)
+            self._columns = {name: self._grow(values, new_capacity) for name, values in self._columns.items()}
+            self._times = self._grow(self._times, new_capacity)
+
+        index = self._size
+        for name, values in self._columns.items():
+            values[index] = candle.get(name, 0) or 0
+        if self.has_time or (index == 0 and self.time_key in candle):
+            self.has_time = True
+            self._times[index] = candle.get(self.time_key, 0)
+        self._size += 1
+
+    def extend(self, candles: Iterable[Dict]) -> None:
+        for candle in candles:
+            self.append(candle)
+
+    def _grow(self, values: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.empty(capacity, dtype=values.dtype)
+        grown[:self._size] = values[:self._size]
+        return grown
+
+    def __getstate__(self) -> Dict:
+        # Без запасной ёмкости (пул процессов, pickle)
+        return {
+            "time_key": self.time_key,
+            "has_time": self.has_time,
+            "_size": self._size,
+            "_columns": {name: values[:self._size].copy() for name, values in self._columns.items()},
+            "_times": self._times[:self._size].copy(),
+        }
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+
+
+def candle_column(candles: Sequence[Dict], key: str, default: float = 0.0) -> np.ndarray:
+    """
+    Колонка свечей как массив float64: без копирования для CandleSeries,
+    сборка из dict для списков (None и отсутствующие значения - default).
+    """
+    if isinstance(candles, CandleSeries):
+        return candles.column(key, default=default)
+    return np.array([c.get(key, default) or default for c in candles], dtype=np.float64)
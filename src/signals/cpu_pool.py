@@ -0,0 +1,135 @@
+"""
+CPU Pool - вынос CPU-bound расчётов из event loop в пул процессов.
+
+Расчёт технических индикаторов (numpy) и рендер сообщений занимают
+event loop на время, сопоставимое с сетевыми запросами, и в это время
+диспетчер aiogram не обслуживает других пользователей. CPUPool выполняет
+такие функции в ProcessPoolExecutor.
+
+Процессы пула запускаются через forkserver (spawn, где его нет), а не fork:
+форк процесса бота копировал бы работающий event loop, открытые сокеты и
+потоки. Запуск процесса стоит сотни миллисекунд, поэтому пул прогревается
+при старте бота (start), а не на первом сигнале.
+
+Функции, передаваемые в пул, должны быть функциями уровня модуля,
+а аргументы и результат - простыми dict/list/float (дешёвая сериализация
+между процессами).
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _start_method() -> str:
+    """forkserver, если доступен на платформе, иначе spawn."""
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _warm_up(modules: Sequence[str]) -> int:
+    """Импортировать модули в процессе пула (выполняется при прогреве)."""
+    for module in modules:
+        importlib.import_module(module)
+    return os.getpid()
+
+
+class CPUPool:
+    """
+    Ленивый пул процессов для CPU-bound функций.
+
+    Args:
+        max_workers: Количество процессов (0 - выполнять в текущем процессе,
+                     None - по числу CPU, но не больше 4)
+        preload: Модули, импортируемые в процессах при прогреве
+                 (модули функций, которые будут выполняться в пуле)
+    """
+
+    MAX_DEFAULT_WORKERS = 4
+
+    def __init__(self, max_workers: Optional[int] = None, preload: Sequence[str] = ()):
+        if max_workers is None:
+            max_workers = min(os.cpu_count() or 1, self.MAX_DEFAULT_WORKERS)
+        self.max_workers = max(0, max_workers)
+        self.preload = tuple(preload)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.stats = {"offloaded": 0, "inline": 0, "broken": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            start_method = _start_method()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(start_method),
+            )
+            logger.info(f"CPU pool started with {self.max_workers} workers ({start_method})")
+        return self._executor
+
+    async def start(self):
+        """
+        Запустить все процессы пула заранее (on_startup).
+
+        Каждому процессу отправляется _warm_up, чтобы первый сигнал не ждал
+        запуска процесса и импорта модулей. Ошибка прогрева не фатальна -
+        пул будет запущен при первом вызове run.
+        """
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        # Задачи отправляются разом: пока процессы не свободны, пул запускает новые
+        futures = [executor.submit(_warm_up, self.preload) for _ in range(self.max_workers)]
+        try:
+            pids = await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+            logger.info(f"CPU pool warmed up: {len(set(pids))} workers")
+        except Exception as e:
+            logger.warning(f"CPU pool warm-up failed: {e}")
+            self.shutdown(wait=False)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Выполнить func(*args) в пуле процессов.
+
+        Если пул отключён или процесс пула аварийно завершился, функция
+        выполняется в текущем процессе (результат при этом тот же).
+
+        Args:
+            func: Функция уровня модуля (должна сериализоваться pickle)
+            *args: Аргументы (простые dict/list/числа)
+
+        Returns:
+            Результат func
+        """
+        if not self.enabled:
+            self.stats["inline"] += 1
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._get_executor(), partial(func, *args))
+            self.stats["offloaded"] += 1
+            return result
+        except BrokenProcessPool:
+            logger.warning(f"CPU pool is broken, running {func.__name__} inline and restarting pool")
+            self.stats["broken"] += 1
+            self.shutdown(wait=False)
+            self.stats["inline"] += 1
+            return func(*args)
+
+    def shutdown(self, wait: bool = True):
+        """Остановить процессы пула (пул будет создан заново при следующем вызове)."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        logger.info("CPU pool stopped")
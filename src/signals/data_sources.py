@@ -17,6 +17,11 @@ from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 import aiohttp
 import asyncio
+from http_client import http_client
+from signals.candle_store import candle_store
+from signals.latency import latency_tracker
+from signals.market_stream import market_stream
+from signals.order_book import OrderBook
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +41,10 @@ class DataSourceManager:
         "exchange_flows": 300,   # 5 min
     }
     
+    # Order book: levels analysed and wall threshold (x average level size)
+    ORDER_BOOK_DEPTH = 50
+    ORDER_BOOK_WALL_MULTIPLE = 3.0
+    
     # Rate limits (requests per minute)
     RATE_LIMITS = {
         "bybit": 600,
@@ -91,44 +100,14 @@ class DataSourceManager:
             List[Dict]: [{"open": 97000, "high": 98000, "low": 96500, "close": 97500, 
                          "volumefrom": 1234, "volumeto": 120000000}, ...]
         """
-        cache_key = f"ohlcv_{symbol}_{limit}"
-        cached_data = self._get_cache(cache_key, self.CACHE_TTL["ohlcv"])
-        if cached_data is not None:
-            return cached_data
-        
         try:
-            url = "https://min-api.cryptocompare.com/data/v2/histohour"
-            params = {
-                "fsym": symbol,
-                "tsym": "USD",
-                "limit": limit
-            }
-            
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=timeout) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("Response") == "Success":
-                            candles = data.get("Data", {}).get("Data", [])
-                            result = [
-                                {
-                                    "open": c["open"],
-                                    "high": c["high"],
-                                    "low": c["low"],
-                                    "close": c["close"],
-                                    "volumefrom": c["volumefrom"],
-                                    "volumeto": c["volumeto"],
-                                    "time": c["time"]
-                                }
-                                for c in candles
-                            ]
-                            self._set_cache(cache_key, result)
-                            logger.info(f"Fetched {len(result)} OHLCV candles for {symbol}")
-                            return result
-                    
-                    logger.warning(f"Failed to fetch OHLCV data for {symbol}: {response.status}")
-                    return None
+            # histohour с limit=N отдаёт N+1 бар
+            result = await candle_store.get("cryptocompare", symbol, "1h", limit + 1)
+            if not result:
+                logger.warning(f"Failed to fetch OHLCV data for {symbol}")
+                return None
+            logger.info(f"Got {len(result)} OHLCV candles for {symbol}")
+            return result
         except Exception as e:
             logger.error(f"Error getting OHLCV data for {symbol}: {e}")
             return None
@@ -136,6 +115,8 @@ class DataSourceManager:
     async def get_order_book_analysis(self, symbol: str) -> Optional[Dict]:
         """
         Analyze Order Book from Bybit.
+        Uses the local MarketStream book when the stream is running (no request),
+        otherwise a REST snapshot:
         API: https://api.bybit.com/v5/market/orderbook?category=spot&symbol=BTCUSDT&limit=50
         
         Args:
@@ -153,6 +134,10 @@ class DataSourceManager:
                 "resistance_level": 98000
             }
         """
+        book = market_stream.book(symbol)
+        if book is not None:
+            return self._analyze_order_book(book)
+        
         cache_key = f"order_book_{symbol}"
         cached_data = self._get_cache(cache_key, self.CACHE_TTL["order_book"])
         if cached_data is not None:
@@ -163,51 +148,22 @@ class DataSourceManager:
             params = {
                 "category": "spot",
                 "symbol": symbol,
-                "limit": 50
+                "limit": self.ORDER_BOOK_DEPTH
             }
             
             timeout = aiohttp.ClientTimeout(total=5)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
                         
                         # Bybit V5 API structure: result.b (bids) and result.a (asks)
                         result_data = data.get("result", {})
-                        bids = result_data.get("b", [])
-                        asks = result_data.get("a", [])
-                        
-                        if not bids or not asks:
+                        book = OrderBook.from_snapshot(result_data.get("b", []), result_data.get("a", []))
+                        result = self._analyze_order_book(book)
+                        if result is None:
                             return None
                         
-                        # Calculate volumes (Bybit format: [price, quantity])
-                        bid_volume = sum(float(b[1]) for b in bids)
-                        ask_volume = sum(float(a[1]) for a in asks)
-                        
-                        # Calculate imbalance
-                        total_volume = bid_volume + ask_volume
-                        imbalance = (bid_volume - ask_volume) / total_volume if total_volume > 0 else 0
-                        
-                        # Calculate spread
-                        top_bid = float(bids[0][0])
-                        top_ask = float(asks[0][0])
-                        spread = ((top_ask - top_bid) / top_bid) * 100
-                        
-                        # Find support and resistance levels (weighted by volume)
-                        support_level = top_bid
-                        resistance_level = top_ask
-                        
-                        result = {
-                            "bid_volume": round(bid_volume, 2),
-                            "ask_volume": round(ask_volume, 2),
-                            "imbalance": round(imbalance, 4),
-                            "spread": round(spread, 4),
-                            "top_bid": top_bid,
-                            "top_ask": top_ask,
-                            "support_level": support_level,
-                            "resistance_level": resistance_level
-                        }
-                        
                         self._set_cache(cache_key, result)
                         logger.info(f"Analyzed order book for {symbol}")
                         return result
@@ -218,6 +174,32 @@ class DataSourceManager:
             logger.error(f"Error analyzing order book for {symbol}: {e}")
             return None
     
+    def _analyze_order_book(self, book: OrderBook) -> Optional[Dict]:
+        """Volumes, imbalance and spread of the best levels; support/resistance - the largest walls."""
+        if book.mid is None:
+            return None
+        
+        depth = self.ORDER_BOOK_DEPTH
+        top_bid = book.best_bid
+        top_ask = book.best_ask
+        
+        # Support and resistance - the largest liquidity walls (top of book if there are none)
+        bid_walls = book.walls("bids", self.ORDER_BOOK_WALL_MULTIPLE)
+        ask_walls = book.walls("asks", self.ORDER_BOOK_WALL_MULTIPLE)
+        support_level = max(bid_walls, key=lambda level: level[1])[0] if bid_walls else top_bid
+        resistance_level = max(ask_walls, key=lambda level: level[1])[0] if ask_walls else top_ask
+        
+        return {
+            "bid_volume": round(book.volume("bids", depth), 2),
+            "ask_volume": round(book.volume("asks", depth), 2),
+            "imbalance": round(book.imbalance(depth=depth), 4),
+            "spread": round(book.spread_pct(), 4),
+            "top_bid": top_bid,
+            "top_ask": top_ask,
+            "support_level": support_level,
+            "resistance_level": resistance_level
+        }
+    
     async def get_recent_trades_analysis(self, symbol: str) -> Optional[Dict]:
         """
         Analyze recent trades from Bybit.
@@ -250,7 +232,7 @@ class DataSourceManager:
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -358,7 +340,7 @@ class DataSourceManager:
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 # Fetch both in parallel
                 oi_task = session.get(oi_url, params=oi_params, timeout=timeout)
                 ls_task = session.get(ls_url, params=ls_params, timeout=timeout)
@@ -459,7 +441,7 @@ class DataSourceManager:
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -520,7 +502,7 @@ class DataSourceManager:
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -577,7 +559,7 @@ class DataSourceManager:
             }
             
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 async with session.get(url, params=params, timeout=timeout) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -632,7 +614,7 @@ class DataSourceManager:
         
         try:
             timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 # Fetch mempool and hashrate in parallel
                 mempool_task = session.get("https://blockchain.info/q/unconfirmedcount", timeout=timeout)
                 hashrate_task = session.get("https://blockchain.info/q/hashrate", timeout=timeout)
@@ -797,13 +779,14 @@ class DataSourceManager:
                     return await self.get_btc_onchain_data()
                 return None
             
+            trace = latency_tracker.trace
             results = await asyncio.gather(
-                self.get_ohlcv_data(symbol),
-                self.get_order_book_analysis(bybit_symbol),
-                self.get_recent_trades_analysis(bybit_symbol),
-                self.get_futures_data(bybit_symbol),
-                get_onchain_if_btc(),
-                self.get_exchange_flows(whale_tracker, symbol),
+                trace("data_sources.ohlcv", self.get_ohlcv_data(symbol)),
+                trace("data_sources.order_book", self.get_order_book_analysis(bybit_symbol)),
+                trace("data_sources.trades", self.get_recent_trades_analysis(bybit_symbol)),
+                trace("data_sources.futures", self.get_futures_data(bybit_symbol)),
+                trace("data_sources.onchain", get_onchain_if_btc()),
+                trace("data_sources.exchange_flows", self.get_exchange_flows(whale_tracker, symbol)),
                 return_exceptions=True
             )
             
@@ -12,9 +12,11 @@ Provides comprehensive derivatives market analysis including:
 import logging
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
-import aiohttp
 import asyncio
 
+from http_client import http_client
+from signals.latency import current_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,14 +31,21 @@ class DeepDerivativesAnalyzer:
         self._cache_timestamps = {}
         
     def _get_cache(self, key: str, ttl_seconds: int) -> Optional[Dict]:
-        """Get data from cache if still valid."""
+        """Get data from cache if still valid (marks the current latency span as hit/miss)."""
+        span = current_span()
         if key not in self._cache:
+            if span:
+                span.cache = "miss"
             return None
         
         age = datetime.now() - self._cache_timestamps.get(key, datetime.min)
         if age > timedelta(seconds=ttl_seconds):
+            if span:
+                span.cache = "miss"
             return None
         
+        if span:
+            span.cache = "hit"
         return self._cache[key]
     
     def _set_cache(self, key: str, value: Dict):
@@ -81,7 +90,7 @@ class DeepDerivativesAnalyzer:
             # For now, we'll estimate based on current price and typical leverage levels
             
             # Get current price from Bybit
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://api.bybit.com/v5/market/tickers"
                 params = {"category": "linear", "symbol": symbol}
                 
@@ -197,7 +206,7 @@ class DeepDerivativesAnalyzer:
             return cached
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 # Get current ticker data
                 url = "https://api.bybit.com/v5/market/tickers"
                 params = {"category": "linear", "symbol": symbol}
@@ -362,7 +371,7 @@ class DeepDerivativesAnalyzer:
     async def _get_bybit_ls_ratio(self, symbol: str) -> Optional[Dict]:
         """Get Long/Short ratio from Bybit."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://api.bybit.com/v5/market/account-ratio"
                 params = {
                     "category": "linear",
@@ -450,7 +459,7 @@ class DeepDerivativesAnalyzer:
             return cached
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://api.bybit.com/v5/market/funding/history"
                 params = {
                     "category": "linear",
@@ -556,7 +565,7 @@ class DeepDerivativesAnalyzer:
             return cached
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 # Get spot price
                 url_spot = "https://api.bybit.com/v5/market/tickers"
                 params_spot = {"category": "spot", "symbol": symbol}
@@ -7,6 +7,7 @@ from typing import List, Dict, Optional
 import aiohttp
 import asyncio
 
+from http_client import http_client
 from signals.rate_limiter import ExchangeRateLimiters
 
 logger = logging.getLogger(__name__)
@@ -26,7 +27,7 @@ class BybitClient:
     async def _ensure_session(self):
         """Ensure aiohttp session exists."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client.get_session()
     
     async def _request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """
@@ -250,6 +251,6 @@ class BybitClient:
             return None
     
     async def close(self):
-        """Close aiohttp session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Release the shared aiohttp session."""
+        # Shared http_client session - closed in on_shutdown
+        self.session = None
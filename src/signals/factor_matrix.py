@@ -0,0 +1,691 @@
+"""
+Factor Matrix - векторизованный расчёт факторных скоров AI сигналов.
+
+AISignalAnalyzer считает 29 факторов по словарям одной монеты в одной
+точке времени (_calculate_*_score). FactorMatrix делает то же самое
+для многих строк (монета, время) сразу: входы превращаются в числовые
+столбцы NumPy, скоры факторов - в матрицу (строки x факторы), после
+чего веса, ограничение вклада фактора, лимит общего score, консенсус,
+направление, сила и вероятность считаются в виде массивов.
+
+Подходит для сканеров (сотни монет за раз) и бэктестов (месяцы баров):
+scripts/run_backtest.py считает им сигналы по всей истории свечей.
+Список факторов и веса берутся из AISignalAnalyzer (SIGNAL_FACTORS).
+Скалярный путь AISignalAnalyzer остаётся эталоном: результаты по строкам
+совпадают с _calculate_*_score / _cap_factor_contribution /
+count_consensus / _calculate_real_probability.
+
+Пример:
+    matrix = FactorMatrix()
+    result = matrix.score([
+        {"whale_data": {...}, "market_data": {...}, "technical_data": {...}},
+        ...
+    ])
+    result["total_score"], result["direction"], result["probability"]
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from signals.ai_signals import AISignalAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+# Факторы в порядке взвешенной суммы calculate_signal: (имя скора, атрибут веса)
+FACTORS: Tuple[Tuple[str, str], ...] = AISignalAnalyzer.SIGNAL_FACTORS
+
+FACTOR_NAMES: Tuple[str, ...] = tuple(name for name, _ in FACTORS)
+
+# Факторы, участвующие в count_consensus (первые в FACTORS)
+CONSENSUS_FACTORS: Tuple[str, ...] = AISignalAnalyzer.CONSENSUS_FACTORS
+
+# Кодирование категориальных значений (отсутствующий ключ - 0, отсутствующий источник - NaN)
+SIGNAL_CODES = {"bullish": 1, "bearish": -1}
+MA_CROSS_CODES = {"golden_cross": 1, "death_cross": -1}
+OSCILLATOR_CODES = {"oversold": 2, "bullish": 1, "bearish": -1, "overbought": -2}
+ROC_CODES = {"strong_up": 2, "up": 1, "down": -1, "strong_down": -2}
+BB_CODES = {"below_lower": 2, "lower_half": 1, "upper_half": -1, "above_upper": -2}
+KELTNER_CODES = {"below": 1, "above": -1}
+OBV_CODES = {"rising": 1, "falling": -1}
+VOLUME_STATUS_CODES = {"high": 1, "low": -1}
+MEMPOOL_CODES = {"low": 1, "congested": -1}
+TV_CODES = {"STRONG_BUY": 2, "BUY": 1, "SELL": -1, "STRONG_SELL": -2}
+PHASE_CODES = {"accumulation": 1, "distribution": -1}
+TREND_CODES = {"rising": 1, "falling": -1}
+BASIS_CODES = {"contango": 1, "backwardation": -1}
+
+DIRECTION_NAMES = np.array(["short", "sideways", "long"])
+
+NAN = float("nan")
+
+
+def _code(value, table: Dict[str, int]) -> float:
+    return float(table.get(value, 0))
+
+
+def _num(value) -> float:
+    return NAN if value is None else float(value)
+
+
+def extract_factor_inputs(
+    whale_data: Optional[Dict] = None,
+    market_data: Optional[Dict] = None,
+    technical_data: Optional[Dict] = None,
+    fear_greed: Optional[Dict] = None,
+    funding_rate: Optional[Dict] = None,
+    order_book: Optional[Dict] = None,
+    futures_data: Optional[Dict] = None,
+    onchain_data: Optional[Dict] = None,
+    exchange_flows: Optional[Dict] = None,
+    short_term_data: Optional[Dict] = None,
+    trades_flow: Optional[Dict] = None,
+    liquidations: Optional[Dict] = None,
+    orderbook_delta: Optional[Dict] = None,
+    coinglass_data: Optional[Dict] = None,
+    news_sentiment: Optional[Dict] = None,
+    tradingview_rating: Optional[Dict] = None,
+    whale_alert: Optional[Dict] = None,
+    social_data: Optional[Dict] = None,
+    deep_whale_data: Optional[Dict] = None,
+    deep_derivatives_data: Optional[Dict] = None,
+    **_ignored,
+) -> Dict[str, float]:
+    """
+    Превратить входы calculate_signal (словари источников) в числовую строку.
+
+    Отсутствующий источник кодируется NaN - соответствующий фактор даёт 0,
+    как и в скалярном пути. Принимает те же именованные аргументы, что
+    calculate_signal; лишние аргументы игнорируются.
+
+    Returns:
+        Dict {столбец: float}
+    """
+    row: Dict[str, float] = {}
+    whale_data = whale_data or {}
+    market_data = market_data or {}
+
+    # Whale
+    row["whale_withdrawals"] = float(whale_data.get("withdrawals", 0))
+    row["whale_deposits"] = float(whale_data.get("deposits", 0))
+    if exchange_flows:
+        row["ef_net"] = float(exchange_flows.get("net_flow_usd", 0))
+        row["ef_total"] = float(
+            exchange_flows.get("inflow_volume_usd", 0) + exchange_flows.get("outflow_volume_usd", 0)
+        )
+    else:
+        row["ef_net"] = row["ef_total"] = NAN
+
+    # Technical (trend / momentum / volatility / volume)
+    tech = technical_data or {}
+    has_tech = bool(technical_data)
+    row["has_technical"] = 1.0 if has_tech else 0.0
+    row["rsi"] = _num(tech["rsi"]["value"]) if "rsi" in tech else NAN
+    row["macd_signal"] = _code(tech["macd"]["signal"], SIGNAL_CODES) if "macd" in tech else NAN
+    if "ma_crossover" in tech:
+        row["ma_cross"] = _code(tech["ma_crossover"]["crossover"], MA_CROSS_CODES)
+        row["ma_trend"] = _code(tech["ma_crossover"]["trend"], SIGNAL_CODES)
+    else:
+        row["ma_cross"] = row["ma_trend"] = NAN
+    row["rsi_divergence"] = _code(tech["rsi_divergence"]["type"], SIGNAL_CODES) if "rsi_divergence" in tech else NAN
+    row["adx"] = _num(tech["adx"]["value"]) if "adx" in tech else NAN
+    row["stoch_rsi"] = _code(tech["stoch_rsi"]["signal"], OSCILLATOR_CODES) if "stoch_rsi" in tech else NAN
+    row["mfi"] = _code(tech["mfi"]["signal"], OSCILLATOR_CODES) if "mfi" in tech else NAN
+    row["roc"] = _code(tech["roc"]["momentum"], ROC_CODES) if "roc" in tech else NAN
+    row["williams_r"] = _code(tech["williams_r"]["signal"], OSCILLATOR_CODES) if "williams_r" in tech else NAN
+    row["bb_position"] = _code(tech["bollinger_bands"]["position"], BB_CODES) if "bollinger_bands" in tech else NAN
+    row["atr_high"] = (
+        float(tech["atr"]["volatility"] in ("high", "extreme")) if "atr" in tech else NAN
+    )
+    row["keltner"] = _code(tech["keltner_channels"]["position"], KELTNER_CODES) if "keltner_channels" in tech else NAN
+    row["obv"] = _code(tech["obv"]["trend"], OBV_CODES) if "obv" in tech else NAN
+    if "vwap" in tech:
+        row["vwap_above"] = float(tech["vwap"]["position"] == "above")
+        row["vwap_deviation"] = float(tech["vwap"]["deviation_percent"])
+    else:
+        row["vwap_above"] = row["vwap_deviation"] = NAN
+    row["volume_status"] = _code(tech["volume_sma"]["status"], VOLUME_STATUS_CODES) if "volume_sma" in tech else NAN
+    if "volume_spike" in tech:
+        row["volume_spike"] = float(bool(tech["volume_spike"]["is_spike"]))
+        row["volume_spike_pct"] = float(tech["volume_spike"]["spike_percentage"])
+    else:
+        row["volume_spike"] = row["volume_spike_pct"] = NAN
+
+    # Market
+    row["change_24h"] = float(market_data.get("change_24h", 0))
+    row["volume_24h"] = float(market_data.get("volume_24h", 0))
+
+    # Order book
+    if order_book:
+        row["ob_imbalance"] = float(order_book.get("imbalance", 0))
+        row["ob_spread"] = float(order_book.get("spread", 0))
+    else:
+        row["ob_imbalance"] = row["ob_spread"] = NAN
+
+    # Derivatives
+    row["ls_ratio"] = float(futures_data.get("long_short_ratio", 1.0)) if futures_data else NAN
+    row["funding_rate_pct"] = float(funding_rate.get("rate_percent", 0)) if funding_rate else NAN
+
+    # On-chain / sentiment
+    row["mempool"] = _code(onchain_data.get("mempool_status", "unknown"), MEMPOOL_CODES) if onchain_data else NAN
+    row["fear_greed"] = float(fear_greed.get("value", 50)) if fear_greed else NAN
+
+    # Short-term (falsy значения = отсутствуют, как в скалярном пути)
+    st = short_term_data or {}
+    row["rsi_5m"] = float(st["rsi_5m"]) if st.get("rsi_5m") else NAN
+    row["rsi_15m"] = float(st["rsi_15m"]) if st.get("rsi_15m") else NAN
+    row["ema_crossover"] = _code(st.get("ema_crossover"), SIGNAL_CODES)
+    if st.get("current_price") and st.get("price_10min_ago"):
+        row["price_change_10m"] = (st["current_price"] - st["price_10min_ago"]) / st["price_10min_ago"] * 100
+    else:
+        row["price_change_10m"] = NAN
+
+    row["flow_ratio"] = float(trades_flow.get("flow_ratio", 1.0)) if trades_flow else NAN
+    row["liquidations"] = _code(liquidations.get("sentiment", "neutral"), SIGNAL_CODES) if liquidations else NAN
+    row["orderbook_delta"] = float(orderbook_delta.get("delta", 0)) if orderbook_delta else NAN
+
+    # New sources
+    if coinglass_data:
+        row["oi_change_24h"] = float(coinglass_data.get("oi_change_24h", 0))
+        row["top_traders_ratio"] = float(coinglass_data.get("top_traders_ratio", 1.0))
+    else:
+        row["oi_change_24h"] = row["top_traders_ratio"] = NAN
+    row["news_sentiment"] = float(news_sentiment.get("sentiment_score", 0)) if news_sentiment else NAN
+    row["tradingview"] = (
+        _code(tradingview_rating.get("recommendation", "NEUTRAL"), TV_CODES) if tradingview_rating else NAN
+    )
+    row["whale_alert_net_flow"] = float(whale_alert.get("net_flow", 0)) if whale_alert else NAN
+    if social_data:
+        row["galaxy_score"] = float(social_data.get("galaxy_score", 50))
+        row["social_sentiment"] = float(social_data.get("sentiment", 0))
+    else:
+        row["galaxy_score"] = row["social_sentiment"] = NAN
+
+    # Deep whale analysis
+    deep_whale = deep_whale_data or {}
+    accumulation = deep_whale.get("accumulation_distribution")
+    if accumulation:
+        row["accumulation_phase"] = _code(accumulation.get("phase", "neutral"), PHASE_CODES)
+        row["accumulation_confidence"] = float(accumulation.get("confidence", 0)) / 100
+    else:
+        row["accumulation_phase"] = row["accumulation_confidence"] = NAN
+    flows_detailed = deep_whale.get("exchange_flows_detailed")
+    row["exchange_total_net"] = float(flows_detailed.get("total_net", 0)) if flows_detailed else NAN
+    stablecoins = deep_whale.get("stablecoin_flows")
+    row["stablecoin_inflow"] = float(stablecoins.get("total_inflow", 0)) if stablecoins else NAN
+
+    # Deep derivatives analysis
+    deep_deriv = deep_derivatives_data or {}
+    oi_corr = deep_deriv.get("oi_price_correlation")
+    if oi_corr:
+        row["oi_corr_signal"] = _code(oi_corr.get("signal", "neutral"), SIGNAL_CODES)
+        row["oi_corr_correlation"] = _code(oi_corr.get("correlation", "neutral"), SIGNAL_CODES)
+    else:
+        row["oi_corr_signal"] = row["oi_corr_correlation"] = NAN
+    liq_levels = deep_deriv.get("liquidation_levels")
+    row["liq_levels_signal"] = _code(liq_levels.get("signal", "neutral"), SIGNAL_CODES) if liq_levels else NAN
+    ls_detailed = deep_deriv.get("ls_ratio_by_exchange")
+    row["ls_avg_ratio"] = float(ls_detailed.get("average_ratio", 1.0)) if ls_detailed else NAN
+    funding_history = deep_deriv.get("funding_rate_history")
+    if funding_history:
+        row["funding_extreme"] = float(bool(funding_history.get("extreme", False)))
+        row["funding_trend"] = _code(funding_history.get("trend", "stable"), TREND_CODES)
+        row["funding_current"] = float(funding_history.get("current", 0))
+    else:
+        row["funding_extreme"] = row["funding_trend"] = row["funding_current"] = NAN
+    basis = deep_deriv.get("basis")
+    if basis:
+        row["basis_type"] = _code(basis.get("basis_type", "neutral"), BASIS_CODES)
+        row["basis_value"] = float(basis.get("basis", 0))
+    else:
+        row["basis_type"] = row["basis_value"] = NAN
+
+    return row
+
+
+def _lookup(codes: np.ndarray, table: Dict[int, float]) -> np.ndarray:
+    """Скор по коду категории; NaN и неизвестные коды дают 0."""
+    result = np.zeros_like(codes, dtype=float)
+    for code, score in table.items():
+        result[codes == code] = score
+    return result
+
+
+def _nz(values: np.ndarray) -> np.ndarray:
+    """NaN -> 0."""
+    return np.where(np.isnan(values), 0.0, values)
+
+
+class FactorMatrix:
+    """
+    Векторизованный движок факторных скоров.
+
+    Args:
+        params: Источник констант (веса, пороги) - по умолчанию AISignalAnalyzer
+    """
+
+    def __init__(self, params=AISignalAnalyzer):
+        self.params = params
+        self.weights = np.array([getattr(params, attr) for _, attr in FACTORS], dtype=float)
+
+    # ------------------------------------------------------------------
+    # Входы
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build_inputs(rows: Sequence[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Собрать столбцы входов из строк.
+
+        Args:
+            rows: Список словарей с аргументами calculate_signal
+                  (whale_data, market_data, technical_data, ...)
+
+        Returns:
+            Dict {столбец: np.ndarray длины len(rows)}
+        """
+        extracted = [extract_factor_inputs(**row) for row in rows]
+        if not extracted:
+            return {}
+        return {key: np.array([r[key] for r in extracted], dtype=float) for key in extracted[0]}
+
+    # ------------------------------------------------------------------
+    # Скоры факторов (аналоги _calculate_*_score)
+    # ------------------------------------------------------------------
+
+    def factor_scores(self, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Матрица скоров факторов (строки x FACTORS), каждый в [-10, +10].
+        """
+        p = self.params
+        n = len(cols["change_24h"])
+
+        # Whale
+        withdrawals, deposits = cols["whale_withdrawals"], cols["whale_deposits"]
+        total_txs = withdrawals + deposits
+        whale = np.divide((withdrawals - deposits) * 6, total_txs, out=np.zeros(n), where=total_txs > 0)
+        ef_total = _nz(cols["ef_total"])
+        whale += np.divide(_nz(cols["ef_net"]) * 4, ef_total, out=np.zeros(n), where=ef_total > 0)
+        whale = np.clip(whale, -10, 10)
+
+        has_tech = cols["has_technical"] > 0
+
+        # Trend
+        rsi = cols["rsi"]
+        trend = np.select([rsi < 30, rsi > 70], [4.0, -4.0], default=(50 - rsi) / 20 * 2)
+        trend = _nz(np.where(np.isnan(rsi), 0.0, trend))
+        trend += _nz(cols["macd_signal"]) * 3
+        ma_cross, ma_trend = _nz(cols["ma_cross"]), _nz(cols["ma_trend"])
+        trend += np.where(ma_cross != 0, ma_cross * 3, ma_trend)
+        adx = cols["adx"]
+        adx_multiplier = np.select([adx < 20, adx > 40], [0.8, 1.2], default=1.0)
+        trend = np.clip(trend * adx_multiplier + _nz(cols["rsi_divergence"]) * 5, -10, 10)
+        trend = np.where(has_tech, trend, 0.0)
+
+        # Momentum
+        momentum = (
+            _lookup(cols["stoch_rsi"], {2: 3.0, 1: 1.5, -1: -1.5, -2: -3.0})
+            + _lookup(cols["mfi"], {2: 2.5, -2: -2.5})
+            + _lookup(cols["roc"], {2: 2.5, 1: 1.5, -1: -1.5, -2: -2.5})
+            + _lookup(cols["williams_r"], {2: 2.0, -2: -2.0})
+        )
+        momentum = np.where(has_tech, np.clip(momentum, -10, 10), 0.0)
+
+        # Volatility
+        volatility = (
+            _lookup(cols["bb_position"], {2: 4.0, 1: 1.0, -1: -1.0, -2: -4.0})
+            - 2 * (cols["atr_high"] == 1)
+            + _lookup(cols["keltner"], {1: 3.0, -1: -3.0})
+        )
+        volatility = np.where(has_tech, np.clip(volatility, -10, 10), 0.0)
+
+        # Volume
+        volume = _lookup(cols["obv"], {1: 4.0, -1: -4.0})
+        deviation = cols["vwap_deviation"]
+        vwap = np.where(
+            cols["vwap_above"] == 1,
+            np.minimum(3, deviation / 2),
+            -np.minimum(3, np.abs(deviation) / 2),
+        )
+        volume += _nz(vwap)
+        volume += _lookup(cols["volume_status"], {1: 3.0, -1: -2.0})
+        spike_pct = cols["volume_spike_pct"]
+        spike = np.where((cols["volume_spike"] == 1) & (spike_pct > 50), np.minimum(5, 3 + spike_pct / 80), 0.0)
+        volume = np.where(has_tech, np.clip(volume + _nz(spike), -10, 10), 0.0)
+
+        # Market
+        market = np.clip(cols["change_24h"] * 0.7, -7, 7)
+        volume_24h = cols["volume_24h"]
+        market += np.select(
+            [volume_24h > p.HIGH_VOLUME_THRESHOLD, volume_24h < p.HIGH_VOLUME_THRESHOLD * 0.3], [3.0, -2.0], default=0.0
+        )
+        market = np.clip(market, -10, 10)
+
+        # Order book
+        spread = cols["ob_spread"]
+        orderbook = cols["ob_imbalance"] * 7 + np.select([spread < 0.01, spread > 0.05], [2.0, -3.0], default=0.0)
+        orderbook = _nz(np.clip(orderbook, -10, 10))
+
+        # Derivatives
+        ls = cols["ls_ratio"]
+        derivatives = np.select([ls > 1.5, ls > 1.2, ls < 0.7, ls < 0.9], [4.0, 2.0, -4.0, -2.0], default=0.0)
+        rate = cols["funding_rate_pct"]
+        funding = np.select(
+            [rate < -0.01, rate > 0.05, rate < 0.02],
+            [5.0, -5.0, (0.02 - rate) / 0.03 * 3],
+            default=-(rate - 0.02) / 0.03 * 3,
+        )
+        derivatives = np.clip(derivatives + _nz(funding), -10, 10)
+
+        onchain = _lookup(cols["mempool"], {1: 3.0, -1: -5.0})
+
+        fg = cols["fear_greed"]
+        sentiment = _nz(np.select([fg < 25, fg > 75], [10.0, -10.0], default=(50 - fg) / 5))
+
+        # Short-term trend
+        rsi_5m, rsi_15m = cols["rsi_5m"], cols["rsi_15m"]
+        short_trend = _nz(np.select(
+            [rsi_5m < 20, rsi_5m < 30, rsi_5m > 80, rsi_5m > 70], [5.0, 3.0, -5.0, -3.0], default=(50 - rsi_5m) / 20
+        ))
+        short_trend += _nz(np.select(
+            [rsi_15m < 20, rsi_15m < 30, rsi_15m > 80, rsi_15m > 70], [4.0, 2.0, -4.0, -2.0], default=(50 - rsi_15m) / 30
+        ))
+        short_trend += cols["ema_crossover"] * 3
+        change_10m = cols["price_change_10m"]
+        short_trend += _nz(np.select([change_10m > 0.5, change_10m < -0.5], [2.0, -2.0], default=change_10m * 4))
+        short_trend = np.clip(short_trend, -10, 10)
+
+        # Trades flow
+        flow = cols["flow_ratio"]
+        bullish_range = p.TRADES_FLOW_BULLISH_THRESHOLD - 1.0
+        trades_flow = np.select(
+            [
+                flow > 50, flow > 10, flow > 5, flow > p.TRADES_FLOW_BULLISH_THRESHOLD,
+                flow < 0.02, flow < 0.1, flow < 0.2, flow < p.TRADES_FLOW_BEARISH_THRESHOLD,
+                flow >= 1.0,
+            ],
+            [10.0, 9.0, 8.0, 7.0, -10.0, -9.0, -8.0, -7.0, (flow - 1.0) / bullish_range * 10],
+            default=(flow - 1.0) / p.TRADES_FLOW_NEUTRAL_DIVISOR * 10,
+        )
+        trades_flow = _nz(np.clip(trades_flow, -10, 10))
+
+        liquidations = _nz(cols["liquidations"]) * 8
+        orderbook_delta = _nz(np.clip(cols["orderbook_delta"], -10, 10))
+
+        price_momentum = _nz(np.clip(
+            np.select([change_10m > 0.5, change_10m < -0.5], [change_10m * 10, change_10m * 10], default=change_10m * 20),
+            -10, 10,
+        ))
+
+        # Coinglass
+        oi_change = cols["oi_change_24h"]
+        price_up = cols["change_24h"] > 0
+        coinglass_oi = _nz(np.where(
+            np.isnan(oi_change), np.nan,
+            np.select([oi_change > 2, oi_change < -2], [np.where(price_up, 10.0, -5.0), np.where(price_up, -3.0, 3.0)], 0.0),
+        ))
+        ratio = cols["top_traders_ratio"]
+        top_traders = _nz(np.select(
+            [ratio > 2.0, ratio > 1.5, ratio < 0.5, ratio < 0.67], [8.0, 4.0, -10.0, -8.0], default=(ratio - 1.0) * 5
+        ))
+
+        news = cols["news_sentiment"]
+        news_score = _nz(np.select(
+            [news > 0.5, news > 0.2, news < -0.5, news < -0.2], [10.0, 5.0, -10.0, -5.0], default=news * 10
+        ))
+        tradingview = _lookup(cols["tradingview"], {2: 10.0, 1: 5.0, -1: -5.0, -2: -10.0})
+        net_flow = cols["whale_alert_net_flow"]
+        whale_alert = _nz(np.select(
+            [net_flow > 50e6, net_flow > 20e6, net_flow < -50e6, net_flow < -20e6],
+            [10.0, 5.0, -10.0, -5.0], default=net_flow / 10_000_000,
+        ))
+        galaxy, social_sent = cols["galaxy_score"], cols["social_sentiment"]
+        social = _nz(np.select(
+            [
+                (galaxy > 70) & (social_sent > 0.5), (galaxy > 60) & (social_sent > 0.3),
+                (galaxy < 30) & (social_sent < -0.5), (galaxy < 40) & (social_sent < -0.3),
+            ],
+            [10.0, 5.0, -10.0, -5.0],
+            default=np.clip((galaxy - 50) / 10 + social_sent * 5, -10, 10),
+        ))
+
+        # Deep whale
+        accumulation = _nz(cols["accumulation_phase"] * 10 * cols["accumulation_confidence"])
+        total_net = cols["exchange_total_net"]
+        exchange_detailed = _nz(np.select(
+            [total_net < -50e6, total_net < -10e6, total_net > 50e6, total_net > 10e6],
+            [10.0, 5.0, -10.0, -5.0], default=-(total_net / 10_000_000),
+        ))
+        inflow = cols["stablecoin_inflow"]
+        stablecoin = _nz(np.select(
+            [inflow > 100e6, inflow > 50e6, inflow < -100e6, inflow < -50e6],
+            [10.0, 5.0, -10.0, -5.0], default=inflow / 20_000_000,
+        ))
+
+        # Deep derivatives
+        oi_signal, oi_correlation = _nz(cols["oi_corr_signal"]), _nz(cols["oi_corr_correlation"])
+        oi_price = np.where((oi_signal != 0) & (oi_correlation == oi_signal), oi_signal * 10, oi_signal * 5)
+        liquidation_levels = _nz(cols["liq_levels_signal"]) * 7
+        avg_ratio = cols["ls_avg_ratio"]
+        ls_detailed = np.select(
+            [avg_ratio > 2.5, avg_ratio > 2.0, avg_ratio > 1.5, avg_ratio < 0.4, avg_ratio < 0.5, avg_ratio < 0.7],
+            [-10.0, -7.0, -3.0, 10.0, 7.0, 3.0], default=0.0,
+        )
+        extreme, f_trend, current = cols["funding_extreme"] == 1, cols["funding_trend"], cols["funding_current"]
+        funding_trend = np.select(
+            [
+                extreme & (current > 0.1), extreme & (current < -0.1),
+                (f_trend == 1) & (current > 0.03), (f_trend == -1) & (current < -0.03),
+            ],
+            [-10.0, 10.0, -5.0, 5.0], default=0.0,
+        )
+        basis_type, basis_value = cols["basis_type"], cols["basis_value"]
+        basis = np.select(
+            [basis_type == 1, basis_type == -1],
+            [np.where(basis_value > 0.5, 8.0, 4.0), np.where(basis_value < -0.5, -8.0, -4.0)], default=0.0,
+        )
+
+        by_name = {
+            "whale_score": whale,
+            "trend_score": trend,
+            "momentum_score": momentum,
+            "volatility_score": volatility,
+            "volume_score": volume,
+            "market_score": market,
+            "orderbook_score": orderbook,
+            "derivatives_score": derivatives,
+            "onchain_score": onchain,
+            "sentiment_score": sentiment,
+            "short_trend_score": short_trend,
+            "trades_flow_score": trades_flow,
+            "liquidations_score": liquidations,
+            "orderbook_delta_score": orderbook_delta,
+            "price_momentum_score": price_momentum,
+            "coinglass_oi_score": coinglass_oi,
+            "coinglass_top_traders_score": top_traders,
+            "news_sentiment_score": news_score,
+            "tradingview_score": tradingview,
+            "whale_alert_score": whale_alert,
+            "social_score": social,
+            "whale_accumulation_score": accumulation,
+            "exchange_flow_detailed_score": exchange_detailed,
+            "stablecoin_flow_score": stablecoin,
+            "oi_price_correlation_score": oi_price,
+            "liquidation_levels_score": liquidation_levels,
+            "ls_ratio_detailed_score": ls_detailed,
+            "funding_trend_score": funding_trend,
+            "basis_score": basis,
+        }
+        # Столбцы - в порядке SIGNAL_FACTORS анализатора
+        return np.column_stack([by_name[name] for name in FACTOR_NAMES]).astype(float)
+
+    # ------------------------------------------------------------------
+    # Агрегация (аналоги _cap_factor_contribution, apply_total_score_limit, ...)
+    # ------------------------------------------------------------------
+
+    def contributions(self, scores: np.ndarray) -> np.ndarray:
+        """Взвешенные вклады факторов, ограниченные ±MAX_SINGLE_FACTOR_SCORE."""
+        cap = self.params.MAX_SINGLE_FACTOR_SCORE
+        return np.clip(scores * self.weights, -cap, cap)
+
+    def total_scores(self, scores: np.ndarray, previous: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Итоговый score строк (-MAX_TOTAL_SCORE..+MAX_TOTAL_SCORE).
+
+        Макро/опционы/соц. сентимент, которые calculate_signal добавляет
+        после ограничения, сюда не входят.
+
+        Args:
+            scores: Матрица скоров факторов
+            previous: Предыдущие score для сглаживания (NaN - без сглаживания)
+        """
+        p = self.params
+        total = self.contributions(scores).sum(axis=1) * p.SCORE_SCALE_FACTOR
+        if previous is not None:
+            smoothed = p.SMOOTHING_ALPHA * total + (1 - p.SMOOTHING_ALPHA) * previous
+            total = np.where(np.isnan(previous), total, smoothed)
+        return np.clip(total, -p.MAX_TOTAL_SCORE, p.MAX_TOTAL_SCORE)
+
+    @staticmethod
+    def consensus(scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Счётчики (bullish, bearish, neutral) по CONSENSUS_FACTORS, как count_consensus."""
+        block = scores[:, :len(CONSENSUS_FACTORS)]
+        bullish = (block > 1).sum(axis=1)
+        bearish = (block < -1).sum(axis=1)
+        neutral = block.shape[1] - bullish - bearish
+        return bullish, bearish, neutral
+
+    @staticmethod
+    def direction_codes(total: np.ndarray) -> np.ndarray:
+        """-1 short / 0 sideways / +1 long (_determine_direction_from_score)."""
+        return np.select([total <= -10, total >= 10], [-1, 1], default=0)
+
+    @staticmethod
+    def directions(total: np.ndarray) -> np.ndarray:
+        """Направления строками: "short" / "sideways" / "long"."""
+        return DIRECTION_NAMES[FactorMatrix.direction_codes(total) + 1]
+
+    def strengths(self, total: np.ndarray) -> np.ndarray:
+        """Сила сигнала 0-100 (calculate_signal_strength)."""
+        return np.minimum(np.floor(np.abs(total) / self.params.MAX_TOTAL_SCORE * 100), 100).astype(int)
+
+    @staticmethod
+    def probabilities_from_score(total: np.ndarray) -> np.ndarray:
+        """Базовая вероятность 50-95 (_calculate_probability_from_score)."""
+        a = np.abs(total)
+        probability = np.select(
+            [a < 15, a < 30, a < 60, a < 100],
+            [
+                50 + np.floor(a * 0.27),
+                55 + np.floor((a - 15) * 0.6),
+                65 + np.floor((a - 30) * 0.3),
+                75 + np.floor((a - 60) * 0.225),
+            ],
+            default=np.minimum(85 + np.floor((a - 100) * 0.1), 95),
+        )
+        return probability.astype(int)
+
+    @staticmethod
+    def sideways_probabilities(total: np.ndarray) -> np.ndarray:
+        """Вероятность боковика 51-62 (_calculate_probability_for_sideways)."""
+        a = np.abs(total)
+        return np.select([a < 2, a < 4, a < 6, a < 8], [62, 58, 55, 53], default=51).astype(int)
+
+    def realistic_probabilities(self, total: np.ndarray, factors_count: np.ndarray, max_factors: int = 30) -> np.ndarray:
+        """Консервативная вероятность 50-MAX_PROBABILITY (calculate_realistic_probability)."""
+        max_probability = self.params.MAX_PROBABILITY
+        a = np.abs(total)
+        completeness = np.clip(factors_count / max_factors, 0.5, 1.0)
+        base = np.select(
+            [a < 20, a < 40, a < 60, a < 80, a < 100],
+            [
+                50 + a * 0.25,
+                55 + (a - 20) * 0.3,
+                61 + (a - 40) * 0.25,
+                66 + (a - 60) * 0.2,
+                70 + (a - 80) * 0.15,
+            ],
+            default=np.minimum(73 + (a - 100) * 0.05, max_probability),
+        )
+        adjusted = 50 + (base - 50) * completeness
+        return np.trunc(np.clip(adjusted, 50, max_probability)).astype(int)
+
+    def real_probabilities(
+        self,
+        total: np.ndarray,
+        direction_codes: np.ndarray,
+        bullish: np.ndarray,
+        bearish: np.ndarray,
+        neutral: np.ndarray,
+    ) -> np.ndarray:
+        """Вероятность с учётом консенсуса факторов (_calculate_real_probability)."""
+        max_probability = self.params.MAX_PROBABILITY
+        prob = self.realistic_probabilities(
+            total, bullish + bearish + neutral, self.params.TOTAL_FACTORS
+        ).astype(float)
+
+        is_long, is_short, is_sideways = direction_codes == 1, direction_codes == -1, direction_codes == 0
+        bonus = np.select(
+            [
+                is_long & (bullish > bearish),
+                is_short & (bearish > bullish),
+                is_sideways & (neutral > bullish + bearish),
+            ],
+            [np.minimum(3, bullish - bearish), np.minimum(3, bearish - bullish), 2],
+            default=0,
+        )
+        prob = np.where(bonus > 0, np.minimum(max_probability, prob + bonus), prob)
+
+        contradicted = (is_long & (bearish > bullish)) | (is_short & (bullish > bearish))
+        prob = np.where(contradicted, np.maximum(50, prob - 3), prob)
+        return np.trunc(np.clip(prob, 50, max_probability)).astype(int)
+
+    def clamp_block_scores(
+        self, scores: np.ndarray, factors: np.ndarray, multiplier: Optional[float] = None
+    ) -> np.ndarray:
+        """Нормализация блочных скоров в [-10, +10] (_clamp_block_score)."""
+        if multiplier is None:
+            multiplier = self.params.BLOCK_SCORE_MULTIPLIER
+        factors = np.asarray(factors, dtype=float)
+        normalized = np.divide(scores * multiplier, factors, out=np.zeros_like(scores, dtype=float), where=factors != 0)
+        return np.clip(normalized, -10, 10)
+
+    # ------------------------------------------------------------------
+    # Полный расчёт
+    # ------------------------------------------------------------------
+
+    def score(self, rows: Sequence[Dict], previous: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Рассчитать факторы и итоговый сигнал для всех строк.
+
+        Args:
+            rows: Список словарей с аргументами calculate_signal
+            previous: Предыдущие score строк для сглаживания (NaN - нет)
+
+        Returns:
+            Dict с массивами: factor_scores, total_score, direction,
+            strength, probability, bullish_count, bearish_count, neutral_count
+        """
+        if not rows:
+            return {}
+        cols = self.build_inputs(rows)
+        scores = self.factor_scores(cols)
+        total = self.total_scores(scores, previous)
+        codes = self.direction_codes(total)
+        bullish, bearish, neutral = self.consensus(scores)
+        return {
+            "factor_scores": scores,
+            "total_score": total,
+            "direction": DIRECTION_NAMES[codes + 1],
+            "strength": self.strengths(total),
+            "probability": self.real_probabilities(total, codes, bullish, bearish, neutral),
+            "bullish_count": bullish,
+            "bearish_count": bearish,
+            "neutral_count": neutral,
+        }
+
+    def as_dicts(self, scores: np.ndarray) -> List[Dict[str, float]]:
+        """Строки матрицы скоров в виде словарей {имя фактора: score}."""
+        return [dict(zip(FACTOR_NAMES, row.tolist())) for row in scores]
@@ -0,0 +1,217 @@
+"""
+Fetch Plan - декларативный граф загрузки данных для AI сигналов.
+
+Каждый источник данных объявляет свои входы (зависимости от других источников).
+Планировщик запускает все независимые источники одновременно, а зависимые
+вычисления стартуют сразу, как только готовы их входы. Итоговая задержка
+определяется самой длинной цепочкой зависимостей, а не суммой стадий.
+"""
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from signals.latency import LatencyTracker, latency_tracker
+
+logger = logging.getLogger(__name__)
+
+
+class FetchPlan:
+    """
+    План загрузки данных в виде графа зависимостей.
+
+    Пример:
+        plan = FetchPlan("BTC")
+        plan.add("ohlcv", lambda: fetch_ohlcv("BTC"))
+        plan.add("technical", lambda ohlcv: calc_indicators(ohlcv), depends=["ohlcv"])
+        results = await plan.run()
+
+    Функция источника получает значения зависимостей позиционно, в порядке
+    объявления в depends. Она может вернуть как awaitable, так и готовое значение.
+    Ошибка источника логируется и заменяется значением default, зависимые
+    источники при этом продолжают работу.
+
+    Задержка каждого источника записывается в трекер как этап "fetch.<имя>".
+
+    Бюджет задержки: весь план должен уложиться в budget секунд от старта,
+    а каждый источник - в свой дедлайн (deadlines) и в остаток бюджета.
+    Источник, не уложившийся в срок, отменяется и получает default
+    (помечается как timeout и попадает в dropped).
+    """
+
+    def __init__(
+        self,
+        name: str = "fetch_plan",
+        tracker: Optional[LatencyTracker] = None,
+        budget: Optional[float] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            name: Имя плана для логов (обычно символ монеты)
+            tracker: Трекер задержек (по умолчанию общий трекер процесса)
+            budget: Общий бюджет задержки плана в секундах (None - без ограничения)
+            deadlines: Дедлайны отдельных источников в секундах от их старта
+        """
+        self.name = name
+        self.tracker = tracker or latency_tracker
+        self.budget = budget
+        self.deadlines = dict(deadlines or {})
+        self.dropped: List[str] = []
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._started: Optional[float] = None
+
+    def add(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        depends: Sequence[str] = (),
+        default: Any = None,
+        required: bool = False,
+    ) -> "FetchPlan":
+        """
+        Добавить источник данных в план.
+
+        Args:
+            name: Уникальное имя источника
+            func: Функция, принимающая значения зависимостей
+            depends: Имена источников, от которых зависит этот
+            default: Значение при ошибке источника
+            required: Если источник вернул None, план прерывается
+                      (оставшиеся задачи отменяются)
+
+        Returns:
+            self для цепочки вызовов
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate fetch plan node: {name}")
+        self._nodes[name] = {
+            "func": func,
+            "depends": tuple(depends),
+            "default": default,
+            "required": required,
+        }
+        return self
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _validate(self):
+        """Проверить, что все зависимости объявлены и граф не содержит циклов."""
+        for name, node in self._nodes.items():
+            for dep in node["depends"]:
+                if dep not in self._nodes:
+                    raise ValueError(f"Fetch plan node '{name}' depends on unknown node '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Fetch plan has a dependency cycle at '{name}'")
+            visiting.add(name)
+            for dep in self._nodes[name]["depends"]:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._nodes:
+            visit(name)
+
+    def _time_left(self, name: str) -> Optional[float]:
+        """Сколько секунд осталось у источника (None - без ограничения)."""
+        limits = []
+        if name in self.deadlines:
+            limits.append(self.deadlines[name])
+        if self.budget is not None:
+            elapsed = asyncio.get_running_loop().time() - self._started
+            limits.append(self.budget - elapsed)
+        return min(limits) if limits else None
+
+    async def _run_node(self, name: str, tasks: Dict[str, asyncio.Task]) -> Any:
+        node = self._nodes[name]
+        args = [await tasks[dep] for dep in node["depends"]]
+        with self.tracker.span(f"fetch.{name}") as span:
+            time_left = self._time_left(name)
+            if time_left is not None and time_left <= 0:
+                span.outcome = "timeout"
+                self.dropped.append(name)
+                return node["default"]
+            try:
+                result = node["func"](*args)
+                if inspect.isawaitable(result):
+                    if time_left is None:
+                        result = await result
+                    else:
+                        result = await asyncio.wait_for(result, time_left)
+                if result is None:
+                    span.outcome = "empty"
+                return result
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                logger.warning(f"[{self.name}] {name} timed out, dropped")
+                span.outcome = "timeout"
+                self.dropped.append(name)
+                return node["default"]
+            except Exception as e:
+                logger.error(f"[{self.name}] Error fetching {name}: {e}")
+                span.outcome = "error"
+                return node["default"]
+
+    async def run(self, on_result: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+        """
+        Выполнить план.
+
+        Args:
+            on_result: Вызывается on_result(имя, результат) сразу после готовности
+                       каждого источника (для показа промежуточных результатов).
+                       Ошибка в обработчике логируется и не прерывает план.
+
+        Returns:
+            Dict {имя источника: результат}. Если required-источник вернул None,
+            результаты отменённых источников отсутствуют в словаре.
+        """
+        self._validate()
+        self._started = asyncio.get_running_loop().time()
+        self.dropped = []
+
+        tasks: Dict[str, asyncio.Task] = {}
+        for name in self._nodes:
+            tasks[name] = asyncio.ensure_future(self._run_node(name, tasks))
+
+        results: Dict[str, Any] = {}
+        aborted: Optional[str] = None
+        try:
+            for future in asyncio.as_completed(list(tasks.values())):
+                await future
+                for name, task in tasks.items():
+                    if name in results or not task.done() or task.cancelled():
+                        continue
+                    results[name] = task.result()
+                    if on_result is not None:
+                        try:
+                            on_result(name, results[name])
+                        except Exception as e:
+                            logger.error(f"[{self.name}] on_result handler failed for {name}: {e}")
+                    if self._nodes[name]["required"] and results[name] is None:
+                        aborted = name
+                        break
+                if aborted:
+                    break
+        finally:
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if aborted:
+            logger.warning(f"[{self.name}] Required source '{aborted}' unavailable, fetch plan aborted")
+
+        return results
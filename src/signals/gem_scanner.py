@@ -7,6 +7,8 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import logging
 
+from http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,12 +46,12 @@ class GemScanner:
     async def _ensure_session(self):
         """Создаёт сессию если её нет."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client.get_session()
 
     async def close(self):
-        """Закрывает сессию."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Освобождает общую сессию."""
+        # Сессия общая (http_client) - закрывается в on_shutdown
+        self.session = None
 
     async def scan(self, network: str, limit: int = 10) -> List[Dict]:
         """
@@ -0,0 +1,139 @@
+"""
+Indicator Cache - мемоизация индикаторов по свечам.
+
+Ключ: (символ, интервал, время последней свечи, индикатор, параметры).
+Повторный запрос того же индикатора по тем же свечам (live-сигнал,
+сканер, MTF-анализ) стоит одного поиска в словаре. Закрытие последней
+свечи тоже входит в ключ: пока бар формируется, его close меняется,
+а время открытия - нет.
+
+Без символа, интервала или времени свечи значение считается без кэша.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ключи времени свечи у разных бирж/источников
+TIMESTAMP_KEYS = ("timestamp", "time", "open_time")
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+def candle_timestamp(candle: Dict) -> Optional[Any]:
+    """Время свечи (первый найденный ключ из TIMESTAMP_KEYS) или None."""
+    for key in TIMESTAMP_KEYS:
+        value = candle.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+class IndicatorCache:
+    """
+    LRU-кэш значений индикаторов.
+
+    Args:
+        max_entries: Максимум записей (старые вытесняются первыми)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "uncached": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        name: str,
+        candles: List[Dict],
+        symbol: Optional[str],
+        interval: Optional[str],
+        params: Dict[str, Any],
+    ) -> Optional[Tuple]:
+        """Ключ кэша или None, если свечи нельзя однозначно идентифицировать."""
+        if not symbol or not interval or not candles:
+            return None
+        last = candles[-1]
+        timestamp = candle_timestamp(last)
+        if timestamp is None:
+            return None
+        return (
+            symbol,
+            interval,
+            timestamp,
+            last.get("close"),
+            len(candles),
+            name,
+            tuple(sorted(params.items())),
+        )
+
+    def get_or_compute(
+        self,
+        name: str,
+        candles: List[Dict],
+        compute: Callable[[], Any],
+        symbol: Optional[str] = None,
+        interval: Optional[str] = None,
+        **params: Any,
+    ) -> Any:
+        """
+        Значение индикатора из кэша или compute() с сохранением.
+
+        Args:
+            name: Имя индикатора ("rsi", "timeframe_indicators", ...)
+            candles: Свечи, по которым считается индикатор
+            compute: Функция расчёта без аргументов
+            symbol: Символ
+            interval: Таймфрейм свечей
+            **params: Параметры индикатора (входят в ключ)
+
+        Returns:
+            Результат compute() (общий для всех вызывающих - не изменяйте его)
+        """
+        key = self.make_key(name, candles, symbol, interval, params)
+        found, value = self.lookup(key)
+        if found:
+            return value
+
+        value = compute()
+        self.store(key, value)
+        return value
+
+    def lookup(self, key: Optional[Tuple]) -> Tuple[bool, Any]:
+        """
+        Поиск по ключу make_key (для асинхронных расчётов).
+
+        Returns:
+            (найдено, значение)
+        """
+        if key is None:
+            self.stats["uncached"] += 1
+            return False, None
+        if key in self._entries:
+            self.stats["hits"] += 1
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+        self.stats["misses"] += 1
+        return False, None
+
+    def store(self, key: Optional[Tuple], value: Any) -> None:
+        """Сохранить значение (ключ None - не кэшируется)."""
+        if key is None:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Очистить кэш."""
+        self._entries.clear()
+
+
+# Общий кэш процесса
+indicator_cache = IndicatorCache()
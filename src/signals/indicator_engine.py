@@ -0,0 +1,341 @@
+"""
+Indicator Engine - пакетный расчёт индикаторов сканеров по матрице символы x бары.
+
+Сканеры (SuperSignals, SmartSignals, RocketHunter) считают индикаторы
+по одной монете за раз из List[Dict] свечей. Движок принимает выровненные
+OHLCV-матрицы сразу для N символов и считает весь набор индикаторов
+несколькими векторизованными проходами:
+
+    ohlcv = OHLCVMatrix.from_candles(symbols, candle_lists)
+    table = compute_indicator_table(ohlcv)
+    table["rsi"]          # np.ndarray (N,)
+    table.row(0)          # {"symbol": ..., "rsi": ..., "macd": ...}
+
+История короче матрицы выравнивается по правому краю (последний бар -
+последний столбец), слева - NaN. Индикатор строки, для которого не хватает
+баров, равен NaN; значения по умолчанию подставляют вызывающие сканеры.
+
+Формулы совпадают со сканерами: RSI - простое среднее роста/падения,
+полосы Боллинджера - стандартное отклонение генеральной совокупности,
+ATR - среднее True Range, ADX - по Уайлдеру, EMA - общее ядро signals.kernels.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from signals.candles import candle_column
+from signals.indicators import calculate_adx_series
+from signals.kernels import ema
+
+logger = logging.getLogger(__name__)
+
+# EMA, которые считаются для всех строк (EMA stack)
+EMA_PERIODS: Tuple[int, ...] = (9, 20, 21, 50)
+
+
+@dataclass
+class OHLCVMatrix:
+    """
+    Выровненные OHLCV-матрицы для N символов.
+
+    Attributes:
+        symbols: Символы строк
+        high, low, close, volume: Матрицы (N, T), слева дополнены NaN
+        bars: Количество реальных баров в каждой строке
+    """
+    symbols: List[str]
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    bars: np.ndarray = field(default=None)
+
+    def __post_init__(self):
+        if self.bars is None:
+            self.bars = (~np.isnan(self.close)).sum(axis=1)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @classmethod
+    def from_candles(
+        cls,
+        symbols: Sequence[str],
+        candle_lists: Sequence[Optional[List[Dict]]],
+        max_bars: Optional[int] = None,
+    ) -> "OHLCVMatrix":
+        """
+        Собрать матрицы из списков свечей (от старых к новым).
+
+        Args:
+            symbols: Символы строк
+            candle_lists: Свечи каждого символа (dict с high/low/close/volume)
+            max_bars: Ограничение длины (берутся последние бары)
+        """
+        lists = [candles if candles is not None else [] for candles in candle_lists]
+        if max_bars is not None:
+            lists = [candles[-max_bars:] if max_bars > 0 else [] for candles in lists]
+        width = max((len(candles) for candles in lists), default=0)
+
+        shape = (len(lists), width)
+        columns = {key: np.full(shape, np.nan) for key in ("high", "low", "close", "volume")}
+        bars = np.zeros(len(lists), dtype=int)
+
+        for row, candles in enumerate(lists):
+            if not candles:
+                continue
+            bars[row] = len(candles)
+            for key, matrix in columns.items():
+                matrix[row, width - len(candles):] = candle_column(candles, key)
+
+        return cls(symbols=list(symbols), bars=bars, **columns)
+
+
+def _last_window(matrix: np.ndarray, period: int) -> np.ndarray:
+    """Последние period столбцов (с NaN-дополнением слева, если столбцов меньше)."""
+    if matrix.shape[1] >= period:
+        return matrix[:, matrix.shape[1] - period:]
+    pad = np.full((matrix.shape[0], period - matrix.shape[1]), np.nan)
+    return np.hstack([pad, matrix])
+
+
+def _mask(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    return np.where(valid, values, np.nan)
+
+
+def rsi_last(close: np.ndarray, bars: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI последнего бара: простое среднее роста/падения за period изменений."""
+    deltas = _last_window(np.diff(close, axis=1), period)
+    window = np.nan_to_num(deltas)
+    avg_gain = np.where(window > 0, window, 0.0).mean(axis=1)
+    avg_loss = np.where(window < 0, -window, 0.0).mean(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+    return _mask(rsi, bars >= period + 1)
+
+
+def bollinger_last(
+    close: np.ndarray, bars: np.ndarray, period: int = 20, num_std: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Полосы Боллинджера последнего бара.
+
+    Returns:
+        (upper, middle, lower, std), std - генеральной совокупности
+    """
+    window = _last_window(close, period)
+    valid = bars >= period
+    middle = _mask(np.nan_to_num(window).mean(axis=1), valid)
+    std = _mask(np.sqrt(((np.nan_to_num(window) - middle[:, np.newaxis]) ** 2).mean(axis=1)), valid)
+    return middle + num_std * std, middle, middle - num_std * std, std
+
+
+def band_position(price: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """Позиция цены внутри полос (0 - нижняя, 1 - верхняя), 0.5 при нулевой ширине."""
+    width = upper - lower
+    with np.errstate(divide="ignore", invalid="ignore"):
+        position = np.clip((price - lower) / width, 0, 1)
+    return np.where(width == 0, 0.5, position)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True Range для баров 1..T-1 (матрица (N, T-1))."""
+    prev_close = close[:, :-1]
+    return np.maximum.reduce([
+        high[:, 1:] - low[:, 1:],
+        np.abs(high[:, 1:] - prev_close),
+        np.abs(low[:, 1:] - prev_close),
+    ])
+
+
+def atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, bars: np.ndarray, period: int = 14) -> np.ndarray:
+    """ATR последнего бара: среднее True Range за period."""
+    window = _last_window(true_range(high, low, close), period)
+    return _mask(np.nan_to_num(window).mean(axis=1), bars >= period + 1)
+
+
+def adx_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, bars: np.ndarray, period: int = 14) -> np.ndarray:
+    """ADX последнего бара по Уайлдеру (до прогрева - последний DX, как в indicators.calculate_adx)."""
+    if close.shape[1] < 2:
+        return np.full(len(bars), np.nan)
+    series = calculate_adx_series(high, low, close, period)
+    adx = np.where(np.isnan(series.adx[:, -1]), series.dx[:, -1], series.adx[:, -1])
+    return _mask(adx, bars >= period + 1)
+
+
+def range_pct_last(high: np.ndarray, low: np.ndarray, period: int = 14) -> np.ndarray:
+    """Средний размах свечи (high - low) / low в % за period баров (бары с low <= 0 пропускаются)."""
+    high_w, low_w = _last_window(high, period), _last_window(low, period)
+    valid = low_w > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranges = np.where(valid, (high_w - low_w) / low_w * 100, 0.0)
+        return np.where(valid.any(axis=1), ranges.sum(axis=1) / valid.sum(axis=1), np.nan)
+
+
+def volume_average_previous(volume: np.ndarray, bars: np.ndarray) -> np.ndarray:
+    """Средний объём баров перед последним (NaN без истории)."""
+    previous = np.nan_to_num(volume[:, :-1])
+    return _mask(previous.sum(axis=1) / np.maximum(bars - 1, 1), bars >= 2)
+
+
+def volume_ratio_last(volume: np.ndarray, bars: np.ndarray) -> np.ndarray:
+    """Объём последнего бара к среднему объёму предыдущих баров (1.0 без истории или при нулевом среднем)."""
+    if volume.shape[1] == 0:
+        return np.ones(len(bars))
+    avg_volume = volume_average_previous(volume, bars)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = volume[:, -1] / avg_volume
+    return np.where((bars >= 2) & (avg_volume != 0), ratio, 1.0)
+
+
+def ema_last_columns(close: np.ndarray, bars: np.ndarray, periods: Sequence[int] = EMA_PERIODS) -> Dict[int, np.ndarray]:
+    """Последние значения EMA для каждого периода (NaN, если баров меньше периода)."""
+    if close.shape[1] == 0:
+        return {period: np.full(len(bars), np.nan) for period in periods}
+    return {period: _mask(ema(close, period)[:, -1], bars >= period) for period in periods}
+
+
+def macd_last(
+    close: np.ndarray, bars: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD последнего бара как в indicators.calculate_macd.
+
+    Returns:
+        (macd_line, signal_line, histogram); NaN, если баров меньше slow
+    """
+    if close.shape[1] == 0:
+        empty = np.full(len(bars), np.nan)
+        return empty, empty, empty
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    valid = bars >= slow
+    return (
+        _mask(macd_line[:, -1], valid),
+        _mask(signal_line[:, -1], valid),
+        _mask(macd_line[:, -1] - signal_line[:, -1], valid),
+    )
+
+
+def stoch_rsi_last(close: np.ndarray, bars: np.ndarray, period: int = 14, smooth: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stochastic RSI последнего бара по формуле сканеров (SuperSignals).
+
+    RSI бара i считается по ценам closes[i - period:i] (period - 1 изменений,
+    делитель period); стохастик берётся по последним period значениям RSI,
+    %D - среднее трёх последних %K с тем же диапазоном.
+
+    Returns:
+        (k, d); NaN, если баров меньше 2 * period
+    """
+    rows, width = close.shape
+    if width < 2 * period:
+        empty = np.full(rows, np.nan)
+        return empty, empty
+
+    deltas = np.nan_to_num(np.diff(close, axis=1))
+    windows = np.lib.stride_tricks.sliding_window_view(deltas, period - 1, axis=1)[:, :width - period]
+    avg_gain = np.where(windows > 0, windows, 0.0).sum(axis=2) / period
+    avg_loss = np.where(windows < 0, -windows, 0.0).sum(axis=2) / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+
+    recent = rsi[:, -period:]
+    rsi_min, rsi_max = recent.min(axis=1), recent.max(axis=1)
+    span = rsi_max - rsi_min
+    flat = span == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normalized = np.where(flat[:, np.newaxis], 0.5, (rsi[:, -smooth:] - rsi_min[:, np.newaxis]) / span[:, np.newaxis]) * 100
+
+    valid = bars >= 2 * period
+    k = np.where(flat, 50.0, normalized[:, -1])
+    d = normalized.mean(axis=1)
+    return _mask(k, valid), _mask(d, valid)
+
+
+class IndicatorTable:
+    """
+    Таблица индикаторов: столбцы - массивы длины N (по строке на символ).
+
+    Args:
+        symbols: Символы строк
+        columns: {имя столбца: np.ndarray (N,)}
+    """
+
+    def __init__(self, symbols: List[str], columns: Dict[str, np.ndarray]):
+        self.symbols = symbols
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def row(self, index: int) -> Dict[str, float]:
+        """Строка таблицы как dict (NaN сохраняются)."""
+        row = {"symbol": self.symbols[index]}
+        row.update({name: float(values[index]) for name, values in self.columns.items()})
+        return row
+
+    def rows(self) -> Iterator[Dict[str, float]]:
+        for index in range(len(self.symbols)):
+            yield self.row(index)
+
+
+def compute_indicator_table(
+    ohlcv: OHLCVMatrix,
+    rsi_period: int = 14,
+    bb_period: int = 20,
+    atr_period: int = 14,
+    ema_periods: Sequence[int] = EMA_PERIODS,
+) -> IndicatorTable:
+    """
+    Рассчитать набор индикаторов сканеров для всех символов матрицы.
+
+    Столбцы: bars, close, rsi, macd, macd_signal, macd_histogram,
+    bb_upper, bb_middle, bb_lower, bb_std, bb_position, atr, adx, range_pct,
+    volume, volume_avg, volume_ratio, stoch_rsi_k, stoch_rsi_d,
+    ema_<period> для ema_periods.
+    """
+    bars = ohlcv.bars
+    close, high, low, volume = ohlcv.close, ohlcv.high, ohlcv.low, ohlcv.volume
+    last_close = close[:, -1] if close.shape[1] else np.full(len(bars), np.nan)
+    last_volume = volume[:, -1] if volume.shape[1] else np.full(len(bars), np.nan)
+
+    upper, middle, lower, std = bollinger_last(close, bars, bb_period)
+    macd_line, signal_line, histogram = macd_last(close, bars)
+    stoch_k, stoch_d = stoch_rsi_last(close, bars, rsi_period)
+
+    columns = {
+        "bars": bars.astype(float),
+        "close": last_close,
+        "rsi": rsi_last(close, bars, rsi_period),
+        "macd": macd_line,
+        "macd_signal": signal_line,
+        "macd_histogram": histogram,
+        "bb_upper": upper,
+        "bb_middle": middle,
+        "bb_lower": lower,
+        "bb_std": std,
+        "bb_position": band_position(last_close, upper, lower),
+        "atr": atr_last(high, low, close, bars, atr_period),
+        "adx": adx_last(high, low, close, bars, atr_period),
+        "range_pct": range_pct_last(high, low, atr_period),
+        "volume": last_volume,
+        "volume_avg": volume_average_previous(volume, bars),
+        "volume_ratio": volume_ratio_last(volume, bars),
+        "stoch_rsi_k": stoch_k,
+        "stoch_rsi_d": stoch_d,
+    }
+    for period, values in ema_last_columns(close, bars, ema_periods).items():
+        columns[f"ema_{period}"] = values
+
+    return IndicatorTable(ohlcv.symbols, columns)
@@ -9,6 +9,9 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
+from signals.candles import candle_column
+from signals.kernels import ema, wilder
+
 
 # Constants for indicator calculations
 RSI_MAX_VALUE = 100.0
@@ -27,12 +30,7 @@ def _calculate_ema(data: np.ndarray, period: int) -> np.ndarray:
     Returns:
         EMA values as numpy array
     """
-    alpha = 2 / (period + 1)
-    result = np.zeros_like(data)
-    result[0] = data[0]
-    for i in range(1, len(data)):
-        result[i] = alpha * data[i] + (1 - alpha) * result[i - 1]
-    return result
+    return ema(data, period)
 
 
 @dataclass
@@ -253,13 +251,43 @@ def calculate_rsi(
     avg_gain = np.mean(gains[-period:])
     avg_loss = np.mean(losses[-period:])
 
+    return RSI(value=float(_rsi_from_averages(avg_gain, avg_loss)), period=period)
+
+
+def _rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """RSI по средним росту и падению."""
     if avg_loss == 0:
-        rsi_value = RSI_MAX_VALUE
-    else:
-        rs = avg_gain / avg_loss
-        rsi_value = RSI_MAX_VALUE - (RSI_MAX_VALUE / (1 + rs))
+        return RSI_MAX_VALUE
+    rs = avg_gain / avg_loss
+    return RSI_MAX_VALUE - (RSI_MAX_VALUE / (1 + rs))
+
+
+def rsi_series(prices, period: int = 14) -> np.ndarray:
+    """
+    RSI на каждом баре: значение i совпадает с calculate_rsi(prices[:i + 1]).
 
-    return RSI(value=float(rsi_value), period=period)
+    Args:
+        prices: Цены закрытия
+        period: Период расчёта
+
+    Returns:
+        Массив той же длины, NaN для первых period баров
+    """
+    prices_array = np.asarray(prices, dtype=float)
+    result = np.full(len(prices_array), np.nan)
+    if len(prices_array) < period + 1:
+        return result
+
+    deltas = np.diff(prices_array)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    avg_gain = np.lib.stride_tricks.sliding_window_view(gains, period).mean(axis=-1)
+    avg_loss = np.lib.stride_tricks.sliding_window_view(losses, period).mean(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = RSI_MAX_VALUE - (RSI_MAX_VALUE / (1 + avg_gain / avg_loss))
+    result[period:] = np.where(avg_loss == 0, RSI_MAX_VALUE, rsi)
+    return result
 
 
 def calculate_macd(
@@ -298,6 +326,46 @@ def calculate_macd(
     )
 
 
+def macd_series(
+    prices,
+    fast_period: int = 12,
+    slow_period: int = 26,
+    signal_period: int = 9,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD на каждом баре (последние значения совпадают с calculate_macd).
+
+    Returns:
+        (macd_line, signal_line, histogram)
+    """
+    prices_array = np.asarray(prices, dtype=float)
+    macd_line = _calculate_ema(prices_array, fast_period) - _calculate_ema(prices_array, slow_period)
+    signal_line = _calculate_ema(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_series(
+    prices,
+    period: int = 20,
+    num_std: float = 2.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Полосы Боллинджера на каждом баре: значение i совпадает с
+    calculate_bollinger_bands(prices[:i + 1]) (стандартное отклонение генеральной совокупности).
+
+    Returns:
+        (upper, middle, lower), NaN для первых period - 1 баров
+    """
+    prices_array = np.asarray(prices, dtype=float)
+    middle = np.full(len(prices_array), np.nan)
+    std = np.full(len(prices_array), np.nan)
+    if len(prices_array) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(prices_array, period)
+        middle[period - 1:] = windows.mean(axis=-1)
+        std[period - 1:] = windows.std(axis=-1)
+    return middle + num_std * std, middle, middle - num_std * std
+
+
 def calculate_bollinger_bands(
     prices: List[float],
     period: int = 20,
@@ -516,11 +584,7 @@ def calculate_stochastic_rsi(prices: List[float], period: int = 14, smooth_k: in
     for i in range(period, len(gains)):
         avg_gain = np.mean(gains[i-period:i])
         avg_loss = np.mean(losses[i-period:i])
-        if avg_loss == 0:
-            rsi_values.append(RSI_MAX_VALUE)
-        else:
-            rs = avg_gain / avg_loss
-            rsi_values.append(RSI_MAX_VALUE - (RSI_MAX_VALUE / (1 + rs)))
+        rsi_values.append(_rsi_from_averages(avg_gain, avg_loss))
     
     if len(rsi_values) < smooth_k:
         return None
@@ -545,7 +609,11 @@ def calculate_stochastic_rsi(prices: List[float], period: int = 14, smooth_k: in
     k = float(stoch_array[-1])
     d = float(np.mean(stoch_array[-smooth_d:]))
     
-    # Determine signal
+    return _stochastic_rsi_result(k, d)
+
+
+def _stochastic_rsi_result(k: float, d: float) -> StochasticRSI:
+    """StochasticRSI с сигналом по значениям %K и %D."""
     if k < 20 and d < 20:
         signal = "oversold"
     elif k > 80 and d > 80:
@@ -734,8 +802,36 @@ def calculate_atr(high: List[float], low: List[float], close: List[float], perio
     if len(tr) < period:
         return None
     
-    atr_value = float(np.mean(tr[-period:]))
-    current_price = close[-1]
+    return _atr_result(float(np.mean(tr[-period:])), close[-1])
+
+
+def atr_series(high, low, close, period: int = 14) -> np.ndarray:
+    """
+    ATR на каждом баре: значение i совпадает с calculate_atr(...[:i + 1]).value
+    (простое среднее True Range за period баров).
+
+    Returns:
+        Массив длины len(close), NaN для первых period баров
+    """
+    high_array = np.asarray(high, dtype=float)
+    low_array = np.asarray(low, dtype=float)
+    close_array = np.asarray(close, dtype=float)
+    result = np.full(len(close_array), np.nan)
+    if len(close_array) < period + 1:
+        return result
+
+    prev_close = close_array[:-1]
+    tr = np.maximum.reduce([
+        high_array[1:] - low_array[1:],
+        np.abs(high_array[1:] - prev_close),
+        np.abs(low_array[1:] - prev_close),
+    ])
+    result[period:] = np.lib.stride_tricks.sliding_window_view(tr, period).mean(axis=-1)
+    return result
+
+
+def _atr_result(atr_value: float, current_price: float) -> ATR:
+    """ATR с уровнем волатильности относительно текущей цены."""
     atr_percent = (atr_value / current_price) * 100
     
     # Determine volatility
@@ -769,12 +865,7 @@ def calculate_keltner_channels(high: List[float], low: List[float], close: List[
         return None
     
     # Calculate EMA
-    close_array = np.array(close)
-    alpha = 2 / (period + 1)
-    ema_values = np.zeros_like(close_array)
-    ema_values[0] = close_array[0]
-    for i in range(1, len(close_array)):
-        ema_values[i] = alpha * close_array[i] + (1 - alpha) * ema_values[i - 1]
+    ema_values = ema(close, period)
     
     middle = float(ema_values[-1])
     
@@ -829,19 +920,16 @@ def calculate_obv(close: List[float], volume: List[float]) -> Optional[OBV]:
     obv_value = float(obv_values[-1])
     obv_sma = float(np.mean(obv_values[-20:]))
     
-    # Determine trend
-    if len(obv_values) >= 10:
-        recent_obv = obv_values[-10:]
-        if recent_obv[-1] > recent_obv[0] * 1.05:
-            trend = "rising"
-        elif recent_obv[-1] < recent_obv[0] * 0.95:
-            trend = "falling"
-        else:
-            trend = "flat"
-    else:
-        trend = "flat"
-    
-    return OBV(value=obv_value, trend=trend, sma=obv_sma)
+    return OBV(value=obv_value, trend=_obv_trend(obv_values[-10], obv_value), sma=obv_sma)
+
+
+def _obv_trend(obv_10_bars_ago: float, obv_value: float) -> str:
+    """Тренд OBV: изменение больше 5% за последние 10 значений."""
+    if obv_value > obv_10_bars_ago * 1.05:
+        return "rising"
+    elif obv_value < obv_10_bars_ago * 0.95:
+        return "falling"
+    return "flat"
 
 
 def calculate_vwap(high: List[float], low: List[float], close: List[float], volume: List[float]) -> Optional[VWAP]:
@@ -870,8 +958,12 @@ def calculate_vwap(high: List[float], low: List[float], close: List[float], volu
     
     # Calculate VWAP
     vwap_value = float(np.sum(typical_price * volume_array) / np.sum(volume_array))
-    current_price = close[-1]
     
+    return _vwap_result(vwap_value, close[-1])
+
+
+def _vwap_result(vwap_value: float, current_price: float) -> VWAP:
+    """VWAP с положением текущей цены."""
     position = "above" if current_price > vwap_value else "below"
     deviation_percent = ((current_price - vwap_value) / vwap_value) * 100
     
@@ -1064,6 +1156,22 @@ class RSIDivergence:
     explanation: str
 
 
+@dataclass
+class DivergenceSeries:
+    """
+    Divergence events for every bar of a history.
+
+    Bar i holds the divergence that calculate_rsi_divergence /
+    calculate_macd_divergence would report for the history up to bar i.
+
+    Attributes:
+        signal: 1 - bullish, -1 - bearish, 0 - none
+        magnitude: |oscillator difference| between the two pivots (0 if none)
+    """
+    signal: np.ndarray
+    magnitude: np.ndarray
+
+
 @dataclass
 class ADX:
     """
@@ -1083,6 +1191,27 @@ class ADX:
     direction: str
 
 
+@dataclass
+class ADXSeries:
+    """
+    Full ADX/DMI history with Wilder smoothing.
+
+    All arrays are aligned with the input bars (last axis); values are NaN
+    until the indicator has warmed up: +DI/-DI/DX from bar `period`,
+    ADX from bar `2 * period - 1`.
+
+    Attributes:
+        adx: ADX series
+        plus_di: +DI series
+        minus_di: -DI series
+        dx: DX series (unsmoothed)
+    """
+    adx: np.ndarray
+    plus_di: np.ndarray
+    minus_di: np.ndarray
+    dx: np.ndarray
+
+
 @dataclass
 class SqueezeMomentum:
     """
@@ -1113,6 +1242,88 @@ class Supertrend:
     is_reversal: bool
 
 
+def _last_two_swings(swings: np.ndarray, n: int, lookback: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Два последних свинга в окне из lookback баров, заканчивающемся на каждом баре.
+
+    Свинг требует 2 бара с каждой стороны внутри окна, поэтому для бара t
+    подходят индексы [t - lookback + 3, t - 2].
+
+    Returns:
+        (has_two, last, prev) - маска и индексы свингов для каждого бара
+    """
+    bars = np.arange(n)
+    if len(swings) < 2:
+        empty = np.zeros(n, dtype=int)
+        return np.zeros(n, dtype=bool), empty, empty
+    count = np.searchsorted(swings, bars - 2, side='right')
+    last = swings[np.maximum(count - 1, 0)]
+    prev = swings[np.maximum(count - 2, 0)]
+    has_two = (count >= 2) & (prev >= bars - lookback + 3)
+    return has_two, last, prev
+
+
+def divergence_series(
+    prices,
+    oscillator,
+    lookback: int = 14,
+    swing_highs: Optional[np.ndarray] = None,
+    swing_lows: Optional[np.ndarray] = None,
+) -> DivergenceSeries:
+    """
+    Дивергенции цены и осциллятора (RSI, MACD histogram) по всей истории за один проход.
+
+    Bullish: цена делает Lower Low, осциллятор - Higher Low.
+    Bearish: цена делает Higher High, осциллятор - Lower High (приоритетнее bullish).
+
+    Args:
+        prices: Цены закрытия
+        oscillator: Ряд осциллятора той же длины
+        lookback: Окно поиска пиков/впадин
+        swing_highs: Индексы локальных максимумов цены (по умолчанию swing_point_mask)
+        swing_lows: Индексы локальных минимумов цены
+
+    Returns:
+        DivergenceSeries; бары с историей короче lookback + 5 - без дивергенции
+    """
+    prices = np.asarray(prices, dtype=float)
+    oscillator = np.asarray(oscillator, dtype=float)
+    n = len(prices)
+    if swing_highs is None:
+        swing_highs = np.flatnonzero(swing_point_mask(prices, 'high'))
+    if swing_lows is None:
+        swing_lows = np.flatnonzero(swing_point_mask(prices, 'low'))
+
+    ready = np.arange(n) >= lookback + 4
+    signal = np.zeros(n, dtype=np.int8)
+    magnitude = np.zeros(n)
+
+    for kind, swings in (('low', np.asarray(swing_lows, dtype=int)), ('high', np.asarray(swing_highs, dtype=int))):
+        has_two, last, prev = _last_two_swings(swings, n, lookback)
+        if kind == 'low':
+            event = has_two & (prices[last] < prices[prev]) & (oscillator[last] > oscillator[prev])
+        else:
+            event = has_two & (prices[last] > prices[prev]) & (oscillator[last] < oscillator[prev])
+        event &= ready
+        signal[event] = 1 if kind == 'low' else -1
+        magnitude[event] = np.abs(oscillator[last] - oscillator[prev])[event]
+
+    return DivergenceSeries(signal=signal, magnitude=magnitude)
+
+
+def _last_divergence(prices: List[float], oscillator: List[float], lookback: int) -> Optional[Tuple[int, float]]:
+    """Дивергенция на последнем баре: (signal, magnitude) или None если мало данных."""
+    # Minimum 5 extra periods needed for reliable peak/trough detection (2 on each side + 1 center)
+    MIN_EXTRA_PERIODS = 5
+    if len(prices) < lookback + MIN_EXTRA_PERIODS or len(prices) != len(oscillator):
+        return None
+
+    # Окно последних lookback баров целиком попадает в хвост длиной lookback + 5
+    tail = lookback + MIN_EXTRA_PERIODS
+    series = divergence_series(prices[-tail:], oscillator[-tail:], lookback)
+    return int(series.signal[-1]), series.magnitude[-1]
+
+
 def calculate_rsi_divergence(
     prices: List[float],
     rsi_values: List[float],
@@ -1129,65 +1340,100 @@ def calculate_rsi_divergence(
     Returns:
         RSIDivergence or None if insufficient data
     """
-    # Minimum 5 extra periods needed for reliable peak/trough detection (2 on each side + 1 center)
-    MIN_EXTRA_PERIODS = 5
-    if len(prices) < lookback + MIN_EXTRA_PERIODS or len(prices) != len(rsi_values):
+    last = _last_divergence(prices, rsi_values, lookback)
+    if last is None:
         return None
-    
-    prices_array = np.array(prices[-lookback:])
-    rsi_array = np.array(rsi_values[-lookback:])
+    signal, magnitude = last
     
     # Strength multiplier for divergence detection
     DIVERGENCE_STRENGTH_MULTIPLIER = 3
     
-    # Find local highs and lows
-    price_highs = []
-    price_lows = []
-    rsi_highs = []
-    rsi_lows = []
-    
-    for i in range(2, len(prices_array) - 2):
-        # Local high
-        if prices_array[i] > prices_array[i-1] and prices_array[i] > prices_array[i+1]:
-            if prices_array[i] > prices_array[i-2] and prices_array[i] > prices_array[i+2]:
-                price_highs.append((i, prices_array[i]))
-                rsi_highs.append((i, rsi_array[i]))
-        
-        # Local low
-        if prices_array[i] < prices_array[i-1] and prices_array[i] < prices_array[i+1]:
-            if prices_array[i] < prices_array[i-2] and prices_array[i] < prices_array[i+2]:
-                price_lows.append((i, prices_array[i]))
-                rsi_lows.append((i, rsi_array[i]))
-    
-    divergence_type = "none"
-    strength = 0.0
-    explanation = "No divergence detected"
-    
-    # Bullish divergence: price makes lower low, RSI makes higher low
-    if len(price_lows) >= 2 and len(rsi_lows) >= 2:
-        last_price_low = price_lows[-1][1]
-        prev_price_low = price_lows[-2][1]
-        last_rsi_low = rsi_lows[-1][1]
-        prev_rsi_low = rsi_lows[-2][1]
-        
-        if last_price_low < prev_price_low and last_rsi_low > prev_rsi_low:
-            divergence_type = "bullish"
-            strength = min(100, abs(last_rsi_low - prev_rsi_low) * DIVERGENCE_STRENGTH_MULTIPLIER)
-            explanation = "🟢 Bullish Divergence: Price making lower lows but RSI making higher lows. Potential reversal up."
-    
-    # Bearish divergence: price makes higher high, RSI makes lower high
-    if len(price_highs) >= 2 and len(rsi_highs) >= 2:
-        last_price_high = price_highs[-1][1]
-        prev_price_high = price_highs[-2][1]
-        last_rsi_high = rsi_highs[-1][1]
-        prev_rsi_high = rsi_highs[-2][1]
-        
-        if last_price_high > prev_price_high and last_rsi_high < prev_rsi_high:
-            divergence_type = "bearish"
-            strength = min(100, abs(last_rsi_high - prev_rsi_high) * DIVERGENCE_STRENGTH_MULTIPLIER)
-            explanation = "🔴 Bearish Divergence: Price making higher highs but RSI making lower highs. Potential reversal down."
-    
-    return RSIDivergence(type=divergence_type, strength=strength, explanation=explanation)
+    if signal > 0:
+        return RSIDivergence(
+            type="bullish",
+            strength=min(100, magnitude * DIVERGENCE_STRENGTH_MULTIPLIER),
+            explanation="🟢 Bullish Divergence: Price making lower lows but RSI making higher lows. Potential reversal up."
+        )
+    if signal < 0:
+        return RSIDivergence(
+            type="bearish",
+            strength=min(100, magnitude * DIVERGENCE_STRENGTH_MULTIPLIER),
+            explanation="🔴 Bearish Divergence: Price making higher highs but RSI making lower highs. Potential reversal down."
+        )
+    return RSIDivergence(type="none", strength=0.0, explanation="No divergence detected")
+
+
+def directional_movement(high, low, close) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    True Range, +DM and -DM for every bar (NaN for the first bar).
+
+    Works on 1-D series or 2-D matrices (rows x bars).
+
+    Returns:
+        (tr, plus_dm, minus_dm) with the same shape as the input
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    tr = np.full_like(close, np.nan)
+    plus_dm = np.full_like(close, np.nan)
+    minus_dm = np.full_like(close, np.nan)
+
+    prev_close = close[..., :-1]
+    tr[..., 1:] = np.maximum.reduce([
+        high[..., 1:] - low[..., 1:],
+        np.abs(high[..., 1:] - prev_close),
+        np.abs(low[..., 1:] - prev_close),
+    ])
+
+    up_move = high[..., 1:] - high[..., :-1]
+    down_move = low[..., :-1] - low[..., 1:]
+    plus_dm[..., 1:] = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm[..., 1:] = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Бары без предыдущего значения (NaN-дополнение слева) не дают движения
+    missing = np.isnan(tr)
+    plus_dm[missing] = np.nan
+    minus_dm[missing] = np.nan
+    return tr, plus_dm, minus_dm
+
+
+def calculate_adx_series(high, low, close, period: int = 14) -> ADXSeries:
+    """
+    Calculate the full ADX/+DI/-DI history with Wilder smoothing.
+
+    TR, +DM and -DM are smoothed with Wilder's RMA (seeded with the mean of
+    the first `period` values), DX is computed from the smoothed DI lines
+    and ADX is the Wilder average of DX.
+
+    Args:
+        high: High prices (1-D series or 2-D matrix rows x bars)
+        low: Low prices
+        close: Closing prices
+        period: Smoothing period
+
+    Returns:
+        ADXSeries aligned with the input bars
+    """
+    tr, plus_dm, minus_dm = directional_movement(high, low, close)
+
+    tr_smooth = wilder(tr, period)
+    plus_smooth = wilder(plus_dm, period)
+    minus_smooth = wilder(minus_dm, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = np.where(tr_smooth > 0, plus_smooth / tr_smooth * 100, 0.0)
+        minus_di = np.where(tr_smooth > 0, minus_smooth / tr_smooth * 100, 0.0)
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum > 0, np.abs(plus_di - minus_di) / di_sum * 100, 0.0)
+
+    warm = ~np.isnan(tr_smooth)
+    plus_di = np.where(warm, plus_di, np.nan)
+    minus_di = np.where(warm, minus_di, np.nan)
+    dx = np.where(warm, dx, np.nan)
+
+    return ADXSeries(adx=wilder(dx, period), plus_di=plus_di, minus_di=minus_di, dx=dx)
 
 
 def calculate_adx(
@@ -1197,7 +1443,11 @@ def calculate_adx(
     period: int = 14
 ) -> Optional[ADX]:
     """
-    Calculate Average Directional Index (ADX).
+    Calculate Average Directional Index (ADX) for the last bar.
+    
+    Uses Wilder smoothing (see calculate_adx_series). While the history is
+    too short for a smoothed ADX (fewer than 2 * period bars), the latest
+    DX is returned as ADX.
     
     Args:
         high: List of high prices
@@ -1211,55 +1461,19 @@ def calculate_adx(
     if len(high) < period + 1 or len(high) != len(low) or len(high) != len(close):
         return None
     
-    high_array = np.array(high)
-    low_array = np.array(low)
-    close_array = np.array(close)
-    
-    # Calculate True Range and Directional Movement
-    tr = []
-    plus_dm = []
-    minus_dm = []
-    
-    for i in range(1, len(high_array)):
-        h_l = high_array[i] - low_array[i]
-        h_c = abs(high_array[i] - close_array[i-1])
-        l_c = abs(low_array[i] - close_array[i-1])
-        tr.append(max(h_l, h_c, l_c))
-        
-        up_move = high_array[i] - high_array[i-1]
-        down_move = low_array[i-1] - low_array[i]
-        
-        if up_move > down_move and up_move > 0:
-            plus_dm.append(up_move)
-        else:
-            plus_dm.append(0)
-        
-        if down_move > up_move and down_move > 0:
-            minus_dm.append(down_move)
-        else:
-            minus_dm.append(0)
-    
-    if len(tr) < period:
-        return None
-    
-    # Smooth the values
-    tr_smooth = float(np.mean(tr[-period:]))
-    plus_dm_smooth = float(np.mean(plus_dm[-period:]))
-    minus_dm_smooth = float(np.mean(minus_dm[-period:]))
-    
-    # Calculate DI
-    plus_di = (plus_dm_smooth / tr_smooth) * 100 if tr_smooth > 0 else 0
-    minus_di = (minus_dm_smooth / tr_smooth) * 100 if tr_smooth > 0 else 0
-    
-    # Calculate DX and ADX
-    di_sum = plus_di + minus_di
-    dx = abs(plus_di - minus_di) / di_sum * 100 if di_sum > 0 else 0
+    series = calculate_adx_series(high, low, close, period)
     
-    # NOTE: For simplicity, we use DX as ADX without smoothing.
-    # A proper ADX implementation would smooth DX values over the period using EMA.
-    # This simplified version is sufficient for basic trend strength detection.
-    adx_value = float(dx)
+    plus_di = float(series.plus_di[-1])
+    minus_di = float(series.minus_di[-1])
+    adx_value = series.adx[-1]
+    if np.isnan(adx_value):
+        adx_value = series.dx[-1]
     
+    return _adx_result(float(adx_value), plus_di, minus_di)
+
+
+def _adx_result(adx_value: float, plus_di: float, minus_di: float) -> ADX:
+    """ADX с силой тренда и направлением по +DI/-DI."""
     # Determine trend strength
     if adx_value < 20:
         trend_strength = "weak"
@@ -1474,6 +1688,34 @@ class SwingPoint:
     strength: int = 1
 
 
+def swing_point_mask(values: np.ndarray, kind: str, order: int = 2) -> np.ndarray:
+    """
+    Mask of swing points: the value is strictly above (kind='high') or below
+    (kind='low') the `order` values on each side.
+
+    Args:
+        values: Highs or lows
+        kind: 'high' or 'low'
+        order: Number of neighbours on each side
+
+    Returns:
+        Boolean mask with the same length as values (edges are False)
+    """
+    values = np.asarray(values, dtype=float)
+    mask = np.zeros(len(values), dtype=bool)
+    if len(values) < 2 * order + 1:
+        return mask
+
+    center = values[order:len(values) - order]
+    compare = np.greater if kind == 'high' else np.less
+    inner = np.ones(len(center), dtype=bool)
+    for shift in range(1, order + 1):
+        inner &= compare(center, values[order - shift:len(values) - order - shift])
+        inner &= compare(center, values[order + shift:len(values) - order + shift])
+    mask[order:len(values) - order] = inner
+    return mask
+
+
 def find_swing_points(ohlcv_data: List[dict], lookback: int = 50) -> Tuple[List[SwingPoint], List[SwingPoint]]:
     """
     Find swing highs and lows in OHLCV data.
@@ -1493,39 +1735,49 @@ def find_swing_points(ohlcv_data: List[dict], lookback: int = 50) -> Tuple[List[
     
     # Use only the most recent candles
     data = ohlcv_data[-lookback:] if len(ohlcv_data) > lookback else ohlcv_data
+    highs = candle_column(data, 'high')
+    lows = candle_column(data, 'low')
+    
+    return swing_points_from_arrays(highs, lows)
+
+
+def swing_points_from_arrays(highs: np.ndarray, lows: np.ndarray) -> Tuple[List[SwingPoint], List[SwingPoint]]:
+    """Swing highs/lows from high/low arrays (indices are positions in the arrays)."""
+    swing_highs = [
+        SwingPoint(price=float(highs[i]), index=int(i), type='high', strength=1)
+        for i in np.flatnonzero(swing_point_mask(highs, 'high'))
+    ]
+    swing_lows = [
+        SwingPoint(price=float(lows[i]), index=int(i), type='low', strength=1)
+        for i in np.flatnonzero(swing_point_mask(lows, 'low'))
+    ]
+    return swing_highs, swing_lows
+
+
+def count_level_touches(highs: np.ndarray, lows: np.ndarray, levels, tolerance_pct: float = 0.5) -> np.ndarray:
+    """
+    Count touches of many levels at once (levels x candles broadcasting).
     
-    swing_highs = []
-    swing_lows = []
-    
-    # Need at least 5 candles (2 before, 1 center, 2 after)
-    for i in range(2, len(data) - 2):
-        # Check for swing high
-        if (data[i]['high'] > data[i-1]['high'] and 
-            data[i]['high'] > data[i-2]['high'] and
-            data[i]['high'] > data[i+1]['high'] and
-            data[i]['high'] > data[i+2]['high']):
-            
-            swing_highs.append(SwingPoint(
-                price=data[i]['high'],
-                index=i,
-                type='high',
-                strength=1
-            ))
-        
-        # Check for swing low
-        if (data[i]['low'] < data[i-1]['low'] and 
-            data[i]['low'] < data[i-2]['low'] and
-            data[i]['low'] < data[i+1]['low'] and
-            data[i]['low'] < data[i+2]['low']):
-            
-            swing_lows.append(SwingPoint(
-                price=data[i]['low'],
-                index=i,
-                type='low',
-                strength=1
-            ))
+    A candle touches a level when its high or low is within tolerance_pct
+    of the level, or the level lies inside the candle range.
     
-    return swing_highs, swing_lows
+    Args:
+        highs: Candle highs
+        lows: Candle lows
+        levels: Price levels
+        tolerance_pct: Tolerance as percentage (default 0.5%)
+        
+    Returns:
+        Number of touches per level (0 for levels <= 0)
+    """
+    levels = np.asarray(levels, dtype=float)[:, np.newaxis]
+    tolerance = levels * (tolerance_pct / 100.0)
+    touched = (
+        (np.abs(highs - levels) <= tolerance)
+        | (np.abs(lows - levels) <= tolerance)
+        | ((lows <= levels) & (levels <= highs))
+    )
+    return np.where(levels[:, 0] > 0, touched.sum(axis=1), 0)
 
 
 def count_touches(ohlcv_data: List[dict], level: float, tolerance_pct: float = 0.5) -> int:
@@ -1549,21 +1801,9 @@ def count_touches(ohlcv_data: List[dict], level: float, tolerance_pct: float = 0
     if not ohlcv_data or level <= 0:
         return 0
     
-    tolerance = level * (tolerance_pct / 100.0)
-    touches = 0
-    
-    for candle in ohlcv_data:
-        high = candle.get('high', 0)
-        low = candle.get('low', 0)
-        
-        # Check if candle touched the level
-        if abs(high - level) <= tolerance or abs(low - level) <= tolerance:
-            touches += 1
-        # Also count if the level is within the candle range
-        elif low <= level <= high:
-            touches += 1
-    
-    return touches
+    highs = candle_column(ohlcv_data, 'high')
+    lows = candle_column(ohlcv_data, 'low')
+    return int(count_level_touches(highs, lows, [level], tolerance_pct)[0])
 
 
 def calculate_level_strength(
@@ -1623,6 +1863,98 @@ def calculate_level_strength(
     return max(1, min(5, strength))
 
 
+# name -> (type, strength, number of candles)
+CANDLESTICK_PATTERNS: Dict[str, Tuple[str, float, int]] = {
+    "hammer": ("bullish", 1.2, 1),
+    "hanging_man": ("bearish", 1.2, 1),
+    "doji": ("neutral", 1.0, 1),
+    "engulfing_bullish": ("bullish", 1.5, 2),
+    "engulfing_bearish": ("bearish", 1.5, 2),
+    "morning_star": ("bullish", 1.5, 3),
+    "evening_star": ("bearish", 1.5, 3),
+    "three_white_soldiers": ("bullish", 1.5, 3),
+    "three_black_crows": ("bearish", 1.5, 3),
+}
+
+
+def candlestick_pattern_masks(ohlcv: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Маски всех свечных паттернов по всей истории за один проход.
+    
+    Тело, тени и диапазон считаются массивами один раз; mask[i] = True,
+    если паттерн завершается на свече i (для 2-3 свечных паттернов
+    i - последняя свеча паттерна). Свечи с нулевыми OHLC не участвуют.
+    
+    Args:
+        ohlcv: List of OHLCV candles with 'open', 'high', 'low', 'close' keys
+        
+    Returns:
+        Dict {pattern name: boolean mask of len(ohlcv)} for CANDLESTICK_PATTERNS
+    """
+    n = len(ohlcv)
+    o = candle_column(ohlcv, 'open')
+    h = candle_column(ohlcv, 'high')
+    l = candle_column(ohlcv, 'low')
+    c = candle_column(ohlcv, 'close')
+    
+    valid = (o != 0) & (h != 0) & (l != 0) & (c != 0)
+    body = np.abs(c - o)
+    total_range = h - l
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    bullish = c > o
+    bearish = ~bullish
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        body_to_range = np.where(total_range > 0, body / total_range, 0.0)
+        lower_to_body = np.where(body > 0, lower_shadow / body, 0.0)
+        upper_to_body = np.where(body > 0, upper_shadow / body, 0.0)
+    
+    # Hammer / Hanging Man: small body, long lower shadow (2x+ body), small upper shadow
+    hammer_shape = valid & (body > 0) & (body_to_range < 0.3) & (lower_to_body >= 2.0) & (upper_to_body < 0.5)
+    masks = {
+        "hammer": hammer_shape & bullish,
+        "hanging_man": hammer_shape & bearish,
+        # Doji: body < 10% of range
+        "doji": valid & (total_range > 0) & (body_to_range < 0.1),
+    }
+    
+    # Candle-aligned views: k bars back from the pattern's last candle
+    def back(values: np.ndarray, k: int, size: int) -> np.ndarray:
+        return values[size - 1 - k:n - k]
+    
+    for name, (_, _, size) in CANDLESTICK_PATTERNS.items():
+        if size > 1:
+            masks[name] = np.zeros(n, dtype=bool)
+    
+    if n >= 2:
+        ok = back(valid, 1, 2) & back(valid, 0, 2)
+        po, pc, co, cc = back(o, 1, 2), back(c, 1, 2), back(o, 0, 2), back(c, 0, 2)
+        masks["engulfing_bullish"][1:] = ok & back(bearish, 1, 2) & back(bullish, 0, 2) & (co < pc) & (cc > po)
+        masks["engulfing_bearish"][1:] = ok & back(bullish, 1, 2) & back(bearish, 0, 2) & (co > pc) & (cc < po)
+    
+    if n >= 3:
+        ok = back(valid, 2, 3) & back(valid, 1, 3) & back(valid, 0, 3)
+        o1, o2, o3 = back(o, 2, 3), back(o, 1, 3), back(o, 0, 3)
+        c1, c2, c3 = back(c, 2, 3), back(c, 1, 3), back(c, 0, 3)
+        b1, b2, b3 = back(body, 2, 3), back(body, 1, 3), back(body, 0, 3)
+        up1, up2, up3 = back(bullish, 2, 3), back(bullish, 1, 3), back(bullish, 0, 3)
+        star = (b1 > b2 * 2) & (b3 > b2 * 2)
+        
+        masks["morning_star"][2:] = ok & ~up1 & up3 & star & (c2 < c1) & (c3 > o1)
+        masks["evening_star"][2:] = ok & up1 & ~up3 & star & (c2 > c1) & (c3 < o1)
+        masks["three_white_soldiers"][2:] = (
+            ok & up1 & up2 & up3 & (c2 > c1) & (c3 > c2)
+            & (o2 > o1) & (o2 < c1) & (o3 > o2) & (o3 < c2)
+        )
+        masks["three_black_crows"][2:] = (
+            ok & ~up1 & ~up2 & ~up3 & (c2 < c1) & (c3 < c2)
+            & (o2 < o1) & (o2 > c1) & (o3 < o2) & (o3 > c2)
+        )
+    
+    return masks
+
+
 def detect_candlestick_patterns(ohlcv: List[Dict]) -> List[CandlestickPattern]:
     """
     Детектирует 5 основных свечных паттернов на 4ч данных.
@@ -1634,6 +1966,9 @@ def detect_candlestick_patterns(ohlcv: List[Dict]) -> List[CandlestickPattern]:
     4. Morning Star / Evening Star - 3-свечной разворот
     5. Three White Soldiers / Three Black Crows - сильный тренд
     
+    Одиночные паттерны ищутся на последних 3 свечах, 2-3 свечные -
+    завершающиеся на последней свече (см. candlestick_pattern_masks).
+    
     Args:
         ohlcv: List of OHLCV candles with 'open', 'high', 'low', 'close' keys
         
@@ -1643,163 +1978,19 @@ def detect_candlestick_patterns(ohlcv: List[Dict]) -> List[CandlestickPattern]:
     if not ohlcv or len(ohlcv) < 3:
         return []
     
-    patterns = []
+    # Маски только по последним 3 свечам - этого достаточно для всех паттернов
+    masks = candlestick_pattern_masks(ohlcv[-3:])
     
-    # Helper function to calculate candle body and shadow sizes
-    def get_candle_properties(candle):
-        o = candle.get('open', 0)
-        h = candle.get('high', 0)
-        l = candle.get('low', 0)
-        c = candle.get('close', 0)
-        
-        if o == 0 or h == 0 or l == 0 or c == 0:
-            return None
-        
-        body_size = abs(c - o)
-        total_range = h - l
-        upper_shadow = h - max(o, c)
-        lower_shadow = min(o, c) - l
-        is_bullish = c > o
-        
-        return {
-            'open': o,
-            'high': h,
-            'low': l,
-            'close': c,
-            'body_size': body_size,
-            'total_range': total_range,
-            'upper_shadow': upper_shadow,
-            'lower_shadow': lower_shadow,
-            'is_bullish': is_bullish
-        }
-    
-    # We need at least last 3 candles for pattern detection
-    # Fix range to avoid negative indices
-    start_idx = max(0, len(ohlcv) - 3)
-    for i in range(start_idx, len(ohlcv)):
-        candle = get_candle_properties(ohlcv[i])
-        if not candle:
-            continue
-        
-        # 1. HAMMER / HANGING MAN
-        # Small body, long lower shadow (2x+ body), small upper shadow
-        if candle['body_size'] > 0:
-            body_to_range = candle['body_size'] / candle['total_range'] if candle['total_range'] > 0 else 0
-            lower_to_body = candle['lower_shadow'] / candle['body_size'] if candle['body_size'] > 0 else 0
-            upper_to_body = candle['upper_shadow'] / candle['body_size'] if candle['body_size'] > 0 else 0
-            
-            if body_to_range < 0.3 and lower_to_body >= 2.0 and upper_to_body < 0.5:
-                # Hammer (bullish at bottom) or Hanging Man (bearish at top)
-                # We'll assume it's a reversal pattern based on context
-                pattern_type = "bullish" if candle['is_bullish'] else "bearish"
-                patterns.append(CandlestickPattern(
-                    name="hammer" if pattern_type == "bullish" else "hanging_man",
-                    type=pattern_type,
-                    strength=1.2
-                ))
-        
-        # 2. DOJI
-        # Very small body (< 0.1% of range), indicates indecision
-        if candle['total_range'] > 0:
-            body_to_range = candle['body_size'] / candle['total_range']
-            if body_to_range < 0.1:
-                patterns.append(CandlestickPattern(
-                    name="doji",
-                    type="neutral",
-                    strength=1.0
-                ))
-    
-    # Patterns requiring 2 candles
-    if len(ohlcv) >= 2:
-        start_idx = max(0, len(ohlcv) - 2)
-        for i in range(start_idx, len(ohlcv) - 1):
-            prev = get_candle_properties(ohlcv[i])
-            curr = get_candle_properties(ohlcv[i + 1])
-            
-            if not prev or not curr:
-                continue
-            
-            # 3. BULLISH / BEARISH ENGULFING
-            # Current candle engulfs previous candle's body
-            if not prev['is_bullish'] and curr['is_bullish']:
-                # Bullish engulfing: previous red, current green, current engulfs previous
-                if curr['open'] < prev['close'] and curr['close'] > prev['open']:
-                    patterns.append(CandlestickPattern(
-                        name="engulfing_bullish",
-                        type="bullish",
-                        strength=1.5
-                    ))
-            
-            if prev['is_bullish'] and not curr['is_bullish']:
-                # Bearish engulfing: previous green, current red, current engulfs previous
-                if curr['open'] > prev['close'] and curr['close'] < prev['open']:
-                    patterns.append(CandlestickPattern(
-                        name="engulfing_bearish",
-                        type="bearish",
-                        strength=1.5
-                    ))
-    
-    # Patterns requiring 3 candles
-    if len(ohlcv) >= 3:
-        start_idx = max(0, len(ohlcv) - 3)
-        for i in range(start_idx, len(ohlcv) - 2):
-            c1 = get_candle_properties(ohlcv[i])
-            c2 = get_candle_properties(ohlcv[i + 1])
-            c3 = get_candle_properties(ohlcv[i + 2])
-            
-            if not c1 or not c2 or not c3:
-                continue
-            
-            # 4. MORNING STAR (bullish) / EVENING STAR (bearish)
-            # Morning Star: long red, small body (star), long green
-            # Evening Star: long green, small body (star), long red
-            
-            # Check for Morning Star
-            if (not c1['is_bullish'] and c3['is_bullish'] and
-                c1['body_size'] > c2['body_size'] * 2 and
-                c3['body_size'] > c2['body_size'] * 2 and
-                c2['close'] < c1['close'] and c3['close'] > c1['open']):
-                patterns.append(CandlestickPattern(
-                    name="morning_star",
-                    type="bullish",
-                    strength=1.5
-                ))
-            
-            # Check for Evening Star
-            if (c1['is_bullish'] and not c3['is_bullish'] and
-                c1['body_size'] > c2['body_size'] * 2 and
-                c3['body_size'] > c2['body_size'] * 2 and
-                c2['close'] > c1['close'] and c3['close'] < c1['open']):
-                patterns.append(CandlestickPattern(
-                    name="evening_star",
-                    type="bearish",
-                    strength=1.5
-                ))
-            
-            # 5. THREE WHITE SOLDIERS (bullish) / THREE BLACK CROWS (bearish)
-            # Three consecutive candles in the same direction with increasing closes
-            
-            # Three White Soldiers
-            if (c1['is_bullish'] and c2['is_bullish'] and c3['is_bullish'] and
-                c2['close'] > c1['close'] and c3['close'] > c2['close'] and
-                c2['open'] > c1['open'] and c2['open'] < c1['close'] and
-                c3['open'] > c2['open'] and c3['open'] < c2['close']):
-                patterns.append(CandlestickPattern(
-                    name="three_white_soldiers",
-                    type="bullish",
-                    strength=1.5
-                ))
-            
-            # Three Black Crows
-            if (not c1['is_bullish'] and not c2['is_bullish'] and not c3['is_bullish'] and
-                c2['close'] < c1['close'] and c3['close'] < c2['close'] and
-                c2['open'] < c1['open'] and c2['open'] > c1['close'] and
-                c3['open'] < c2['open'] and c3['open'] > c2['close']):
-                patterns.append(CandlestickPattern(
-                    name="three_black_crows",
-                    type="bearish",
-                    strength=1.5
-                ))
+    def found(name: str) -> CandlestickPattern:
+        pattern_type, strength, _ = CANDLESTICK_PATTERNS[name]
+        return CandlestickPattern(name=name, type=pattern_type, strength=strength)
+    
+    patterns = []
+    for i in range(3):
+        patterns.extend(found(name) for name in ("hammer", "hanging_man", "doji") if masks[name][i])
+    for name, (_, _, size) in CANDLESTICK_PATTERNS.items():
+        if size > 1 and masks[name][-1]:
+            patterns.append(found(name))
     
     return patterns
 
@@ -1823,63 +2014,24 @@ def calculate_macd_divergence(
     Returns:
         MACDDivergence or None if insufficient data
     """
-    # Minimum 5 extra periods needed for reliable peak/trough detection
-    # (requires 2 periods on each side of the peak/trough + 1 center period)
-    MIN_EXTRA_PERIODS = 5
-    if len(prices) < lookback + MIN_EXTRA_PERIODS or len(prices) != len(macd_histogram):
+    last = _last_divergence(prices, macd_histogram, lookback)
+    if last is None:
         return None
-    
-    prices_array = np.array(prices[-lookback:])
-    macd_array = np.array(macd_histogram[-lookback:])
+    signal, magnitude = last
     
     # Strength multiplier for divergence detection
     DIVERGENCE_STRENGTH_MULTIPLIER = 3
     
-    # Find local highs and lows
-    price_highs = []
-    price_lows = []
-    macd_highs = []
-    macd_lows = []
-    
-    for i in range(2, len(prices_array) - 2):
-        # Local high
-        if prices_array[i] > prices_array[i-1] and prices_array[i] > prices_array[i+1]:
-            if prices_array[i] > prices_array[i-2] and prices_array[i] > prices_array[i+2]:
-                price_highs.append((i, prices_array[i]))
-                macd_highs.append((i, macd_array[i]))
-        
-        # Local low
-        if prices_array[i] < prices_array[i-1] and prices_array[i] < prices_array[i+1]:
-            if prices_array[i] < prices_array[i-2] and prices_array[i] < prices_array[i+2]:
-                price_lows.append((i, prices_array[i]))
-                macd_lows.append((i, macd_array[i]))
-    
-    divergence_type = "none"
-    strength = 0.0
-    explanation = "No MACD divergence detected"
-    
-    # Bullish divergence: price makes lower low, MACD makes higher low
-    if len(price_lows) >= 2 and len(macd_lows) >= 2:
-        last_price_low = price_lows[-1][1]
-        prev_price_low = price_lows[-2][1]
-        last_macd_low = macd_lows[-1][1]
-        prev_macd_low = macd_lows[-2][1]
-        
-        if last_price_low < prev_price_low and last_macd_low > prev_macd_low:
-            divergence_type = "bullish"
-            strength = min(100, abs(last_macd_low - prev_macd_low) * DIVERGENCE_STRENGTH_MULTIPLIER * 10)
-            explanation = "🟢 Bullish MACD Divergence: Price making lower lows but MACD making higher lows. Potential reversal up."
-    
-    # Bearish divergence: price makes higher high, MACD makes lower high
-    if len(price_highs) >= 2 and len(macd_highs) >= 2:
-        last_price_high = price_highs[-1][1]
-        prev_price_high = price_highs[-2][1]
-        last_macd_high = macd_highs[-1][1]
-        prev_macd_high = macd_highs[-2][1]
-        
-        if last_price_high > prev_price_high and last_macd_high < prev_macd_high:
-            divergence_type = "bearish"
-            strength = min(100, abs(last_macd_high - prev_macd_high) * DIVERGENCE_STRENGTH_MULTIPLIER * 10)
-            explanation = "🔴 Bearish MACD Divergence: Price making higher highs but MACD making lower highs. Potential reversal down."
-    
-    return MACDDivergence(type=divergence_type, strength=strength, explanation=explanation)
+    if signal > 0:
+        return MACDDivergence(
+            type="bullish",
+            strength=min(100, magnitude * DIVERGENCE_STRENGTH_MULTIPLIER * 10),
+            explanation="🟢 Bullish MACD Divergence: Price making lower lows but MACD making higher lows. Potential reversal up."
+        )
+    if signal < 0:
+        return MACDDivergence(
+            type="bearish",
+            strength=min(100, magnitude * DIVERGENCE_STRENGTH_MULTIPLIER * 10),
+            explanation="🔴 Bearish MACD Divergence: Price making higher highs but MACD making lower highs. Potential reversal down."
+        )
+    return MACDDivergence(type="none", strength=0.0, explanation="No MACD divergence detected")
@@ -0,0 +1,163 @@
+"""
+Kernels - векторизованные ядра скользящих средних (EMA, SMA, Wilder).
+
+Все индикаторы и сканеры считают EMA одним и тем же ядром, поэтому
+значения совпадают бит в бит у всех вызывающих. Ядра работают как с
+одномерными рядами, так и с матрицами (символы x бары): расчёт идёт
+по последней оси, каждая строка - отдельный ряд.
+
+Рекурсия EMA y[i] = alpha * x[i] + (1 - alpha) * y[i-1] выполняется
+линейным фильтром scipy.signal.lfilter (в C, те же операции в том же
+порядке, что и в цикле Python). Без SciPy используется цикл по барам,
+векторизованный по строкам.
+
+Строки матрицы могут начинаться с NaN (короткая история, выровненная
+по правому краю): ряд строки начинается с первого не-NaN значения.
+"""
+
+import logging
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    lfilter = None
+    SCIPY_AVAILABLE = False
+
+
+def ema_alpha(period: int) -> float:
+    """Коэффициент сглаживания EMA: 2 / (period + 1)."""
+    return 2 / (period + 1)
+
+
+def _as_2d(data) -> Tuple[np.ndarray, bool]:
+    array = np.asarray(data, dtype=float)
+    if array.ndim == 1:
+        return array[np.newaxis, :], True
+    if array.ndim != 2:
+        raise ValueError(f"Expected 1-D or 2-D array, got {array.ndim}-D")
+    return array, False
+
+
+def _first_valid(array: np.ndarray) -> np.ndarray:
+    """Индекс первого не-NaN значения в каждой строке (len - если строка пустая)."""
+    valid = ~np.isnan(array)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), array.shape[1])
+
+
+def _recurse(x: np.ndarray, alpha: float, initial: np.ndarray) -> np.ndarray:
+    """
+    y[i] = alpha * x[i] + (1 - alpha) * y[i-1] по строкам, y[-1] = initial.
+    """
+    if x.shape[1] == 0:
+        return x.copy()
+    decay = 1 - alpha
+    if SCIPY_AVAILABLE:
+        return lfilter([alpha], [1.0, -decay], x, axis=1, zi=(decay * initial)[:, np.newaxis])[0]
+
+    result = np.empty_like(x)
+    previous = initial
+    for i in range(x.shape[1]):
+        previous = alpha * x[:, i] + decay * previous
+        result[:, i] = previous
+    return result
+
+
+def exp_smooth(data, alpha: float) -> np.ndarray:
+    """
+    Экспоненциальное сглаживание, засеянное первым значением ряда.
+
+    y[0] = x[0]; y[i] = alpha * x[i] + (1 - alpha) * y[i-1]
+
+    Args:
+        data: Ряд (N,) или матрица (строки x бары)
+        alpha: Коэффициент сглаживания (0, 1]
+
+    Returns:
+        Массив той же формы (NaN до начала ряда строки)
+    """
+    array, was_1d = _as_2d(data)
+    result = np.full_like(array, np.nan)
+    starts = _first_valid(array)
+
+    for start in np.unique(starts):
+        if start >= array.shape[1]:
+            continue
+        rows = np.nonzero(starts == start)[0]
+        seed = array[rows, start]
+        result[rows, start] = seed
+        result[rows, start + 1:] = _recurse(array[rows, start + 1:], alpha, seed)
+
+    return result[0] if was_1d else result
+
+
+def ema(data, period: int) -> np.ndarray:
+    """
+    Exponential Moving Average, alpha = 2 / (period + 1), засеянная первым значением.
+
+    Args:
+        data: Ряд (N,) или матрица (строки x бары)
+        period: Период EMA
+
+    Returns:
+        EMA той же формы
+    """
+    return exp_smooth(data, ema_alpha(period))
+
+
+def ema_last(data, period: int) -> float:
+    """Последнее значение EMA ряда."""
+    return float(ema(data, period)[-1])
+
+
+def sma(data, period: int) -> np.ndarray:
+    """
+    Simple Moving Average по окну period.
+
+    Значение окна совпадает с np.mean(x[i - period + 1:i + 1]).
+
+    Returns:
+        Массив той же формы, NaN для первых period - 1 баров
+    """
+    array, was_1d = _as_2d(data)
+    result = np.full_like(array, np.nan)
+    if period <= array.shape[1]:
+        windows = np.lib.stride_tricks.sliding_window_view(array, period, axis=1)
+        result[:, period - 1:] = windows.mean(axis=2)
+    return result[0] if was_1d else result
+
+
+def wilder(data, period: int) -> np.ndarray:
+    """
+    Сглаживание Уайлдера (RMA): засев средним первых period значений,
+    далее y[i] = (y[i-1] * (period - 1) + x[i]) / period.
+
+    Используется в RSI/ATR/ADX по Уайлдеру.
+
+    Args:
+        data: Ряд (N,) или матрица (строки x бары); ведущие NaN пропускаются
+        period: Период сглаживания
+
+    Returns:
+        Массив той же формы, NaN до первого полного окна строки
+    """
+    array, was_1d = _as_2d(data)
+    result = np.full_like(array, np.nan)
+    starts = _first_valid(array)
+    alpha = 1 / period
+
+    for start in np.unique(starts):
+        seed_at = start + period - 1
+        if seed_at >= array.shape[1]:
+            continue
+        rows = np.nonzero(starts == start)[0]
+        seed = array[rows, start:seed_at + 1].mean(axis=1)
+        result[rows, seed_at] = seed
+        result[rows, seed_at + 1:] = _recurse(array[rows, seed_at + 1:], alpha, seed)
+
+    return result[0] if was_1d else result
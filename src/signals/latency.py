@@ -0,0 +1,193 @@
+"""
+Latency - трассировка задержек этапов конвейера AI сигналов.
+
+Каждый этап (запрос источника, расчёт, рендер) оборачивается в span,
+который записывает длительность, результат (ok/empty/error/timeout) и,
+если этап обслужен из кэша, признак cache hit/miss. Данные хранятся
+в процессе: кольцевой буфер последних замеров и гистограмма по
+фиксированным корзинам для каждого этапа.
+
+Выгрузка: LatencyTracker.summary() (текст для /debug) и to_json().
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограммы (мс); последняя корзина - всё, что дольше
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("latency_current_span", default=None)
+
+
+class Span:
+    """Один замер этапа. Поля outcome/cache можно уточнить внутри блока."""
+
+    __slots__ = ("stage", "started", "outcome", "cache")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started = time.perf_counter()
+        self.outcome = "ok"
+        self.cache: Optional[str] = None
+
+
+class _StageStats:
+    """Накопленная статистика одного этапа."""
+
+    def __init__(self, max_samples: int):
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+        self.buckets: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.outcomes: Dict[str, int] = {}
+        self.cache: Dict[str, int] = {}
+
+    def add(self, duration_ms: float, outcome: str, cache: Optional[str]):
+        self.samples.append(duration_ms)
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if cache:
+            self.cache[cache] = self.cache.get(cache, 0) + 1
+        for i, bound in enumerate(BUCKETS_MS):
+            if duration_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 1),
+            "p95_ms": round(self.percentile(95), 1),
+            "p99_ms": round(self.percentile(99), 1),
+            "max_ms": round(self.max_ms, 1),
+            "outcomes": dict(self.outcomes),
+            "cache": dict(self.cache),
+            "histogram": {
+                **{f"<={bound}ms": n for bound, n in zip(BUCKETS_MS, self.buckets)},
+                f">{BUCKETS_MS[-1]}ms": self.buckets[-1],
+            },
+        }
+
+
+class LatencyTracker:
+    """
+    Хранилище задержек по этапам.
+
+    Args:
+        max_samples: Сколько последних замеров хранить для перцентилей
+    """
+
+    def __init__(self, max_samples: int = 500):
+        self.max_samples = max_samples
+        self._stages: Dict[str, _StageStats] = {}
+
+    def record(self, stage: str, duration_ms: float, outcome: str = "ok", cache: Optional[str] = None):
+        """Записать замер этапа."""
+        stats = self._stages.get(stage)
+        if stats is None:
+            stats = self._stages[stage] = _StageStats(self.max_samples)
+        stats.add(duration_ms, outcome, cache)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[Span]:
+        """
+        Замерить блок кода.
+
+        Исключение помечает span как error (timeout для asyncio.TimeoutError)
+        и пробрасывается дальше.
+        """
+        span = Span(stage)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if isinstance(e, asyncio.TimeoutError):
+                span.outcome = "timeout"
+            elif isinstance(e, asyncio.CancelledError):
+                span.outcome = "cancelled"
+            else:
+                span.outcome = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.record(stage, (time.perf_counter() - span.started) * 1000, span.outcome, span.cache)
+
+    async def trace(self, stage: str, awaitable: Awaitable) -> Any:
+        """Дождаться awaitable внутри span; пустой результат помечается как empty."""
+        with self.span(stage) as span:
+            result = await awaitable
+            if result is None and span.outcome == "ok":
+                span.outcome = "empty"
+            return result
+
+    def stats(self, stage: Optional[str] = None) -> Dict[str, Any]:
+        """Статистика одного этапа или всех этапов."""
+        if stage is not None:
+            stats = self._stages.get(stage)
+            return stats.to_dict() if stats else {}
+        return {name: stats.to_dict() for name, stats in sorted(self._stages.items())}
+
+    def slowest(self, limit: int = 15, prefix: Optional[str] = None) -> List[tuple]:
+        """Этапы с наибольшим p95: [(этап, stats), ...]."""
+        items = [
+            (name, stats.to_dict()) for name, stats in self._stages.items()
+            if prefix is None or name.startswith(prefix)
+        ]
+        items.sort(key=lambda item: item[1]["p95_ms"], reverse=True)
+        return items[:limit]
+
+    def summary(self, limit: int = 15, prefix: Optional[str] = None) -> str:
+        """Текстовая сводка самых медленных этапов (для /debug)."""
+        rows = self.slowest(limit, prefix)
+        if not rows:
+            return "Нет данных о задержках"
+
+        lines = [f"{'stage':<34} {'n':>5} {'p50':>7} {'p95':>7} {'max':>7}  fail  cache"]
+        for name, stats in rows:
+            failures = sum(n for outcome, n in stats["outcomes"].items() if outcome not in ("ok", "empty"))
+            hits = stats["cache"].get("hit", 0)
+            cache_total = sum(stats["cache"].values())
+            cache = f"{hits}/{cache_total}" if cache_total else "-"
+            lines.append(
+                f"{name[:34]:<34} {stats['count']:>5} {stats['p50_ms']:>7.0f} "
+                f"{stats['p95_ms']:>7.0f} {stats['max_ms']:>7.0f}  {failures:>4}  {cache}"
+            )
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        """Полная статистика всех этапов в JSON."""
+        return json.dumps(self.stats(), ensure_ascii=False, indent=2)
+
+    def reset(self):
+        """Очистить накопленную статистику."""
+        self._stages.clear()
+
+
+def current_span() -> Optional[Span]:
+    """Span, внутри которого выполняется текущий код (или None)."""
+    return _current_span.get()
+
+
+# Общий трекер процесса
+latency_tracker = LatencyTracker()
@@ -0,0 +1,276 @@
+"""
+Market Stream - рыночные данные Bybit spot по WebSocket.
+
+Один фоновый поток подписывается на каналы kline, publicTrade и orderbook
+для набора символов и держит локальное состояние:
+
+- сделки - скользящий буфер за последние trade_window_seconds;
+- стакан - signals.order_book.OrderBook из снимка и дельт (orderbook.50);
+- свечи - бары применяются к окнам candle_store, которые поэтому
+  остаются свежими без REST-запросов.
+
+Потребители (get_recent_trades_flow, get_orderbook_delta, OrderFlowEnhancer)
+спрашивают поток и получают None, если он не покрывает нужный период
+(не запущен, переподключается, подключён позже начала окна) - тогда они
+идут в REST, как раньше.
+
+Сообщение, которое не удалось разобрать, пропускается (stats["errors"]),
+соединение и буферы остаются.
+
+Сырые сообщения можно записывать в JSONL (record_path) и проигрывать
+через signals.replay_server вместо биржи.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, TextIO
+
+import aiohttp
+
+from http_client import http_client
+from signals.candle_store import BYBIT_INTERVALS, INTERVAL_FROM_BYBIT, CandleStore, candle_store
+from signals.order_book import OrderBook
+
+logger = logging.getLogger(__name__)
+
+BYBIT_SPOT_WS_URL = "wss://stream.bybit.com/v5/public/spot"
+
+# Символы AI сигналов (DataSourceManager.BYBIT_MAPPING)
+DEFAULT_SYMBOLS = ("BTCUSDT", "ETHUSDT", "TONUSDT", "SOLUSDT", "XRPUSDT")
+
+
+class Trade(NamedTuple):
+    """Сделка из потока publicTrade (side - сторона тейкера)."""
+    time: int
+    price: float
+    size: float
+    side: str
+
+
+class MarketStream:
+    """
+    Подписка на рыночные каналы Bybit spot с локальными буферами.
+
+    Args:
+        symbols: Символы Bybit ("BTCUSDT")
+        url: Адрес WebSocket (биржа или replay_server)
+        kline_intervals: Интервалы свечей для candle_store ("5m" - база для 15m)
+        depth: Глубина стакана (1, 50, 200)
+        trade_window_seconds: Сколько секунд сделок держать
+        store: Склад свечей, окна которого обновляются барами потока
+        record_path: Записывать сырые сообщения в JSONL
+        clock: Текущее время в секундах (для тестов)
+    """
+
+    PING_INTERVAL = 20  # Bybit закрывает соединение без ping ~за 30 секунд
+    MAX_RECONNECT_DELAY = 30
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = DEFAULT_SYMBOLS,
+        url: str = BYBIT_SPOT_WS_URL,
+        kline_intervals: Iterable[str] = ("5m",),
+        depth: int = 50,
+        trade_window_seconds: int = 600,
+        store: Optional[CandleStore] = None,
+        record_path: Optional[str] = None,
+        clock=time.time,
+    ):
+        self.symbols = [s.upper() for s in symbols]
+        self.url = url
+        self.kline_intervals = tuple(kline_intervals)
+        self.depth = depth
+        self.trade_window_ms = trade_window_seconds * 1000
+        self.store = store if store is not None else candle_store
+        self.record_path = record_path
+        self.clock = clock
+
+        self._trades: Dict[str, Deque[Trade]] = {symbol: deque() for symbol in self.symbols}
+        self._books: Dict[str, OrderBook] = {}
+        self._connected_since: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._record_file: Optional[TextIO] = None
+        self.stats = {"messages": 0, "errors": 0, "reconnects": 0}
+
+    @property
+    def topics(self) -> List[str]:
+        topics = []
+        for symbol in self.symbols:
+            topics += [f"kline.{BYBIT_INTERVALS[interval]}.{symbol}" for interval in self.kline_intervals]
+            topics += [f"publicTrade.{symbol}", f"orderbook.{self.depth}.{symbol}"]
+        return topics
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected_since is not None
+
+    async def start(self):
+        """Запустить поток (идемпотентно)."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Market stream started for {', '.join(self.symbols)} ({self.url})")
+
+    async def stop(self):
+        """Остановить поток."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._disconnected()
+        if self._record_file is not None:
+            self._record_file.close()
+            self._record_file = None
+        logger.info("Market stream stopped")
+
+    # === Соединение ===
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                await self._consume()
+                delay = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Market stream connection error: {e}")
+            self._disconnected()
+            self.stats["reconnects"] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+
+    async def _consume(self):
+        async with http_client.session() as session:
+            async with session.ws_connect(self.url, heartbeat=None) as ws:
+                await ws.send_json({"op": "subscribe", "args": self.topics})
+                self._connected_since = self.clock()
+                pinger = asyncio.create_task(self._ping(ws))
+                try:
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._on_message(message.data)
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+                finally:
+                    pinger.cancel()
+                    # Ошибка ping (соединение уже закрыто) не должна теряться в задаче
+                    error, = await asyncio.gather(pinger, return_exceptions=True)
+                    if error is not None and not isinstance(error, asyncio.CancelledError):
+                        logger.debug(f"Market stream ping failed: {error!r}")
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.PING_INTERVAL)
+            await ws.send_json({"op": "ping"})
+
+    def _disconnected(self):
+        # Без соединения буферы перестают быть полными: сделки и стакан начинаются заново
+        self._connected_since = None
+        self._books.clear()
+        for trades in self._trades.values():
+            trades.clear()
+        if self._record_file is not None:
+            self._record_file.flush()
+
+    def _record(self, raw: str):
+        if not self.record_path:
+            return
+        # Файл открыт на всё время работы потока; запись буферизуется
+        if self._record_file is None:
+            self._record_file = open(self.record_path, "a", encoding="utf-8")
+        self._record_file.write(raw + "\n")
+
+    def _on_message(self, raw: str):
+        self._record(raw)
+        try:
+            self.handle(json.loads(raw))
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Market stream message skipped ({e!r}): {raw[:200]}")
+
+    # === Сообщения ===
+
+    def handle(self, message: Dict):
+        """Применить сообщение биржи к локальному состоянию."""
+        topic = message.get("topic")
+        if not topic:
+            return  # ответы на subscribe/ping
+        self.stats["messages"] += 1
+        channel, _, symbol = topic.rpartition(".")
+        data = message.get("data")
+
+        if channel == "publicTrade":
+            self._on_trades(symbol, data)
+        elif channel.startswith("orderbook"):
+            kind = message.get("type", "delta")
+            if kind == "snapshot":
+                self._books.setdefault(symbol, OrderBook(history_depth=self.depth))
+            if symbol in self._books:  # дельты до первого снимка пропускаются
+                try:
+                    self._books[symbol].apply(kind, data, message.get("ts", 0))
+                except Exception:
+                    # Стакан мог примениться частично - ждём следующий снимок
+                    del self._books[symbol]
+                    raise
+        elif channel.startswith("kline"):
+            interval = INTERVAL_FROM_BYBIT[channel.split(".")[1]]
+            for kline in data:
+                self.store.apply_bar("bybit", symbol, interval, {
+                    "timestamp": int(kline["start"]),
+                    "open": float(kline["open"]),
+                    "high": float(kline["high"]),
+                    "low": float(kline["low"]),
+                    "close": float(kline["close"]),
+                    "volume": float(kline["volume"]),
+                })
+
+    def _on_trades(self, symbol: str, data: List[Dict]):
+        trades = self._trades.setdefault(symbol, deque())
+        for trade in data:
+            trades.append(Trade(int(trade["T"]), float(trade["p"]), float(trade["v"]), trade["S"]))
+        horizon = trades[-1].time - self.trade_window_ms if trades else 0
+        while trades and trades[0].time < horizon:
+            trades.popleft()
+
+    # === Запросы ===
+
+    def covers(self, since_ms: float) -> bool:
+        """Поток подключён непрерывно с момента since_ms."""
+        return self._connected_since is not None and self._connected_since * 1000 <= since_ms
+
+    def recent_trades(self, symbol: str, since_ms: float) -> Optional[List[Trade]]:
+        """Сделки с since_ms или None, если поток не покрывает период."""
+        if not self.covers(since_ms) or since_ms < self.clock() * 1000 - self.trade_window_ms:
+            return None
+        return [trade for trade in self._trades.get(symbol, ()) if trade.time >= since_ms]
+
+    def last_trades(self, symbol: str, limit: int) -> Optional[List[Trade]]:
+        """Последние limit сделок или None, если с подключения их меньше."""
+        if not self.is_connected:
+            return None
+        trades = self._trades.get(symbol, ())
+        if len(trades) < limit:
+            return None
+        return list(trades)[-limit:]
+
+    def book(self, symbol: str) -> Optional[OrderBook]:
+        """Локальный стакан или None до первого снимка."""
+        if not self.is_connected:
+            return None
+        return self._books.get(symbol)
+
+
+# Общий поток процесса (запускается в on_startup)
+market_stream = MarketStream()
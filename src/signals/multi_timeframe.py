@@ -7,10 +7,11 @@ and calculates consensus across timeframes.
 
 import logging
 from typing import Optional, Dict, List
-from datetime import datetime, timedelta
-import aiohttp
 
+from signals.candle_store import candle_store
+from signals.indicator_cache import indicator_cache
 from signals.indicators import calculate_rsi, calculate_macd
+from signals.kernels import ema_last
 
 logger = logging.getLogger(__name__)
 
@@ -18,36 +19,15 @@ logger = logging.getLogger(__name__)
 class MultiTimeframeAnalyzer:
     """Analyzer for multi-timeframe technical analysis."""
     
-    # Bybit API endpoints
-    BYBIT_KLINE_URL = "https://api.bybit.com/v5/market/kline"
-    
-    # Timeframe mapping to Bybit intervals
-    TIMEFRAME_MAPPING = {
-        "15m": "15",
-        "1h": "60",
-        "4h": "240"
+    # Timeframe -> base interval it is resampled from (candles come from the
+    # shared Bybit spot store). 15m shares the 5m window with short-term
+    # signals, 4h shares the 1h window with the price history.
+    BASE_INTERVALS = {
+        "15m": "5m",
+        "1h": "1h",
+        "4h": "1h",
     }
     
-    # Cache TTL for candles
-    CACHE_TTL_SECONDS = 300  # 5 minutes
-    
-    def __init__(self):
-        """Initialize multi-timeframe analyzer."""
-        self._cache = {}
-        self._cache_timestamps = {}
-    
-    def _get_cache_key(self, symbol: str, timeframe: str) -> str:
-        """Generate cache key."""
-        return f"candles_{symbol}_{timeframe}"
-    
-    def _is_cache_valid(self, key: str) -> bool:
-        """Check if cache is still valid."""
-        if key not in self._cache:
-            return False
-        
-        age = datetime.now() - self._cache_timestamps.get(key, datetime.min)
-        return age.total_seconds() < self.CACHE_TTL_SECONDS
-    
     async def fetch_candles(
         self,
         symbol: str,
@@ -55,7 +35,10 @@ class MultiTimeframeAnalyzer:
         limit: int = 100
     ) -> Optional[List[Dict]]:
         """
-        Fetch OHLCV candles from Bybit API.
+        Fetch OHLCV candles from Bybit via the shared candle store.
+        
+        Higher timeframes are resampled locally from BASE_INTERVALS, and
+        repeated calls only fetch the bars that closed since the last call.
         
         Args:
             symbol: Trading symbol (e.g., "BTCUSDT")
@@ -63,7 +46,7 @@ class MultiTimeframeAnalyzer:
             limit: Number of candles to fetch
             
         Returns:
-            List of candles or None if failed
+            Candles (CandleSeries, oldest first) or None if failed
             Each candle: {
                 "timestamp": int,
                 "open": float,
@@ -73,88 +56,36 @@ class MultiTimeframeAnalyzer:
                 "volume": float
             }
         """
-        cache_key = self._get_cache_key(symbol, timeframe)
-        
-        # Check cache
-        if self._is_cache_valid(cache_key):
-            logger.debug(f"Using cached candles for {symbol} {timeframe}")
-            return self._cache[cache_key]
-        
-        # Validate timeframe
-        if timeframe not in self.TIMEFRAME_MAPPING:
+        if timeframe not in self.BASE_INTERVALS:
             logger.error(f"Invalid timeframe: {timeframe}")
             return None
         
-        interval = self.TIMEFRAME_MAPPING[timeframe]
-        
-        try:
-            params = {
-                "category": "spot",
-                "symbol": symbol,
-                "interval": interval,
-                "limit": limit
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.BYBIT_KLINE_URL, params=params) as response:
-                    if response.status != 200:
-                        logger.error(f"Bybit API error: {response.status}")
-                        return None
-                    
-                    data = await response.json()
-                    
-                    if data.get("retCode") != 0:
-                        logger.error(f"Bybit API error: {data.get('retMsg')}")
-                        return None
-                    
-                    # Parse candles
-                    result = data.get("result", {})
-                    raw_list = result.get("list", [])
-                    
-                    if not raw_list:
-                        logger.warning(f"No candles returned for {symbol} {timeframe}")
-                        return None
-                    
-                    candles = []
-                    for item in raw_list:
-                        # Bybit returns: [timestamp, open, high, low, close, volume, turnover]
-                        try:
-                            candle = {
-                                "timestamp": int(item[0]),
-                                "open": float(item[1]),
-                                "high": float(item[2]),
-                                "low": float(item[3]),
-                                "close": float(item[4]),
-                                "volume": float(item[5])
-                            }
-                            candles.append(candle)
-                        except (IndexError, ValueError) as e:
-                            logger.warning(f"Failed to parse candle: {e}")
-                            continue
-                    
-                    # Bybit returns newest first, reverse to get chronological order
-                    candles.reverse()
-                    
-                    # Cache the result
-                    self._cache[cache_key] = candles
-                    self._cache_timestamps[cache_key] = datetime.now()
-                    
-                    logger.info(f"Fetched {len(candles)} candles for {symbol} {timeframe}")
-                    return candles
-        
-        except Exception as e:
-            logger.error(f"Error fetching candles for {symbol} {timeframe}: {e}")
+        candles = await candle_store.get_resampled(
+            "bybit", symbol, timeframe, limit, self.BASE_INTERVALS[timeframe]
+        )
+        if not candles:
+            logger.warning(f"No candles returned for {symbol} {timeframe}")
             return None
+        
+        logger.debug(f"Got {len(candles)} candles for {symbol} {timeframe}")
+        return candles
     
     def calculate_timeframe_indicators(
         self,
-        candles: List[Dict]
+        candles: List[Dict],
+        symbol: Optional[str] = None,
+        timeframe: Optional[str] = None
     ) -> Optional[Dict]:
         """
         Calculate technical indicators for a timeframe.
         
+        With symbol and timeframe the result is memoized in indicator_cache
+        by the last candle, so repeated analyses of the same bars are free.
+        
         Args:
             candles: List of OHLCV candles
+            symbol: Trading symbol (cache key)
+            timeframe: Candle timeframe (cache key)
             
         Returns:
             Dict with indicators or None if failed
@@ -162,6 +93,16 @@ class MultiTimeframeAnalyzer:
         if not candles or len(candles) < 30:
             return None
         
+        return indicator_cache.get_or_compute(
+            "timeframe_indicators",
+            candles,
+            lambda: self._compute_timeframe_indicators(candles),
+            symbol=symbol,
+            interval=timeframe,
+        )
+    
+    def _compute_timeframe_indicators(self, candles: List[Dict]) -> Optional[Dict]:
+        """Calculate RSI, MACD and EMA 12/26 for a timeframe."""
         try:
             # Extract price arrays
             closes = [c["close"] for c in candles]
@@ -204,13 +145,7 @@ class MultiTimeframeAnalyzer:
             return None
         
         try:
-            multiplier = 2 / (period + 1)
-            ema = prices[0]
-            
-            for price in prices[1:]:
-                ema = (price * multiplier) + (ema * (1 - multiplier))
-            
-            return ema
+            return ema_last(prices, period)
         except Exception:
             return None
     
@@ -282,7 +217,7 @@ class MultiTimeframeAnalyzer:
         for tf in timeframes:
             candles = await self.fetch_candles(symbol, tf, limit=100)
             if candles:
-                indicators = self.calculate_timeframe_indicators(candles)
+                indicators = self.calculate_timeframe_indicators(candles, symbol, tf)
                 if indicators:
                     results[tf] = indicators
         
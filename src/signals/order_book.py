@@ -0,0 +1,229 @@
+"""
+Order Book - локальный L2 стакан из снимка и дельт.
+
+Каждая сторона - отсортированные массивы уровней от лучшей цены (у bids
+ключ сортировки - цена со знаком минус) и накопленные объёмы, которые
+пересчитываются лениво после обновлений. Поэтому запросы не трогают все
+уровни:
+
+- объём лучших N уровней и объём в пределах X% от mid - O(log n);
+- дисбаланс bid/ask - O(log n);
+- стены - уровни, объём которых в multiple раз выше среднего по диапазону;
+- изменение объёма с момента T - бинарный поиск по истории объёмов,
+  которая пишется не чаще раза в секунду.
+
+Дельта уровня с нулевым объёмом удаляет уровень (формат Bybit v5).
+"""
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Levels = Iterable[Sequence]
+
+
+class _Side:
+    """Одна сторона стакана: ключи по возрастанию (лучший уровень - первый)."""
+
+    def __init__(self, sign: int):
+        self.sign = sign  # +1 для asks, -1 для bids
+        self.keys = np.empty(0)
+        self.sizes = np.empty(0)
+        self._cumulative: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.keys * self.sign
+
+    @property
+    def cumulative(self) -> np.ndarray:
+        if self._cumulative is None:
+            self._cumulative = np.cumsum(self.sizes)
+        return self._cumulative
+
+    def _parse(self, levels: Levels) -> Tuple[np.ndarray, np.ndarray]:
+        table = np.asarray([(float(price), float(size)) for price, size in levels], dtype=np.float64).reshape(-1, 2)
+        # Повтор цены в одном сообщении - действует последний
+        keys, first = np.unique(table[::-1, 0] * self.sign, return_index=True)
+        return keys, table[::-1, 1][first]
+
+    def replace(self, levels: Levels):
+        keys, sizes = self._parse(levels)
+        present = sizes > 0
+        self.keys, self.sizes = keys[present], sizes[present]
+        self._cumulative = None
+
+    def update(self, levels: Levels):
+        keys, sizes = self._parse(levels)
+        if not len(keys):
+            return
+        keep = ~np.isin(self.keys, keys)
+        old_keys, old_sizes = self.keys[keep], self.sizes[keep]
+        present = sizes > 0
+        keys, sizes = keys[present], sizes[present]
+        positions = np.searchsorted(old_keys, keys)
+        self.keys = np.insert(old_keys, positions, keys)
+        self.sizes = np.insert(old_sizes, positions, sizes)
+        self._cumulative = None
+
+    def count_within(self, price_limit: float) -> int:
+        """Число уровней не дальше price_limit от лучшего."""
+        return int(np.searchsorted(self.keys, price_limit * self.sign, side="right"))
+
+    def volume(self, count: int) -> float:
+        count = min(count, len(self.keys))
+        return float(self.cumulative[count - 1]) if count > 0 else 0.0
+
+
+class OrderBook:
+    """
+    L2 стакан одного символа.
+
+    Args:
+        history_seconds: Сколько секунд истории объёмов держать для delta_since
+        history_depth: Число лучших уровней, объём которых пишется в историю
+    """
+
+    HISTORY_STEP_MS = 1000
+
+    def __init__(self, history_seconds: int = 600, history_depth: int = 50):
+        self.bids = _Side(-1)
+        self.asks = _Side(1)
+        self.history_ms = history_seconds * 1000
+        self.history_depth = history_depth
+        self.update_id = 0
+        self.updated_at = 0
+        self._history_times: List[int] = []
+        self._history_volumes: List[Tuple[float, float]] = []
+
+    @classmethod
+    def from_snapshot(cls, bids: Levels, asks: Levels, timestamp: int = 0, **kwargs) -> "OrderBook":
+        """Стакан из одного снимка (например, ответа REST)."""
+        book = cls(**kwargs)
+        book.apply("snapshot", {"b": bids, "a": asks}, timestamp)
+        return book
+
+    def apply(self, kind: str, data: Dict, timestamp: int = 0):
+        """Применить снимок ("snapshot") или дельту ("delta") в формате {"b": [...], "a": [...]}."""
+        if kind == "snapshot":
+            self.bids.replace(data.get("b", []))
+            self.asks.replace(data.get("a", []))
+        else:
+            self.bids.update(data.get("b", []))
+            self.asks.update(data.get("a", []))
+        self.update_id = int(data.get("u", self.update_id))
+        self.updated_at = timestamp
+        self._record(timestamp)
+
+    # === Уровни ===
+
+    def _side(self, side: str) -> _Side:
+        if side not in ("bids", "asks"):
+            raise ValueError(f"Unknown order book side: {side}")
+        return self.bids if side == "bids" else self.asks
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return float(-self.bids.keys[0]) if len(self.bids) else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return float(self.asks.keys[0]) if len(self.asks) else None
+
+    @property
+    def mid(self) -> Optional[float]:
+        if not len(self.bids) or not len(self.asks):
+            return None
+        return (self.best_bid + self.best_ask) / 2
+
+    def spread_pct(self) -> Optional[float]:
+        """Спред в % от лучшего bid."""
+        if self.mid is None:
+            return None
+        return (self.best_ask - self.best_bid) / self.best_bid * 100
+
+    def levels(self, side: str, depth: Optional[int] = None) -> List[List[float]]:
+        """Уровни [цена, объём] от лучшего ("bids" или "asks")."""
+        book_side = self._side(side)
+        return np.column_stack([book_side.prices[:depth], book_side.sizes[:depth]]).tolist()
+
+    # === Запросы ===
+
+    def volume(self, side: str, depth: Optional[int] = None) -> float:
+        """Объём лучших depth уровней (всех - без depth)."""
+        book_side = self._side(side)
+        return book_side.volume(len(book_side) if depth is None else depth)
+
+    def depth_within(self, pct: float) -> Tuple[float, float]:
+        """Объёмы (bid, ask) в пределах pct% от mid."""
+        mid = self.mid
+        if mid is None:
+            return 0.0, 0.0
+        bid_count = self.bids.count_within(mid * (1 - pct / 100))
+        ask_count = self.asks.count_within(mid * (1 + pct / 100))
+        return self.bids.volume(bid_count), self.asks.volume(ask_count)
+
+    def imbalance(self, pct: Optional[float] = None, depth: Optional[int] = None) -> float:
+        """
+        (bid - ask) / (bid + ask) от -1 до 1.
+
+        Объёмы - в пределах pct% от mid, иначе лучших depth уровней.
+        """
+        if pct is not None:
+            bid_volume, ask_volume = self.depth_within(pct)
+        else:
+            bid_volume, ask_volume = self.volume("bids", depth), self.volume("asks", depth)
+        total = bid_volume + ask_volume
+        return (bid_volume - ask_volume) / total if total > 0 else 0.0
+
+    def walls(self, side: str, multiple: float = 3.0, pct: Optional[float] = None) -> List[List[float]]:
+        """
+        Стены: уровни [цена, объём] от лучшего, объём которых не меньше
+        multiple средних по диапазону (pct% от mid или вся сторона).
+        """
+        book_side = self._side(side)
+        count = len(book_side)
+        if pct is not None and self.mid is not None:
+            factor = 1 - pct / 100 if side == "bids" else 1 + pct / 100
+            count = book_side.count_within(self.mid * factor)
+        if not count:
+            return []
+        threshold = multiple * book_side.volume(count) / count
+        found = np.flatnonzero(book_side.sizes[:count] >= threshold)
+        return [[float(book_side.prices[i]), float(book_side.sizes[i])] for i in found]
+
+    # === История ===
+
+    def _record(self, timestamp: int):
+        times = self._history_times
+        if times and timestamp - times[-1] < self.HISTORY_STEP_MS:
+            return
+        times.append(timestamp)
+        self._history_volumes.append(
+            (self.bids.volume(self.history_depth), self.asks.volume(self.history_depth))
+        )
+        if timestamp - times[0] > self.history_ms:
+            cut = bisect.bisect_left(times, timestamp - self.history_ms)
+            del times[:cut]
+            del self._history_volumes[:cut]
+
+    def delta_since(self, since_ms: float) -> Optional[Dict[str, float]]:
+        """
+        Изменение объёма лучших history_depth уровней с момента since_ms (%).
+
+        Returns:
+            {"bid_change", "ask_change", "delta"} или None, если история
+            не доходит до since_ms
+        """
+        index = bisect.bisect_right(self._history_times, since_ms) - 1
+        if index < 0:
+            return None
+        prev_bid, prev_ask = self._history_volumes[index]
+        bid_volume, ask_volume = self.volume("bids", self.history_depth), self.volume("asks", self.history_depth)
+        bid_change = (bid_volume - prev_bid) / prev_bid * 100 if prev_bid > 0 else 0.0
+        ask_change = (ask_volume - prev_ask) / prev_ask * 100 if prev_ask > 0 else 0.0
+        return {"bid_change": bid_change, "ask_change": ask_change, "delta": bid_change - ask_change}
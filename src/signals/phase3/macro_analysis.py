@@ -1,7 +1,8 @@
-import aiohttp
 import logging
 from typing import Dict, Optional
 
+from http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class MacroAnalyzer:
@@ -14,7 +15,7 @@ class MacroAnalyzer:
     async def get_dxy_data(self) -> Optional[Dict]:
         """DXY через Yahoo Finance (работает в РФ)"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://query1.finance.yahoo.com/v8/finance/chart/DX-Y.NYB"
                 params = {'interval': '1h', 'range': '2d'}
                 headers = {'User-Agent': 'Mozilla/5.0'}
@@ -45,7 +46,7 @@ class MacroAnalyzer:
     async def get_sp500_data(self) -> Optional[Dict]:
         """S&P500 через Yahoo Finance"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://query1.finance.yahoo.com/v8/finance/chart/%5EGSPC"
                 params = {'interval': '1h', 'range': '2d'}
                 headers = {'User-Agent': 'Mozilla/5.0'}
@@ -76,7 +77,7 @@ class MacroAnalyzer:
     async def get_gold_data(self) -> Optional[Dict]:
         """Gold через Yahoo Finance"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = "https://query1.finance.yahoo.com/v8/finance/chart/GC=F"
                 params = {'interval': '1h', 'range': '2d'}
                 headers = {'User-Agent': 'Mozilla/5.0'}
@@ -1,7 +1,8 @@
-import aiohttp
 import logging
 from typing import Dict, Optional
 
+from http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class OptionsAnalyzer:
@@ -23,7 +24,7 @@ class OptionsAnalyzer:
             return None
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with http_client.session() as session:
                 url = f"{self.BASE_URL}/get_book_summary_by_currency"
                 params = {'currency': currency, 'kind': 'option'}
                 
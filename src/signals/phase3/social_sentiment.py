@@ -1,7 +1,8 @@
-import aiohttp
 import logging
 from typing import Dict, Optional, List
 
+from http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 class SocialSentimentAnalyzer:
@@ -42,7 +43,7 @@ class SocialSentimentAnalyzer:
         total_engagement = 0
         posts_analyzed = 0
         
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session() as session:
             for subreddit in subreddits[:self.MAX_SUBREDDITS]:
                 try:
                     url = f"https://www.reddit.com/r/{subreddit}/hot.json"
@@ -0,0 +1,134 @@
+"""
+Replay Server - локальная замена WebSocket Bybit для тестов и офлайн-разработки.
+
+Проигрывает записанные сообщения (JSONL, см. MarketStream(record_path=...))
+по протоколу Bybit v5 public: клиент присылает {"op": "subscribe", "args":
+[topics]}, сервер отвечает подтверждением и отправляет сообщения только
+подписанных топиков; на {"op": "ping"} отвечает pong.
+
+    python -m signals.replay_server --file data/stream.jsonl --port 8765
+    MarketStream(url="ws://127.0.0.1:8765/v5/public/spot")
+
+speed - множитель времени по полю ts сообщений (None - без пауз).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from aiohttp import WSMsgType, web
+
+logger = logging.getLogger(__name__)
+
+WS_PATH = "/v5/public/spot"
+
+
+def load_frames(path: str) -> List[Dict]:
+    """Сообщения из JSONL-записи потока."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayServer:
+    """
+    WebSocket-сервер, проигрывающий сообщения биржи.
+
+    Args:
+        frames: Сообщения (dict или JSON-строки) в порядке отправки
+        host: Адрес
+        port: Порт (0 - любой свободный)
+        speed: Ускорение по ts сообщений (None - отправлять сразу)
+    """
+
+    def __init__(
+        self,
+        frames: Iterable[Union[Dict, str]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        speed: Optional[float] = None,
+    ):
+        self.frames = [json.loads(frame) if isinstance(frame, str) else frame for frame in frames]
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}{WS_PATH}"
+
+    async def start(self) -> str:
+        """Запустить сервер; возвращает адрес WebSocket."""
+        app = web.Application()
+        app.router.add_get(WS_PATH, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Replay server with {len(self.frames)} frames at {self.url}")
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        topics: Set[str] = set()
+        replay: Optional[asyncio.Task] = None
+
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                request_data = json.loads(message.data)
+                op = request_data.get("op")
+                if op == "ping":
+                    await ws.send_json({"op": "pong", "success": True})
+                elif op == "subscribe":
+                    topics.update(request_data.get("args", []))
+                    await ws.send_json({"op": "subscribe", "success": True, "ret_msg": ""})
+                    if replay is None:
+                        replay = asyncio.create_task(self._replay(ws, topics))
+        finally:
+            if replay is not None:
+                replay.cancel()
+        return ws
+
+    async def _replay(self, ws: web.WebSocketResponse, topics: Set[str]):
+        previous_ts = None
+        for frame in self.frames:
+            if frame.get("topic") not in topics:
+                continue
+            ts = frame.get("ts")
+            if self.speed and previous_ts is not None and ts is not None:
+                await asyncio.sleep(max(0, ts - previous_ts) / 1000 / self.speed)
+            previous_ts = ts
+            await ws.send_str(json.dumps(frame))
+
+
+async def _serve(args):
+    server = ReplayServer(load_frames(args.file), host=args.host, port=args.port, speed=args.speed)
+    print(f"Replaying {len(server.frames)} frames at {await server.start()}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Bybit WebSocket messages")
+    parser.add_argument("--file", required=True, help="JSONL recorded by MarketStream(record_path=...)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=None, help="Replay speed multiplier (default: no delays)")
+    asyncio.run(_serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
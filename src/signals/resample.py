@@ -0,0 +1,80 @@
+"""
+Resample - старшие таймфреймы из одной базовой серии свечей.
+
+Свечи бирж (Binance, Bybit, MEXC, Gate.io) выровнены по UTC от эпохи:
+бар 4h открывается в 00:00, 04:00, ... UTC, бар 1d - в 00:00 UTC. Поэтому
+корзина базового бара - floor(время / длительность интервала).
+
+В корзине: open - первого бара, high/low - экстремумы, close - последнего,
+объёмы (volume, volumeto, ...) суммируются. Последняя корзина - формирующийся
+бар (как в ответе биржи). Первая корзина без начала (история обрезана
+посередине бара) отбрасывается: её open/high/low неверны.
+"""
+
+from typing import Dict, List, Union
+
+import numpy as np
+
+from signals.candles import INTERVAL_MS, CandleSeries
+
+
+def base_bars_needed(interval: str, limit: int, base_interval: str) -> int:
+    """
+    Сколько базовых баров нужно для limit баров interval.
+
+    Одна корзина в запас - на случай неполной первой.
+    """
+    return (limit + 1) * (INTERVAL_MS[interval] // INTERVAL_MS[base_interval])
+
+
+def resample(
+    candles: Union[CandleSeries, List[Dict]],
+    interval: str,
+    time_scale: int = 1,
+    drop_partial_first: bool = True,
+) -> CandleSeries:
+    """
+    Свечи interval из более мелких свечей (от старых к новым).
+
+    Args:
+        candles: Базовые свечи со временем открытия
+        interval: Целевой интервал ("15m", "1h", "4h", "1d")
+        time_scale: Множитель времени свечей к мс (1000 для секунд)
+        drop_partial_first: Отбросить первую корзину, если история начинается не с её начала
+
+    Returns:
+        CandleSeries с теми же колонками и временем открытия корзин
+    """
+    series = CandleSeries.from_dicts(candles)
+    if not series.has_time:
+        raise ValueError("Resampling needs candle open times")
+    step = INTERVAL_MS[interval] // time_scale
+    if not len(series):
+        return series[:0]
+
+    times = series.times
+    buckets = times // step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    if drop_partial_first and times[0] != buckets[0] * step:
+        first = int(starts[1]) if len(starts) > 1 else len(series)
+        series, buckets = series[first:], buckets[first:]
+        starts = starts[1:] - first
+        if not len(series):
+            return series
+    ends = np.r_[starts[1:], len(series)] - 1
+
+    columns = {}
+    for name in series.columns:
+        values = series.column(name)
+        if name == "open":
+            columns[name] = values[starts]
+        elif name == "high":
+            columns[name] = np.maximum.reduceat(values, starts)
+        elif name == "low":
+            columns[name] = np.minimum.reduceat(values, starts)
+        elif name == "close":
+            columns[name] = values[ends]
+        else:
+            columns[name] = np.add.reduceat(values, starts)
+
+    return CandleSeries(columns, times=buckets[starts] * step, time_key=series.time_key)
@@ -15,7 +15,9 @@ import aiohttp
 from signals.exchanges.okx import OKXClient
 from signals.exchanges.bybit import BybitClient
 from signals.exchanges.gate import GateClient
+from signals.indicator_engine import OHLCVMatrix, bollinger_last, rsi_last
 from config import settings
+from http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -142,14 +144,14 @@ class RocketHunterAnalyzer:
     async def _ensure_session(self):
         """Ensure aiohttp session exists."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client.get_session()
 
     async def close(self):
         """Close all exchange connections."""
         for exchange in self.exchanges.values():
             await exchange.close()
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Shared http_client session - closed in on_shutdown
+        self.session = None
 
     def _is_valid_symbol(self, symbol: str) -> bool:
         """Проверяет валидность символа."""
@@ -705,24 +707,14 @@ class RocketHunterAnalyzer:
             return False
 
         try:
-            # Берём последние 20 свечей
-            closes = [float(c.get("close", 0)) for c in candles[-20:]]
-            if not closes:
-                return False
+            # Bollinger Bands по последним 20 свечам
+            ohlcv = OHLCVMatrix.from_candles([""], [candles], max_bars=20)
+            upper_band, _, lower_band, _ = bollinger_last(ohlcv.close, ohlcv.bars, period=20)
 
-            # Рассчитываем MA и стандартное отклонение
-            ma = sum(closes) / len(closes)
-            variance = sum((x - ma) ** 2 for x in closes) / len(closes)
-            std = variance**0.5
-
-            # Bollinger Bands
-            upper_band = ma + 2 * std
-            lower_band = ma - 2 * std
-
-            current_price = closes[-1]
+            current_price = ohlcv.close[0, -1]
 
             # Пробой вверх или вниз
-            return current_price > upper_band or current_price < lower_band
+            return bool(current_price > upper_band[0] or current_price < lower_band[0])
 
         except Exception as e:
             logger.warning(f"Error checking BB breakout: {e}")
@@ -734,30 +726,8 @@ class RocketHunterAnalyzer:
             return 50.0
 
         try:
-            closes = [float(c.get("close", 0)) for c in candles[-(period + 1) :]]
-
-            gains = []
-            losses = []
-
-            for i in range(1, len(closes)):
-                change = closes[i] - closes[i - 1]
-                if change > 0:
-                    gains.append(change)
-                    losses.append(0)
-                else:
-                    gains.append(0)
-                    losses.append(abs(change))
-
-            avg_gain = sum(gains) / len(gains) if gains else 0
-            avg_loss = sum(losses) / len(losses) if losses else 0
-
-            if avg_loss == 0:
-                return 100.0
-
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-            return rsi
+            ohlcv = OHLCVMatrix.from_candles([""], [candles], max_bars=period + 1)
+            return float(rsi_last(ohlcv.close, ohlcv.bars, period)[0])
 
         except Exception as e:
             logger.warning(f"Error calculating RSI: {e}")
@@ -6,6 +6,9 @@ import logging
 from typing import Dict, List
 import numpy as np
 
+from signals import indicators
+from signals.kernels import ema_last
+
 logger = logging.getLogger(__name__)
 
 
@@ -244,14 +247,7 @@ def calculate_ema(prices: List[float], period: int) -> float:
     if len(prices) < period:
         return np.mean(prices) if prices else 0
     
-    prices_array = np.array(prices)
-    ema = prices_array[0]
-    multiplier = 2 / (period + 1)
-    
-    for price in prices_array[1:]:
-        ema = (price - ema) * multiplier + ema
-    
-    return float(ema)
+    return ema_last(prices, period)
 
 
 def calculate_adx(high: List[float], low: List[float], close: List[float], period: int = 14) -> float:
@@ -271,38 +267,9 @@ def calculate_adx(high: List[float], low: List[float], close: List[float], perio
         return 25.0  # Нейтральное значение
     
     try:
-        # Упрощённый расчёт ADX
-        high_arr = np.array(high)
-        low_arr = np.array(low)
-        close_arr = np.array(close)
-        
-        # True Range
-        tr1 = high_arr[1:] - low_arr[1:]
-        tr2 = np.abs(high_arr[1:] - close_arr[:-1])
-        tr3 = np.abs(low_arr[1:] - close_arr[:-1])
-        tr = np.maximum(tr1, np.maximum(tr2, tr3))
-        
-        # Smoothed TR
-        atr = np.mean(tr[-period:])
-        
-        # +DM and -DM
-        dm_plus = np.maximum(high_arr[1:] - high_arr[:-1], 0)
-        dm_minus = np.maximum(low_arr[:-1] - low_arr[1:], 0)
-        
-        # Smooth DM
-        dm_plus_smooth = np.mean(dm_plus[-period:])
-        dm_minus_smooth = np.mean(dm_minus[-period:])
-        
-        # Directional Indicators
-        if atr > 0:
-            di_plus = (dm_plus_smooth / atr) * 100
-            di_minus = (dm_minus_smooth / atr) * 100
-            
-            # ADX
-            dx = abs(di_plus - di_minus) / (di_plus + di_minus) * 100 if (di_plus + di_minus) > 0 else 0
-            return float(dx)
-        else:
-            return 25.0
+        # ADX по Уайлдеру - общий расчёт из indicators
+        adx = indicators.calculate_adx(high, low, close, period)
+        return float(adx.value) if adx else 25.0
     except Exception as e:
         logger.warning(f"ADX calculation error: {e}")
         return 25.0
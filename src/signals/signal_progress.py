@@ -0,0 +1,181 @@
+"""
+Signal Progress - промежуточные результаты AI сигнала во время анализа.
+
+Полный анализ монеты длится несколько секунд, и всё это время пользователь
+видит "⏳ Анализирую данные...". SignalProgress собирает результаты
+источников по мере их готовности (FetchPlan.run(on_result=...)) и рендерит
+короткое превью: цена и индикаторы, затем деривативы, киты и расчёт
+сигнала с enhancers.
+
+ThrottledEditor доставляет превью в Telegram: правки коалесцируются,
+отправляется только последний текст и не чаще одного раза в min_interval
+секунд (лимит Telegram на редактирование сообщений).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Этапы превью: (имя, заголовок, источники FetchPlan, после которых этап готов).
+# Этап без источников отмечается вручную через SignalProgress.complete().
+PROGRESS_STAGES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("market", "💰 Цена и индикаторы", ("market_data", "technical_data")),
+    ("derivatives", "📊 Деривативы", ("funding_rate", "coinglass_data", "liquidations", "deep_derivatives_data")),
+    ("whales", "🐋 Киты", ("whale_data", "whale_alert", "deep_whale_data")),
+    ("signal", "🧠 Enhancers и расчёт сигнала", ()),
+)
+
+# Источники, значения которых показываются в превью
+PREVIEW_NODES = frozenset({"market_data", "technical_data", "funding_rate", "whale_data"})
+
+
+class SignalProgress:
+    """
+    Состояние анализа одной монеты.
+
+    Args:
+        symbol: Символ монеты
+        stages: Этапы превью (по умолчанию PROGRESS_STAGES)
+    """
+
+    def __init__(self, symbol: str, stages: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = PROGRESS_STAGES):
+        self.symbol = symbol
+        self.stages = stages
+        self.data: Dict[str, Any] = {}
+        self.completed: Set[str] = set()
+
+    def update(self, node: str, value: Any) -> bool:
+        """
+        Учесть готовый источник.
+
+        Returns:
+            True, если превью изменилось (готов этап или новое значение для показа)
+        """
+        self.data[node] = value
+        before = len(self.completed)
+        for stage, _, nodes in self.stages:
+            if nodes and stage not in self.completed and all(n in self.data for n in nodes):
+                self.completed.add(stage)
+        return len(self.completed) != before or (node in PREVIEW_NODES and value is not None)
+
+    def complete(self, stage: str) -> bool:
+        """Отметить этап готовым. Returns: True, если этап не был готов."""
+        if stage in self.completed:
+            return False
+        self.completed.add(stage)
+        return True
+
+    @property
+    def done(self) -> bool:
+        return all(stage in self.completed for stage, _, _ in self.stages)
+
+    def render(self) -> str:
+        """Текст превью (Markdown)."""
+        lines = [f"⏳ *Анализ {self.symbol}*", ""]
+
+        market = self.data.get("market_data")
+        if market and market.get("price_usd"):
+            change = market.get("change_24h", 0) or 0
+            lines.append(f"💰 ${market['price_usd']:,.2f} ({change:+.2f}% за 24ч)")
+
+        technical = self.data.get("technical_data") or {}
+        indicators = []
+        if "rsi" in technical:
+            indicators.append(f"RSI {technical['rsi']['value']:.0f}")
+        if "macd" in technical:
+            indicators.append(f"MACD {technical['macd']['signal']}")
+        if indicators:
+            lines.append("📈 " + " | ".join(indicators))
+
+        funding = self.data.get("funding_rate")
+        if funding and funding.get("rate_percent") is not None:
+            lines.append(f"💸 Funding {funding['rate_percent']:.4f}%")
+
+        whales = self.data.get("whale_data")
+        if whales and whales.get("transaction_count"):
+            lines.append(f"🐋 Выводы {whales.get('withdrawals', 0)} / депозиты {whales.get('deposits', 0)}")
+
+        if len(lines) > 2:
+            lines.append("")
+        for stage, title, _ in self.stages:
+            mark = "✅" if stage in self.completed else "⏳"
+            lines.append(f"{mark} {title}")
+        return "\n".join(lines)
+
+
+class ThrottledEditor:
+    """
+    Коалесцирующее редактирование одного сообщения.
+
+    submit() можно вызывать сколь угодно часто: между отправками копится
+    только последний текст, одинаковые тексты не отправляются повторно.
+
+    Args:
+        send: Корутина-функция, отправляющая текст (например, edit_text)
+        min_interval: Минимальный интервал между отправками в секундах
+    """
+
+    DEFAULT_MIN_INTERVAL = 1.5
+
+    def __init__(self, send: Callable[[str], Awaitable[Any]], min_interval: float = DEFAULT_MIN_INTERVAL):
+        self._send = send
+        self.min_interval = min_interval
+        self._pending: Optional[str] = None
+        self._last_text: Optional[str] = None
+        self._last_sent = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+        self._sending = False
+        self._closed = False
+        self.stats = {"submitted": 0, "sent": 0, "coalesced": 0}
+
+    def submit(self, text: str):
+        """Запланировать показ текста (без ожидания отправки)."""
+        if self._closed:
+            return
+        self.stats["submitted"] += 1
+        if self._pending is not None:
+            self.stats["coalesced"] += 1
+        self._pending = text
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._flush())
+
+    async def _flush(self):
+        while self._pending is not None and not self._closed:
+            delay = self._last_sent + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            text, self._pending = self._pending, None
+            if text is None or text == self._last_text:
+                continue
+            self._sending = True
+            try:
+                await self._send(text)
+                self.stats["sent"] += 1
+            except Exception as e:
+                logger.warning(f"Progress edit failed: {e}")
+            finally:
+                self._sending = False
+            self._last_text = text
+            self._last_sent = time.monotonic()
+
+    async def close(self):
+        """
+        Прекратить правки перед отправкой итогового сообщения.
+
+        Ожидающий текст отбрасывается; уже идущая отправка дожидается
+        завершения, чтобы не перезаписать итоговое сообщение.
+        """
+        self._closed = True
+        self._pending = None
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        if not self._sending:
+            task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
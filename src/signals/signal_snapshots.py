@@ -0,0 +1,224 @@
+"""
+Signal Snapshots - фоновый предрасчёт AI сигналов.
+
+Набор монет для AI сигналов небольшой и фиксированный
+(AISignalAnalyzer.SUPPORTED_SIGNAL_COINS), поэтому полный сигнал для каждой
+монеты пересчитывается в фоне с фиксированным интервалом. Нажатие кнопки
+обслуживается из готового снимка за миллисекунды с пометкой
+"рассчитано N секунд назад"; по запросу снимок можно обновить немедленно.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SignalSnapshot:
+    """Готовый снимок AI сигнала."""
+    symbol: str
+    message: str
+    signal_data: Dict = field(default_factory=dict)
+    market_data: Dict = field(default_factory=dict)
+    computed_at: float = field(default_factory=time.time)
+
+    @property
+    def age_seconds(self) -> float:
+        """Возраст снимка в секундах."""
+        return max(0.0, time.time() - self.computed_at)
+
+
+class SignalSnapshotService:
+    """
+    Фоновый сервис предрасчёта сигналов.
+
+    Args:
+        analyzer: Экземпляр AISignalAnalyzer
+        symbols: Монеты для предрасчёта (по умолчанию SUPPORTED_SIGNAL_COINS)
+        refresh_interval: Интервал пересчёта в секундах
+        max_age: Максимальный возраст снимка, который можно показать пользователю
+    """
+
+    DEFAULT_REFRESH_INTERVAL = 120  # 2 минуты
+    # BTC считается первым - его сигнал используется для корреляции ETH/TON
+    LEADING_SYMBOL = "BTC"
+
+    def __init__(
+        self,
+        analyzer,
+        symbols: Optional[Iterable[str]] = None,
+        refresh_interval: int = DEFAULT_REFRESH_INTERVAL,
+        max_age: Optional[int] = None,
+    ):
+        self.analyzer = analyzer
+        self.symbols = self._order_symbols(symbols or analyzer.SUPPORTED_SIGNAL_COINS)
+        self.refresh_interval = refresh_interval
+        # Снимок не должен быть старше кэша параметров сигнала (get_signal_params)
+        self.max_age = max_age if max_age is not None else analyzer.SIGNAL_CACHE_TTL
+        self._snapshots: Dict[str, SignalSnapshot] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _order_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """BTC первым, остальные по алфавиту."""
+        ordered = sorted({s.upper() for s in symbols})
+        if self.LEADING_SYMBOL in ordered:
+            ordered.remove(self.LEADING_SYMBOL)
+            ordered.insert(0, self.LEADING_SYMBOL)
+        return ordered
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Запустить фоновый пересчёт (идемпотентно)."""
+        if self.is_running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Signal precompute started for {', '.join(self.symbols)} "
+            f"(every {self.refresh_interval}s)"
+        )
+
+    async def stop(self):
+        """Остановить фоновый пересчёт."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Signal precompute stopped")
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.refresh_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Signal precompute cycle failed: {e}", exc_info=True)
+            elapsed = time.monotonic() - started
+            await asyncio.sleep(max(1.0, self.refresh_interval - elapsed))
+
+    async def refresh_all(self):
+        """
+        Пересчитать снимки для всех монет одним пакетом.
+
+        analyze_coins загружает общие рыночные данные один раз и считает
+        BTC первым, передавая его сигнал в корреляцию остальных монет.
+        """
+        try:
+            messages = await self.analyzer.analyze_coins(self.symbols, force_refresh=True)
+        except Exception as e:
+            logger.error(f"Signal precompute batch failed: {e}", exc_info=True)
+            return
+        for symbol, message in messages.items():
+            self._store(symbol, message)
+
+    async def refresh(self, symbol: str) -> Optional[SignalSnapshot]:
+        """
+        Пересчитать снимок для монеты.
+
+        Returns:
+            Новый снимок или None, если анализ завершился ошибкой
+            (предыдущий снимок в этом случае сохраняется).
+        """
+        snapshot, _ = await self._compute(symbol.upper(), force_refresh=True)
+        return snapshot
+
+    async def _compute(
+        self,
+        symbol: str,
+        force_refresh: bool = False,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Optional[SignalSnapshot], str]:
+        """Выполнить анализ и сохранить снимок. Возвращает (снимок, сообщение анализатора)."""
+        try:
+            message = await self.analyzer.analyze_coin(
+                symbol, force_refresh=force_refresh, on_progress=on_progress
+            )
+        except Exception as e:
+            logger.error(f"Signal precompute failed for {symbol}: {e}", exc_info=True)
+            return None, (
+                "❌ *Ошибка анализа*\n\n"
+                f"Произошла ошибка при анализе {symbol}.\n"
+                "Попробуйте позже."
+            )
+        return self._store(symbol, message), message
+
+    def _store(self, symbol: str, message: str) -> Optional[SignalSnapshot]:
+        """Сохранить снимок по сообщению анализатора (сообщения об ошибках не сохраняются)."""
+        if not message or message.startswith("❌"):
+            logger.warning(f"Signal analysis for {symbol} returned an error message, keeping previous snapshot")
+            return None
+
+        last_signal = self.analyzer.get_last_signal(symbol) or {}
+        snapshot = SignalSnapshot(
+            symbol=symbol,
+            message=message,
+            signal_data=last_signal.get("signal_data") or {},
+            market_data=last_signal.get("market_data") or {},
+            computed_at=last_signal.get("timestamp", time.time()),
+        )
+        self._snapshots[symbol] = snapshot
+        logger.info(f"Signal snapshot updated for {symbol}")
+        return snapshot
+
+    def get_snapshot(self, symbol: str) -> Optional[SignalSnapshot]:
+        """Получить снимок, если он не старше max_age."""
+        snapshot = self._snapshots.get(symbol.upper())
+        if snapshot is None or snapshot.age_seconds > self.max_age:
+            return None
+        return snapshot
+
+    @staticmethod
+    def format_age(seconds: float) -> str:
+        """Человекочитаемый возраст снимка."""
+        seconds = int(seconds)
+        if seconds < 60:
+            return f"{seconds} сек назад"
+        return f"{seconds // 60} мин {seconds % 60} сек назад"
+
+    def render(self, snapshot: SignalSnapshot) -> str:
+        """Сообщение снимка с пометкой о времени расчёта."""
+        return f"{snapshot.message}\n\n🕐 Рассчитано {self.format_age(snapshot.age_seconds)}"
+
+    async def get_message(
+        self,
+        symbol: str,
+        force_refresh: bool = False,
+        on_progress: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """
+        Получить сообщение с сигналом.
+
+        Args:
+            symbol: Символ монеты
+            force_refresh: Пересчитать сигнал немедленно
+            on_progress: Получатель промежуточных результатов, если сигнал
+                         считается сейчас (см. AISignalAnalyzer.analyze_coin)
+
+        Returns:
+            Сообщение из снимка (с пометкой возраста) или результат прямого анализа
+        """
+        symbol = symbol.upper()
+
+        if not force_refresh:
+            snapshot = self.get_snapshot(symbol)
+            if snapshot is not None:
+                return self.render(snapshot)
+
+        snapshot, message = await self._compute(symbol, force_refresh=force_refresh, on_progress=on_progress)
+        if snapshot is not None:
+            return self.render(snapshot)
+
+        # Неподдерживаемая монета или ошибка анализа - отдаём сообщение анализатора
+        return message
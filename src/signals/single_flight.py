@@ -0,0 +1,104 @@
+"""
+Single Flight - объединение одновременных одинаковых запросов.
+
+Когда несколько пользователей одновременно запрашивают один и тот же сигнал,
+вычисление выполняется один раз: все вызывающие ждут общую задачу и получают
+одинаковый результат. Готовый результат дополнительно переиспользуется
+в течение окна свежести (freshness window).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Коалесцирующий слой: один ключ - одно вычисление в полёте.
+
+    Args:
+        window_seconds: Сколько секунд переиспользовать готовый результат (0 - только in-flight)
+        should_cache: Предикат, решающий, можно ли переиспользовать результат
+                      (например, не кэшировать сообщения об ошибках)
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 0,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.window_seconds = window_seconds
+        self.should_cache = should_cache
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "window_hits": 0}
+
+    def _get_fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is None:
+            return False, None
+        completed_at, result = entry
+        if time.monotonic() - completed_at > self.window_seconds:
+            del self._results[key]
+            return False, None
+        return True, result
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполнить func() для ключа или присоединиться к уже идущему вычислению.
+
+        Args:
+            key: Ключ коалесцирования (например, символ монеты)
+            func: Фабрика корутины, выполняющей вычисление
+
+        Returns:
+            Результат общего вычисления
+        """
+        self.stats["calls"] += 1
+
+        if self.window_seconds > 0:
+            hit, result = self._get_fresh(key)
+            if hit:
+                self.stats["window_hits"] += 1
+                return result
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done():
+            self.stats["coalesced"] += 1
+            logger.debug(f"SingleFlight: joining in-flight computation for {key}")
+        else:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(self._execute(key, func))
+            self._inflight[key] = task
+
+        # shield: отмена одного ожидающего не должна отменять общее вычисление
+        return await asyncio.shield(task)
+
+    async def _execute(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await func()
+            if self.window_seconds > 0 and (self.should_cache is None or self.should_cache(result)):
+                self._results[key] = (time.monotonic(), result)
+            return result
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def forget(self, key: Optional[Hashable] = None):
+        """
+        Сбросить сохранённый результат (для ключа или для всех ключей).
+
+        Вычисления в полёте не затрагиваются.
+        """
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Идёт ли сейчас вычисление для ключа."""
+        task = self._inflight.get(key)
+        return task is not None and not task.done()
@@ -8,18 +8,20 @@ from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import asyncio
 import aiohttp
-import statistics
+import numpy as np
 
 from signals.exchanges.okx import OKXClient
 from signals.exchanges.bybit import BybitClient
 from signals.exchanges.gate import GateClient
+from signals.indicator_engine import OHLCVMatrix, compute_indicator_table
 from signals.scoring import (
     calculate_momentum_score, calculate_volume_score,
     calculate_trend_score, calculate_volatility_score,
     calculate_total_score, apply_score_bonuses,
-    calculate_ema, calculate_adx, clamp
+    clamp
 )
 from config import settings
+from http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -178,14 +180,14 @@ class SmartSignalAnalyzer:
     async def _ensure_session(self):
         """Ensure aiohttp session exists."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client.get_session()
     
     async def close(self):
         """Close all exchange connections."""
         for exchange in self.exchanges.values():
             await exchange.close()
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Shared http_client session - closed in on_shutdown
+        self.session = None
     
     def _is_valid_symbol(self, symbol: str) -> bool:
         """
@@ -765,12 +767,54 @@ class SmartSignalAnalyzer:
             "has_changes": bool(added or removed),
         }
     
-    async def calculate_score(self, coin: Dict) -> Optional[Dict]:
+    def _calculate_indicators(self, ohlcv_list: List[List[Dict]]) -> List[Dict]:
+        """
+        Индикаторы 1h для нескольких монет одним проходом (см. signals.indicator_engine).
+
+        Returns:
+            Для каждой монеты: current_volume, avg_volume, volume_ratio,
+            ema_short, ema_long, adx, atr_pct, bb_width_pct
+        """
+        rows = [str(i) for i in range(len(ohlcv_list))]
+        table = compute_indicator_table(OHLCVMatrix.from_candles(rows, ohlcv_list), bb_period=20, ema_periods=(9, 21))
+
+        # BB width считается по выборочному стандартному отклонению (как statistics.stdev)
+        sample_std = table["bb_std"] * np.sqrt(20 / 19)
+
+        results = []
+        for i, ohlcv in enumerate(ohlcv_list):
+            prices = [c["close"] for c in ohlcv]
+            current_price = table["close"][i]
+            fallback_ema = float(np.mean(prices)) if prices else 0
+
+            results.append({
+                "current_volume": float(table["volume"][i]),
+                "avg_volume": float(table["volume_avg"][i]),
+                "volume_ratio": float(table["volume_ratio"][i]),
+                "ema_short": fallback_ema if np.isnan(table["ema_9"][i]) else float(table["ema_9"][i]),
+                "ema_long": fallback_ema if np.isnan(table["ema_21"][i]) else float(table["ema_21"][i]),
+                "adx": 25.0 if np.isnan(table["adx"][i]) else float(table["adx"][i]),
+                "atr_pct": 2.0 if np.isnan(table["range_pct"][i]) else float(table["range_pct"][i]),
+                "bb_width_pct": (
+                    float(sample_std[i] * 2 / current_price * 100)
+                    if current_price > 0 and not np.isnan(sample_std[i]) else 5.0
+                ),
+            })
+        return results
+
+    async def calculate_score(
+        self,
+        coin: Dict,
+        exchange_data: Optional[Dict] = None,
+        indicators: Optional[Dict] = None,
+    ) -> Optional[Dict]:
         """
         Рассчитывает score для монеты.
         
         Args:
             coin: Данные монеты от CoinGecko
+            exchange_data: Уже загруженные данные биржи (иначе загружаются)
+            indicators: Уже рассчитанная строка _calculate_indicators (иначе считается)
             
         Returns:
             Dict с score и метриками или None
@@ -778,7 +822,8 @@ class SmartSignalAnalyzer:
         symbol = coin["symbol"]
         
         # Получаем данные с биржи
-        exchange_data = await self._get_data_with_fallback(symbol)
+        if exchange_data is None:
+            exchange_data = await self._get_data_with_fallback(symbol)
         if not exchange_data:
             return None
         
@@ -794,9 +839,6 @@ class SmartSignalAnalyzer:
         # Извлекаем цены для расчётов
         try:
             prices_1h = [c["close"] for c in ohlcv_1h]
-            highs = [c["high"] for c in ohlcv_1h]
-            lows = [c["low"] for c in ohlcv_1h]
-            volumes = [c["volume"] for c in ohlcv_1h]
             
             if len(prices_1h) < 20:
                 return None
@@ -813,28 +855,27 @@ class SmartSignalAnalyzer:
             momentum_score_4h = calculate_momentum_score({"1h": 0, "4h": change_4h})
             momentum_score_1h = calculate_momentum_score({"1h": change_1h, "4h": 0})
             
+            if indicators is None:
+                indicators = self._calculate_indicators([ohlcv_1h])[0]
+            
             # Volume score
-            avg_volume = sum(volumes[:-1]) / len(volumes[:-1]) if len(volumes) > 1 else volumes[-1]
-            current_volume = volumes[-1]
-            volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
+            avg_volume = indicators["avg_volume"]
+            current_volume = indicators["current_volume"]
+            volume_ratio = indicators["volume_ratio"]
             volume_score = calculate_volume_score(current_volume, avg_volume)
             
             # Trend score (EMA + ADX)
-            ema_short = calculate_ema(prices_1h, 9)
-            ema_long = calculate_ema(prices_1h, 21)
-            adx = calculate_adx(highs, lows, prices_1h, 14)
+            ema_short = indicators["ema_short"]
+            ema_long = indicators["ema_long"]
+            adx = indicators["adx"]
             trend_score = calculate_trend_score(
                 {"ema_short": ema_short, "ema_long": ema_long, "price": current_price},
                 adx
             )
             
             # Volatility score (упрощённый ATR + BB width)
-            high_low_range = [(h - l) / l * 100 for h, l in zip(highs[-14:], lows[-14:]) if l > 0]
-            atr_pct = sum(high_low_range) / len(high_low_range) if high_low_range else 2.0
-            
-            # BB width (упрощённо через std)
-            price_std = statistics.stdev(prices_1h[-20:]) if len(prices_1h) >= 20 else 0
-            bb_width_pct = (price_std * 2 / current_price) * 100 if current_price > 0 else 5.0
+            atr_pct = indicators["atr_pct"]
+            bb_width_pct = indicators["bb_width_pct"]
             
             volatility_score = calculate_volatility_score(atr_pct, bb_width_pct)
             
@@ -933,11 +974,30 @@ class SmartSignalAnalyzer:
         # Configurable via settings.smart_signals_max_analyze
         max_coins_to_analyze = min(len(filtered_coins), self.MAX_ANALYZE)
         
-        async def score_coin_with_limit(coin):
+        coins_to_analyze = filtered_coins[:max_coins_to_analyze]
+        
+        async def fetch_with_limit(coin):
+            async with semaphore:
+                return await self._get_data_with_fallback(coin["symbol"])
+        
+        fetched = await asyncio.gather(*[fetch_with_limit(coin) for coin in coins_to_analyze], return_exceptions=True)
+        ready = [
+            (coin, data) for coin, data in zip(coins_to_analyze, fetched)
+            if data and not isinstance(data, Exception)
+        ]
+        
+        # Индикаторы всех монет - одним векторизованным проходом
+        try:
+            indicators = self._calculate_indicators([data["ohlcv_1h"] for _, data in ready])
+        except Exception as e:
+            logger.warning(f"Batch indicator calculation failed: {e}")
+            indicators = [None] * len(ready)
+        
+        async def score_coin_with_limit(coin, data, row):
             async with semaphore:
-                return await self.calculate_score(coin)
+                return await self.calculate_score(coin, exchange_data=data, indicators=row)
         
-        tasks = [score_coin_with_limit(coin) for coin in filtered_coins[:max_coins_to_analyze]]
+        tasks = [score_coin_with_limit(coin, data, row) for (coin, data), row in zip(ready, indicators)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         for result in results:
@@ -0,0 +1,115 @@
+"""
+Индекс уровней поддержки/сопротивления.
+
+SRIndex строится один раз по массиву свечей: свинги ищутся сравнением
+сдвинутых окон NumPy, касания считаются сразу для всех уровней
+(см. indicators.count_level_touches). PriceLevelIndex хранит уровни
+отсортированными и отвечает на "ближайший уровень выше/ниже цены P"
+бинарным поиском за O(log n); построение индекса - одна сортировка, так что
+он окупается, когда к одному набору уровней много запросов. Для одного
+запроса достаточно прохода по списку.
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from signals.candles import candle_column
+from signals.indicators import (
+    SwingPoint,
+    calculate_level_strength,
+    count_level_touches,
+    swing_points_from_arrays,
+)
+
+
+def _price_getter(key: Union[str, Callable[[Any], float]]) -> Callable[[Any], float]:
+    if callable(key):
+        return key
+    return lambda level: float(level.get(key, 0))
+
+
+class PriceLevelIndex:
+    """
+    Отсортированный набор уровней (dict с ценой или любые объекты + key).
+
+    При равных ценах уровни возвращаются в исходном порядке.
+    """
+
+    def __init__(self, levels: Sequence[Any], key: Union[str, Callable[[Any], float]] = "price"):
+        price = _price_getter(key)
+        pairs = sorted(((price(level), position) for position, level in enumerate(levels)))
+        self._levels = list(levels)
+        self._prices = [p for p, _ in pairs]
+        self._order = [position for _, position in pairs]
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def above(self, price: float, count: Optional[int] = None) -> List[Any]:
+        """Уровни строго выше цены, от ближайшего."""
+        start = bisect_right(self._prices, price)
+        stop = len(self._prices) if count is None else min(len(self._prices), start + count)
+        return [self._levels[i] for i in self._order[start:stop]]
+
+    def below(self, price: float, count: Optional[int] = None) -> List[Any]:
+        """Уровни строго ниже цены, от ближайшего."""
+        stop = bisect_left(self._prices, price)
+        result = []
+        # Идём группами равных цен сверху вниз, сохраняя исходный порядок внутри группы
+        while stop > 0 and (count is None or len(result) < count):
+            start = bisect_left(self._prices, self._prices[stop - 1], 0, stop)
+            result.extend(self._levels[i] for i in self._order[start:stop])
+            stop = start
+        return result if count is None else result[:count]
+
+    def nearest_above(self, price: float) -> Optional[Any]:
+        levels = self.above(price, 1)
+        return levels[0] if levels else None
+
+    def nearest_below(self, price: float) -> Optional[Any]:
+        levels = self.below(price, 1)
+        return levels[0] if levels else None
+
+
+class SRIndex:
+    """
+    Свинги и касания по массиву свечей, рассчитанные один раз.
+
+    Args:
+        ohlcv_data: Свечи с ключами 'high', 'low'
+        lookback: Сколько последних свечей использовать для поиска свингов
+        tolerance_pct: Допуск касания в процентах
+    """
+
+    def __init__(self, ohlcv_data: List[dict], lookback: int = 100, tolerance_pct: float = 0.5):
+        self.tolerance_pct = tolerance_pct
+        self.highs = candle_column(ohlcv_data, "high")
+        self.lows = candle_column(ohlcv_data, "low")
+
+        self.swing_highs: List[SwingPoint] = []
+        self.swing_lows: List[SwingPoint] = []
+        if len(ohlcv_data) >= 5:
+            window = slice(-lookback, None) if len(ohlcv_data) > lookback else slice(None)
+            self.swing_highs, self.swing_lows = swing_points_from_arrays(self.highs[window], self.lows[window])
+
+    def touches(self, levels: Sequence[float]) -> np.ndarray:
+        """Число касаний каждого уровня по всем свечам."""
+        if not len(levels) or not len(self.highs):
+            return np.zeros(len(levels), dtype=int)
+        return count_level_touches(self.highs, self.lows, levels, self.tolerance_pct)
+
+    def swing_levels(self) -> List[Dict]:
+        """Уровни свингов с касаниями и силой (swing_high, затем swing_low)."""
+        swings = [(s, "swing_high") for s in self.swing_highs] + [(s, "swing_low") for s in self.swing_lows]
+        touches = self.touches([s.price for s, _ in swings])
+        return [
+            {
+                "price": swing.price,
+                "source": source,
+                "strength": calculate_level_strength(swing.price, source, int(count)),
+                "touches": int(count),
+            }
+            for (swing, source), count in zip(swings, touches)
+        ]
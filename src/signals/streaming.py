@@ -0,0 +1,621 @@
+"""
+Streaming - инкрементальные (O(1) на бар) состояния индикаторов.
+
+Пакетные функции indicators.py пересчитывают индикатор по всей истории
+свечей при каждом обновлении. Состояния ниже хранят скользящие суммы
+и сглаженные значения и обновляются одной новой свечой:
+
+    rsi = RSIState(14)
+    for candle in history:
+        rsi.update(candle)
+    rsi.update(new_candle).value  # то же число, что calculate_rsi(closes)
+
+update() возвращает тот же объект результата, что и пакетная функция
+(RSI, MACD, BollingerBands, ...), или None, пока данных недостаточно.
+Состояние сериализуется в простой dict (snapshot) и восстанавливается
+через IndicatorState.restore() - например, между перезапусками
+фонового предрасчёта.
+
+Свеча - dict с ключами close (и high/low/volume для индикаторов,
+которым они нужны; объём CryptoCompare - volumeto) или просто цена
+закрытия для индикаторов по close.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional, Type, Union
+
+from signals.indicators import (
+    ADX,
+    ATR,
+    MACD,
+    OBV,
+    RSI,
+    VWAP,
+    BollingerBands,
+    StochasticRSI,
+    _adx_result,
+    _atr_result,
+    _obv_trend,
+    _rsi_from_averages,
+    _stochastic_rsi_result,
+    _vwap_result,
+)
+from signals.kernels import ema_alpha
+
+Candle = Union[Dict[str, float], float]
+
+
+def _close(candle: Candle) -> float:
+    return float(candle["close"]) if isinstance(candle, dict) else float(candle)
+
+
+def _volume(candle: Dict[str, float]) -> float:
+    return float(candle["volume"] if "volume" in candle else candle["volumeto"])
+
+
+class _RollingWindow:
+    """
+    Скользящее окно фиксированной длины с суммой за O(1).
+
+    Сумма периодически пересчитывается точно (math.fsum), чтобы ошибка
+    округления не накапливалась на длинных потоках.
+    """
+
+    RESYNC_EVERY = 1024
+
+    def __init__(self, size: int, values: Iterable[float] = ()):
+        self.size = size
+        self.values: Deque[float] = deque(values, maxlen=size)
+        self.total = math.fsum(self.values)
+        self._pushes = 0
+
+    def push(self, value: float):
+        if len(self.values) == self.size:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        self._pushes += 1
+        if self._pushes >= self.RESYNC_EVERY:
+            self.total = math.fsum(self.values)
+            self._pushes = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.size
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+    def to_list(self) -> list:
+        return list(self.values)
+
+
+class IndicatorState(ABC):
+    """
+    Базовый класс потокового индикатора.
+
+    Наследники задают kind (ключ для restore) и реализуют _update, _state и _load.
+    """
+
+    kind: str = ""
+    _registry: Dict[str, Type["IndicatorState"]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.kind:
+            IndicatorState._registry[cls.kind] = cls
+
+    def __init__(self):
+        self.count = 0
+        self.value: Optional[Any] = None
+
+    def update(self, candle: Candle) -> Optional[Any]:
+        """Учесть новую закрытую свечу. Returns: текущее значение индикатора или None."""
+        self.count += 1
+        self.value = self._update(candle)
+        return self.value
+
+    def update_many(self, candles: Iterable[Candle]) -> Optional[Any]:
+        """Прогнать историю свечей."""
+        for candle in candles:
+            self.update(candle)
+        return self.value
+
+    @abstractmethod
+    def _update(self, candle: Candle) -> Optional[Any]:
+        """Обновить состояние свечой и вернуть значение индикатора (или None)."""
+
+    def _params(self) -> Dict[str, Any]:
+        return {}
+
+    @abstractmethod
+    def _state(self) -> Dict[str, Any]:
+        """Внутреннее состояние для snapshot() (JSON-совместимое)."""
+
+    @abstractmethod
+    def _load(self, state: Dict[str, Any]):
+        """Загрузить внутреннее состояние из _state()."""
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Состояние в виде простого dict (JSON-совместимого)."""
+        return {"kind": self.kind, "params": self._params(), "count": self.count, "state": self._state()}
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> "IndicatorState":
+        """Восстановить состояние из snapshot() (класс определяется по kind)."""
+        state_cls = IndicatorState._registry[snapshot["kind"]]
+        instance = state_cls(**snapshot["params"])
+        instance.count = snapshot["count"]
+        instance._load(snapshot["state"])
+        # Значение пересчитывается при следующем update(); до этого - последнее сохранённое
+        instance.value = instance._current()
+        return instance
+
+    def _current(self) -> Optional[Any]:
+        return None
+
+
+class RSIState(IndicatorState):
+    """RSI как в calculate_rsi: простое среднее роста/падения за period."""
+
+    kind = "rsi"
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.gains = _RollingWindow(period)
+        self.losses = _RollingWindow(period)
+
+    def _update(self, candle: Candle) -> Optional[RSI]:
+        close = _close(candle)
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            self.gains.push(delta if delta > 0 else 0.0)
+            self.losses.push(-delta if delta < 0 else 0.0)
+        self.prev_close = close
+        return self._current()
+
+    def _current(self) -> Optional[RSI]:
+        if not self.gains.full:
+            return None
+        return RSI(value=float(_rsi_from_averages(self.gains.mean, self.losses.mean)), period=self.period)
+
+    def _params(self):
+        return {"period": self.period}
+
+    def _state(self):
+        return {"prev_close": self.prev_close, "gains": self.gains.to_list(), "losses": self.losses.to_list()}
+
+    def _load(self, state):
+        self.prev_close = state["prev_close"]
+        self.gains = _RollingWindow(self.period, state["gains"])
+        self.losses = _RollingWindow(self.period, state["losses"])
+
+
+class MACDState(IndicatorState):
+    """MACD как в calculate_macd (EMA засеяны первым значением)."""
+
+    kind = "macd"
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.ema_fast: Optional[float] = None
+        self.ema_slow: Optional[float] = None
+        self.signal: Optional[float] = None
+
+    @staticmethod
+    def _step(previous: Optional[float], value: float, period: int) -> float:
+        if previous is None:
+            return value
+        alpha = ema_alpha(period)
+        return alpha * value + (1 - alpha) * previous
+
+    def _update(self, candle: Candle) -> Optional[MACD]:
+        close = _close(candle)
+        self.ema_fast = self._step(self.ema_fast, close, self.fast_period)
+        self.ema_slow = self._step(self.ema_slow, close, self.slow_period)
+        self.signal = self._step(self.signal, self.ema_fast - self.ema_slow, self.signal_period)
+        return self._current()
+
+    def _current(self) -> Optional[MACD]:
+        if self.count < self.slow_period + self.signal_period:
+            return None
+        macd_line = self.ema_fast - self.ema_slow
+        return MACD(
+            macd_line=float(macd_line),
+            signal_line=float(self.signal),
+            histogram=float(macd_line - self.signal),
+        )
+
+    def _params(self):
+        return {"fast_period": self.fast_period, "slow_period": self.slow_period, "signal_period": self.signal_period}
+
+    def _state(self):
+        return {"ema_fast": self.ema_fast, "ema_slow": self.ema_slow, "signal": self.signal}
+
+    def _load(self, state):
+        self.ema_fast = state["ema_fast"]
+        self.ema_slow = state["ema_slow"]
+        self.signal = state["signal"]
+
+
+class BollingerState(IndicatorState):
+    """Полосы Боллинджера как в calculate_bollinger_bands (стандартное отклонение генеральной совокупности)."""
+
+    kind = "bollinger"
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        super().__init__()
+        self.period = period
+        self.num_std = num_std
+        self.window: Deque[float] = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _update(self, candle: Candle) -> Optional[BollingerBands]:
+        close = _close(candle)
+        if len(self.window) < self.period:
+            # Welford: добавление значения
+            self.window.append(close)
+            delta = close - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (close - self.mean)
+        else:
+            # Скользящее окно: замена самого старого значения
+            oldest = self.window[0]
+            self.window.append(close)
+            old_mean = self.mean
+            self.mean += (close - oldest) / self.period
+            self.m2 += (close - oldest) * (close - self.mean + oldest - old_mean)
+        if self.count % self.period == 0:
+            self._resync()
+        return self._current()
+
+    def _resync(self):
+        n = len(self.window)
+        self.mean = math.fsum(self.window) / n
+        self.m2 = math.fsum((x - self.mean) ** 2 for x in self.window)
+
+    def _current(self) -> Optional[BollingerBands]:
+        if len(self.window) < self.period:
+            return None
+        std = math.sqrt(max(self.m2, 0.0) / self.period)
+        return BollingerBands(
+            upper=self.mean + (self.num_std * std),
+            middle=self.mean,
+            lower=self.mean - (self.num_std * std),
+            current_price=self.window[-1],
+        )
+
+    def _params(self):
+        return {"period": self.period, "num_std": self.num_std}
+
+    def _state(self):
+        return {"window": list(self.window)}
+
+    def _load(self, state):
+        self.window = deque(state["window"], maxlen=self.period)
+        if self.window:
+            self._resync()
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class ATRState(IndicatorState):
+    """ATR как в calculate_atr: простое среднее True Range за period."""
+
+    kind = "atr"
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.tr = _RollingWindow(period)
+
+    def _update(self, candle: Dict[str, float]) -> Optional[ATR]:
+        close = float(candle["close"])
+        if self.prev_close is not None:
+            self.tr.push(_true_range(float(candle["high"]), float(candle["low"]), self.prev_close))
+        self.prev_close = close
+        return self._current()
+
+    def _current(self) -> Optional[ATR]:
+        if not self.tr.full:
+            return None
+        return _atr_result(self.tr.mean, self.prev_close)
+
+    def _params(self):
+        return {"period": self.period}
+
+    def _state(self):
+        return {"prev_close": self.prev_close, "tr": self.tr.to_list()}
+
+    def _load(self, state):
+        self.prev_close = state["prev_close"]
+        self.tr = _RollingWindow(self.period, state["tr"])
+
+
+class _WilderAverage:
+    """Сглаживание Уайлдера: засев средним первых period значений, далее RMA."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.seed: list = []
+        self.value: Optional[float] = None
+
+    def push(self, x: float) -> Optional[float]:
+        if self.value is None:
+            self.seed.append(x)
+            if len(self.seed) == self.period:
+                self.value = sum(self.seed) / self.period
+                self.seed = []
+        else:
+            alpha = 1 / self.period
+            self.value = alpha * x + (1 - alpha) * self.value
+        return self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seed": list(self.seed), "value": self.value}
+
+    @classmethod
+    def from_dict(cls, period: int, state: Dict[str, Any]) -> "_WilderAverage":
+        average = cls(period)
+        average.seed = list(state["seed"])
+        average.value = state["value"]
+        return average
+
+
+class ADXState(IndicatorState):
+    """ADX как в calculate_adx: сглаживание Уайлдера TR, +DM/-DM и DX."""
+
+    kind = "adx"
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.prev: Optional[Dict[str, float]] = None
+        self.tr = _WilderAverage(period)
+        self.plus_dm = _WilderAverage(period)
+        self.minus_dm = _WilderAverage(period)
+        self.adx = _WilderAverage(period)
+        self.last: Optional[Dict[str, float]] = None
+
+    def _update(self, candle: Dict[str, float]) -> Optional[ADX]:
+        high, low, close = float(candle["high"]), float(candle["low"]), float(candle["close"])
+        if self.prev is not None:
+            up_move = high - self.prev["high"]
+            down_move = self.prev["low"] - low
+            tr_smooth = self.tr.push(_true_range(high, low, self.prev["close"]))
+            plus_smooth = self.plus_dm.push(up_move if up_move > down_move and up_move > 0 else 0.0)
+            minus_smooth = self.minus_dm.push(down_move if down_move > up_move and down_move > 0 else 0.0)
+            if tr_smooth is not None:
+                plus_di = plus_smooth / tr_smooth * 100 if tr_smooth > 0 else 0.0
+                minus_di = minus_smooth / tr_smooth * 100 if tr_smooth > 0 else 0.0
+                di_sum = plus_di + minus_di
+                dx = abs(plus_di - minus_di) / di_sum * 100 if di_sum > 0 else 0.0
+                self.adx.push(dx)
+                self.last = {"plus_di": plus_di, "minus_di": minus_di, "dx": dx}
+        self.prev = {"high": high, "low": low, "close": close}
+        return self._current()
+
+    def _current(self) -> Optional[ADX]:
+        if self.last is None:
+            return None
+        # До прогрева ADX (2 * period баров) - последний DX, как в calculate_adx
+        adx_value = self.adx.value if self.adx.value is not None else self.last["dx"]
+        return _adx_result(float(adx_value), self.last["plus_di"], self.last["minus_di"])
+
+    def _params(self):
+        return {"period": self.period}
+
+    def _state(self):
+        return {
+            "prev": self.prev,
+            "tr": self.tr.to_dict(),
+            "plus_dm": self.plus_dm.to_dict(),
+            "minus_dm": self.minus_dm.to_dict(),
+            "adx": self.adx.to_dict(),
+            "last": self.last,
+        }
+
+    def _load(self, state):
+        self.prev = state["prev"]
+        self.tr = _WilderAverage.from_dict(self.period, state["tr"])
+        self.plus_dm = _WilderAverage.from_dict(self.period, state["plus_dm"])
+        self.minus_dm = _WilderAverage.from_dict(self.period, state["minus_dm"])
+        self.adx = _WilderAverage.from_dict(self.period, state["adx"])
+        self.last = state["last"]
+
+
+class StochRSIState(IndicatorState):
+    """
+    Stochastic RSI как в calculate_stochastic_rsi.
+
+    RSI для бара i считается по окну изменений, заканчивающемуся на i-1
+    (так же, как в пакетной функции).
+    """
+
+    kind = "stoch_rsi"
+
+    def __init__(self, period: int = 14, smooth_k: int = 3, smooth_d: int = 3):
+        super().__init__()
+        self.period = period
+        self.smooth_k = smooth_k
+        self.smooth_d = smooth_d
+        self.prev_close: Optional[float] = None
+        self.gains = _RollingWindow(period)
+        self.losses = _RollingWindow(period)
+        self.rsi: Deque[float] = deque(maxlen=smooth_k)
+        self.stoch = _RollingWindow(smooth_d)
+
+    def _update(self, candle: Candle) -> Optional[StochasticRSI]:
+        close = _close(candle)
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            if self.gains.full:
+                self._push_rsi(_rsi_from_averages(self.gains.mean, self.losses.mean))
+            self.gains.push(delta if delta > 0 else 0.0)
+            self.losses.push(-delta if delta < 0 else 0.0)
+        self.prev_close = close
+        return self._current()
+
+    def _push_rsi(self, rsi_value: float):
+        self.rsi.append(rsi_value)
+        if len(self.rsi) < self.smooth_k:
+            return
+        rsi_min, rsi_max = min(self.rsi), max(self.rsi)
+        if rsi_max - rsi_min == 0:
+            self.stoch.push(0.0)
+        else:
+            self.stoch.push((rsi_value - rsi_min) / (rsi_max - rsi_min) * 100)
+
+    def _current(self) -> Optional[StochasticRSI]:
+        if self.count < self.period + self.smooth_k + self.smooth_d or not self.stoch.full:
+            return None
+        return _stochastic_rsi_result(float(self.stoch.values[-1]), float(self.stoch.mean))
+
+    def _params(self):
+        return {"period": self.period, "smooth_k": self.smooth_k, "smooth_d": self.smooth_d}
+
+    def _state(self):
+        return {
+            "prev_close": self.prev_close,
+            "gains": self.gains.to_list(),
+            "losses": self.losses.to_list(),
+            "rsi": list(self.rsi),
+            "stoch": self.stoch.to_list(),
+        }
+
+    def _load(self, state):
+        self.prev_close = state["prev_close"]
+        self.gains = _RollingWindow(self.period, state["gains"])
+        self.losses = _RollingWindow(self.period, state["losses"])
+        self.rsi = deque(state["rsi"], maxlen=self.smooth_k)
+        self.stoch = _RollingWindow(self.smooth_d, state["stoch"])
+
+
+class OBVState(IndicatorState):
+    """On-Balance Volume как в calculate_obv (SMA за 20, тренд за 10 значений)."""
+
+    kind = "obv"
+
+    SMA_PERIOD = 20
+    TREND_LOOKBACK = 10
+
+    def __init__(self):
+        super().__init__()
+        self.prev_close: Optional[float] = None
+        self.obv = 0.0
+        self.sma = _RollingWindow(self.SMA_PERIOD)
+        self.recent: Deque[float] = deque(maxlen=self.TREND_LOOKBACK)
+
+    def _update(self, candle: Dict[str, float]) -> Optional[OBV]:
+        close = float(candle["close"])
+        if self.prev_close is not None:
+            if close > self.prev_close:
+                self.obv += _volume(candle)
+            elif close < self.prev_close:
+                self.obv -= _volume(candle)
+        self.prev_close = close
+        self.sma.push(self.obv)
+        self.recent.append(self.obv)
+        return self._current()
+
+    def _current(self) -> Optional[OBV]:
+        if self.count < self.SMA_PERIOD:
+            return None
+        return OBV(value=float(self.obv), trend=_obv_trend(self.recent[0], self.obv), sma=float(self.sma.mean))
+
+    def _state(self):
+        return {"prev_close": self.prev_close, "obv": self.obv, "sma": self.sma.to_list(), "recent": list(self.recent)}
+
+    def _load(self, state):
+        self.prev_close = state["prev_close"]
+        self.obv = state["obv"]
+        self.sma = _RollingWindow(self.SMA_PERIOD, state["sma"])
+        self.recent = deque(state["recent"], maxlen=self.TREND_LOOKBACK)
+
+
+class VWAPState(IndicatorState):
+    """VWAP как в calculate_vwap: по всем свечам с начала потока."""
+
+    kind = "vwap"
+
+    def __init__(self):
+        super().__init__()
+        self.pv_total = 0.0
+        self.volume_total = 0.0
+        self.last_close: Optional[float] = None
+
+    def _update(self, candle: Dict[str, float]) -> Optional[VWAP]:
+        typical_price = (float(candle["high"]) + float(candle["low"]) + float(candle["close"])) / 3
+        volume = _volume(candle)
+        self.pv_total += typical_price * volume
+        self.volume_total += volume
+        self.last_close = float(candle["close"])
+        return self._current()
+
+    def _current(self) -> Optional[VWAP]:
+        if self.last_close is None or self.volume_total == 0:
+            return None
+        return _vwap_result(float(self.pv_total / self.volume_total), self.last_close)
+
+    def _state(self):
+        return {"pv_total": self.pv_total, "volume_total": self.volume_total, "last_close": self.last_close}
+
+    def _load(self, state):
+        self.pv_total = state["pv_total"]
+        self.volume_total = state["volume_total"]
+        self.last_close = state["last_close"]
+
+
+class IndicatorSet:
+    """
+    Набор потоковых индикаторов одной монеты.
+
+    Пример:
+        indicators = IndicatorSet()
+        indicators.update_many(ohlcv)
+        values = indicators.update(new_candle)  # {"rsi": RSI(...), "macd": MACD(...), ...}
+    """
+
+    def __init__(self, states: Optional[Dict[str, IndicatorState]] = None):
+        self.states: Dict[str, IndicatorState] = states if states is not None else {
+            "rsi": RSIState(14),
+            "macd": MACDState(),
+            "bollinger_bands": BollingerState(20),
+            "atr": ATRState(14),
+            "adx": ADXState(14),
+            "stoch_rsi": StochRSIState(14, 3, 3),
+            "obv": OBVState(),
+            "vwap": VWAPState(),
+        }
+
+    def update(self, candle: Dict[str, float]) -> Dict[str, Any]:
+        """Обновить все индикаторы свечой. Returns: {имя: значение или None}."""
+        return {name: state.update(candle) for name, state in self.states.items()}
+
+    def update_many(self, candles: Iterable[Dict[str, float]]) -> Dict[str, Any]:
+        for candle in candles:
+            self.update(candle)
+        return self.values
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        return {name: state.value for name, state in self.states.items()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: state.snapshot() for name, state in self.states.items()}
+
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> "IndicatorSet":
+        return cls({name: IndicatorState.restore(state) for name, state in snapshot.items()})
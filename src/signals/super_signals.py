@@ -11,13 +11,20 @@ import logging
 import time
 import asyncio
 import aiohttp
+import numpy as np
 from typing import List, Dict, Optional, Set, Tuple
 from datetime import datetime
 
 from signals.exchanges.okx import OKXClient
 from signals.exchanges.bybit import BybitClient
 from signals.exchanges.gate import GateClient
+from signals.candles import GATE_KLINE_LAYOUT, CandleSeries
+from signals.resample import base_bars_needed, resample
+from signals.indicator_engine import OHLCVMatrix, band_position, compute_indicator_table
+from signals.indicators import calculate_atr, calculate_bollinger_bands, calculate_rsi
+from signals.kernels import ema_last
 from config import settings
+from http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -80,14 +87,14 @@ class SuperSignals:
     async def _ensure_session(self):
         """Ensure aiohttp session exists."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client.get_session()
 
     async def close(self):
         """Close all connections."""
         for exchange in self.exchanges.values():
             await exchange.close()
-        if self.session and not self.session.closed:
-            await self.session.close()
+        # Shared http_client session - closed in on_shutdown
+        self.session = None
 
     async def fetch_futures_symbols(self) -> Set[str]:
         """Получает список всех фьючерсных пар с Binance Futures."""
@@ -299,17 +306,7 @@ class SuperSignals:
             ) as resp:
                 if resp.status == 200:
                     data = await resp.json()
-                    candles = []
-                    for k in data:
-                        candles.append({
-                            "timestamp": k[0],
-                            "open": float(k[1]),
-                            "high": float(k[2]),
-                            "low": float(k[3]),
-                            "close": float(k[4]),
-                            "volume": float(k[5])
-                        })
-                    return candles
+                    return CandleSeries.from_rows(data)
         except Exception as e:
             logger.debug(f"Binance klines failed for {symbol}: {e}")
         
@@ -342,17 +339,8 @@ class SuperSignals:
                 if resp.status == 200:
                     data = await resp.json()
                     klines = data.get("result", {}).get("list", [])
-                    candles = []
-                    for k in reversed(klines):  # Bybit возвращает в обратном порядке
-                        candles.append({
-                            "timestamp": int(k[0]),
-                            "open": float(k[1]),
-                            "high": float(k[2]),
-                            "low": float(k[3]),
-                            "close": float(k[4]),
-                            "volume": float(k[5])
-                        })
-                    return candles
+                    # Bybit возвращает в обратном порядке
+                    return CandleSeries.from_rows(klines, reverse=True)
         except Exception as e:
             logger.debug(f"Bybit klines failed for {symbol}: {e}")
         
@@ -383,17 +371,7 @@ class SuperSignals:
             ) as resp:
                 if resp.status == 200:
                     data = await resp.json()
-                    candles = []
-                    for k in data:
-                        candles.append({
-                            "timestamp": k[0],
-                            "open": float(k[1]),
-                            "high": float(k[2]),
-                            "low": float(k[3]),
-                            "close": float(k[4]),
-                            "volume": float(k[5])
-                        })
-                    return candles
+                    return CandleSeries.from_rows(data)
         except Exception as e:
             logger.debug(f"MEXC klines failed for {symbol}: {e}")
         
@@ -424,17 +402,8 @@ class SuperSignals:
             ) as resp:
                 if resp.status == 200:
                     data = await resp.json()
-                    candles = []
-                    for k in data:
-                        candles.append({
-                            "timestamp": int(k[0]) * 1000,  # Gate.io возвращает секунды
-                            "open": float(k[5]),
-                            "high": float(k[3]),
-                            "low": float(k[4]),
-                            "close": float(k[2]),
-                            "volume": float(k[1])
-                        })
-                    return candles
+                    # Gate.io возвращает время в секундах
+                    return CandleSeries.from_rows(data, GATE_KLINE_LAYOUT, time_scale=1000)
         except Exception as e:
             logger.debug(f"Gate.io klines failed for {symbol}: {e}")
         
@@ -776,6 +745,48 @@ class SuperSignals:
         Returns:
             Dict с полной информацией или None
         """
+        results = await self.deep_analyze_batch([coin])
+        return results[0]
+
+    async def deep_analyze_batch(self, coins: List[Dict], delay: float = 0.0) -> List[Optional[Dict]]:
+        """
+        Глубокий анализ нескольких монет: свечи загружаются по очереди,
+        индикаторы считаются одним векторизованным проходом по всем монетам.
+
+        Args:
+            coins: Данные монет
+            delay: Пауза между загрузками свечей разных монет (rate limit бирж)
+
+        Returns:
+            Результат для каждой монеты (None - монета отклонена)
+        """
+        loaded = []
+        for index, coin in enumerate(coins):
+            if index and delay:
+                await asyncio.sleep(delay)
+            loaded.append(await self._load_analysis_data(coin))
+
+        ready = [i for i, data in enumerate(loaded) if data]
+        results: List[Optional[Dict]] = [None] * len(coins)
+        if not ready:
+            return results
+
+        try:
+            analyses = self._calculate_indicators_batch(
+                [loaded[i]["candles_1h"] for i in ready],
+                [loaded[i]["candles_4h"] for i in ready],
+                [loaded[i]["current_price"] for i in ready],
+            )
+        except Exception as e:
+            logger.warning(f"SuperSignals: batch indicator calculation failed: {e}")
+            return results
+
+        for i, analysis in zip(ready, analyses):
+            results[i] = self._finish_analysis(coins[i], loaded[i], analysis)
+        return results
+
+    async def _load_analysis_data(self, coin: Dict) -> Optional[Dict]:
+        """Загружает свечи 1h/4h и funding для глубокого анализа."""
         symbol = coin.get("symbol", "").upper()
 
         try:
@@ -783,36 +794,55 @@ class SuperSignals:
             if current_price <= 0:
                 return None
 
-            price_change_1h = coin.get("price_change_percentage_1h_in_currency", 0) or 0
-            price_change_24h = coin.get("price_change_percentage_24h", 0) or 0
-            volume_24h = coin.get("total_volume", 0) or 0
-            market_cap = coin.get("market_cap", 0) or 0
+            # === Загрузка свечей с fallback: 4h собираются из тех же 1h ===
+            candles, exchange = await self.fetch_klines_with_fallback(
+                symbol, "1h", base_bars_needed("4h", 50, "1h")
+            )
+            candles_1h = candles[-100:]
+            candles_4h = resample(candles, "4h")[-50:] if candles else []
+            if len(candles_4h) < 20:
+                # Короткая история 1h на бирже - 4h напрямую
+                candles_4h, _ = await self.fetch_klines_with_fallback(symbol, "4h", 50)
 
-            # === Загрузка свечей с fallback ===
-            candles_1h, exchange_1h = await self.fetch_klines_with_fallback(symbol, "1h", 100)
-            candles_4h, exchange_4h = await self.fetch_klines_with_fallback(symbol, "4h", 50)
-            
             # Проверяем что получили достаточно данных
             if not candles_1h or len(candles_1h) < 20:
                 logger.debug(f"Not enough 1h candles for {symbol}")
                 return None
-                
+
             if not candles_4h or len(candles_4h) < 20:
                 logger.debug(f"Not enough 4h candles for {symbol}")
                 return None
-            
-            exchange_name = exchange_1h or exchange_4h
-            
+
             # Funding rate - пробуем получить с Binance Futures
             funding_rate = await self.fetch_binance_funding(symbol)
 
-            # === Расчёт индикаторов СНАЧАЛА (нужен RSI для определения направления) ===
-            analysis = self._calculate_indicators(candles_1h, candles_4h, current_price)
-            
+            return {
+                "current_price": current_price,
+                "candles_1h": candles_1h,
+                "candles_4h": candles_4h,
+                "exchange": exchange,
+                "funding_rate": funding_rate,
+            }
+
+        except Exception as e:
+            logger.debug(f"Error analyzing {symbol}: {e}")
+            return None
+
+    def _finish_analysis(self, coin: Dict, data: Dict, analysis: Dict) -> Optional[Dict]:
+        """Направление, вероятность и уровни по рассчитанным индикаторам."""
+        symbol = coin.get("symbol", "").upper()
+
+        try:
+            current_price = data["current_price"]
+            price_change_1h = coin.get("price_change_percentage_1h_in_currency", 0) or 0
+            price_change_24h = coin.get("price_change_percentage_24h", 0) or 0
+            volume_24h = coin.get("total_volume", 0) or 0
+            market_cap = coin.get("market_cap", 0) or 0
+
             # === Определение направления на основе RSI и движения ===
             # Логика: ищем РАЗВОРОТ, а не продолжение тренда
             rsi = analysis["rsi"]
-            
+
             # Приоритет 1: Сильное движение + подтверждение RSI (более мягкие пороги 40/60)
             # После падения + перепродан = ЛОНГ (ожидаем отскок)
             if price_change_24h < -15 and rsi < 40:
@@ -820,13 +850,13 @@ class SuperSignals:
             # После роста + перекуплен = ШОРТ (ожидаем откат)
             elif price_change_24h > 15 and rsi > 60:
                 direction = "short"
-            
+
             # Приоритет 2: Экстремальный RSI (стандартные пороги 30/70)
             elif rsi < 30:
                 direction = "long"  # Сильно перепродан
             elif rsi > 70:
                 direction = "short"  # Сильно перекуплен
-            
+
             # Приоритет 3: Нейтральный RSI - смотрим на экстремальное движение
             else:
                 if price_change_24h > 30:
@@ -835,9 +865,9 @@ class SuperSignals:
                     direction = "long"  # Сильное падение - ждём отскок
                 else:
                     direction = "long" if price_change_24h < 0 else "short"
-            
+
             logger.debug(f"{symbol}: direction={direction.upper()} (RSI={rsi:.1f}, change_24h={price_change_24h:+.1f}%)")
-            
+
             analysis["symbol"] = symbol
             analysis["name"] = coin.get("name", symbol)
             analysis["direction"] = direction
@@ -846,8 +876,8 @@ class SuperSignals:
             analysis["change_24h"] = price_change_24h
             analysis["volume_24h"] = volume_24h
             analysis["market_cap"] = market_cap
-            analysis["exchange"] = exchange_name
-            analysis["funding_rate"] = funding_rate
+            analysis["exchange"] = data["exchange"]
+            analysis["funding_rate"] = data["funding_rate"]
             analysis["source"] = coin.get("source", "unknown")
 
             # Логируем результат анализа индикаторов
@@ -858,9 +888,9 @@ class SuperSignals:
             )
 
             # Определяем накопление (accumulation)
-            accumulation = self.detect_accumulation(candles_1h, analysis['volume_ratio'], price_change_1h)
+            accumulation = self.detect_accumulation(data["candles_1h"], analysis['volume_ratio'], price_change_1h)
             analysis["accumulation"] = accumulation
-            
+
             if accumulation["detected"]:
                 logger.debug(f"{symbol}: Accumulation detected - {accumulation['strength']}")
 
@@ -888,90 +918,74 @@ class SuperSignals:
 
     def _calculate_indicators(self, candles_1h: List[Dict], candles_4h: List[Dict], current_price: float) -> Dict:
         """Рассчитывает все индикаторы для анализа."""
-        # Закрытия для индикаторов
-        closes_1h = [float(c.get("close", 0)) for c in candles_1h]
-        closes_4h = [float(c.get("close", 0)) for c in candles_4h]
-
-        # RSI 1h и 4h
-        rsi = self._calculate_rsi(closes_1h, period=14)
-        rsi_4h = self._calculate_rsi(closes_4h, period=14) if candles_4h else None
-
-        # MACD
-        macd = self._calculate_macd(closes_1h)
+        return self._calculate_indicators_batch([candles_1h], [candles_4h], [current_price])[0]
+
+    def _calculate_indicators_batch(
+        self,
+        candles_1h_list: List[List[Dict]],
+        candles_4h_list: List[List[Dict]],
+        current_prices: List[float],
+    ) -> List[Dict]:
+        """
+        Рассчитывает индикаторы сразу для нескольких монет (см. signals.indicator_engine).
 
-        # Bollinger Bands
-        bb_position = self._calculate_bb_position(closes_1h, current_price)
+        Значения совпадают с поштучными _calculate_rsi, _calculate_macd,
+        _calculate_bb_position, _calculate_atr, _calculate_ema и _calculate_stoch_rsi.
+        """
+        rows = [str(i) for i in range(len(current_prices))]
+        table_1h = compute_indicator_table(OHLCVMatrix.from_candles(rows, candles_1h_list), ema_periods=(20, 50))
+        table_4h = compute_indicator_table(OHLCVMatrix.from_candles(rows, candles_4h_list), ema_periods=())
 
-        # ATR (для стопа)
-        highs = [float(c.get("high", 0)) for c in candles_1h]
-        lows = [float(c.get("low", 0)) for c in candles_1h]
-        atr = self._calculate_atr(highs, lows, closes_1h, period=14)
+        prices = np.asarray(current_prices, dtype=float)
+        bb_position = np.nan_to_num(band_position(prices, table_1h["bb_upper"], table_1h["bb_lower"]), nan=0.5)
 
-        # Volume ratio
-        volumes = [float(c.get("volume", 0)) for c in candles_1h]
-        volume_ratio = self._calculate_volume_ratio(volumes)
+        def value(column: np.ndarray, i: int, default: float) -> float:
+            return default if np.isnan(column[i]) else float(column[i])
 
-        # Поддержка/сопротивление
-        support, resistance = self._find_support_resistance(closes_4h, current_price)
+        results = []
+        for i, current_price in enumerate(current_prices):
+            closes_4h = [float(c.get("close", 0)) for c in candles_4h_list[i]]
 
-        # Расстояние до поддержки/сопротивления
-        price_to_support = abs(current_price - support) / current_price * 100 if support else 100
-        price_to_resistance = abs(resistance - current_price) / current_price * 100 if resistance else 100
+            # Поддержка/сопротивление
+            support, resistance = self._find_support_resistance(closes_4h, current_price)
 
-        # EMA 20/50
-        ema_20 = self._calculate_ema(candles_1h, 20)
-        ema_50 = self._calculate_ema(candles_1h, 50)
-        ema_trend = "bullish" if ema_20 > ema_50 else "bearish"
-        price_vs_ema = "above" if current_price > ema_20 else "below"
+            # Расстояние до поддержки/сопротивления
+            price_to_support = abs(current_price - support) / current_price * 100 if support else 100
+            price_to_resistance = abs(resistance - current_price) / current_price * 100 if resistance else 100
 
-        # Stochastic RSI
-        stoch_rsi = self._calculate_stoch_rsi(candles_1h)
+            # EMA 20/50
+            ema_20 = value(table_1h["ema_20"], i, 0)
+            ema_50 = value(table_1h["ema_50"], i, 0)
 
-        return {
-            "rsi": rsi,
-            "rsi_4h": rsi_4h,
-            "macd": macd,
-            "bb_position": bb_position,
-            "atr": atr,
-            "volume_ratio": volume_ratio,
-            "support": support,
-            "resistance": resistance,
-            "price_to_support": price_to_support,
-            "price_to_resistance": price_to_resistance,
-            "ema_20": ema_20,
-            "ema_50": ema_50,
-            "ema_trend": ema_trend,
-            "price_vs_ema": price_vs_ema,
-            "stoch_rsi": stoch_rsi,
-        }
-
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Рассчитывает RSI."""
-        if len(prices) < period + 1:
-            return 50.0
-
-        gains = []
-        losses = []
-
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i - 1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
+            if np.isnan(table_1h["stoch_rsi_k"][i]):
+                stoch_rsi = {"k": 50, "d": 50}
             else:
-                gains.append(0)
-                losses.append(abs(change))
-
-        avg_gain = sum(gains[-period:]) / period if gains else 0
-        avg_loss = sum(losses[-period:]) / period if losses else 0
-
-        if avg_loss == 0:
-            return 100.0
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+                stoch_rsi = {"k": round(float(table_1h["stoch_rsi_k"][i]), 1), "d": round(float(table_1h["stoch_rsi_d"][i]), 1)}
+
+            results.append({
+                "rsi": value(table_1h["rsi"], i, 50.0),
+                "rsi_4h": value(table_4h["rsi"], i, 50.0) if candles_4h_list[i] else None,
+                "macd": self._macd_from_line(table_1h["macd"][i]),
+                "bb_position": float(bb_position[i]),
+                "atr": value(table_1h["atr"], i, 0),
+                "volume_ratio": float(table_1h["volume_ratio"][i]),
+                "support": support,
+                "resistance": resistance,
+                "price_to_support": price_to_support,
+                "price_to_resistance": price_to_resistance,
+                "ema_20": ema_20,
+                "ema_50": ema_50,
+                "ema_trend": "bullish" if ema_20 > ema_50 else "bearish",
+                "price_vs_ema": "above" if current_price > ema_20 else "below",
+                "stoch_rsi": stoch_rsi,
+            })
+
+        return results
 
-        return rsi
+    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
+        """Рассчитывает RSI (signals.indicators.calculate_rsi)."""
+        rsi = calculate_rsi(prices, period)
+        return rsi.value if rsi else 50.0
 
     def _calculate_macd(self, prices: List[float]) -> Dict:
         """Рассчитывает MACD."""
@@ -982,7 +996,13 @@ class SuperSignals:
         ema_12 = self._ema(prices, 12)
         ema_26 = self._ema(prices, 26)
 
-        macd_line = ema_12 - ema_26
+        return self._macd_from_line(ema_12 - ema_26)
+
+    def _macd_from_line(self, macd_line: float) -> Dict:
+        """Histogram и crossover по значению линии MACD (NaN - недостаточно данных)."""
+        if np.isnan(macd_line):
+            return {"crossover": None, "histogram": 0, "prev_histogram": 0}
+        macd_line = float(macd_line)
 
         # Signal line (EMA of MACD)
         # Упрощённо - берём последние значения
@@ -1011,48 +1031,21 @@ class SuperSignals:
         if not prices:
             return 0
 
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        return ema_last(prices, period)
 
     def _calculate_bb_position(self, prices: List[float], current_price: float) -> float:
         """Рассчитывает позицию цены в Bollinger Bands (0-1)."""
-        if len(prices) < 20:
+        bb = calculate_bollinger_bands(prices, period=20)
+        if bb is None or bb.upper == bb.lower:
             return 0.5
 
-        sma = sum(prices[-20:]) / 20
-        variance = sum((x - sma) ** 2 for x in prices[-20:]) / 20
-        std = variance ** 0.5
-
-        upper = sma + 2 * std
-        lower = sma - 2 * std
-
-        if upper == lower:
-            return 0.5
-
-        position = (current_price - lower) / (upper - lower)
+        position = (current_price - bb.lower) / (bb.upper - bb.lower)
         return max(0, min(1, position))
 
     def _calculate_atr(self, highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
-        """Рассчитывает ATR."""
-        if len(closes) < period + 1:
-            return 0
-
-        true_ranges = []
-        for i in range(1, len(closes)):
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i - 1]),
-                abs(lows[i] - closes[i - 1]),
-            )
-            true_ranges.append(tr)
-
-        atr = sum(true_ranges[-period:]) / period if true_ranges else 0
-        return atr
+        """Рассчитывает ATR (signals.indicators.calculate_atr)."""
+        atr = calculate_atr(highs, lows, closes, period)
+        return atr.value if atr else 0
 
     def _calculate_volume_ratio(self, volumes: List[float]) -> float:
         """Рассчитывает отношение текущего объёма к среднему."""
@@ -1147,13 +1140,7 @@ class SuperSignals:
             return 0
         
         closes = [float(c["close"]) for c in candles]
-        multiplier = 2 / (period + 1)
-        ema = closes[0]
-        
-        for close in closes[1:]:
-            ema = (close - ema) * multiplier + ema
-        
-        return ema
+        return ema_last(closes, period)
 
     def _calculate_stoch_rsi(self, candles: List[Dict], period: int = 14) -> Dict:
         """Рассчитывает Stochastic RSI."""
@@ -1683,12 +1670,8 @@ class SuperSignals:
             logger.info(f"  Candidate #{i}: {coin['symbol']} ({coin['price_change_percentage_24h']:+.1f}%)")
 
         # Этап 2: Глубокий анализ
-        analyzed = []
-        for coin in top_candidates:
-            result = await self.deep_analyze(coin)
-            if result:
-                analyzed.append(result)
-            await asyncio.sleep(0.1)
+        results = await self.deep_analyze_batch(top_candidates, delay=0.1)
+        analyzed = [result for result in results if result]
 
         # Логируем результат анализа
         logger.info(f"SuperSignals: Analyzed {len(top_candidates)} coins, accepted {len(analyzed)}")
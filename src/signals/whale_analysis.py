@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 import aiohttp
 import asyncio
 
+from signals.latency import current_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -132,14 +134,21 @@ class DeepWhaleAnalyzer:
         self._cache_timestamps = {}
         
     def _get_cache(self, key: str, ttl_seconds: int) -> Optional[Dict]:
-        """Get data from cache if still valid."""
+        """Get data from cache if still valid (marks the current latency span as hit/miss)."""
+        span = current_span()
         if key not in self._cache:
+            if span:
+                span.cache = "miss"
             return None
         
         age = datetime.now() - self._cache_timestamps.get(key, datetime.min)
         if age > timedelta(seconds=ttl_seconds):
+            if span:
+                span.cache = "miss"
             return None
         
+        if span:
+            span.cache = "hit"
         return self._cache[key]
     
     def _set_cache(self, key: str, value: Dict):
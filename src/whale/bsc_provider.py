@@ -16,6 +16,8 @@ from typing import Optional
 import aiohttp
 import structlog
 
+from http_client import http_client
+
 logger = structlog.get_logger()
 
 
@@ -80,13 +82,13 @@ class BSCProvider:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = http_client.get_session()
         return self._session
     
     async def close(self) -> None:
-        """Close HTTP session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Release the shared HTTP session."""
+        # Shared http_client session - closed in on_shutdown
+        self._session = None
     
     def invalidate_cache(self) -> None:
         """Invalidate the cached working provider."""
@@ -27,6 +27,7 @@ from tenacity import (
 )
 
 from config import settings
+from http_client import http_client
 from whale.api_keys import get_next_api_key
 
 logger = structlog.get_logger()
@@ -156,13 +157,13 @@ class PolygonTracker:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Получение HTTP сессии."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = http_client.get_session()
         return self._session
 
     async def close(self) -> None:
-        """Закрытие HTTP сессии."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Освобождение общей HTTP сессии."""
+        # Сессия общая (http_client) - закрывается в on_shutdown
+        self._session = None
 
     async def _update_matic_price(self) -> None:
         """Обновление цены MATIC через CoinGecko с кэшированием."""
@@ -32,6 +32,7 @@ from tenacity import (
 )
 
 from config import settings
+from http_client import http_client
 
 logger = structlog.get_logger()
 
@@ -358,13 +359,13 @@ class TONTracker:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Получение HTTP сессии."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = http_client.get_session()
         return self._session
 
     async def close(self) -> None:
-        """Закрытие HTTP сессии."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Освобождение общей HTTP сессии."""
+        # Сессия общая (http_client) - закрывается в on_shutdown
+        self._session = None
 
     async def _update_ton_price(self) -> None:
         """
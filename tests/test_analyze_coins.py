@@ -0,0 +1,120 @@
+"""
+Tests for batch multi-symbol analysis (AISignalAnalyzer.analyze_coins).
+"""
+
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.ai_signals import AISignalAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    tracker = Mock()
+    tracker.get_transactions_by_blockchain = AsyncMock(return_value=[])
+    analyzer = AISignalAnalyzer(tracker)
+    analyzer.get_fear_greed_index = AsyncMock(return_value={"value": 40})
+    analyzer.get_macro_data = AsyncMock(return_value={"score": 1, "verdict": "neutral"})
+    analyzer._get_stablecoin_flows = AsyncMock(return_value={"net_flow": 5})
+    return analyzer
+
+
+class TestAnalyzeCoins:
+    """Tests for analyze_coins."""
+
+    @pytest.mark.asyncio
+    async def test_market_wide_inputs_fetched_once(self, analyzer):
+        seen = {}
+
+        async def fake_analysis(symbol, shared=None):
+            seen[symbol] = shared
+            return f"signal {symbol}"
+
+        analyzer._analyze_coin = AsyncMock(side_effect=fake_analysis)
+
+        results = await analyzer.analyze_coins(["eth", "ton", "btc"])
+
+        assert list(results) == ["BTC", "ETH", "TON"]
+        assert results["ETH"] == "signal ETH"
+        analyzer.get_fear_greed_index.assert_awaited_once()
+        analyzer.get_macro_data.assert_awaited_once()
+        analyzer._get_stablecoin_flows.assert_awaited_once()
+        assert seen["TON"]["fear_greed"] == {"value": 40}
+
+    @pytest.mark.asyncio
+    async def test_btc_signal_passed_to_followers(self, analyzer):
+        order = []
+
+        async def fake_analysis(symbol, shared=None):
+            order.append(symbol)
+            if symbol == "BTC":
+                analyzer._correlation_signals["BTC"] = {
+                    "direction": "long", "expires_at": time.time() + 600,
+                }
+            else:
+                assert shared["btc_signal"]["direction"] == "long"
+            return f"signal {symbol}"
+
+        analyzer._analyze_coin = AsyncMock(side_effect=fake_analysis)
+
+        await analyzer.analyze_coins(["ETH", "BTC", "TON"])
+
+        assert order[0] == "BTC"
+        assert sorted(order[1:]) == ["ETH", "TON"]
+
+    @pytest.mark.asyncio
+    async def test_failed_btc_does_not_pass_stored_signal(self, analyzer):
+        analyzer._correlation_signals["BTC"] = {"direction": "short", "expires_at": time.time() + 600}
+        seen = {}
+
+        async def fake_analysis(symbol, shared=None):
+            seen[symbol] = shared
+            return "❌ error" if symbol == "BTC" else f"signal {symbol}"
+
+        analyzer._analyze_coin = AsyncMock(side_effect=fake_analysis)
+
+        await analyzer.analyze_coins(["BTC", "ETH"])
+
+        assert seen["ETH"]["btc_signal"] == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_market_wide_source_fetched_per_coin(self, analyzer):
+        analyzer.get_fear_greed_index = AsyncMock(side_effect=Exception("timeout"))
+        seen = {}
+
+        async def fake_analysis(symbol, shared=None):
+            seen[symbol] = shared
+            return f"signal {symbol}"
+
+        analyzer._analyze_coin = AsyncMock(side_effect=fake_analysis)
+
+        await analyzer.analyze_coins(["ETH"])
+
+        assert "fear_greed" not in seen["ETH"]
+        assert seen["ETH"]["macro_data"] == {"score": 1, "verdict": "neutral"}
+        plan = analyzer._build_fetch_plan("ETH", "ETHUSDT", seen["ETH"])
+        assert plan._nodes["fear_greed"]["func"] == analyzer.get_fear_greed_index
+
+    @pytest.mark.asyncio
+    async def test_unsupported_symbol_returns_error_message(self, analyzer):
+        results = await analyzer.analyze_coins(["DOGE"])
+
+        assert results["DOGE"].startswith("❌")
+        analyzer.get_fear_greed_index.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_shared_inputs_replace_plan_nodes(self, analyzer):
+        shared = {"fear_greed": {"value": 77}, "macro_data": {"score": 2}, "stablecoin_flows": None}
+
+        plan = analyzer._build_fetch_plan("ETH", "ETHUSDT", shared)
+
+        assert plan._nodes["fear_greed"]["func"]() == {"value": 77}
+        assert plan._nodes["macro_data"]["func"]() == {"score": 2}
+        assert plan._nodes["stablecoin_flows"]["func"]() is None
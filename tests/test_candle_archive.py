@@ -0,0 +1,120 @@
+"""
+Tests for the on-disk candle archive (signals.candle_archive).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.candle_archive import CandleArchive
+from signals.candles import INTERVAL_MS, CandleSeries
+
+HOUR = INTERVAL_MS["1h"]
+DAY_START = 1_699_920_000_000  # 2023-11-14 00:00 UTC
+
+
+class FakeExchange:
+    """Детерминированные часовые свечи с листингом в listed_at."""
+
+    def __init__(self, listed_at=DAY_START):
+        self.listed_at = listed_at
+        self.calls = []
+
+    async def download(self, symbol, interval, start, end):
+        self.calls.append((start, end))
+        times = np.arange(max(start, self.listed_at), end, HOUR, dtype=np.int64)
+        close = (times - DAY_START) / HOUR + 100.0
+        return CandleSeries(
+            {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": np.ones(len(times))},
+            times=times,
+        )
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange()
+
+
+def make_archive(tmp_path, exchange, now):
+    return CandleArchive(
+        db_path=str(tmp_path / "candles.db"),
+        fetchers={"fake": exchange.download},
+        clock=lambda: now / 1000,
+    )
+
+
+class TestCandleArchive:
+    """Покрытие, догрузка хвоста и дыр."""
+
+    @pytest.mark.asyncio
+    async def test_second_run_downloads_only_tail(self, tmp_path, exchange):
+        first = await make_archive(tmp_path, exchange, DAY_START + 48 * HOUR).fetch(
+            "fake", "BTCUSDT", "1h", DAY_START, DAY_START + 48 * HOUR
+        )
+        # Через 5.5 часов: формирующийся бар не входит
+        archive = make_archive(tmp_path, exchange, DAY_START + 53.5 * HOUR)
+        second = await archive.fetch("fake", "BTCUSDT", "1h", DAY_START)
+
+        assert exchange.calls == [
+            (DAY_START, DAY_START + 48 * HOUR),
+            (DAY_START + 48 * HOUR, DAY_START + 53 * HOUR),
+        ]
+        assert len(first) == 48
+        assert len(second) == 53
+        assert second[:48] == first
+        assert np.all(np.diff(second.times) == HOUR)
+
+    @pytest.mark.asyncio
+    async def test_gap_filled_and_ranges_merged(self, tmp_path, exchange):
+        archive = make_archive(tmp_path, exchange, DAY_START + 100 * HOUR)
+        await archive.fetch("fake", "BTCUSDT", "1h", DAY_START, DAY_START + 10 * HOUR)
+        await archive.fetch("fake", "BTCUSDT", "1h", DAY_START + 20 * HOUR, DAY_START + 30 * HOUR)
+        candles = await archive.fetch("fake", "BTCUSDT", "1h", DAY_START, DAY_START + 30 * HOUR)
+
+        assert exchange.calls[-1] == (DAY_START + 10 * HOUR, DAY_START + 20 * HOUR)
+        assert archive.covered_ranges("fake", "BTCUSDT", "1h") == [(DAY_START, DAY_START + 30 * HOUR)]
+        assert candles == await exchange.download("BTCUSDT", "1h", DAY_START, DAY_START + 30 * HOUR)
+
+    @pytest.mark.asyncio
+    async def test_empty_range_before_listing_is_covered(self, tmp_path):
+        exchange = FakeExchange(listed_at=DAY_START + 24 * HOUR)
+        archive = make_archive(tmp_path, exchange, DAY_START + 48 * HOUR)
+
+        candles = await archive.fetch("fake", "NEWUSDT", "1h", DAY_START)
+        await archive.fetch("fake", "NEWUSDT", "1h", DAY_START)
+
+        assert len(candles) == 24
+        assert len(exchange.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_download_not_marked_covered(self, tmp_path, exchange):
+        async def broken(symbol, interval, start, end):
+            raise RuntimeError("429")
+
+        archive = CandleArchive(
+            db_path=str(tmp_path / "candles.db"),
+            fetchers={"fake": broken},
+            clock=lambda: (DAY_START + 10 * HOUR) / 1000,
+        )
+
+        assert len(await archive.fetch("fake", "BTCUSDT", "1h", DAY_START)) == 0
+        assert archive.missing_ranges("fake", "BTCUSDT", "1h", DAY_START, DAY_START + 10 * HOUR) == [
+            (DAY_START, DAY_START + 10 * HOUR)
+        ]
+
+    def test_missing_ranges(self, tmp_path, exchange):
+        archive = make_archive(tmp_path, exchange, DAY_START)
+        empty = CandleSeries.empty()
+        archive.store("fake", "BTCUSDT", "1h", empty, 10, 20)
+        archive.store("fake", "BTCUSDT", "1h", empty, 30, 40)
+        archive.store("fake", "BTCUSDT", "1h", empty, 40, 50)
+
+        assert archive.covered_ranges("fake", "BTCUSDT", "1h") == [(10, 20), (30, 50)]
+        assert archive.missing_ranges("fake", "BTCUSDT", "1h", 0, 60) == [(0, 10), (20, 30), (50, 60)]
+        assert archive.missing_ranges("fake", "BTCUSDT", "1h", 12, 45) == [(20, 30)]
+        assert archive.missing_ranges("fake", "ETHUSDT", "1h", 12, 45) == [(12, 45)]
@@ -0,0 +1,244 @@
+"""
+Tests for the shared candle store (signals.candle_store).
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals import candle_store as candle_store_module
+from signals.candle_store import INTERVAL_MS, CandleStore
+from signals.candles import CandleSeries
+from signals.multi_timeframe import MultiTimeframeAnalyzer
+
+HOUR = INTERVAL_MS["1h"]
+
+
+class FakeVenue:
+    """Биржа с детерминированными свечами; последняя свеча формируется."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = []
+
+    async def fetch(self, symbol, interval, limit):
+        self.calls.append(limit)
+        await asyncio.sleep(0)
+        now = int(self.clock() * 1000)
+        step = INTERVAL_MS[interval]
+        times = (now // step - np.arange(limit)[::-1]) * step
+        # Цена формирующейся свечи зависит от прошедшего внутри бара времени
+        close = times / step % 1000 + np.where(times + step > now, (now - times) / step, 1.0)
+        return CandleSeries(
+            {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": np.ones(limit)},
+            times=times,
+        )
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def venue(clock):
+    return FakeVenue(clock)
+
+
+@pytest.fixture
+def store(clock, venue):
+    return CandleStore(max_age=10, venues={"fake": (venue.fetch, 1000, 1)}, clock=clock)
+
+
+class TestCandleStore:
+    """Окна, хвосты и дедупликация загрузок."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_served_from_memory(self, store, venue):
+        first = await store.get("fake", "BTCUSDT", "1h", 100)
+        second = await store.get("fake", "BTCUSDT", "1h", 50)
+
+        assert len(first) == 100
+        assert second == first[-50:]
+        assert venue.calls == [100]
+
+    @pytest.mark.asyncio
+    async def test_tail_fetch_matches_full_fetch(self, store, venue, clock):
+        first = await store.get("fake", "BTCUSDT", "1h", 100)
+        snapshot = first.to_dicts()
+
+        clock.now += 2.5 * HOUR / 1000
+        updated = await store.get("fake", "BTCUSDT", "1h", 100)
+
+        assert venue.calls == [100, 4]
+        assert updated == await venue.fetch("BTCUSDT", "1h", 100)
+        # Выданный раньше срез не изменился
+        assert first == snapshot
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_fetch(self, store, venue):
+        results = await asyncio.gather(*[store.get("fake", "BTCUSDT", "1h", 100) for _ in range(5)])
+
+        assert venue.calls == [100]
+        assert all(r == results[0] for r in results)
+
+    @pytest.mark.asyncio
+    async def test_larger_limit_refetches_window(self, store, venue):
+        await store.get("fake", "BTCUSDT", "1h", 50)
+        candles = await store.get("fake", "BTCUSDT", "1h", 200)
+
+        assert venue.calls == [50, 200]
+        assert len(candles) == 200
+
+    @pytest.mark.asyncio
+    async def test_keys_are_separate(self, store, venue):
+        await store.get("fake", "BTCUSDT", "1h", 10)
+        await store.get("fake", "ETHUSDT", "1h", 10)
+        await store.get("fake", "BTCUSDT", "15m", 10)
+
+        assert len(store) == 3
+        assert venue.calls == [10, 10, 10]
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_returns_stored(self, store, venue, clock):
+        first = await store.get("fake", "BTCUSDT", "1h", 20)
+        clock.now += 60
+        venue.fetch = AsyncMock(side_effect=Exception("timeout"))
+        store.venues["fake"] = (venue.fetch, 1000, 1)
+
+        assert await store.get("fake", "BTCUSDT", "1h", 20) == first
+        assert await store.get("fake", "ETHUSDT", "1h", 20) is None
+        assert store.stats["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_larger_window_does_not_refetch_in_loop(self, store, venue):
+        first = await store.get("fake", "BTCUSDT", "1h", 20)
+        venue.fetch = AsyncMock(side_effect=Exception("timeout"))
+        store.venues["fake"] = (venue.fetch, 1000, 1)
+
+        candles = await store.get("fake", "BTCUSDT", "1h", 100)
+
+        assert candles == first
+        assert venue.fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_with_zero_max_age_returns_none(self, store, venue, clock):
+        await store.get("fake", "BTCUSDT", "1h", 20)
+        clock.now += 60
+        venue.fetch = AsyncMock(side_effect=Exception("timeout"))
+        store.venues["fake"] = (venue.fetch, 1000, 1)
+
+        assert await store.get("fake", "BTCUSDT", "1h", 20, max_age=0) is None
+        assert await store.get("fake", "BTCUSDT", "1h", 100, max_age=0) is None
+
+    @pytest.mark.asyncio
+    async def test_shared_smaller_load_refetches_once(self, store, venue):
+        small, large = await asyncio.gather(
+            store.get("fake", "BTCUSDT", "1h", 10),
+            store.get("fake", "BTCUSDT", "1h", 50),
+        )
+
+        assert len(small) == 10 and len(large) == 50
+        assert venue.calls == [10, 50]
+
+    @pytest.mark.asyncio
+    async def test_unknown_venue(self, store):
+        with pytest.raises(ValueError):
+            await store.get("nowhere", "BTCUSDT", "1h", 10)
+
+
+class TestApplyBar:
+    """Бары из потока обновляют окно без запросов."""
+
+    @staticmethod
+    def bar(timestamp, close):
+        return {"timestamp": timestamp, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 2.0}
+
+    @pytest.mark.asyncio
+    async def test_forming_and_next_bar(self, store, venue, clock):
+        first = await store.get("fake", "BTCUSDT", "1h", 10)
+        last = first.times[-1]
+
+        assert store.apply_bar("fake", "BTCUSDT", "1h", self.bar(last, 123.0))
+        assert store.apply_bar("fake", "BTCUSDT", "1h", self.bar(last + HOUR, 124.0))
+        clock.now += 20
+        candles = await store.get("fake", "BTCUSDT", "1h", 10)
+
+        assert venue.calls == [10]
+        assert len(candles) == 10
+        assert candles.close[-2:].tolist() == [123.0, 124.0]
+        assert candles.times[-1] == last + HOUR
+        assert candles[:-2] == first[1:-1]
+
+    @pytest.mark.asyncio
+    async def test_stale_and_unknown_bars_ignored(self, store, venue):
+        first = await store.get("fake", "BTCUSDT", "1h", 10)
+
+        assert not store.apply_bar("fake", "BTCUSDT", "1h", self.bar(first.times[-3], 1.0))
+        assert not store.apply_bar("fake", "ETHUSDT", "1h", self.bar(first.times[-1], 1.0))
+        assert await store.get("fake", "BTCUSDT", "1h", 10) == first
+
+    @pytest.mark.asyncio
+    async def test_gap_marks_window_stale(self, store, venue, clock):
+        first = await store.get("fake", "BTCUSDT", "1h", 10)
+
+        assert not store.apply_bar("fake", "BTCUSDT", "1h", self.bar(first.times[-1] + 3 * HOUR, 1.0))
+        await store.get("fake", "BTCUSDT", "1h", 10)
+
+        assert len(venue.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_timeout_falls_back_to_max_age(self, store, venue, clock):
+        first = await store.get("fake", "BTCUSDT", "1h", 10)
+        store.apply_bar("fake", "BTCUSDT", "1h", self.bar(first.times[-1], 1.0))
+
+        clock.now += candle_store_module.STREAM_TIMEOUT - 1
+        await store.get("fake", "BTCUSDT", "1h", 10, max_age=0)
+        assert venue.calls == [10]
+
+        clock.now += 2
+        await store.get("fake", "BTCUSDT", "1h", 10, max_age=0)
+        assert len(venue.calls) == 2
+
+
+class TestConsumers:
+    """Потребители получают свечи из общего склада."""
+
+    @pytest.mark.asyncio
+    async def test_multi_timeframe_and_price_history_share_window(self, store, venue, monkeypatch):
+        from signals import ai_signals, multi_timeframe
+
+        store.venues["bybit"] = store.venues["fake"]
+        monkeypatch.setattr(multi_timeframe, "candle_store", store)
+        monkeypatch.setattr(ai_signals, "candle_store", store)
+        analyzer = ai_signals.AISignalAnalyzer.__new__(ai_signals.AISignalAnalyzer)
+        analyzer.bybit_mapping = {"BTC": "BTCUSDT"}
+
+        prices = await analyzer.get_price_history_bybit("BTC", interval="60", limit=200)
+        candles = await MultiTimeframeAnalyzer().fetch_candles("BTCUSDT", "1h", limit=100)
+        short_term = await analyzer.get_short_term_ohlcv("BTC", interval="60", limit=10)
+
+        # 1h MTF - из окна истории цен, краткосрочные 1h - из окна 5m
+        assert venue.calls == [200, 132]
+        assert candles.close.tolist() == prices[-100:]
+        # Краткосрочные свечи - от новых к старым, как отдаёт Bybit
+        assert [c["timestamp"] for c in short_term] == sorted(candles.times[-10:].tolist(), reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_invalid_timeframe(self):
+        assert await MultiTimeframeAnalyzer().fetch_candles("BTCUSDT", "2h") is None
@@ -0,0 +1,159 @@
+"""
+Tests for the columnar candle series (signals.candles).
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.candles import GATE_KLINE_LAYOUT, CandleSeries, candle_column
+from signals.indicator_engine import OHLCVMatrix
+from signals.indicators import (
+    count_touches,
+    detect_candlestick_patterns,
+    find_swing_points,
+)
+from signals.sr_index import SRIndex
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 1, 80))
+    spread = rng.uniform(0.1, 2.0, 80)
+    return [
+        {
+            "timestamp": 1_700_000_000_000 + i * 60_000,
+            "open": float(c - s / 3),
+            "high": float(c + s),
+            "low": float(c - s),
+            "close": float(c),
+            "volume": float(10 + i),
+        }
+        for i, (c, s) in enumerate(zip(close, spread))
+    ]
+
+
+class TestConstruction:
+    """Сборка из ответов бирж и dict-свечей."""
+
+    def test_from_binance_rows(self):
+        rows = [
+            [1000, "1.0", "2.0", "0.5", "1.5", "10", 1999, "15"],
+            [2000, "1.5", "2.5", "1.0", "2.0", "20", 2999, "40"],
+        ]
+        series = CandleSeries.from_rows(rows)
+
+        assert series.to_dicts() == [
+            {"timestamp": 1000, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0},
+            {"timestamp": 2000, "open": 1.5, "high": 2.5, "low": 1.0, "close": 2.0, "volume": 20.0},
+        ]
+        assert series.close.dtype == np.float64
+        assert series.times.dtype == np.int64
+
+    def test_reverse_and_gate_layout(self):
+        newest_first = [[2000, "2", "3", "1", "2.5", "5"], [1000, "1", "2", "0.5", "1.5", "4"]]
+        assert list(CandleSeries.from_rows(newest_first, reverse=True).times) == [1000, 2000]
+
+        gate = [["1700000000", "123.4", "2.5", "3", "1", "2"]]
+        candle = CandleSeries.from_rows(gate, GATE_KLINE_LAYOUT, time_scale=1000)[0]
+        assert dict(candle) == {
+            "timestamp": 1_700_000_000_000, "open": 2.0, "high": 3.0, "low": 1.0, "close": 2.5, "volume": 123.4,
+        }
+
+    def test_malformed_rows_skipped(self):
+        # Ответ Bybit (от новых к старым) с битыми строками в середине
+        rows = [
+            [3000, "3", "4", "2", "3.5", "6", "21"],
+            [2500, "oops", "4", "2", "3", "6", "18"],
+            [2000, "2", "3"],
+            [1000, "1", "2", "0.5", "1.5", "4", "6"],
+        ]
+
+        series = CandleSeries.from_rows(rows, reverse=True)
+
+        assert list(series.times) == [1000, 3000]
+        assert series.close.tolist() == [1.5, 3.5]
+
+    def test_from_dicts_keeps_extra_columns(self):
+        raw = [{"time": 1, "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volumeto": 7}]
+        series = CandleSeries.from_dicts(raw)
+
+        assert series.time_key == "time"
+        assert series[0]["time"] == 1
+        assert series[-1].get("volumeto", 0) == 7.0
+        assert series[0].get("volume", 0) == 0
+
+
+class TestDictAdapter:
+    """Серия ведёт себя как List[Dict]."""
+
+    def test_equals_source_dicts(self, candles):
+        series = CandleSeries.from_dicts(candles)
+
+        assert series == candles
+        assert len(series) == len(candles)
+        assert series[-1]["close"] == candles[-1]["close"]
+        assert [c["high"] for c in series[-10:]] == [c["high"] for c in candles[-10:]]
+        with pytest.raises(KeyError):
+            series[0]["missing"]
+        with pytest.raises(IndexError):
+            series[len(candles)]
+
+    def test_columns_and_slices_are_views(self, candles):
+        series = CandleSeries.from_dicts(candles)
+        tail = series[-20:]
+
+        assert np.shares_memory(series.close, tail.close)
+        assert series[::-1] == candles[::-1]
+        assert series[-3:1:-2] == candles[-3:1:-2]
+        assert np.shares_memory(candle_column(series, "close"), series.close)
+        assert np.array_equal(candle_column(candles, "close"), series.close)
+
+    def test_append_keeps_earlier_slices(self, candles):
+        series = CandleSeries.from_dicts(candles[:10])
+        head = series[:]
+        series.extend(candles[10:])
+
+        assert series == candles
+        assert len(head) == 10
+        assert head == candles[:10]
+
+    def test_append_to_empty(self, candles):
+        series = CandleSeries.empty()
+        series.extend(candles)
+
+        assert series == candles
+
+    def test_pickle_round_trip(self, candles):
+        series = CandleSeries.empty()
+        series.extend(candles)
+        restored = pickle.loads(pickle.dumps(series))
+
+        assert restored == series
+        assert len(restored._times) == len(candles)
+
+
+class TestIndicatorParity:
+    """Индикаторы по CandleSeries совпадают с расчётом по списку dict."""
+
+    def test_swing_points_touches_and_patterns(self, candles):
+        series = CandleSeries.from_dicts(candles)
+
+        assert find_swing_points(series) == find_swing_points(candles)
+        assert count_touches(series, 100.0) == count_touches(candles, 100.0)
+        assert detect_candlestick_patterns(series) == detect_candlestick_patterns(candles)
+        assert SRIndex(series).swing_levels() == SRIndex(candles).swing_levels()
+
+    def test_ohlcv_matrix(self, candles):
+        from_series = OHLCVMatrix.from_candles(["A"], [CandleSeries.from_dicts(candles)], max_bars=50)
+        from_dicts = OHLCVMatrix.from_candles(["A"], [candles], max_bars=50)
+
+        for name in ("high", "low", "close", "volume"):
+            assert np.array_equal(getattr(from_series, name), getattr(from_dicts, name), equal_nan=True)
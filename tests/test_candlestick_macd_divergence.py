@@ -10,6 +10,8 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from signals.indicators import (
+    CANDLESTICK_PATTERNS,
+    candlestick_pattern_masks,
     detect_candlestick_patterns,
     calculate_macd_divergence,
     CandlestickPattern,
@@ -283,3 +285,46 @@ def test_macd_divergence_dataclass():
     assert div.strength == 75.0
     assert "lower lows" in div.explanation
 
+
+def _random_candles(count, seed=0):
+    import random
+    rng = random.Random(seed)
+    candles = []
+    for _ in range(count):
+        o = float(rng.randint(95, 105))
+        c = o + rng.choice([0.0, rng.uniform(-4, 4)])
+        candles.append({
+            'open': o,
+            'high': max(o, c) + rng.choice([0.0, rng.uniform(0, 3)]),
+            'low': min(o, c) - rng.choice([0.0, rng.uniform(0, 3)]),
+            'close': c,
+        })
+    return candles
+
+
+def test_pattern_masks_match_last_bar_detection():
+    """Маски по всей истории совпадают с поштучной детекцией на каждой свече."""
+    ohlcv = _random_candles(300)
+    masks = candlestick_pattern_masks(ohlcv)
+    
+    assert set(masks) == set(CANDLESTICK_PATTERNS)
+    for i in range(2, len(ohlcv)):
+        names = {p.name for p in detect_candlestick_patterns(ohlcv[:i + 1])}
+        multi = {name for name, (_, _, size) in CANDLESTICK_PATTERNS.items() if size > 1 and masks[name][i]}
+        single = {name for name, (_, _, size) in CANDLESTICK_PATTERNS.items()
+                  if size == 1 and masks[name][i - 2:i + 1].any()}
+        assert names == multi | single
+
+
+def test_pattern_masks_skip_invalid_candles():
+    """Свечи с нулевыми ценами не участвуют в паттернах."""
+    ohlcv = [
+        {'open': 100, 'high': 100, 'low': 95, 'close': 104},
+        {'open': 0, 'high': 100.6, 'low': 95, 'close': 100.5},
+        {'open': 100, 'high': 100.6, 'low': 95, 'close': 100.5},
+    ]
+    masks = candlestick_pattern_masks(ohlcv)
+    
+    assert list(masks['hammer']) == [False, False, True]
+    assert not masks['engulfing_bearish'].any()
+    assert all(len(mask) == 3 for mask in masks.values())
@@ -0,0 +1,184 @@
+"""
+Tests for the CPU-bound work pool (CPUPool).
+"""
+
+import os
+import sys
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.cpu_pool import CPUPool
+from signals.ai_signals import AISignalAnalyzer, _compute_technical_indicators, _render_compact_message, score_signal
+
+
+def square(value):
+    return value * value
+
+
+def make_prices(n=120):
+    return list(50000 + np.cumsum(np.sin(np.arange(n) / 5.0) * 50))
+
+
+def make_signal_inputs(symbol="BTC"):
+    return dict(
+        symbol=symbol,
+        whale_data={"transaction_count": 5, "total_volume_usd": 10_000_000,
+                    "deposits": 1, "withdrawals": 4, "sentiment": "neutral"},
+        market_data={"price_usd": 50000.0, "change_1h": 2.0, "change_24h": 5.0,
+                     "change_7d": 10.0, "market_cap": 1_000_000_000_000,
+                     "volume_24h": 20_000_000_000},
+    )
+
+
+def make_ohlcv(prices):
+    return [
+        {"high": p * 1.01, "low": p * 0.99, "close": p, "volumeto": 1_000_000 + i * 1000}
+        for i, p in enumerate(prices)
+    ]
+
+
+class TestCPUPool:
+    """Tests for CPUPool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self):
+        pool = CPUPool(max_workers=1)
+        try:
+            assert await pool.run(square, 7) == 49
+            assert await pool.run(os.getpid) != os.getpid()
+            assert pool.stats["offloaded"] == 2
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_start_warms_all_workers(self):
+        pool = CPUPool(max_workers=2, preload=("signals.ai_signals",))
+        try:
+            await pool.start()
+            workers = dict(pool._executor._processes)
+            assert len(workers) == 2
+            assert await pool.run(square, 3) == 9
+            # Вызов после прогрева не запускает новых процессов
+            assert pool._executor._processes.keys() == workers.keys()
+        finally:
+            pool.shutdown()
+
+    def test_workers_not_forked(self):
+        pool = CPUPool(max_workers=1)
+        try:
+            assert pool._get_executor()._mp_context.get_start_method() in ("forkserver", "spawn")
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_zero_workers_runs_inline(self):
+        pool = CPUPool(max_workers=0)
+
+        assert await pool.run(os.getpid) == os.getpid()
+        assert pool.stats["inline"] == 1
+        await pool.start()
+        assert pool._executor is None
+
+    def test_default_worker_count_is_bounded(self):
+        pool = CPUPool()
+        assert 1 <= pool.max_workers <= CPUPool.MAX_DEFAULT_WORKERS
+
+
+class TestOffloadedSignalWork:
+    """Offloaded functions give the same results as in-process execution."""
+
+    @pytest.mark.asyncio
+    async def test_technical_indicators_match_inline(self):
+        prices = make_prices()
+        ohlcv = make_ohlcv(prices)
+        pool = CPUPool(max_workers=1)
+        try:
+            offloaded = await pool.run(_compute_technical_indicators, prices, ohlcv)
+        finally:
+            pool.shutdown()
+
+        assert offloaded == _compute_technical_indicators(prices, ohlcv)
+        assert "rsi" in offloaded and "atr" in offloaded
+
+    @pytest.mark.asyncio
+    async def test_analyzer_uses_pool_for_indicators(self):
+        tracker = Mock()
+        tracker.get_transactions_by_blockchain = AsyncMock(return_value=[])
+        analyzer = AISignalAnalyzer(tracker)
+        analyzer.cpu_pool = CPUPool(max_workers=0)
+
+        with patch.object(analyzer, 'get_price_history', new_callable=AsyncMock, return_value=make_prices()):
+            result = await analyzer.calculate_technical_indicators("BTC")
+
+        assert result["rsi"]["period"] == 14
+        assert analyzer.cpu_pool.stats["inline"] == 1
+
+    def test_render_matches_analyzer_method(self):
+        tracker = Mock()
+        analyzer = AISignalAnalyzer(tracker)
+        analyzer.cpu_pool = CPUPool(max_workers=0)
+        kwargs = dict(
+            symbol="BTC",
+            signal_data={"raw_direction": "sideways", "probability": 55.0},
+            market_data={"price_usd": 50000.0},
+            technical_data={"rsi": {"value": 48.0}, "macd": {"histogram": 1.0}},
+            fear_greed={"value": 40, "classification": "Fear"},
+            funding_rate={"funding_rate": 0.01},
+            deep_derivatives_data={},
+        )
+
+        assert _render_compact_message(kwargs) == analyzer.format_signal_message_compact(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_score_signal_matches_inline(self):
+        inputs = make_signal_inputs()
+        pool = CPUPool(max_workers=1)
+        try:
+            offloaded = await pool.run(score_signal, inputs)
+        finally:
+            pool.shutdown()
+
+        inline = score_signal(inputs)
+        for result in (offloaded, inline):
+            result["signal_data"].pop("timestamp", None)
+            result["state"]["stability"].pop("time", None)
+        assert offloaded == inline
+        assert offloaded["state"]["direction"] == offloaded["signal_data"]["raw_direction"]
+
+    @pytest.mark.asyncio
+    async def test_calculate_signal_applies_state(self):
+        tracker = Mock()
+        analyzer = AISignalAnalyzer(tracker)
+        analyzer.cpu_pool = CPUPool(max_workers=0)
+
+        inputs = make_signal_inputs()
+        result = await analyzer.calculate_signal(inputs.pop("symbol"), **inputs)
+
+        assert analyzer.cpu_pool.stats["inline"] == 1
+        assert analyzer.previous_direction["BTC"] == result["raw_direction"]
+        assert "BTC" in analyzer.previous_scores
+        assert analyzer.stability_manager.get_last_signal("BTC")["direction"] == result["raw_direction"]
+        assert analyzer._correlation_signals["BTC"]["direction"] == result["raw_direction"]
+        assert analyzer.last_symbol_signals["BTC"]["probability"] == result["probability"]
+
+    @pytest.mark.asyncio
+    async def test_previous_state_passed_to_scoring(self):
+        tracker = Mock()
+        analyzer = AISignalAnalyzer(tracker)
+        analyzer.cpu_pool = CPUPool(max_workers=0)
+        analyzer.previous_scores["BTC"] = 3.5
+        analyzer.previous_direction["BTC"] = "long"
+
+        with patch.object(analyzer.cpu_pool, 'run', wraps=analyzer.cpu_pool.run) as run:
+            inputs = make_signal_inputs()
+            await analyzer.calculate_signal(inputs.pop("symbol"), **inputs)
+
+        func, passed = run.call_args.args
+        assert func is score_signal
+        assert passed["previous_score"] == 3.5
+        assert passed["previous_direction"] == "long"
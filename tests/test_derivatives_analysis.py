@@ -26,7 +26,7 @@ class TestDeepDerivativesAnalyzer:
     @pytest.mark.asyncio
     async def test_get_liquidation_levels_structure(self, analyzer):
         """Test liquidation levels returns correct structure."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.json = AsyncMock(return_value={
@@ -53,7 +53,7 @@ class TestDeepDerivativesAnalyzer:
     @pytest.mark.asyncio
     async def test_analyze_oi_price_correlation_structure(self, analyzer):
         """Test OI/price correlation returns correct structure."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             # Mock ticker response
             ticker_response = AsyncMock()
             ticker_response.status = 200
@@ -100,7 +100,7 @@ class TestDeepDerivativesAnalyzer:
     @pytest.mark.asyncio
     async def test_get_ls_ratio_by_exchange_structure(self, analyzer):
         """Test L/S ratio returns correct structure."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.json = AsyncMock(return_value={
@@ -126,7 +126,7 @@ class TestDeepDerivativesAnalyzer:
     @pytest.mark.asyncio
     async def test_get_funding_rate_history_structure(self, analyzer):
         """Test funding rate history returns correct structure."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_response = AsyncMock()
             mock_response.status = 200
             mock_response.json = AsyncMock(return_value={
@@ -156,7 +156,7 @@ class TestDeepDerivativesAnalyzer:
     @pytest.mark.asyncio
     async def test_get_basis_structure(self, analyzer):
         """Test basis calculation returns correct structure."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             spot_response = AsyncMock()
             spot_response.status = 200
             spot_response.json = AsyncMock(return_value={
@@ -1096,6 +1096,14 @@ class TestVolatilityEnhancer:
         assert isinstance(atr, float)
         assert atr > 0
 
+    def test_calculate_atr_from_ohlcv_skips_missing_close(self, volatility):
+        """Candles without close are skipped instead of dividing by zero."""
+        ohlcv_data = [{'high': 101 + i, 'low': 99 + i, 'close': 100 + i} for i in range(15)]
+
+        assert volatility.calculate_atr_from_ohlcv(ohlcv_data + [{'high': 120, 'low': 110}]) == \
+            volatility.calculate_atr_from_ohlcv(ohlcv_data)
+        assert volatility.calculate_atr_from_ohlcv(ohlcv_data[:-1] + [{'high': 1, 'low': 0, 'close': 0}]) == 0.0
+
 
 class TestDynamicTargetsEnhancer:
     """Tests for DynamicTargetsEnhancer class."""
@@ -0,0 +1,280 @@
+"""
+Tests for the vectorised factor scoring matrix (FactorMatrix).
+
+Скалярные методы AISignalAnalyzer - эталон: матричный путь должен
+давать те же значения на случайных входах.
+"""
+
+import os
+import random
+import sys
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.ai_signals import AISignalAnalyzer
+from signals.factor_matrix import CONSENSUS_FACTORS, FACTOR_NAMES, FactorMatrix
+
+
+def maybe(rng, value, p=0.8):
+    return value if rng.random() < p else None
+
+
+def make_row(rng):
+    """Случайные входы calculate_signal (часть источников отсутствует)."""
+    technical = {}
+    if rng.random() < 0.9:
+        pick = rng.choice
+        technical = {
+            "rsi": {"value": rng.uniform(5, 95)},
+            "macd": {"signal": pick(["bullish", "bearish", "neutral"])},
+            "ma_crossover": {
+                "crossover": pick(["golden_cross", "death_cross", "none"]),
+                "trend": pick(["bullish", "bearish", "neutral"]),
+            },
+            "rsi_divergence": {"type": pick(["bullish", "bearish", "none"])},
+            "adx": {"value": rng.uniform(5, 60)},
+            "stoch_rsi": {"signal": pick(["oversold", "overbought", "bullish", "bearish", "neutral"])},
+            "mfi": {"signal": pick(["oversold", "overbought", "neutral"])},
+            "roc": {"momentum": pick(["strong_up", "up", "down", "strong_down", "flat"])},
+            "williams_r": {"signal": pick(["oversold", "overbought", "neutral"])},
+            "bollinger_bands": {"position": pick(["below_lower", "lower_half", "upper_half", "above_upper"])},
+            "atr": {"volatility": pick(["low", "normal", "high", "extreme"])},
+            "keltner_channels": {"position": pick(["below", "inside", "above"])},
+            "obv": {"trend": pick(["rising", "falling", "flat"])},
+            "vwap": {"position": pick(["above", "below"]), "deviation_percent": rng.uniform(-8, 8)},
+            "volume_sma": {"status": pick(["high", "low", "normal"])},
+            "volume_spike": {"is_spike": rng.random() < 0.5, "spike_percentage": rng.uniform(0, 300)},
+        }
+        for key in list(technical):
+            if rng.random() < 0.15:
+                del technical[key]
+
+    price = rng.uniform(1, 100000)
+    return {
+        "whale_data": {"withdrawals": rng.randint(0, 20), "deposits": rng.randint(0, 20)},
+        "market_data": {"change_24h": rng.uniform(-15, 15), "volume_24h": rng.uniform(0, 5e9)},
+        "technical_data": technical,
+        "fear_greed": maybe(rng, {"value": rng.randint(0, 100)}),
+        "funding_rate": maybe(rng, {"rate_percent": rng.uniform(-0.05, 0.1)}),
+        "order_book": maybe(rng, {"imbalance": rng.uniform(-1, 1), "spread": rng.uniform(0, 0.1)}),
+        "futures_data": maybe(rng, {"long_short_ratio": rng.uniform(0.3, 2.5)}),
+        "onchain_data": maybe(rng, {"mempool_status": rng.choice(["low", "congested", "normal"])}),
+        "exchange_flows": maybe(rng, {
+            "net_flow_usd": rng.uniform(-5e7, 5e7),
+            "inflow_volume_usd": rng.uniform(0, 1e8),
+            "outflow_volume_usd": rng.uniform(0, 1e8),
+        }),
+        "short_term_data": maybe(rng, {
+            "rsi_5m": maybe(rng, rng.uniform(5, 95)),
+            "rsi_15m": maybe(rng, rng.uniform(5, 95)),
+            "ema_crossover": rng.choice(["bullish", "bearish", None]),
+            "current_price": price * rng.uniform(0.98, 1.02),
+            "price_10min_ago": maybe(rng, price),
+        }),
+        "trades_flow": maybe(rng, {"flow_ratio": rng.choice([
+            rng.uniform(0.001, 0.7), rng.uniform(0.67, 1.5), rng.uniform(1.5, 100),
+        ])}),
+        "liquidations": maybe(rng, {"sentiment": rng.choice(["bullish", "bearish", "neutral"])}),
+        "orderbook_delta": maybe(rng, {"delta": rng.uniform(-20, 20)}),
+        "coinglass_data": maybe(rng, {
+            "oi_change_24h": rng.uniform(-6, 6), "top_traders_ratio": rng.uniform(0.3, 2.5),
+        }),
+        "news_sentiment": maybe(rng, {"sentiment_score": rng.uniform(-1, 1)}),
+        "tradingview_rating": maybe(rng, {"recommendation": rng.choice(
+            ["STRONG_BUY", "BUY", "NEUTRAL", "SELL", "STRONG_SELL"]
+        )}),
+        "whale_alert": maybe(rng, {"net_flow": rng.uniform(-8e7, 8e7)}),
+        "social_data": maybe(rng, {"galaxy_score": rng.uniform(0, 100), "sentiment": rng.uniform(-1, 1)}),
+        "deep_whale_data": maybe(rng, {
+            "accumulation_distribution": maybe(rng, {
+                "phase": rng.choice(["accumulation", "distribution", "neutral"]),
+                "confidence": rng.uniform(0, 100),
+            }),
+            "exchange_flows_detailed": maybe(rng, {"total_net": rng.uniform(-8e7, 8e7)}),
+            "stablecoin_flows": maybe(rng, {"total_inflow": rng.uniform(-2e8, 2e8)}),
+        }),
+        "deep_derivatives_data": maybe(rng, {
+            "oi_price_correlation": maybe(rng, {
+                "signal": rng.choice(["bullish", "bearish", "neutral"]),
+                "correlation": rng.choice(["bullish", "bearish", "neutral"]),
+            }),
+            "liquidation_levels": maybe(rng, {"signal": rng.choice(["bullish", "bearish", "neutral"])}),
+            "ls_ratio_by_exchange": maybe(rng, {"average_ratio": rng.uniform(0.3, 3.0)}),
+            "funding_rate_history": maybe(rng, {
+                "extreme": rng.random() < 0.3,
+                "trend": rng.choice(["rising", "falling", "stable"]),
+                "current": rng.uniform(-0.2, 0.2),
+            }),
+            "basis": maybe(rng, {
+                "basis_type": rng.choice(["contango", "backwardation", "neutral"]),
+                "basis": rng.uniform(-1, 1),
+            }),
+        }),
+    }
+
+
+def scalar_scores(analyzer, row):
+    """Скоры факторов скалярным путём (как в calculate_signal)."""
+    a = analyzer
+    technical = row["technical_data"]
+    short_term = row["short_term_data"]
+    coinglass = row["coinglass_data"]
+    deep_whale = row["deep_whale_data"] or {}
+    deep_deriv = row["deep_derivatives_data"] or {}
+
+    price_momentum = 0.0
+    if short_term and short_term.get("current_price") and short_term.get("price_10min_ago"):
+        price_momentum = a._calculate_price_momentum_score(
+            short_term["current_price"], short_term["price_10min_ago"]
+        )
+    coinglass_oi = coinglass_top = 0.0
+    if coinglass:
+        coinglass_oi = a._calculate_oi_change_score(
+            coinglass.get("oi_change_24h", 0), row["market_data"].get("change_24h", 0)
+        )
+        coinglass_top = a._calculate_top_traders_score(coinglass.get("top_traders_ratio", 1.0))
+
+    return [
+        a._calculate_whale_score(row["whale_data"], row["exchange_flows"]),
+        a._calculate_trend_score(technical) if technical else 0.0,
+        a._calculate_momentum_score(technical) if technical else 0.0,
+        a._calculate_volatility_score(technical) if technical else 0.0,
+        a._calculate_volume_score(technical) if technical else 0.0,
+        a._calculate_market_score(row["market_data"]),
+        a._calculate_orderbook_score(row["order_book"]),
+        a._calculate_derivatives_score(row["futures_data"], row["funding_rate"]),
+        a._calculate_onchain_score(row["onchain_data"]),
+        a._calculate_sentiment_score(row["fear_greed"]),
+        a._calculate_short_term_trend_score(short_term),
+        a._calculate_trades_flow_score(row["trades_flow"]),
+        a._calculate_liquidations_score(row["liquidations"]),
+        a._calculate_orderbook_delta_score(row["orderbook_delta"]),
+        price_momentum,
+        coinglass_oi,
+        coinglass_top,
+        a._calculate_news_sentiment_score(row["news_sentiment"]),
+        a._calculate_tradingview_score(row["tradingview_rating"]),
+        a._calculate_whale_alert_score(row["whale_alert"]),
+        a._calculate_social_score(row["social_data"]),
+        a._calculate_whale_accumulation_score(deep_whale.get("accumulation_distribution")),
+        a._calculate_exchange_flow_detailed_score(deep_whale.get("exchange_flows_detailed")),
+        a._calculate_stablecoin_flow_score(deep_whale.get("stablecoin_flows")),
+        a._calculate_oi_price_correlation_score(deep_deriv.get("oi_price_correlation")),
+        a._calculate_liquidation_levels_score(deep_deriv.get("liquidation_levels")),
+        a._calculate_ls_ratio_detailed_score(deep_deriv.get("ls_ratio_by_exchange")),
+        a._calculate_funding_trend_score(deep_deriv.get("funding_rate_history")),
+        a._calculate_basis_score(deep_deriv.get("basis")),
+    ]
+
+
+@pytest.fixture
+def analyzer():
+    return AISignalAnalyzer(Mock())
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(42)
+    return [make_row(rng) for _ in range(400)]
+
+
+class TestFactorMatrix:
+    """Matrix path vs scalar AISignalAnalyzer reference."""
+
+    def test_factor_scores_match_scalar(self, analyzer, rows):
+        matrix = FactorMatrix()
+        scores = matrix.factor_scores(matrix.build_inputs(rows))
+
+        expected = np.array([scalar_scores(analyzer, row) for row in rows], dtype=float)
+        assert scores.shape == (len(rows), len(FACTOR_NAMES))
+        for i, name in enumerate(FACTOR_NAMES):
+            np.testing.assert_allclose(scores[:, i], expected[:, i], atol=1e-9, err_msg=name)
+
+    def test_total_and_consensus_match_scalar(self, analyzer, rows):
+        matrix = FactorMatrix()
+        result = matrix.score(rows)
+
+        for i, row in enumerate(rows):
+            scores = scalar_scores(analyzer, row)
+            total = sum(
+                analyzer._cap_factor_contribution(score, weight) for score, weight in zip(scores, matrix.weights)
+            ) * analyzer.SCORE_SCALE_FACTOR
+            total = analyzer.apply_total_score_limit(total)
+            assert result["total_score"][i] == pytest.approx(total)
+
+            consensus = analyzer.count_consensus(dict(zip(CONSENSUS_FACTORS, scores)))
+            assert result["bullish_count"][i] == consensus["bullish_count"]
+            assert result["bearish_count"][i] == consensus["bearish_count"]
+            assert result["neutral_count"][i] == consensus["neutral_count"]
+
+            direction = analyzer._determine_direction_from_score(total)
+            assert result["direction"][i] == direction
+            assert result["strength"][i] == analyzer.calculate_signal_strength(total)
+            assert result["probability"][i] == analyzer._calculate_real_probability(
+                total, direction,
+                consensus["bullish_count"], consensus["bearish_count"], consensus["neutral_count"],
+            )
+
+    def test_smoothing_with_previous_scores(self, analyzer, rows):
+        matrix = FactorMatrix()
+        scores = matrix.factor_scores(matrix.build_inputs(rows[:3]))
+        raw = matrix.total_scores(scores)
+        previous = np.array([np.nan, 50.0, -200.0])
+
+        smoothed = matrix.total_scores(scores, previous)
+
+        alpha = analyzer.SMOOTHING_ALPHA
+        assert smoothed[0] == pytest.approx(raw[0])
+        assert smoothed[1] == pytest.approx(
+            analyzer.apply_total_score_limit(alpha * raw[1] + (1 - alpha) * 50.0)
+        )
+        assert smoothed[2] == pytest.approx(
+            analyzer.apply_total_score_limit(alpha * raw[2] + (1 - alpha) * -200.0)
+        )
+
+    def test_probability_scales_match_scalar(self, analyzer):
+        totals = np.linspace(-140, 140, 561)
+        matrix = FactorMatrix()
+
+        from_score = matrix.probabilities_from_score(totals)
+        sideways = matrix.sideways_probabilities(totals)
+        realistic = matrix.realistic_probabilities(totals, np.full(totals.shape, 18))
+
+        for i, total in enumerate(totals):
+            assert from_score[i] == analyzer._calculate_probability_from_score(total)
+            assert sideways[i] == analyzer._calculate_probability_for_sideways(total)
+            assert realistic[i] == analyzer.calculate_realistic_probability(total, 18)
+
+    def test_clamp_block_scores_match_scalar(self, analyzer):
+        rng = np.random.default_rng(1)
+        scores = rng.uniform(-30, 30, 200)
+        factors = rng.integers(0, 6, 200)
+
+        clamped = FactorMatrix().clamp_block_scores(scores, factors)
+
+        for i in range(len(scores)):
+            assert clamped[i] == pytest.approx(analyzer._clamp_block_score(scores[i], int(factors[i])))
+
+    def test_factors_come_from_analyzer(self, analyzer):
+        matrix = FactorMatrix()
+
+        assert FACTOR_NAMES == tuple(name for name, _ in AISignalAnalyzer.SIGNAL_FACTORS)
+        assert CONSENSUS_FACTORS == FACTOR_NAMES[:len(CONSENSUS_FACTORS)]
+        assert matrix.weights.tolist() == [getattr(analyzer, attr) for _, attr in AISignalAnalyzer.SIGNAL_FACTORS]
+
+    def test_empty_rows(self):
+        assert FactorMatrix().score([]) == {}
+
+    def test_as_dicts(self, rows):
+        matrix = FactorMatrix()
+        scores = matrix.factor_scores(matrix.build_inputs(rows[:2]))
+
+        dicts = matrix.as_dicts(scores)
+
+        assert len(dicts) == 2
+        assert list(dicts[0]) == list(FACTOR_NAMES)
@@ -0,0 +1,232 @@
+"""
+Tests for FetchPlan dependency-graph scheduler.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.ai_signals import AISignalAnalyzer
+from signals.fetch_plan import FetchPlan
+from signals.latency import LatencyTracker, latency_tracker
+
+
+async def _delayed(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestFetchPlan:
+    """Tests for FetchPlan."""
+
+    @pytest.mark.asyncio
+    async def test_independent_nodes_run_concurrently(self):
+        """Independent sources should finish in ~max latency, not the sum."""
+        plan = FetchPlan("test")
+        for i in range(5):
+            plan.add(f"source_{i}", lambda i=i: _delayed(i, 0.1))
+
+        start = time.monotonic()
+        results = await plan.run()
+        elapsed = time.monotonic() - start
+
+        assert results == {f"source_{i}": i for i in range(5)}
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_dependent_node_receives_inputs(self):
+        """Dependencies are passed positionally in declaration order."""
+        plan = FetchPlan("test")
+        plan.add("a", lambda: _delayed(2, 0.01))
+        plan.add("b", lambda: 3)
+        plan.add("product", lambda a, b: a * b, depends=["a", "b"])
+        plan.add("chained", lambda product: _delayed(product + 1, 0.01), depends=["product"])
+
+        results = await plan.run()
+
+        assert results["product"] == 6
+        assert results["chained"] == 7
+
+    @pytest.mark.asyncio
+    async def test_dependent_starts_before_unrelated_slow_source(self):
+        """A dependent computation must not wait for unrelated slow sources."""
+        started = {}
+        plan = FetchPlan("test")
+        plan.add("fast", lambda: _delayed(1, 0.01))
+        plan.add("slow", lambda: _delayed(2, 0.2))
+
+        def compute(fast):
+            started["at"] = time.monotonic()
+            return fast
+
+        plan.add("compute", compute, depends=["fast"])
+
+        start = time.monotonic()
+        await plan.run()
+
+        assert started["at"] - start < 0.1
+
+    @pytest.mark.asyncio
+    async def test_failed_node_uses_default(self):
+        """Errors are replaced by the node default and dependents still run."""
+        async def boom():
+            raise RuntimeError("upstream down")
+
+        plan = FetchPlan("test")
+        plan.add("external", boom, default={})
+        plan.add("ohlcv", lambda external: external.get("ohlcv"), depends=["external"])
+
+        results = await plan.run()
+
+        assert results["external"] == {}
+        assert results["ohlcv"] is None
+
+    @pytest.mark.asyncio
+    async def test_required_node_aborts_plan(self):
+        """A required source returning None cancels the remaining work."""
+        plan = FetchPlan("test")
+        plan.add("market", lambda: _delayed(None, 0.01), required=True)
+        plan.add("slow", lambda: _delayed(1, 5))
+
+        start = time.monotonic()
+        results = await plan.run()
+
+        assert results["market"] is None
+        assert "slow" not in results
+        assert time.monotonic() - start < 1
+
+    def test_unknown_dependency_rejected(self):
+        """Unknown dependencies are reported before anything runs."""
+        plan = FetchPlan("test")
+        plan.add("a", lambda missing: missing, depends=["missing"])
+
+        with pytest.raises(ValueError):
+            asyncio.run(plan.run())
+
+    def test_cycle_rejected(self):
+        """Dependency cycles are reported."""
+        plan = FetchPlan("test")
+        plan.add("a", lambda b: b, depends=["b"])
+        plan.add("b", lambda a: a, depends=["a"])
+
+        with pytest.raises(ValueError):
+            asyncio.run(plan.run())
+
+    def test_duplicate_node_rejected(self):
+        """Node names must be unique."""
+        plan = FetchPlan("test")
+        plan.add("a", lambda: 1)
+
+        with pytest.raises(ValueError):
+            plan.add("a", lambda: 2)
+
+    @pytest.mark.asyncio
+    async def test_on_result_called_per_node(self):
+        """on_result sees every source as soon as it is ready."""
+        seen = []
+        plan = FetchPlan("test")
+        plan.add("a", lambda: 1)
+        plan.add("b", lambda a: a + 1, depends=["a"])
+
+        await plan.run(on_result=lambda name, value: seen.append((name, value)))
+
+        assert sorted(seen) == [("a", 1), ("b", 2)]
+
+
+class TestFetchPlanLatencyBudget:
+    """Per-source deadlines and the global latency budget."""
+
+    @pytest.mark.asyncio
+    async def test_source_past_deadline_is_dropped(self):
+        async def slow():
+            await asyncio.sleep(1)
+            return "late"
+
+        plan = FetchPlan("BTC", deadlines={"slow": 0.05})
+        plan.add("fast", AsyncMock(return_value=1))
+        plan.add("slow", slow, default={})
+
+        started = time.monotonic()
+        results = await plan.run()
+
+        assert time.monotonic() - started < 0.5
+        assert results == {"fast": 1, "slow": {}}
+        assert plan.dropped == ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_budget_bounds_whole_plan(self):
+        async def slow(value):
+            await asyncio.sleep(0.06)
+            return value
+
+        plan = FetchPlan("BTC", budget=0.1)
+        plan.add("a", lambda: slow(1))
+        plan.add("b", lambda a: slow(a + 1), depends=["a"])
+        plan.add("c", lambda b: b, depends=["b"])
+
+        results = await plan.run()
+
+        assert results["a"] == 1
+        assert results["b"] is None
+        assert "b" in plan.dropped
+
+    @pytest.mark.asyncio
+    async def test_timeout_recorded_in_tracker(self):
+        tracker = LatencyTracker()
+        plan = FetchPlan("BTC", tracker=tracker, deadlines={"slow": 0.01})
+        plan.add("slow", lambda: asyncio.sleep(1))
+
+        await plan.run()
+
+        assert tracker.stats("fetch.slow")["outcomes"] == {"timeout": 1}
+
+
+class TestAnalyzeCoinLatencyBudget:
+    """Enhancers run inside the analyze_coin latency budget."""
+
+    @pytest.mark.asyncio
+    async def test_slow_enhancer_dropped_within_budget(self):
+        analyzer = AISignalAnalyzer(Mock())
+        analyzer.SIGNAL_LATENCY_BUDGET = 0.2
+
+        async def slow_score(symbol, current_price):
+            await asyncio.sleep(10)
+            return 25.0
+
+        analyzer.enhancer = Mock()
+        analyzer.enhancer.get_total_score = slow_score
+        analyzer.enhancer.get_extra_data = AsyncMock(return_value={"exchange_leader": "Binance"})
+
+        build_plan = analyzer._build_fetch_plan
+
+        def offline_plan(symbol, bybit_symbol, shared=None):
+            # Сетевые источники заменены заглушками, enhancers - настоящие узлы плана
+            plan = build_plan(symbol, bybit_symbol, shared)
+            for name, node in plan._nodes.items():
+                if not name.startswith("enhancer_"):
+                    node["func"] = lambda *args: None
+            plan._nodes["market_data"]["func"] = lambda: {"price_usd": 100.0}
+            return plan
+
+        analyzer._build_fetch_plan = offline_plan
+        analyzer.calculate_signal = AsyncMock(return_value={"direction": "long"})
+        analyzer.cpu_pool.run = AsyncMock(return_value="signal BTC")
+        timeouts = latency_tracker.stats("fetch.enhancer_score").get("outcomes", {}).get("timeout", 0)
+
+        started = time.monotonic()
+        message = await analyzer.analyze_coin("BTC")
+
+        assert time.monotonic() - started < analyzer.SIGNAL_LATENCY_BUDGET + 0.3
+        assert message == "signal BTC"
+        kwargs = analyzer.calculate_signal.await_args.kwargs
+        assert kwargs["enhancer_raw_score"] == 0.0
+        assert kwargs["enhancer_data"] == {"exchange_leader": "Binance"}
+        assert analyzer.get_last_signal("BTC")["dropped_sources"] == ["enhancer_score"]
+        assert latency_tracker.stats("fetch.enhancer_score")["outcomes"]["timeout"] == timeouts + 1
@@ -0,0 +1,113 @@
+"""
+Tests for per-source freshness policy in AISignalAnalyzer.
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.ai_signals import AISignalAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    tracker = Mock()
+    tracker.get_transactions_by_blockchain = AsyncMock(return_value=[])
+    return AISignalAnalyzer(tracker)
+
+
+class TestFreshnessPolicy:
+    """Tests for FRESHNESS_POLICY handling."""
+
+    def test_policy_covers_slow_and_fast_sources(self, analyzer):
+        """Slow inputs are cached, microstructure is always refreshed."""
+        policy = analyzer.FRESHNESS_POLICY
+        for slow in ("fear_greed", "macro", "options", "stablecoin_flows"):
+            assert policy[slow]["ttl"] >= 900
+            assert policy[slow]["max_staleness"] >= policy[slow]["ttl"]
+        for fast in ("orderbook_delta", "trades_flow", "short_term_ohlcv_5m"):
+            assert policy[fast]["ttl"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_reused(self, analyzer):
+        fetch = AsyncMock(return_value={"value": 40})
+
+        first = await analyzer._fetch_fresh("fear_greed", "fng", fetch)
+        second = await analyzer._fetch_fresh("fear_greed", "fng", fetch)
+
+        assert first == second == {"value": 40}
+        assert fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_always_fetches(self, analyzer):
+        fetch = AsyncMock(return_value={"delta": 1.0})
+
+        await analyzer._fetch_fresh("orderbook_delta", "ob_BTC", fetch)
+        await analyzer._fetch_fresh("orderbook_delta", "ob_BTC", fetch)
+
+        assert fetch.await_count == 2
+        assert "ob_BTC" not in analyzer._cache
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_refetched(self, analyzer):
+        fetch = AsyncMock(side_effect=[{"value": 40}, {"value": 55}])
+
+        await analyzer._fetch_fresh("fear_greed", "fng", fetch)
+        analyzer._cache_timestamps["fng"] = datetime.now() - timedelta(
+            seconds=analyzer.FRESHNESS_POLICY["fear_greed"]["ttl"] + 1
+        )
+        result = await analyzer._fetch_fresh("fear_greed", "fng", fetch)
+
+        assert result == {"value": 55}
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_used_when_fetch_fails(self, analyzer):
+        """A failed refresh falls back to data within max_staleness."""
+        analyzer._set_cache("macro_data", {"score": 3}, "macro")
+        analyzer._cache_timestamps["macro_data"] = datetime.now() - timedelta(
+            seconds=analyzer.FRESHNESS_POLICY["macro"]["ttl"] + 10
+        )
+
+        result = await analyzer._fetch_fresh("macro", "macro_data", AsyncMock(side_effect=RuntimeError("down")))
+
+        assert result == {"score": 3}
+
+    @pytest.mark.asyncio
+    async def test_too_stale_entry_not_used(self, analyzer):
+        analyzer._set_cache("macro_data", {"score": 3}, "macro")
+        analyzer._cache_timestamps["macro_data"] = datetime.now() - timedelta(
+            seconds=analyzer.FRESHNESS_POLICY["macro"]["max_staleness"] + 10
+        )
+
+        result = await analyzer._fetch_fresh("macro", "macro_data", AsyncMock(return_value=None))
+
+        assert result is None
+
+    def test_evict_keeps_valid_entries(self, analyzer):
+        """Evicting replaces the old full clear: still-valid entries survive."""
+        analyzer._set_cache("fear_greed_index", {"value": 40}, "fear_greed")
+        analyzer._set_cache("old", {"x": 1})
+        analyzer._cache_timestamps["old"] = datetime.now() - timedelta(
+            seconds=analyzer.CACHE_MAX_AGE_DEFAULT + 1
+        )
+
+        analyzer._evict_expired_cache()
+
+        assert "fear_greed_index" in analyzer._cache
+        assert "old" not in analyzer._cache
+
+    @pytest.mark.asyncio
+    async def test_fear_greed_reused_across_calls(self, analyzer):
+        analyzer._fetch_fear_greed_index = AsyncMock(return_value={"value": 20, "classification": "Fear"})
+
+        await analyzer.get_fear_greed_index()
+        await analyzer.get_fear_greed_index()
+
+        assert analyzer._fetch_fear_greed_index.await_count == 1
@@ -91,7 +91,7 @@ async def test_scan_with_futures_mode():
     with patch.object(scanner, 'fetch_futures_symbols', return_value=mock_futures_symbols):
         with patch.object(scanner, 'fetch_all_coins', return_value=test_coins):
             with patch.object(scanner, 'apply_filters', side_effect=lambda x: x):
-                with patch.object(scanner, 'deep_analyze', return_value=None):
+                with patch.object(scanner, 'deep_analyze_batch', return_value=[]):
                     # Test futures mode
                     await scanner.scan(mode="futures")
                     
@@ -106,14 +106,16 @@ class TestGemScanner:
         # Session should be None initially
         assert scanner.session is None
 
-        # Create session
+        # Create session (shared http_client pool)
         await scanner._ensure_session()
-        assert scanner.session is not None
-        assert not scanner.session.closed
+        session = scanner.session
+        assert session is not None
+        assert not session.closed
 
-        # Close session
+        # Release session: the shared pool is closed only on shutdown
         await scanner.close()
-        assert scanner.session.closed
+        assert scanner.session is None
+        assert not session.closed
 
     @pytest.mark.asyncio
     async def test_scan_returns_list(self):
@@ -0,0 +1,127 @@
+"""
+Tests for the process-wide HTTP client (http_client).
+"""
+
+import asyncio
+import os
+import sys
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from http_client import HTTPClient
+
+
+class FlakyServer:
+    """Локальный сервер: первые failures ответов - status, затем JSON."""
+
+    def __init__(self, failures=0, status=503):
+        self.failures = failures
+        self.status = status
+        self.calls = 0
+        self.url = None
+        self._runner = None
+
+    async def _handle(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return web.Response(status=self.status)
+        return web.json_response({"ok": True, "query": dict(request.query)})
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/data", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}/data"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._runner.cleanup()
+
+
+@pytest.fixture
+def client():
+    return HTTPClient(retries=2, retry_backoff=0)
+
+
+class TestSession:
+    """Одна сессия на процесс."""
+
+    @pytest.mark.asyncio
+    async def test_session_shared_and_not_closed(self, client):
+        async with client.session() as first:
+            pass
+        async with client.session() as second:
+            pass
+
+        assert first is second
+        assert not first.closed
+        assert first.connector.limit_per_host == client.limit_per_host
+
+        await client.close()
+        assert first.closed
+        assert client.get_session() is not first
+        await client.close()
+
+    def test_new_event_loop_gets_new_session(self, client):
+        async def current():
+            return client.get_session()
+
+        first = asyncio.run(current())
+        second = asyncio.run(current())
+
+        assert first is not second
+        assert first.closed
+        asyncio.run(client.close())
+
+
+class TestGetJson:
+    """Повторы при временных ошибках."""
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_status(self, client):
+        async with FlakyServer(failures=2) as server:
+            data = await client.get_json(server.url, params={"symbol": "BTCUSDT"})
+        await client.close()
+
+        assert data == {"ok": True, "query": {"symbol": "BTCUSDT"}}
+        assert server.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_retries(self, client):
+        async with FlakyServer(failures=5, status=429) as server:
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await client.get_json(server.url)
+        await client.close()
+
+        assert error.value.status == 429
+        assert server.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, client):
+        async with FlakyServer(failures=1, status=404) as server:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.get_json(server.url)
+        await client.close()
+
+        assert server.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_error_retried(self, client, monkeypatch):
+        async with FlakyServer() as server:
+            url = server.url
+        attempts = []
+        get_session = client.get_session
+        monkeypatch.setattr(client, "get_session", lambda: attempts.append(1) or get_session())
+
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.get_json(url)
+        await client.close()
+
+        assert len(attempts) == 3
@@ -0,0 +1,153 @@
+"""
+Tests for the indicator memo cache and the shared indicator series.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from enhancers.volatility import VolatilityEnhancer
+from ml.data_collector import calculate_indicators_for_training
+from signals.indicator_cache import IndicatorCache
+from signals.indicators import (
+    atr_series,
+    bollinger_series,
+    calculate_atr,
+    calculate_bollinger_bands,
+    calculate_macd,
+    calculate_rsi,
+    macd_series,
+    rsi_series,
+)
+from signals.multi_timeframe import MultiTimeframeAnalyzer
+from signals.super_signals import SuperSignals
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(12)
+    close = 100 + np.cumsum(rng.normal(0, 1, 120))
+    spread = rng.uniform(0.1, 2.0, 120)
+    return [
+        {
+            "timestamp": 1_700_000_000_000 + i * 3_600_000,
+            "open": float(c - s / 3),
+            "high": float(c + s),
+            "low": float(c - s),
+            "close": float(c),
+            "volume": float(100 + i),
+        }
+        for i, (c, s) in enumerate(zip(close, spread))
+    ]
+
+
+class TestIndicatorCache:
+    """Ключ (символ, интервал, последняя свеча, параметры)."""
+
+    def test_repeated_request_is_a_lookup(self, candles):
+        cache = IndicatorCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 42
+
+        assert cache.get_or_compute("rsi", candles, compute, symbol="BTC", interval="1h", period=14) == 42
+        assert cache.get_or_compute("rsi", candles, compute, symbol="BTC", interval="1h", period=14) == 42
+
+        assert len(calls) == 1
+        assert cache.stats["hits"] == 1
+
+    def test_key_changes(self, candles):
+        cache = IndicatorCache()
+        compute = lambda: object()
+
+        first = cache.get_or_compute("rsi", candles, compute, symbol="BTC", interval="1h", period=14)
+        assert cache.get_or_compute("rsi", candles, compute, symbol="BTC", interval="1h", period=7) is not first
+        assert cache.get_or_compute("rsi", candles, compute, symbol="ETH", interval="1h", period=14) is not first
+        assert cache.get_or_compute("rsi", candles[:-1], compute, symbol="BTC", interval="1h", period=14) is not first
+
+        # Формирующийся бар: то же время открытия, другое закрытие
+        updated = candles[:-1] + [dict(candles[-1], close=candles[-1]["close"] + 1)]
+        assert cache.get_or_compute("rsi", updated, compute, symbol="BTC", interval="1h", period=14) is not first
+
+    def test_uncached_without_identity(self, candles):
+        cache = IndicatorCache()
+        no_time = [{k: v for k, v in c.items() if k != "timestamp"} for c in candles]
+
+        cache.get_or_compute("rsi", candles, lambda: 1)
+        cache.get_or_compute("rsi", no_time, lambda: 1, symbol="BTC", interval="1h")
+
+        assert len(cache) == 0
+        assert cache.stats["uncached"] == 2
+
+    def test_lru_eviction(self, candles):
+        cache = IndicatorCache(max_entries=2)
+        for period in (7, 14, 21):
+            cache.get_or_compute("rsi", candles, lambda: period, symbol="BTC", interval="1h", period=period)
+
+        assert len(cache) == 2
+        key = cache.make_key("rsi", candles, "BTC", "1h", {"period": 7})
+        assert cache.lookup(key) == (False, None)
+
+    def test_multi_timeframe_uses_cache(self, candles, monkeypatch):
+        from signals import multi_timeframe
+
+        cache = IndicatorCache()
+        monkeypatch.setattr(multi_timeframe, "indicator_cache", cache)
+        analyzer = MultiTimeframeAnalyzer()
+
+        first = analyzer.calculate_timeframe_indicators(candles, "BTCUSDT", "1h")
+        second = analyzer.calculate_timeframe_indicators(candles, "BTCUSDT", "1h")
+
+        assert first is second
+        assert first == analyzer.calculate_timeframe_indicators(candles)
+
+
+class TestSharedIndicators:
+    """Все пути считают индикаторы одной библиотекой."""
+
+    def test_series_match_single_value_functions(self, candles):
+        high = [c["high"] for c in candles]
+        low = [c["low"] for c in candles]
+        close = [c["close"] for c in candles]
+        rsi = rsi_series(close)
+        atr = atr_series(high, low, close)
+        upper, middle, lower = bollinger_series(close)
+        macd_line, signal_line, histogram = macd_series(close)
+
+        for i in (19, 35, 80, len(close) - 1):
+            window = slice(0, i + 1)
+            assert rsi[i] == calculate_rsi(close[window]).value
+            assert atr[i] == calculate_atr(high[window], low[window], close[window]).value
+            bb = calculate_bollinger_bands(close[window])
+            assert (upper[i], middle[i], lower[i]) == (bb.upper, bb.middle, bb.lower)
+            macd = calculate_macd(close[window])
+            if macd:
+                assert (macd_line[i], signal_line[i], histogram[i]) == (
+                    macd.macd_line, macd.signal_line, macd.histogram
+                )
+
+    def test_scanner_and_enhancer_match_library(self, candles):
+        high = [c["high"] for c in candles]
+        low = [c["low"] for c in candles]
+        close = [c["close"] for c in candles]
+        ss = SuperSignals()
+
+        assert ss._calculate_rsi(close) == calculate_rsi(close).value
+        assert ss._calculate_atr(high, low, close) == calculate_atr(high, low, close).value
+        assert VolatilityEnhancer().calculate_atr_from_ohlcv(candles) == calculate_atr(high, low, close).value
+
+    def test_training_indicators_match_live(self, candles):
+        df = calculate_indicators_for_training(pd.DataFrame(candles))
+        close = [c["close"] for c in candles]
+
+        assert df["rsi"].iloc[-1] == calculate_rsi(close).value
+        assert df["macd_diff"].iloc[-1] == calculate_macd(close).histogram
+        assert df["bb_upper"].iloc[-1] == calculate_bollinger_bands(close).upper
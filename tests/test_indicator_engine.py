@@ -0,0 +1,123 @@
+"""
+Tests for the batch indicator engine (signals.indicator_engine).
+"""
+
+import os
+import statistics
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.indicator_engine import OHLCVMatrix, compute_indicator_table
+from signals.indicators import calculate_adx, calculate_macd
+from signals.smart_signals import SmartSignalAnalyzer
+from signals.super_signals import SuperSignals
+
+
+def make_candles(rng, bars, start=100.0):
+    close = start + np.cumsum(rng.normal(0, 1, bars))
+    spread = rng.uniform(0.1, 2.0, bars)
+    volume = rng.uniform(10, 1000, bars)
+    return [
+        {"high": float(c + s), "low": float(c - s), "close": float(c), "volume": float(v)}
+        for c, s, v in zip(close, spread, volume)
+    ]
+
+
+@pytest.fixture
+def universe():
+    """Монеты с разной длиной истории (включая слишком короткие)."""
+    rng = np.random.default_rng(5)
+    lengths = [100, 100, 64, 35, 27, 21, 15, 5, 0]
+    return [make_candles(rng, n, start=50 + 10 * i) for i, n in enumerate(lengths)]
+
+
+class TestOHLCVMatrix:
+    """Tests for OHLCVMatrix.from_candles."""
+
+    def test_right_aligned_with_nan_padding(self, universe):
+        matrix = OHLCVMatrix.from_candles([str(i) for i in range(len(universe))], universe)
+
+        assert matrix.close.shape == (len(universe), 100)
+        assert list(matrix.bars) == [len(c) for c in universe]
+        assert np.isnan(matrix.close[2, :36]).all()
+        assert matrix.close[2, -1] == universe[2][-1]["close"]
+        assert np.isnan(matrix.close[-1]).all()
+
+    def test_max_bars_keeps_latest(self, universe):
+        matrix = OHLCVMatrix.from_candles(["a"], [universe[0]], max_bars=20)
+
+        assert matrix.close.shape == (1, 20)
+        assert matrix.close[0, 0] == universe[0][80]["close"]
+
+
+class TestScannerParity:
+    """Колонки таблицы совпадают с поштучными расчётами сканеров."""
+
+    def test_matches_super_signals_methods(self, universe):
+        ss = SuperSignals()
+        table = compute_indicator_table(OHLCVMatrix.from_candles([str(i) for i in range(len(universe))], universe))
+
+        for i, candles in enumerate(universe):
+            closes = [c["close"] for c in candles]
+            highs = [c["high"] for c in candles]
+            lows = [c["low"] for c in candles]
+            volumes = [c["volume"] for c in candles]
+            row = table.row(i)
+
+            if len(closes) >= 15:
+                assert row["rsi"] == pytest.approx(ss._calculate_rsi(closes), rel=1e-9)
+                assert row["atr"] == pytest.approx(ss._calculate_atr(highs, lows, closes), rel=1e-9)
+                assert row["adx"] == pytest.approx(calculate_adx(highs, lows, closes).value, rel=1e-9)
+            else:
+                assert np.isnan(row["rsi"]) and np.isnan(row["atr"]) and np.isnan(row["adx"])
+            if len(closes) >= 20:
+                assert row["bb_position"] == pytest.approx(ss._calculate_bb_position(closes, closes[-1]), rel=1e-9)
+                assert row["ema_20"] == pytest.approx(ss._calculate_ema(candles, 20), rel=1e-12)
+            if len(closes) >= 2:
+                assert row["volume_ratio"] == pytest.approx(ss._calculate_volume_ratio(volumes), rel=1e-9)
+            if len(closes) >= 28:
+                stoch = ss._calculate_stoch_rsi(candles)
+                assert round(row["stoch_rsi_k"], 1) == pytest.approx(stoch["k"], abs=0.051)
+                assert round(row["stoch_rsi_d"], 1) == pytest.approx(stoch["d"], abs=0.051)
+            else:
+                assert np.isnan(row["stoch_rsi_k"])
+            if len(closes) >= 35:
+                expected = calculate_macd(closes)
+                assert row["macd"] == pytest.approx(expected.macd_line, rel=1e-9, abs=1e-12)
+                assert row["macd_signal"] == pytest.approx(expected.signal_line, rel=1e-9, abs=1e-12)
+
+    def test_super_signals_batch_equals_single(self, universe):
+        ss = SuperSignals()
+        pairs = [(c, c[-30:]) for c in universe if len(c) >= 20]
+        prices = [c[-1]["close"] * 1.01 for c, _ in pairs]
+
+        batch = ss._calculate_indicators_batch([c for c, _ in pairs], [c4 for _, c4 in pairs], prices)
+
+        for (candles_1h, candles_4h), price, result in zip(pairs, prices, batch):
+            single = ss._calculate_indicators(candles_1h, candles_4h, price)
+            assert result == single
+            assert result["stoch_rsi"] == ss._calculate_stoch_rsi(candles_1h)
+            assert result["macd"] == pytest.approx(ss._calculate_macd([c["close"] for c in candles_1h]))
+
+    def test_smart_signals_indicators(self, universe):
+        analyzer = SmartSignalAnalyzer()
+        ohlcv = [c for c in universe if len(c) >= 20]
+
+        rows = analyzer._calculate_indicators(ohlcv)
+
+        for candles, row in zip(ohlcv, rows):
+            closes = [c["close"] for c in candles]
+            volumes = [c["volume"] for c in candles]
+            ranges = [(c["high"] - c["low"]) / c["low"] * 100 for c in candles[-14:]]
+            assert row["avg_volume"] == pytest.approx(sum(volumes[:-1]) / len(volumes[:-1]), rel=1e-9)
+            assert row["atr_pct"] == pytest.approx(sum(ranges) / len(ranges), rel=1e-9)
+            assert row["bb_width_pct"] == pytest.approx(
+                statistics.stdev(closes[-20:]) * 2 / closes[-1] * 100, rel=1e-9
+            )
+            if len(closes) < 21:
+                assert row["ema_long"] == pytest.approx(np.mean(closes))
@@ -0,0 +1,120 @@
+"""
+Tests for vectorised moving-average kernels (signals.kernels).
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals import kernels
+from signals.kernels import ema, ema_last, exp_smooth, sma, wilder
+from signals.indicators import _calculate_ema, calculate_keltner_channels
+from signals.scoring import calculate_ema as scoring_ema
+
+
+def loop_ema(data, period):
+    """Reference: the original per-element loop from indicators._calculate_ema."""
+    alpha = 2 / (period + 1)
+    result = np.zeros_like(data)
+    result[0] = data[0]
+    for i in range(1, len(data)):
+        result[i] = alpha * data[i] + (1 - alpha) * result[i - 1]
+    return result
+
+
+def loop_wilder(data, period):
+    result = np.full(len(data), np.nan)
+    result[period - 1] = np.mean(data[:period])
+    for i in range(period, len(data)):
+        result[i] = (1 / period) * data[i] + (1 - 1 / period) * result[i - 1]
+    return result
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    return 100 + np.cumsum(rng.normal(0, 1, 300))
+
+
+class TestEMA:
+    """Tests for ema / exp_smooth."""
+
+    @pytest.mark.parametrize("period", [2, 9, 12, 26, 50])
+    def test_bit_exact_with_loop(self, prices, period):
+        assert np.array_equal(ema(prices, period), loop_ema(prices, period))
+
+    def test_numpy_fallback_bit_exact(self, prices):
+        with patch.object(kernels, "SCIPY_AVAILABLE", False):
+            result = ema(prices, 12)
+
+        assert np.array_equal(result, loop_ema(prices, 12))
+
+    def test_matrix_rows_match_1d(self, prices):
+        matrix = np.vstack([prices, prices[::-1], prices * 2])
+
+        result = ema(matrix, 21)
+
+        for row in range(3):
+            assert np.array_equal(result[row], ema(matrix[row], 21))
+
+    def test_leading_nan_padding(self, prices):
+        matrix = np.vstack([prices, np.concatenate([np.full(100, np.nan), prices[:200]])])
+
+        result = ema(matrix, 9)
+
+        assert np.isnan(result[1, :100]).all()
+        assert np.array_equal(result[1, 100:], ema(prices[:200], 9))
+
+    def test_all_nan_row(self):
+        result = exp_smooth(np.full((2, 5), np.nan), 0.5)
+
+        assert np.isnan(result).all()
+
+    def test_callers_share_kernel(self, prices):
+        assert np.array_equal(_calculate_ema(prices, 26), ema(prices, 26))
+        assert scoring_ema(list(prices), 20) == ema_last(prices, 20)
+
+    def test_keltner_middle_is_ema(self, prices):
+        result = calculate_keltner_channels(list(prices + 1), list(prices - 1), list(prices), period=20)
+
+        assert result.middle == ema_last(prices, 20)
+
+
+class TestSMAAndWilder:
+    """Tests for sma / wilder."""
+
+    def test_sma_matches_window_mean(self, prices):
+        result = sma(prices, 20)
+
+        assert np.isnan(result[:19]).all()
+        for i in (19, 100, 299):
+            assert result[i] == np.mean(prices[i - 19:i + 1])
+
+    def test_sma_period_longer_than_series(self):
+        assert np.isnan(sma([1.0, 2.0], 5)).all()
+
+    def test_wilder_matches_loop(self, prices):
+        expected = loop_wilder(prices, 14)
+
+        result = wilder(prices, 14)
+
+        assert np.isnan(result[:13]).all()
+        np.testing.assert_array_equal(result[13:], expected[13:])
+
+    def test_wilder_matrix_with_padding(self, prices):
+        matrix = np.vstack([prices[:250], np.concatenate([np.full(50, np.nan), prices[:200]])])
+
+        result = wilder(matrix, 14)
+
+        np.testing.assert_array_equal(result[1, 50:], wilder(prices[:200], 14))
+        assert np.isnan(result[1, :63]).all()
+
+    def test_rejects_3d_input(self):
+        with pytest.raises(ValueError):
+            ema(np.zeros((2, 2, 2)), 3)
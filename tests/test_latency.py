@@ -0,0 +1,111 @@
+"""
+Tests for per-stage latency tracing (LatencyTracker).
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.latency import LatencyTracker, current_span
+from signals.fetch_plan import FetchPlan
+from signals.ai_signals import AISignalAnalyzer
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker."""
+
+    def test_record_and_percentiles(self):
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("fetch.ohlcv", float(ms))
+
+        stats = tracker.stats("fetch.ohlcv")
+
+        assert stats["count"] == 100
+        assert stats["p50_ms"] == pytest.approx(50, abs=1)
+        assert stats["p95_ms"] == pytest.approx(95, abs=1)
+        assert stats["max_ms"] == 100
+        assert stats["histogram"]["<=10ms"] == 10
+        assert sum(stats["histogram"].values()) == 100
+
+    def test_span_marks_errors_and_reraises(self):
+        tracker = LatencyTracker()
+
+        with pytest.raises(RuntimeError):
+            with tracker.span("fetch.broken"):
+                raise RuntimeError("boom")
+
+        assert tracker.stats("fetch.broken")["outcomes"] == {"error": 1}
+
+    @pytest.mark.asyncio
+    async def test_trace_marks_empty_and_timeout(self):
+        tracker = LatencyTracker()
+
+        assert await tracker.trace("fetch.none", AsyncMock(return_value=None)()) is None
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.trace("fetch.slow", asyncio.wait_for(asyncio.sleep(1), 0.01))
+
+        assert tracker.stats("fetch.none")["outcomes"] == {"empty": 1}
+        assert tracker.stats("fetch.slow")["outcomes"] == {"timeout": 1}
+
+    def test_current_span_is_scoped(self):
+        tracker = LatencyTracker()
+
+        with tracker.span("outer") as span:
+            assert current_span() is span
+            span.cache = "hit"
+        assert current_span() is None
+        assert tracker.stats("outer")["cache"] == {"hit": 1}
+
+    def test_summary_sorted_by_p95_and_json(self):
+        tracker = LatencyTracker()
+        tracker.record("fetch.fast", 5)
+        tracker.record("fetch.slow", 900, outcome="error")
+
+        lines = tracker.summary().splitlines()
+
+        assert lines[1].startswith("fetch.slow")
+        assert lines[2].startswith("fetch.fast")
+        assert set(json.loads(tracker.to_json())) == {"fetch.fast", "fetch.slow"}
+        assert "fetch.fast" not in tracker.summary(prefix="fetch.s")
+
+        tracker.reset()
+        assert tracker.summary() == "Нет данных о задержках"
+
+
+class TestPipelineInstrumentation:
+    """Fetch plan nodes and freshness cache are recorded."""
+
+    @pytest.mark.asyncio
+    async def test_fetch_plan_records_each_node(self):
+        tracker = LatencyTracker()
+        plan = FetchPlan("BTC", tracker=tracker)
+        plan.add("a", AsyncMock(return_value=1))
+        plan.add("b", AsyncMock(side_effect=RuntimeError("down")), default={})
+        plan.add("c", lambda a: None, depends=["a"])
+
+        await plan.run()
+
+        assert tracker.stats("fetch.a")["outcomes"] == {"ok": 1}
+        assert tracker.stats("fetch.b")["outcomes"] == {"error": 1}
+        assert tracker.stats("fetch.c")["outcomes"] == {"empty": 1}
+
+    @pytest.mark.asyncio
+    async def test_freshness_cache_hit_is_recorded(self):
+        tracker = LatencyTracker()
+        analyzer = AISignalAnalyzer(Mock())
+        fetch = AsyncMock(return_value={"value": 40})
+
+        for _ in range(2):
+            plan = FetchPlan("BTC", tracker=tracker)
+            plan.add("fear_greed", lambda: analyzer._fetch_fresh("fear_greed", "fng", fetch))
+            await plan.run()
+
+        assert tracker.stats("fetch.fear_greed")["cache"] == {"miss": 1, "hit": 1}
@@ -37,7 +37,7 @@ class TestMacroAnalyzer:
             }
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -53,7 +53,7 @@ class TestMacroAnalyzer:
     @pytest.mark.asyncio
     async def test_get_dxy_data_failure(self, analyzer):
         """Test DXY data fetch failure handling."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 404
             mock_session.return_value.__aenter__.return_value.get = Mock(return_value=mock_get)
@@ -77,7 +77,7 @@ class TestMacroAnalyzer:
             }
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -105,7 +105,7 @@ class TestMacroAnalyzer:
             }
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
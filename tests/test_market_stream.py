@@ -0,0 +1,317 @@
+"""
+Tests for WebSocket market data (signals.market_stream, signals.replay_server).
+"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.candle_store import CandleStore, _Entry
+from signals.candles import CandleSeries
+from signals.market_stream import MarketStream, Trade
+from signals.replay_server import ReplayServer, load_frames
+
+NOW = 1_700_000_000.0
+NOW_MS = int(NOW * 1000)
+FIVE_MIN = 5 * 60 * 1000
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def book_frame(kind, bids, asks, ts=NOW_MS, update_id=1):
+    return {
+        "topic": "orderbook.50.BTCUSDT",
+        "type": kind,
+        "ts": ts,
+        "data": {"s": "BTCUSDT", "b": bids, "a": asks, "u": update_id},
+    }
+
+
+def trade_frame(*trades):
+    return {
+        "topic": "publicTrade.BTCUSDT",
+        "type": "snapshot",
+        "ts": trades[-1][0],
+        "data": [
+            {"T": t, "s": "BTCUSDT", "S": side, "v": str(size), "p": str(price)}
+            for t, price, size, side in trades
+        ],
+    }
+
+
+def kline_frame(start, close):
+    return {
+        "topic": "kline.5.BTCUSDT",
+        "type": "snapshot",
+        "ts": start + 1000,
+        "data": [{
+            "start": start, "end": start + FIVE_MIN - 1, "interval": "5",
+            "open": "100", "high": str(close + 1), "low": "99", "close": str(close),
+            "volume": "3", "turnover": "300", "confirm": False, "timestamp": start + 1000,
+        }],
+    }
+
+
+FRAMES = [
+    book_frame("delta", [["1", "1"]], []),  # до снимка - пропускается
+    book_frame("snapshot", [["100", "2"], ["99", "3"]], [["101", "1"], ["102", "4"]]),
+    book_frame("delta", [["99", "0"], ["98", "5"]], [["101", "2.5"]], update_id=2),
+    trade_frame((NOW_MS - 1000, 100.5, 0.2, "Buy"), (NOW_MS - 500, 100.4, 0.1, "Sell")),
+    kline_frame(NOW_MS // FIVE_MIN * FIVE_MIN, 105.0),
+]
+
+
+def window_entry(times, clock):
+    series = CandleSeries(
+        {name: [100.0] * len(times) for name in ("open", "high", "low", "close", "volume")},
+        times=times,
+    )
+    return _Entry(series, len(times), clock())
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def stream(clock):
+    store = Mock()
+    store.apply_bar = Mock(return_value=True)
+    return MarketStream(symbols=["BTCUSDT"], store=store, clock=clock)
+
+
+class TestHandle:
+    """Разбор сообщений Bybit в локальное состояние."""
+
+    def test_topics(self, stream):
+        assert stream.topics == ["kline.5.BTCUSDT", "publicTrade.BTCUSDT", "orderbook.50.BTCUSDT"]
+
+    def test_orderbook_snapshot_and_delta(self, stream):
+        for frame in FRAMES[:3]:
+            stream.handle(frame)
+        stream._connected_since = NOW
+
+        book = stream.book("BTCUSDT")
+        assert book.levels("bids") == [[100.0, 2.0], [98.0, 5.0]]
+        assert book.levels("asks", 1) == [[101.0, 2.5]]
+        assert book.update_id == 2
+
+    def test_kline_applied_to_store(self, stream):
+        stream.handle(FRAMES[4])
+
+        venue, symbol, interval, bar = stream.store.apply_bar.call_args.args
+        assert (venue, symbol, interval) == ("bybit", "BTCUSDT", "5m")
+        assert bar["timestamp"] == NOW_MS // FIVE_MIN * FIVE_MIN
+        assert bar["close"] == 105.0
+
+    def test_trades_pruned_to_window(self, stream):
+        stream.handle(trade_frame((NOW_MS - 700_000, 1.0, 1.0, "Buy"), (NOW_MS, 2.0, 1.0, "Sell")))
+        stream._connected_since = NOW - 1000
+
+        assert stream.recent_trades("BTCUSDT", NOW_MS - 60_000) == [Trade(NOW_MS, 2.0, 1.0, "Sell")]
+
+    def test_not_covered_returns_none(self, stream, clock):
+        stream.handle(FRAMES[3])
+        assert stream.recent_trades("BTCUSDT", NOW_MS - 60_000) is None
+        assert stream.last_trades("BTCUSDT", 1) is None
+
+        # Подключение позже начала периода - буфер неполный
+        stream._connected_since = NOW - 30
+        assert stream.recent_trades("BTCUSDT", NOW_MS - 60_000) is None
+        assert len(stream.recent_trades("BTCUSDT", NOW_MS - 10_000)) == 2
+        assert stream.last_trades("BTCUSDT", 3) is None
+        assert stream.last_trades("BTCUSDT", 1) == [Trade(NOW_MS - 500, 100.4, 0.1, "Sell")]
+
+    def test_malformed_message_skipped(self, stream):
+        stream._connected_since = NOW - 30
+        for frame in FRAMES[:3]:
+            stream._on_message(json.dumps(frame))
+
+        stream._on_message("{not json")
+        stream._on_message(json.dumps(trade_frame((NOW_MS, "bad", 1.0, "Buy"))))
+        stream._on_message(json.dumps(FRAMES[3]))
+
+        assert stream.stats["errors"] == 2
+        assert stream.book("BTCUSDT").best_bid == 100.0
+        assert len(stream.recent_trades("BTCUSDT", NOW_MS - 10_000)) == 2
+
+    def test_broken_book_delta_drops_book(self, stream):
+        stream._connected_since = NOW
+        stream.handle(FRAMES[1])
+
+        stream._on_message(json.dumps(book_frame("delta", [["100"]], [], update_id=2)))
+
+        assert stream.stats["errors"] == 1
+        assert stream.book("BTCUSDT") is None
+        stream.handle(FRAMES[1])
+        assert stream.book("BTCUSDT") is not None
+
+    def test_disconnect_clears_state(self, stream):
+        for frame in FRAMES:
+            stream.handle(frame)
+        stream._connected_since = NOW
+
+        stream._disconnected()
+
+        assert stream.book("BTCUSDT") is None
+        assert stream.recent_trades("BTCUSDT", NOW_MS) is None
+
+
+class TestReplay:
+    """Поток против локального replay-сервера вместо биржи."""
+
+    @pytest.mark.asyncio
+    async def test_stream_from_replay_server(self, clock, tmp_path):
+        store = CandleStore(venues={"bybit": (AsyncMock(), 1000, 1)}, clock=clock)
+        start = NOW_MS // FIVE_MIN * FIVE_MIN
+        times = [start - FIVE_MIN * i for i in range(3, -1, -1)]
+        store._entries[("bybit", "BTCUSDT", "5m")] = window_entry(times, clock)
+
+        record_path = tmp_path / "stream.jsonl"
+        # Битый кадр не рвёт соединение
+        bad = book_frame("delta", [["x", "1"]], [], update_id=3)
+        frames = FRAMES[:4] + [bad] + FRAMES[4:]
+        server = ReplayServer(frames + [{"topic": "publicTrade.ETHUSDT", "data": []}])
+        stream = MarketStream(
+            symbols=["BTCUSDT"], url=await server.start(), store=store,
+            record_path=str(record_path), clock=clock,
+        )
+        clock.now -= 5  # подключение раньше сделок
+        await stream.start()
+        try:
+            for _ in range(200):
+                if stream.stats["messages"] >= len(frames):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await stream.stop()
+            await server.stop()
+
+        # Чужой символ не подписан
+        assert stream.stats["messages"] == len(frames)
+        assert stream.stats["errors"] == 1 and stream.stats["reconnects"] == 0
+        candles = await store.get("bybit", "BTCUSDT", "5m", 4, max_age=0)
+        assert candles.close[-1] == 105.0
+        assert store.venues["bybit"][0].await_count == 0
+        recorded = [frame for frame in load_frames(record_path) if "topic" in frame]
+        assert recorded == frames
+
+
+class TestConsumers:
+    """Потребители берут данные из потока, а без него - из REST."""
+
+    @pytest.fixture
+    def connected(self, stream):
+        for frame in FRAMES:
+            stream.handle(frame)
+        stream._connected_since = NOW - 3600
+        return stream
+
+    @pytest.fixture
+    def analyzer(self):
+        from signals import ai_signals
+
+        analyzer = ai_signals.AISignalAnalyzer.__new__(ai_signals.AISignalAnalyzer)
+        analyzer.bybit_mapping = {"BTC": "BTCUSDT"}
+        analyzer._previous_orderbook = {}
+        return analyzer
+
+    @pytest.mark.asyncio
+    async def test_trades_flow_from_stream(self, connected, analyzer, monkeypatch):
+        from signals import ai_signals
+
+        monkeypatch.setattr(ai_signals, "market_stream", connected)
+        monkeypatch.setattr(ai_signals, "datetime", Mock(now=Mock(return_value=Mock(timestamp=lambda: NOW))))
+        analyzer._fetch_recent_trades = AsyncMock()
+
+        flow = await analyzer.get_recent_trades_flow("BTC")
+
+        analyzer._fetch_recent_trades.assert_not_called()
+        assert flow["buy_count"] == 1 and flow["sell_count"] == 1
+        assert flow["buy_volume"] == round(100.5 * 0.2, 2)
+
+    @pytest.mark.asyncio
+    async def test_trades_flow_falls_back_to_rest(self, stream, analyzer, monkeypatch):
+        from signals import ai_signals
+
+        monkeypatch.setattr(ai_signals, "market_stream", stream)
+        analyzer._fetch_recent_trades = AsyncMock(return_value=[])
+
+        assert await analyzer.get_recent_trades_flow("BTC") is None
+        analyzer._fetch_recent_trades.assert_awaited_once_with("BTCUSDT")
+
+    @pytest.mark.asyncio
+    async def test_orderbook_delta_from_stream(self, connected, analyzer, monkeypatch):
+        from signals import ai_signals
+
+        monkeypatch.setattr(ai_signals, "market_stream", connected)
+        analyzer._fetch_orderbook_levels = AsyncMock()
+
+        # История стакана короче окна - дельты ещё нет
+        monkeypatch.setattr(ai_signals.time, "time", lambda: NOW + 60)
+        first = await analyzer.get_orderbook_delta("BTC")
+
+        connected.handle(book_frame("delta", [["100", "9"]], [], ts=NOW_MS + 150_000, update_id=3))
+        monkeypatch.setattr(ai_signals.time, "time", lambda: NOW + 200)
+        delta = await analyzer.get_orderbook_delta("BTC")
+
+        analyzer._fetch_orderbook_levels.assert_not_called()
+        assert first == {"bid_change": 0.0, "ask_change": 0.0, "delta": 0.0, "sentiment": "neutral"}
+        # Снимок в NOW_MS: bids 2 + 3, asks 1 + 4
+        assert delta["bid_change"] == round((9 + 5 - 5) / 5 * 100, 2)
+        assert delta["ask_change"] == round((2.5 + 4 - 5) / 5 * 100, 2)
+        assert delta["sentiment"] == "bullish"
+
+    @pytest.mark.asyncio
+    async def test_orderbook_delta_rest_fallback(self, stream, analyzer, monkeypatch):
+        from signals import ai_signals
+
+        monkeypatch.setattr(ai_signals, "market_stream", stream)
+        analyzer._fetch_orderbook_levels = AsyncMock(side_effect=[
+            ([["100", "10"]], [["101", "10"]]),
+            ([["100", "12"]], [["101", "10"]]),
+        ])
+
+        first = await analyzer.get_orderbook_delta("BTC")
+        second = await analyzer.get_orderbook_delta("BTC")
+
+        assert first["delta"] == 0.0
+        assert second["bid_change"] == 20.0 and second["sentiment"] == "bullish"
+
+    @pytest.mark.asyncio
+    async def test_order_flow_trades_from_stream(self, connected, monkeypatch):
+        from enhancers import order_flow
+
+        monkeypatch.setattr(order_flow, "market_stream", connected)
+        trades = await order_flow.OrderFlowEnhancer()._get_recent_trades("BTC", limit=2)
+
+        assert trades == [
+            {"p": 100.5, "q": 0.2, "m": False, "T": NOW_MS - 1000},
+            {"p": 100.4, "q": 0.1, "m": True, "T": NOW_MS - 500},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_order_book_analysis_from_stream(self, connected, monkeypatch):
+        from signals import data_sources
+
+        monkeypatch.setattr(data_sources, "market_stream", connected)
+        analysis = await data_sources.DataSourceManager().get_order_book_analysis("BTCUSDT")
+
+        # bids 100: 2, 98: 5; asks 101: 2.5, 102: 4
+        assert analysis["bid_volume"] == 7.0 and analysis["ask_volume"] == 6.5
+        assert analysis["imbalance"] == round(0.5 / 13.5, 4)
+        assert (analysis["top_bid"], analysis["top_ask"]) == (100.0, 101.0)
@@ -6,12 +6,17 @@ import pytest
 import sys
 import os
 
+import numpy as np
+
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from signals.indicators import (
-    detect_volume_spike, calculate_rsi_divergence, calculate_adx, calculate_rsi
+    detect_volume_spike, calculate_rsi_divergence, calculate_adx, calculate_rsi,
+    calculate_adx_series, calculate_macd_divergence, divergence_series, rsi_series,
+    swing_point_mask
 )
+from signals.scoring import calculate_adx as scoring_adx
 
 
 class TestVolumeSpikeDetection:
@@ -144,6 +149,58 @@ class TestRSIDivergence:
         assert result is None
 
 
+class TestDivergenceSeries:
+    """Tests for full-history divergence detection."""
+    
+    @pytest.fixture
+    def history(self):
+        rng = np.random.default_rng(4)
+        prices = list(np.round(100 + np.cumsum(rng.normal(0, 1, 250)), 1))
+        return prices, rsi_series(prices, 14)
+    
+    def test_rsi_series_matches_calculate_rsi(self, history):
+        prices, rsi = history
+        
+        assert np.isnan(rsi[:14]).all()
+        for i in range(14, len(prices)):
+            assert rsi[i] == calculate_rsi(prices[:i + 1], 14).value
+    
+    def test_every_bar_matches_latest_window_call(self, history):
+        prices, rsi = history
+        series = divergence_series(prices, rsi, lookback=14)
+        types = {1: "bullish", -1: "bearish", 0: "none"}
+        
+        for i in range(len(prices)):
+            expected = calculate_rsi_divergence(prices[:i + 1], list(rsi[:i + 1]), lookback=14)
+            if expected is None:
+                assert series.signal[i] == 0
+                continue
+            assert types[int(series.signal[i])] == expected.type
+            assert min(100, series.magnitude[i] * 3) == expected.strength
+        
+        assert (series.signal == 1).any() and (series.signal == -1).any()
+    
+    def test_precomputed_swings(self, history):
+        prices, rsi = history
+        highs = np.flatnonzero(swing_point_mask(np.array(prices), 'high'))
+        lows = np.flatnonzero(swing_point_mask(np.array(prices), 'low'))
+        
+        default = divergence_series(prices, rsi, lookback=20)
+        precomputed = divergence_series(prices, rsi, lookback=20, swing_highs=highs, swing_lows=lows)
+        
+        assert np.array_equal(default.signal, precomputed.signal)
+        assert np.array_equal(default.magnitude, precomputed.magnitude)
+    
+    def test_macd_divergence_uses_same_events(self, history):
+        prices, _ = history
+        histogram = list(np.sin(np.arange(len(prices)) / 3))
+        series = divergence_series(prices, histogram, lookback=30)
+        
+        result = calculate_macd_divergence(prices, histogram, lookback=30)
+        
+        assert result.type == {1: "bullish", -1: "bearish", 0: "none"}[int(series.signal[-1])]
+
+
 class TestADX:
     """Tests for ADX calculation."""
     
@@ -228,6 +285,85 @@ class TestADX:
             assert result.trend_strength == "very_strong"
 
 
+def loop_wilder_adx(high, low, close, period):
+    """Reference: classic Wilder ADX with running sums, one bar at a time."""
+    tr, plus_dm, minus_dm = [], [], []
+    for i in range(1, len(close)):
+        tr.append(max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+        up, down = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm.append(up if up > down and up > 0 else 0.0)
+        minus_dm.append(down if down > up and down > 0 else 0.0)
+
+    tr_s, plus_s, minus_s = sum(tr[:period]), sum(plus_dm[:period]), sum(minus_dm[:period])
+    dx, plus_di, minus_di = [], None, None
+    for i in range(period - 1, len(tr)):
+        if i >= period:
+            tr_s = tr_s - tr_s / period + tr[i]
+            plus_s = plus_s - plus_s / period + plus_dm[i]
+            minus_s = minus_s - minus_s / period + minus_dm[i]
+        plus_di, minus_di = 100 * plus_s / tr_s, 100 * minus_s / tr_s
+        dx.append(100 * abs(plus_di - minus_di) / (plus_di + minus_di))
+
+    adx = sum(dx[:period]) / period
+    for value in dx[period:]:
+        adx = (adx * (period - 1) + value) / period
+    return adx, plus_di, minus_di
+
+
+class TestADXSeries:
+    """Tests for full-series Wilder ADX."""
+
+    @pytest.fixture
+    def ohlc(self):
+        rng = np.random.default_rng(21)
+        close = 100 + np.cumsum(rng.normal(0.1, 1, 200))
+        spread = rng.uniform(0.2, 2.0, 200)
+        return close + spread, close - spread, close
+
+    def test_matches_classic_wilder(self, ohlc):
+        high, low, close = ohlc
+        adx, plus_di, minus_di = loop_wilder_adx(list(high), list(low), list(close), 14)
+
+        series = calculate_adx_series(high, low, close, 14)
+
+        assert series.adx[-1] == pytest.approx(adx, rel=1e-9)
+        assert series.plus_di[-1] == pytest.approx(plus_di, rel=1e-9)
+        assert series.minus_di[-1] == pytest.approx(minus_di, rel=1e-9)
+
+    def test_warmup_is_nan(self, ohlc):
+        series = calculate_adx_series(*ohlc, period=14)
+
+        assert np.isnan(series.plus_di[:14]).all() and not np.isnan(series.plus_di[14:]).any()
+        assert np.isnan(series.adx[:27]).all() and not np.isnan(series.adx[27:]).any()
+
+    def test_matrix_rows_match_series(self, ohlc):
+        high, low, close = ohlc
+        pad = np.full(50, np.nan)
+        matrix = [np.vstack([x, np.concatenate([pad, x[:150]])]) for x in (high, low, close)]
+
+        series = calculate_adx_series(*matrix, period=14)
+
+        single = calculate_adx_series(high[:150], low[:150], close[:150], 14)
+        np.testing.assert_allclose(series.adx[1, 50:], single.adx, rtol=1e-12)
+        np.testing.assert_allclose(series.adx[0], calculate_adx_series(high, low, close, 14).adx, rtol=1e-12)
+
+    def test_calculate_adx_uses_last_value(self, ohlc):
+        high, low, close = ohlc
+        series = calculate_adx_series(high, low, close, 14)
+
+        result = calculate_adx(list(high), list(low), list(close), period=14)
+
+        assert result.value == pytest.approx(series.adx[-1])
+        assert scoring_adx(list(high), list(low), list(close), 14) == pytest.approx(series.adx[-1])
+
+    def test_short_history_falls_back_to_dx(self, ohlc):
+        high, low, close = (list(x[:20]) for x in ohlc)
+
+        result = calculate_adx(high, low, close, period=14)
+
+        assert result.value == pytest.approx(calculate_adx_series(high, low, close, 14).dx[-1])
+
+
 class TestNewIndicatorsIntegration:
     """Integration tests for new indicators."""
     
@@ -33,7 +33,7 @@ class TestOptionsAnalyzer:
             ]
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -63,7 +63,7 @@ class TestOptionsAnalyzer:
             ]
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -87,7 +87,7 @@ class TestOptionsAnalyzer:
     @pytest.mark.asyncio
     async def test_get_options_data_failure(self, analyzer):
         """Test options data fetch failure handling."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 404
             mock_session.return_value.__aenter__.return_value.get = Mock(return_value=mock_get)
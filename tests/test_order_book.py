@@ -0,0 +1,124 @@
+"""
+Tests for the local L2 order book (signals.order_book).
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.order_book import OrderBook
+
+
+@pytest.fixture
+def book():
+    return OrderBook.from_snapshot(
+        bids=[["100", "2"], ["99", "3"], ["98", "20"], ["97", "1"]],
+        asks=[["101", "1"], ["102", "4"], ["105", "2"]],
+        timestamp=0,
+    )
+
+
+class TestLevels:
+    """Снимок и дельты."""
+
+    def test_snapshot_sorted_from_best(self, book):
+        assert book.levels("bids", 2) == [[100.0, 2.0], [99.0, 3.0]]
+        assert book.levels("asks") == [[101.0, 1.0], [102.0, 4.0], [105.0, 2.0]]
+        assert (book.best_bid, book.best_ask, book.mid) == (100.0, 101.0, 100.5)
+        assert book.spread_pct() == pytest.approx(1.0)
+
+    def test_delta_updates_inserts_and_removes(self, book):
+        book.apply("delta", {"b": [["99", "0"], ["100.5", "1"], ["98", "7"]], "a": [["101", "0"]], "u": 5}, 1000)
+
+        assert book.levels("bids") == [[100.5, 1.0], [100.0, 2.0], [98.0, 7.0], [97.0, 1.0]]
+        assert book.best_ask == 102.0
+        assert book.update_id == 5
+
+    def test_snapshot_replaces_book(self, book):
+        book.apply("snapshot", {"b": [["50", "1"]], "a": [["51", "1"]]}, 1000)
+
+        assert book.levels("bids") == [[50.0, 1.0]]
+        assert book.levels("asks") == [[51.0, 1.0]]
+
+    def test_empty_book(self):
+        book = OrderBook()
+
+        assert book.mid is None and book.spread_pct() is None
+        assert book.levels("bids") == []
+        assert book.depth_within(1.0) == (0.0, 0.0)
+        assert book.imbalance() == 0.0
+        assert book.walls("asks") == []
+
+    def test_unknown_side(self, book):
+        with pytest.raises(ValueError):
+            book.volume("middle")
+
+    def test_matches_dict_book(self):
+        rng = random.Random(7)
+        book = OrderBook()
+        reference = {"b": {}, "a": {}}
+        for step in range(300):
+            data = {
+                side: [[str(rng.randint(1, 60) * (1 if side == "b" else -1) + 100), str(rng.choice([0, 0.5, 1, 3]))]
+                       for _ in range(rng.randint(0, 8))]
+                for side in ("b", "a")
+            }
+            kind = "snapshot" if step % 100 == 0 else "delta"
+            if kind == "snapshot":
+                reference = {"b": {}, "a": {}}
+            book.apply(kind, data, step * 100)
+            for side, levels in data.items():
+                for price, size in levels:
+                    if float(size):
+                        reference[side][float(price)] = float(size)
+                    else:
+                        reference[side].pop(float(price), None)
+
+        expected_bids = sorted(reference["b"].items(), reverse=True)
+        expected_asks = sorted(reference["a"].items())
+        assert book.levels("bids") == [list(level) for level in expected_bids]
+        assert book.levels("asks") == [list(level) for level in expected_asks]
+        assert book.volume("bids", 10) == pytest.approx(sum(size for _, size in expected_bids[:10]))
+
+
+class TestQueries:
+    """Глубина, дисбаланс, стены и изменение объёма."""
+
+    def test_volume_and_depth_within(self, book):
+        assert book.volume("bids") == 26.0
+        assert book.volume("asks", 2) == 5.0
+        # mid 100.5: bids >= 99.495, asks <= 101.505
+        assert book.depth_within(1.0) == (2.0, 1.0)
+        assert book.depth_within(3.0) == (25.0, 5.0)
+
+    def test_imbalance(self, book):
+        assert book.imbalance(depth=1) == pytest.approx((2 - 1) / 3)
+        assert book.imbalance(pct=3.0) == pytest.approx((25 - 5) / 30)
+
+    def test_walls(self, book):
+        assert book.walls("bids") == [[98.0, 20.0]]
+        assert book.walls("asks", multiple=1.5) == [[102.0, 4.0]]
+        # В пределах 1% стен нет
+        assert book.walls("bids", pct=1.0) == []
+
+    def test_delta_since(self):
+        book = OrderBook.from_snapshot([["100", "10"]], [["101", "10"]], timestamp=0)
+        book.apply("delta", {"b": [["100", "11"]]}, 500)  # чаще шага истории - не пишется
+        book.apply("delta", {"b": [["100", "15"]], "a": [["101", "5"]]}, 2000)
+
+        assert book.delta_since(-1) is None
+        assert book.delta_since(1500) == {"bid_change": 50.0, "ask_change": -50.0, "delta": 100.0}
+        assert book.delta_since(2000) == {"bid_change": 0.0, "ask_change": 0.0, "delta": 0.0}
+
+    def test_history_trimmed(self):
+        book = OrderBook(history_seconds=10)
+        for second in range(30):
+            book.apply("snapshot", {"b": [["100", str(second + 1)]], "a": [["101", "1"]]}, second * 1000)
+
+        assert book.delta_since(5000) is None
+        assert book.delta_since(19_000)["bid_change"] == pytest.approx((30 - 20) / 20 * 100)
@@ -0,0 +1,135 @@
+"""
+Tests for local timeframe resampling (signals.resample).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.candle_store import CandleStore
+from signals.candles import INTERVAL_MS, CandleSeries
+from signals.resample import base_bars_needed, resample
+
+# 2023-11-14 22:00 UTC, не кратно 4h
+START = 1_699_999_200_000
+
+
+def make_candles(count, interval="15m", start=START):
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    spread = rng.uniform(0.1, 2.0, count)
+    return CandleSeries(
+        {
+            "open": close - spread / 3,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.uniform(1, 10, count),
+        },
+        times=start + np.arange(count) * INTERVAL_MS[interval],
+    )
+
+
+def loop_resample(candles, interval):
+    step = INTERVAL_MS[interval]
+    buckets = {}
+    for c in candles:
+        buckets.setdefault(c["timestamp"] // step * step, []).append(c)
+    return [
+        {
+            "timestamp": start,
+            "open": group[0]["open"],
+            "high": max(c["high"] for c in group),
+            "low": min(c["low"] for c in group),
+            "close": group[-1]["close"],
+            "volume": sum(c["volume"] for c in group),
+        }
+        for start, group in buckets.items()
+    ]
+
+
+class TestResample:
+    """Корзины, выравнивание по UTC и неполные бары."""
+
+    def test_matches_loop_aggregation(self):
+        candles = make_candles(16 * 10 + 8, start=START + 2 * 3_600_000)
+        result = resample(candles, "4h")
+        expected = loop_resample(candles, "4h")
+
+        assert len(result) == len(expected)
+        for got, want in zip(result, expected):
+            assert got["timestamp"] == want["timestamp"]
+            assert (got["open"], got["high"], got["low"], got["close"]) == (
+                want["open"], want["high"], want["low"], want["close"]
+            )
+            assert got["volume"] == pytest.approx(want["volume"])
+
+    def test_buckets_aligned_to_utc(self):
+        result = resample(make_candles(200), "4h")
+
+        assert all(t % INTERVAL_MS["4h"] == 0 for t in result.times)
+        assert all(t % INTERVAL_MS["1d"] == 0 for t in resample(make_candles(500), "1d").times)
+
+    def test_partial_first_bucket_dropped(self):
+        candles = make_candles(40)  # 22:00 - первые 2 часа бара 20:00-24:00
+        result = resample(candles, "4h")
+        kept = resample(candles, "4h", drop_partial_first=False)
+
+        assert result.times[0] == START + 2 * 3_600_000
+        assert len(kept) == len(result) + 1
+        assert kept.times[0] == START - 2 * 3_600_000
+
+    def test_forming_last_bucket_kept(self):
+        candles = make_candles(16 + 3, start=START + 2 * 3_600_000)
+        result = resample(candles, "4h")
+
+        assert len(result) == 2
+        assert result[-1]["open"] == candles[16]["open"]
+        assert result[-1]["close"] == candles[-1]["close"]
+
+    def test_seconds_and_extra_columns(self):
+        seconds = [
+            {"time": 1_700_006_400 + i * 3600, "open": i, "high": i + 1, "low": i - 1, "close": i + 0.5,
+             "volumefrom": 1.0, "volumeto": 100.0}
+            for i in range(8)
+        ]
+        result = resample(seconds, "4h", time_scale=1000)
+
+        assert result.time_key == "time"
+        assert result.to_dicts() == [
+            {"time": 1_700_006_400, "open": 0.0, "high": 4.0, "low": -1.0, "close": 3.5,
+             "volumefrom": 4.0, "volumeto": 400.0},
+            {"time": 1_700_020_800, "open": 4.0, "high": 8.0, "low": 3.0, "close": 7.5,
+             "volumefrom": 4.0, "volumeto": 400.0},
+        ]
+
+    def test_base_bars_needed(self):
+        assert base_bars_needed("4h", 50, "1h") == 204
+        assert base_bars_needed("15m", 50, "5m") == 153
+
+
+class TestStoreResampling:
+    """Несколько таймфреймов из одного окна."""
+
+    @pytest.mark.asyncio
+    async def test_one_request_per_symbol(self):
+        calls = []
+
+        async def fetch(symbol, interval, limit):
+            calls.append((interval, limit))
+            return make_candles(limit, interval)
+
+        store = CandleStore(venues={"fake": (fetch, 1000, 1)}, clock=lambda: START / 1000)
+
+        h1 = await store.get_resampled("fake", "BTCUSDT", "1h", 100, "15m")
+        m15 = await store.get_resampled("fake", "BTCUSDT", "15m", 100, "15m")
+        h4 = await store.get_resampled("fake", "BTCUSDT", "4h", 100, "15m")
+
+        assert calls == [("15m", 404), ("4h", 100)]
+        assert len(h1) == 100 and len(m15) == 100 and len(h4) == 100
+        assert h1.close[-1] == m15.close[-1]
@@ -0,0 +1,166 @@
+"""
+Tests for progressive signal previews (SignalProgress, ThrottledEditor)
+and their fan-out from AISignalAnalyzer.analyze_coin.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.ai_signals import AISignalAnalyzer
+from signals.fetch_plan import FetchPlan
+from signals.signal_progress import SignalProgress, ThrottledEditor
+
+
+class TestSignalProgress:
+    """Tests for SignalProgress."""
+
+    def test_stage_completes_when_all_sources_ready(self):
+        progress = SignalProgress("BTC")
+
+        assert progress.update("market_data", {"price_usd": 50000.0, "change_24h": 2.5})
+        assert "market" not in progress.completed
+        assert progress.update("technical_data", {"rsi": {"value": 41.7}, "macd": {"signal": "bullish"}})
+
+        text = progress.render()
+        assert "market" in progress.completed
+        assert "$50,000.00 (+2.50% за 24ч)" in text
+        assert "RSI 42 | MACD bullish" in text
+        assert "✅ 💰 Цена и индикаторы" in text
+        assert "⏳ 📊 Деривативы" in text
+
+    def test_unrelated_source_does_not_change_preview(self):
+        progress = SignalProgress("BTC")
+
+        assert not progress.update("news_sentiment", {"sentiment_score": 0.1})
+
+    def test_complete_signal_stage(self):
+        progress = SignalProgress("ETH")
+
+        assert progress.complete("signal")
+        assert not progress.complete("signal")
+        assert "✅ 🧠 Enhancers и расчёт сигнала" in progress.render()
+        assert not progress.done
+
+
+class TestThrottledEditor:
+    """Tests for ThrottledEditor."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_to_latest_text(self):
+        sent = []
+        editor = ThrottledEditor(AsyncMock(side_effect=sent.append), min_interval=0.05)
+
+        editor.submit("a")
+        await asyncio.sleep(0.01)
+        editor.submit("b")
+        editor.submit("c")
+        await asyncio.sleep(0.1)
+
+        assert sent == ["a", "c"]
+        assert editor.stats["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_respects_min_interval_and_skips_duplicates(self):
+        times = []
+        loop = asyncio.get_running_loop()
+
+        async def send(text):
+            times.append(loop.time())
+
+        editor = ThrottledEditor(send, min_interval=0.05)
+        editor.submit("a")
+        await asyncio.sleep(0.01)
+        editor.submit("b")
+        await asyncio.sleep(0.1)
+        editor.submit("b")
+        await asyncio.sleep(0.01)
+
+        assert len(times) == 2
+        assert times[1] - times[0] >= 0.045
+
+    @pytest.mark.asyncio
+    async def test_close_drops_pending_text(self):
+        sent = []
+        editor = ThrottledEditor(AsyncMock(side_effect=sent.append), min_interval=10)
+        editor.submit("a")
+        await asyncio.sleep(0.01)
+        editor.submit("b")
+
+        await editor.close()
+        editor.submit("c")
+        await asyncio.sleep(0.01)
+
+        assert sent == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_send_error_is_swallowed(self):
+        editor = ThrottledEditor(AsyncMock(side_effect=RuntimeError("boom")), min_interval=0)
+
+        editor.submit("a")
+        await asyncio.sleep(0.01)
+        await editor.close()
+
+        assert editor.stats["sent"] == 0
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = AISignalAnalyzer(Mock())
+    release = asyncio.Event()
+
+    async def market():
+        await release.wait()
+        return {"price_usd": 100.0, "change_24h": 1.5}
+
+    def build_plan(symbol, bybit_symbol, shared=None):
+        plan = FetchPlan(symbol)
+        plan.add("market_data", market, required=True)
+        plan.add("technical_data", lambda m: {"rsi": {"value": 40}}, depends=["market_data"])
+        return plan
+
+    analyzer._build_fetch_plan = build_plan
+    analyzer.calculate_signal = AsyncMock(return_value={"direction": "long"})
+    analyzer.cpu_pool.run = AsyncMock(return_value="signal BTC")
+    analyzer.release = release
+    return analyzer
+
+
+class TestAnalyzeCoinProgress:
+    """Progress fan-out from analyze_coin."""
+
+    @pytest.mark.asyncio
+    async def test_progress_reaches_single_flight_followers(self, analyzer):
+        leader, follower = [], []
+
+        first = asyncio.ensure_future(analyzer.analyze_coin("BTC", on_progress=leader.append))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(analyzer.analyze_coin("btc", on_progress=follower.append))
+        await asyncio.sleep(0.01)
+
+        # Присоединившийся вызов сразу получает текущее состояние
+        assert len(follower) == 1 and "⏳ 💰 Цена и индикаторы" in follower[0]
+
+        analyzer.release.set()
+        assert await first == await second == "signal BTC"
+
+        for texts in (leader, follower):
+            assert any("✅ 💰 Цена и индикаторы" in t and "$100.00" in t for t in texts)
+            assert "✅ 🧠 Enhancers и расчёт сигнала" in texts[-1]
+        assert analyzer._progress == {}
+        assert analyzer._progress_listeners == {}
+
+    @pytest.mark.asyncio
+    async def test_failing_listener_does_not_break_analysis(self, analyzer):
+        analyzer.release.set()
+
+        message = await analyzer.analyze_coin("BTC", on_progress=Mock(side_effect=RuntimeError("boom")))
+
+        assert message == "signal BTC"
+
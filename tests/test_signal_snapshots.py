@@ -0,0 +1,137 @@
+"""
+Tests for background signal precomputation (SignalSnapshotService).
+"""
+
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.signal_snapshots import SignalSnapshot, SignalSnapshotService
+
+
+def make_analyzer(message_for=None):
+    """Fake AISignalAnalyzer with the attributes the service relies on."""
+    analyzer = Mock()
+    analyzer.SUPPORTED_SIGNAL_COINS = {"TON", "ETH", "BTC"}
+    analyzer.SIGNAL_CACHE_TTL = 300
+    calls = []
+
+    async def analyze_coin(symbol, force_refresh=False, on_progress=None):
+        calls.append(symbol)
+        if message_for:
+            return message_for(symbol)
+        return f"signal {symbol}"
+
+    async def analyze_coins(symbols, force_refresh=False):
+        return {symbol: await analyze_coin(symbol, force_refresh) for symbol in symbols}
+
+    analyzer.analyze_coin = AsyncMock(side_effect=analyze_coin)
+    analyzer.analyze_coins = AsyncMock(side_effect=analyze_coins)
+    analyzer.get_last_signal = Mock(side_effect=lambda symbol: {
+        "signal_data": {"direction": "long", "symbol": symbol},
+        "market_data": {"price_usd": 100.0},
+        "timestamp": time.time(),
+    })
+    analyzer.calls = calls
+    return analyzer
+
+
+class TestSignalSnapshotService:
+    """Tests for SignalSnapshotService."""
+
+    def test_btc_is_computed_first(self):
+        service = SignalSnapshotService(make_analyzer())
+        assert service.symbols == ["BTC", "ETH", "TON"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_all_stores_message_and_signal_data(self):
+        analyzer = make_analyzer()
+        service = SignalSnapshotService(analyzer)
+
+        await service.refresh_all()
+
+        analyzer.analyze_coins.assert_awaited_once_with(["BTC", "ETH", "TON"], force_refresh=True)
+        assert analyzer.calls == ["BTC", "ETH", "TON"]
+        snapshot = service.get_snapshot("btc")
+        assert snapshot.message == "signal BTC"
+        assert snapshot.signal_data["direction"] == "long"
+        assert snapshot.market_data["price_usd"] == 100.0
+
+    @pytest.mark.asyncio
+    async def test_button_served_from_snapshot(self):
+        analyzer = make_analyzer()
+        service = SignalSnapshotService(analyzer)
+        await service.refresh("BTC")
+        analyzer.analyze_coin.reset_mock()
+
+        message = await service.get_message("BTC")
+
+        analyzer.analyze_coin.assert_not_awaited()
+        assert message.startswith("signal BTC")
+        assert "Рассчитано" in message and "сек назад" in message
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_recomputes(self):
+        analyzer = make_analyzer()
+        service = SignalSnapshotService(analyzer)
+        await service.refresh("BTC")
+
+        await service.get_message("BTC", force_refresh=True)
+
+        assert analyzer.analyze_coin.await_count == 2
+        assert analyzer.analyze_coin.await_args.kwargs["force_refresh"] is True
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_not_served(self):
+        analyzer = make_analyzer()
+        service = SignalSnapshotService(analyzer, max_age=60)
+        service._snapshots["BTC"] = SignalSnapshot(
+            symbol="BTC", message="old", computed_at=time.time() - 120
+        )
+
+        message = await service.get_message("BTC")
+
+        assert message.startswith("signal BTC")
+
+    @pytest.mark.asyncio
+    async def test_error_keeps_previous_snapshot(self):
+        analyzer = make_analyzer(message_for=lambda s: "❌ *Ошибка получения данных*")
+        service = SignalSnapshotService(analyzer)
+        previous = SignalSnapshot(symbol="BTC", message="previous")
+        service._snapshots["BTC"] = previous
+
+        assert await service.refresh("BTC") is None
+        assert service.get_snapshot("BTC") is previous
+
+    @pytest.mark.asyncio
+    async def test_unsupported_coin_returns_analyzer_message(self):
+        analyzer = make_analyzer(message_for=lambda s: "❌ *Ошибка*")
+        service = SignalSnapshotService(analyzer)
+
+        message = await service.get_message("DOGE")
+
+        assert message == "❌ *Ошибка*"
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_background_task(self):
+        analyzer = make_analyzer()
+        service = SignalSnapshotService(analyzer, refresh_interval=3600)
+
+        await service.start()
+        await asyncio.sleep(0.05)
+        assert service.is_running
+        assert service.get_snapshot("TON") is not None
+
+        await service.stop()
+        assert not service.is_running
+
+    def test_format_age(self):
+        assert SignalSnapshotService.format_age(5) == "5 сек назад"
+        assert SignalSnapshotService.format_age(125) == "2 мин 5 сек назад"
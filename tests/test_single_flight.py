@@ -0,0 +1,148 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+import os
+import sys
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.single_flight import SingleFlight
+from signals.ai_signals import AISignalAnalyzer
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_execution(self):
+        """50 concurrent callers should trigger exactly one computation."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"signal": "long"}
+
+        results = await asyncio.gather(*[flight.do("BTC", compute) for _ in range(50)])
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert flight.stats["executions"] == 1
+        assert flight.stats["coalesced"] == 49
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Each key has its own computation."""
+        flight = SingleFlight()
+
+        async def compute(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        btc, eth = await asyncio.gather(
+            flight.do("BTC", lambda: compute("btc")),
+            flight.do("ETH", lambda: compute("eth")),
+        )
+
+        assert (btc, eth) == ("btc", "eth")
+        assert flight.stats["executions"] == 2
+
+    @pytest.mark.asyncio
+    async def test_without_window_sequential_calls_recompute(self):
+        """Without a freshness window only in-flight calls are coalesced."""
+        flight = SingleFlight()
+        compute = AsyncMock(return_value="ok")
+
+        await flight.do("BTC", compute)
+        await flight.do("BTC", compute)
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_window_reuses_completed_result(self):
+        """A completed result is reused inside the freshness window."""
+        flight = SingleFlight(window_seconds=60)
+        compute = AsyncMock(return_value="ok")
+
+        await flight.do("BTC", compute)
+        result = await flight.do("BTC", compute)
+
+        assert result == "ok"
+        assert compute.await_count == 1
+        assert flight.stats["window_hits"] == 1
+
+        flight.forget("BTC")
+        await flight.do("BTC", compute)
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_should_cache_predicate(self):
+        """Results rejected by should_cache are not reused."""
+        flight = SingleFlight(window_seconds=60, should_cache=lambda r: not r.startswith("❌"))
+        compute = AsyncMock(return_value="❌ error")
+
+        await flight.do("BTC", compute)
+        await flight.do("BTC", compute)
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates_to_all_waiters(self):
+        """All waiters see the error and nothing is cached."""
+        flight = SingleFlight(window_seconds=60)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            flight.do("BTC", fail), flight.do("BTC", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert not flight.in_flight("BTC")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_work(self):
+        """Cancelling one waiter must not cancel the computation for others."""
+        flight = SingleFlight()
+
+        async def compute():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("BTC", compute))
+        second = asyncio.ensure_future(flight.do("BTC", compute))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+
+
+class TestAnalyzeCoinCoalescing:
+    """analyze_coin should coalesce concurrent requests per symbol."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_analyze_coin_runs_once(self):
+        tracker = Mock()
+        tracker.get_transactions_by_blockchain = AsyncMock(return_value=[])
+        analyzer = AISignalAnalyzer(tracker)
+
+        async def fake_analysis(symbol):
+            await asyncio.sleep(0.05)
+            return f"signal {symbol}"
+
+        analyzer._analyze_coin = AsyncMock(side_effect=fake_analysis)
+
+        results = await asyncio.gather(*[analyzer.analyze_coin("btc") for _ in range(20)])
+
+        assert analyzer._analyze_coin.await_count == 1
+        assert set(results) == {"signal BTC"}
@@ -55,7 +55,7 @@ class TestSocialSentimentAnalyzer:
             }
         }
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -74,7 +74,7 @@ class TestSocialSentimentAnalyzer:
     @pytest.mark.asyncio
     async def test_get_reddit_sentiment_rate_limited(self, analyzer):
         """Test Reddit rate limit handling."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 429
             mock_session.return_value.__aenter__.return_value.get = Mock(return_value=mock_get)
@@ -86,7 +86,7 @@ class TestSocialSentimentAnalyzer:
     @pytest.mark.asyncio
     async def test_get_reddit_sentiment_failure(self, analyzer):
         """Test Reddit fetch failure handling."""
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 404
             mock_session.return_value.__aenter__.return_value.get = Mock(return_value=mock_get)
@@ -235,7 +235,7 @@ class TestSocialSentimentAnalyzer:
         
         mock_response = {'data': {'children': posts}}
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
@@ -264,7 +264,7 @@ class TestSocialSentimentAnalyzer:
         
         mock_response = {'data': {'children': posts}}
         
-        with patch('aiohttp.ClientSession') as mock_session:
+        with patch('http_client.http_client.session') as mock_session:
             mock_get = AsyncMock()
             mock_get.__aenter__.return_value.status = 200
             mock_get.__aenter__.return_value.json = AsyncMock(return_value=mock_response)
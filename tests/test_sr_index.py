@@ -0,0 +1,116 @@
+"""
+Tests for the support/resistance index (signals.sr_index).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from enhancers.dynamic_targets import DynamicTargetsEnhancer
+from signals.indicators import count_touches, find_swing_points
+from signals.sr_index import PriceLevelIndex, SRIndex
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(21)
+    close = 100 + np.cumsum(rng.normal(0, 1, 150))
+    spread = rng.uniform(0.1, 2.0, 150)
+    # Округление даёт равные соседние экстремумы (проверка строгих сравнений)
+    return [
+        {"high": round(float(c + s), 1), "low": round(float(c - s), 1), "close": float(c)}
+        for c, s in zip(close, spread)
+    ]
+
+
+def loop_swing_points(data):
+    highs, lows = [], []
+    for i in range(2, len(data) - 2):
+        h = data[i]["high"]
+        if all(h > data[i + k]["high"] for k in (-2, -1, 1, 2)):
+            highs.append((h, i))
+        l = data[i]["low"]
+        if all(l < data[i + k]["low"] for k in (-2, -1, 1, 2)):
+            lows.append((l, i))
+    return highs, lows
+
+
+def loop_touches(data, level, tolerance_pct=0.5):
+    tolerance = level * tolerance_pct / 100
+    return sum(
+        1 for c in data
+        if abs(c["high"] - level) <= tolerance
+        or abs(c["low"] - level) <= tolerance
+        or c["low"] <= level <= c["high"]
+    )
+
+
+class TestVectorisedKernels:
+    """Векторные версии совпадают с поштучными циклами."""
+
+    def test_swing_points_match_loop(self, candles):
+        swing_highs, swing_lows = find_swing_points(candles, lookback=100)
+        expected_highs, expected_lows = loop_swing_points(candles[-100:])
+
+        assert [(s.price, s.index) for s in swing_highs] == expected_highs
+        assert [(s.price, s.index) for s in swing_lows] == expected_lows
+
+    def test_touches_match_loop(self, candles):
+        index = SRIndex(candles)
+        levels = [95.0, 100.0, 103.3, 110.0, 0.0]
+
+        assert list(index.touches(levels)) == [loop_touches(candles, l) if l > 0 else 0 for l in levels]
+        assert [count_touches(candles, l) for l in levels] == list(index.touches(levels))
+
+    def test_swing_levels(self, candles):
+        index = SRIndex(candles)
+        levels = index.swing_levels()
+
+        assert len(levels) == len(index.swing_highs) + len(index.swing_lows)
+        for level in levels:
+            assert level["touches"] == count_touches(candles, level["price"])
+
+
+class TestPriceLevelIndex:
+    """Запросы ближайших уровней."""
+
+    def test_above_and_below(self):
+        levels = [{"price": p, "id": i} for i, p in enumerate([105, 98, 101, 95, 101, 110])]
+        index = PriceLevelIndex(levels)
+
+        assert [l["id"] for l in index.above(100, 3)] == [2, 4, 0]
+        assert [l["id"] for l in index.below(101)] == [1, 3]
+        assert [l["id"] for l in index.below(200, 3)] == [5, 0, 2]
+        assert index.nearest_above(110) is None
+        assert index.nearest_below(101)["id"] == 1
+
+    def test_matches_sorted_filter(self):
+        rng = np.random.default_rng(8)
+        levels = [{"price": float(p)} for p in rng.integers(90, 110, 40)]
+        index = PriceLevelIndex(levels)
+
+        for price in (89.5, 95.0, 100.0, 104.5, 120.0):
+            above = sorted([l for l in levels if l["price"] > price], key=lambda x: x["price"])[:3]
+            below = sorted([l for l in levels if l["price"] < price], key=lambda x: x["price"], reverse=True)[:3]
+            assert index.above(price, 3) == above
+            assert all(a is b for a, b in zip(index.below(price, 3), below))
+
+    def test_nearest_order_block(self):
+        enhancer = DynamicTargetsEnhancer()
+        blocks = [
+            {"high": 95, "low": 93},
+            {"high": 98, "low": 96},
+            {"high": 98, "low": 97},
+            {"high": 106, "low": 104},
+            {"high": 103, "low": 102},
+        ]
+
+        assert enhancer._find_nearest_order_block(100, blocks, "below") is blocks[1]
+        assert enhancer._find_nearest_order_block(100, blocks, "above") is blocks[4]
+        assert enhancer._find_nearest_order_block(200, blocks, "above") is None
+        assert enhancer._find_nearest_order_block(100, [], "below") is None
@@ -0,0 +1,169 @@
+"""
+Tests for streaming indicator states (signals.streaming).
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signals.indicators import (
+    calculate_adx,
+    calculate_atr,
+    calculate_bollinger_bands,
+    calculate_macd,
+    calculate_obv,
+    calculate_rsi,
+    calculate_stochastic_rsi,
+    calculate_vwap,
+)
+from signals.streaming import (
+    ADXState,
+    ATRState,
+    BollingerState,
+    IndicatorSet,
+    IndicatorState,
+    MACDState,
+    OBVState,
+    RSIState,
+    StochRSIState,
+    VWAPState,
+)
+
+
+@pytest.fixture
+def candles():
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, 200))
+    spread = rng.uniform(0.1, 2.0, 200)
+    volume = rng.uniform(10, 1000, 200)
+    return [
+        {"high": float(c + s), "low": float(c - s), "close": float(c), "volume": float(v)}
+        for c, s, v in zip(close, spread, volume)
+    ]
+
+
+def columns(candles):
+    return (
+        [c["high"] for c in candles],
+        [c["low"] for c in candles],
+        [c["close"] for c in candles],
+        [c["volume"] for c in candles],
+    )
+
+
+def assert_same(streamed, batch):
+    """Поля результата совпадают с пакетным расчётом (числа - с точностью до округления)."""
+    assert (streamed is None) == (batch is None)
+    if batch is None:
+        return
+    for field, expected in vars(batch).items():
+        actual = getattr(streamed, field)
+        if isinstance(expected, float):
+            assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9), field
+        else:
+            assert actual == expected, field
+
+
+BATCH = {
+    "rsi": (lambda: RSIState(14), lambda h, l, c, v: calculate_rsi(c, 14)),
+    "macd": (lambda: MACDState(), lambda h, l, c, v: calculate_macd(c)),
+    "bollinger": (lambda: BollingerState(20), lambda h, l, c, v: calculate_bollinger_bands(c, 20)),
+    "atr": (lambda: ATRState(14), lambda h, l, c, v: calculate_atr(h, l, c, 14)),
+    "adx": (lambda: ADXState(14), lambda h, l, c, v: calculate_adx(h, l, c, 14)),
+    "stoch_rsi": (lambda: StochRSIState(14, 3, 3), lambda h, l, c, v: calculate_stochastic_rsi(c, 14, 3, 3)),
+    "obv": (lambda: OBVState(), lambda h, l, c, v: calculate_obv(c, v)),
+    "vwap": (lambda: VWAPState(), lambda h, l, c, v: calculate_vwap(h, l, c, v)),
+}
+
+
+class TestBatchParity:
+    """Каждое обновление совпадает с пакетной функцией по той же истории."""
+
+    @pytest.mark.parametrize("name", sorted(BATCH))
+    def test_matches_batch_on_every_bar(self, candles, name):
+        make_state, batch = BATCH[name]
+        state = make_state()
+        high, low, close, volume = columns(candles)
+
+        for n, candle in enumerate(candles, start=1):
+            streamed = state.update(candle)
+            assert_same(streamed, batch(high[:n], low[:n], close[:n], volume[:n]))
+
+    def test_close_only_input(self, candles):
+        closes = [c["close"] for c in candles]
+        state = RSIState(14)
+
+        assert_same(state.update_many(closes), calculate_rsi(closes, 14))
+
+    def test_cryptocompare_volume_key(self, candles):
+        high, low, close, volume = columns(candles)
+        renamed = [{"high": h, "low": l, "close": c, "volumeto": v} for h, l, c, v in zip(high, low, close, volume)]
+
+        assert_same(VWAPState().update_many(renamed), calculate_vwap(high, low, close, volume))
+
+
+class TestSnapshotRestore:
+    """snapshot()/restore() продолжают поток без расхождений."""
+
+    @pytest.mark.parametrize("name", sorted(BATCH))
+    def test_round_trip_continues_stream(self, candles, name):
+        make_state, _ = BATCH[name]
+        original = make_state()
+        original.update_many(candles[:120])
+
+        snapshot = json.loads(json.dumps(original.snapshot()))
+        restored = IndicatorState.restore(snapshot)
+
+        assert type(restored) is type(original)
+        assert_same(restored.value, original.value)
+        for candle in candles[120:]:
+            assert_same(restored.update(candle), original.update(candle))
+
+    def test_indicator_set_round_trip(self, candles):
+        indicators = IndicatorSet()
+        indicators.update_many(candles[:150])
+
+        restored = IndicatorSet.restore(json.loads(json.dumps(indicators.snapshot())))
+        values = restored.update(candles[150])
+        expected = indicators.update(candles[150])
+
+        assert set(values) == set(expected)
+        for name in expected:
+            assert_same(values[name], expected[name])
+
+    def test_incomplete_state_cannot_be_created(self):
+        class NoSnapshot(IndicatorState):
+            def _update(self, candle):
+                return None
+
+        with pytest.raises(TypeError):
+            NoSnapshot()
+        with pytest.raises(TypeError):
+            IndicatorState()
+
+
+class TestWarmup:
+    """Пока данных мало, update() возвращает None."""
+
+    def test_returns_none_until_enough_bars(self, candles):
+        state = MACDState()
+
+        results = [state.update(c) for c in candles[:35]]
+
+        assert all(r is None for r in results[:34])
+        assert results[34] is not None
+
+    def test_long_stream_stays_accurate(self):
+        rng = np.random.default_rng(3)
+        closes = list(1e4 + np.cumsum(rng.normal(0, 5, 5000)))
+        state = BollingerState(20)
+
+        state.update_many(closes)
+
+        assert_same(state.value, calculate_bollinger_bands(closes, 20))
@@ -155,7 +155,7 @@ async def test_scan_logs_summary(caplog):
     
     # Mock the main methods
     with patch.object(ss, 'fetch_all_coins', new_callable=AsyncMock) as mock_fetch_all:
-        with patch.object(ss, 'deep_analyze', new_callable=AsyncMock) as mock_analyze:
+        with patch.object(ss, 'deep_analyze_batch', new_callable=AsyncMock) as mock_analyze:
             # Return some filtered coins
             mock_fetch_all.return_value = [
                 {
@@ -169,7 +169,7 @@ async def test_scan_logs_summary(caplog):
             ]
             
             # Mock analyze to return results for some coins
-            def analyze_side_effect(coin):
+            def analyze_one(coin):
                 if int(coin['symbol'].replace('COIN', '')) % 2 == 0:
                     return {
                         "symbol": coin["symbol"],
@@ -177,6 +177,9 @@ async def test_scan_logs_summary(caplog):
                         "direction": "long"
                     }
                 return None
+
+            def analyze_side_effect(coins, delay=0.0):
+                return [analyze_one(coin) for coin in coins]
             
             mock_analyze.side_effect = analyze_side_effect
             
@@ -192,6 +192,17 @@ class TestSupportResistanceLevels:
         assert sr_levels['nearest_resistance'] > current_price
         assert sr_levels['nearest_support'] < current_price
     
+    def test_real_targets_use_levels_in_caller_order(self, analyzer):
+        """Test that TP/SL take the caller's levels as given, without re-sorting."""
+        resistances = [{'price': 110.0, 'strength': 5}, {'price': 105.0, 'strength': 3}]
+        supports = [{'price': 97.0, 'strength': 4}]
+        
+        targets = analyzer.calculate_real_targets("long", 100.0, resistances, supports, atr=1.0)
+        
+        assert targets['tp1'] == 110.0
+        assert targets['tp2'] == 105.0
+        assert [r['price'] for r in resistances] == [110.0, 105.0]
+    
     def test_swing_points_detection(self):
         """Test swing high/low detection."""
         ohlcv_data = [